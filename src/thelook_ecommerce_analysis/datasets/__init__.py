@@ -0,0 +1,12 @@
+"""Datasets customizados do projeto."""
+
+from .postgres_polars_dataset import PostgresPolarsDataset
+from .postgres_pool_dataset import PostgresPoolDataset
+from .streaming_polars_dataset import PART_COLUMN, StreamingPolarsDataset
+
+__all__ = [
+    "PART_COLUMN",
+    "PostgresPolarsDataset",
+    "PostgresPoolDataset",
+    "StreamingPolarsDataset",
+]
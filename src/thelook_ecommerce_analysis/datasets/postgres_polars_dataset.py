@@ -0,0 +1,524 @@
+import argparse
+import logging
+import time
+from collections.abc import Iterator
+from typing import Any
+
+import polars as pl
+import psycopg
+import sqlalchemy as sa
+from kedro.io import AbstractDataset, DatasetError
+from psycopg import pq, sql
+from psycopg.abc import Buffer
+
+from thelook_ecommerce_analysis.utils.get_credentials import get_credentials
+from thelook_ecommerce_analysis.utils.postgres_pool import POSTGRES_POOLS
+
+logger = logging.getLogger(__name__)
+
+# Tipo Polars de cada tipo do Postgres (pg_type.typname) lido direto pelo parser.
+# Os demais (text, uuid, json, enums, tipos do PostGIS...) são lidos como String.
+POLARS_TYPES = {
+    "int2": pl.Int16,
+    "int4": pl.Int32,
+    "int8": pl.Int64,
+    "oid": pl.Int64,
+    "float4": pl.Float32,
+    "float8": pl.Float64,
+}
+
+# Tipos convertidos depois da leitura como texto (formato ISO, fuso UTC na sessão)
+TEMPORAL_FORMATS = {
+    "date": (pl.Date, "%Y-%m-%d"),
+    "timestamp": (pl.Datetime("us"), "%Y-%m-%d %H:%M:%S%.f"),
+    "timestamptz": (pl.Datetime("us", "UTC"), "%Y-%m-%d %H:%M:%S%.f%#z"),
+}
+
+# Escapes que o `COPY ... TO` (formato texto) gera (em ordem: a barra dupla primeiro)
+TEXT_ESCAPES = {
+    "\\\\": "\\",
+    "\\b": "\b",
+    "\\f": "\f",
+    "\\n": "\n",
+    "\\r": "\r",
+    "\\t": "\t",
+    "\\v": "\v",
+}
+NULL_MARKER = "\\N"
+
+# Precisão máxima do Decimal do Polars; `numeric` sem precisão vira Float64
+MAX_DECIMAL_PRECISION = 38
+
+# Operadores aceitos em `filters` (coluna, operador, valor)
+FILTER_OPERATORS = ("=", "!=", "<", "<=", ">", ">=", "in", "not in")
+
+# Ajustes da sessão (apenas na transação da leitura) que fixam o texto do COPY
+SESSION_SETTINGS = {"DateStyle": "ISO", "TimeZone": "UTC", "bytea_output": "hex"}
+
+
+def _column_type(
+    type_name: str, precision: int | None, scale: int | None
+) -> pl.DataType:
+    """Tipo Polars de uma coluna do resultado, pelo nome do tipo do Postgres."""
+    if type_name == "numeric":
+        if precision and precision <= MAX_DECIMAL_PRECISION:
+            return pl.Decimal(precision, scale or 0)
+        return pl.Float64
+    if type_name == "bool":
+        return pl.Boolean
+    if type_name == "bytea":
+        return pl.Binary
+    if type_name in TEMPORAL_FORMATS:
+        return TEMPORAL_FORMATS[type_name][0]
+    return POLARS_TYPES.get(type_name, pl.String)
+
+
+def _parsed_directly(dtype: pl.DataType) -> bool:
+    """
+    Se o parser lê a coluna direto no tipo final.
+
+    O Decimal é lido como texto: o `numeric` do Postgres aceita `NaN` (e `Infinity`), que
+    o parser não converte em Decimal e que abortariam a leitura.
+    """
+    return dtype.is_numeric() and not isinstance(dtype, pl.Decimal)
+
+
+def _read_schema(schema: dict[str, pl.DataType]) -> dict[str, pl.DataType]:
+    """Schema do parser: numéricos direto, os demais como texto (convertidos depois)."""
+    return {
+        col: dtype if _parsed_directly(dtype) else pl.String
+        for col, dtype in schema.items()
+    }
+
+
+def _convert(col: str, type_name: str, dtype: pl.DataType) -> pl.Expr:
+    """Expressão que converte o texto do COPY de uma coluna no tipo final."""
+    text = pl.col(col)
+    if type_name in TEMPORAL_FORMATS:
+        return text.str.strptime(dtype, TEMPORAL_FORMATS[type_name][1], cache=False)
+    if dtype == pl.Boolean:
+        return text == "t"
+    if dtype == pl.Binary:
+        # bytea em hex ('\x0101...', com a barra escapada no COPY)
+        return text.str.strip_prefix("\\\\x").str.decode("hex")
+    if dtype == pl.String:
+        return text.str.replace_many(TEXT_ESCAPES)
+    if isinstance(dtype, pl.Decimal):
+        # `NaN`/`Infinity` não têm Decimal: viram nulo
+        return text.cast(dtype, strict=False)
+    return text
+
+
+def parse_copy_text(
+    data: bytes,
+    schema: dict[str, pl.DataType],
+    type_names: dict[str, str],
+) -> pl.DataFrame:
+    """
+    Converte linhas do `COPY ... TO STDOUT` (formato texto) em um DataFrame.
+
+    O parser CSV nativo do Polars lê os campos (separados por tab, sem aspas, `\\N` como
+    nulo) direto para buffers Arrow, sem objetos Python por valor. Inteiros e floats são
+    lidos no tipo final; Decimais (`NaN` vira nulo), datas, booleanos, bytea e textos são
+    convertidos em seguida por
+    expressões vetorizadas (incluindo os escapes `\\t`, `\\n`, `\\\\` e os demais de
+    `TEXT_ESCAPES`).
+
+    Args:
+        data (bytes): Linhas completas (terminadas em `\\n`).
+        schema (dict[str, pl.DataType]): Tipo Polars de cada coluna (`_column_type`).
+        type_names (dict[str, str]): Nome do tipo do Postgres de cada coluna.
+
+    Returns:
+        pl.DataFrame: Linhas com o `schema`.
+    """
+    if not data:
+        return pl.DataFrame(schema=schema)
+
+    df = pl.read_csv(
+        data,
+        has_header=False,
+        separator="\t",
+        quote_char=None,
+        null_values=NULL_MARKER,
+        # Campo vazio é texto vazio: o nulo do COPY é \\N
+        missing_utf8_is_empty_string=True,
+        schema=_read_schema(schema),
+    )
+    return df.with_columns(
+        _convert(col, type_names[col], dtype).alias(col)
+        for col, dtype in schema.items()
+        if not _parsed_directly(dtype)
+    )
+
+
+def build_select(  # noqa: PLR0913
+    table: str | None = None,
+    schema_name: str = "public",
+    query: str | None = None,
+    columns: list[str] | None = None,
+    filters: list[list[Any]] | None = None,
+) -> sql.Composed:
+    """
+    SELECT da tabela (ou da query) com a projeção e os filtros empurrados ao Postgres.
+
+    Args:
+        table (str | None): Tabela lida (ou `query`).
+        schema_name (str): Schema do Postgres da tabela.
+        query (str | None): SELECT arbitrário, usado como subquery.
+        columns (list[str] | None): Colunas lidas (padrão: todas).
+        filters (list[list[Any]] | None): Condições `[coluna, operador, valor]`, combinadas
+            com AND (ex: `[created_at, ">=", "2025-06-01"]`, `[status, in, [Complete]]`).
+
+    Returns:
+        sql.Composed: SELECT com os valores dos filtros como literais (o COPY não aceita
+            parâmetros).
+
+    Raises:
+        DatasetError: Sem `table` nem `query` (ou com os dois), ou filtro inválido.
+    """
+    if (table is None) == (query is None):
+        raise DatasetError("Informe 'table' ou 'query' (apenas um).")
+
+    source = (
+        sql.Identifier(schema_name, table)
+        if table is not None
+        else sql.SQL("({}) AS q").format(sql.SQL(query))
+    )
+    projection = (
+        sql.SQL(", ").join(map(sql.Identifier, columns)) if columns else sql.SQL("*")
+    )
+
+    conditions = []
+    for condition in filters or []:
+        try:
+            col, op, value = condition
+        except ValueError:
+            op = None
+        if str(op).lower() not in FILTER_OPERATORS:
+            raise DatasetError(
+                f"Filtro inválido: {condition}. Use [coluna, operador, valor], com o "
+                f"operador em {FILTER_OPERATORS}."
+            )
+        op = op.lower()
+        if op in ("in", "not in"):
+            rhs = sql.SQL("({})").format(sql.SQL(", ").join(map(sql.Literal, value)))
+        else:
+            rhs = sql.Literal(value)
+        conditions.append(
+            sql.SQL("{} {} {}").format(sql.Identifier(col), sql.SQL(op.upper()), rhs)
+        )
+
+    statement = sql.SQL("SELECT {} FROM {}").format(projection, source)
+    if conditions:
+        statement += sql.SQL(" WHERE ") + sql.SQL(" AND ").join(conditions)
+    return statement
+
+
+def _describe_result(
+    conn: psycopg.Connection, statement: sql.Composed
+) -> tuple[dict[str, pl.DataType], dict[str, str]]:
+    """Colunas do resultado (tipo Polars e nome do tipo do Postgres), sem ler linhas."""
+    cursor = conn.execute(sql.SQL("SELECT * FROM ({}) AS r LIMIT 0").format(statement))
+    schema, type_names = {}, {}
+    for column in cursor.description:
+        info = conn.adapters.types.get(column.type_code)
+        type_names[column.name] = info.name if info else "unknown"
+        schema[column.name] = _column_type(
+            type_names[column.name], column.precision, column.scale
+        )
+    return schema, type_names
+
+
+def _finish_copy(pgconn: pq.abc.PGconn) -> None:
+    """Lê os resultados finais do COPY (após o fim dos dados) e propaga erros do banco."""
+    errors = []
+    while (result := pgconn.get_result()) is not None:
+        if result.status != pq.ExecStatus.COMMAND_OK:
+            errors.append(result.error_message.decode(errors="replace").strip())
+    if errors:
+        msg = f"POSTGRES ERROR: Falha no COPY: {'; '.join(errors)}"
+        logger.error(msg)
+        raise DatasetError(msg)
+
+
+def iter_copy_data(copy: psycopg.Copy, pgconn: pq.abc.PGconn) -> Iterator[Buffer]:
+    """
+    Mensagens de um `COPY ... TO STDOUT` (uma linha do resultado em cada).
+
+    O `copy.read()` do psycopg passa por um gerador de espera do socket a cada mensagem,
+    o que domina o tempo da leitura (cerca de 3x o próprio libpq). Aqui ele é usado
+    apenas quando o libpq não tem mais mensagens recebidas: as já recebidas são lidas
+    direto do `pgconn`, sem bloquear, e o fim do COPY é tratado por `_finish_copy`.
+
+    Args:
+        copy (psycopg.Copy): COPY TO em andamento (`cursor.copy(...)`).
+        pgconn (pq.abc.PGconn): Conexão do libpq do cursor (`conn.pgconn`).
+
+    Yields:
+        Buffer: Dados de cada mensagem, válidos até a próxima.
+
+    Raises:
+        DatasetError: Se o banco ou a conexão falharem durante o COPY.
+    """
+    try:
+        while data := copy.read():
+            yield data
+            while True:
+                nbytes, data = pgconn.get_copy_data(1)
+                if nbytes == 0:
+                    # Nada recebido ainda: volta a esperar pelo socket no copy.read()
+                    break
+                if nbytes < 0:
+                    _finish_copy(pgconn)
+                    return
+                yield data
+    except psycopg.Error as e:
+        # Erros do banco no meio dos dados (ex.: divisão por zero) chegam pelo copy.read()
+        msg = f"POSTGRES ERROR: Falha no COPY: {e}"
+        logger.error(msg)
+        raise DatasetError(msg) from e
+
+
+class PostgresPolarsDataset(
+    AbstractDataset[Any, pl.DataFrame | Iterator[pl.DataFrame]]
+):
+    """
+    Leitura de uma tabela (ou query) do Postgres direto para Polars/Arrow.
+
+    A leitura usa `COPY (SELECT ...) TO STDOUT` em vez de um cursor: o Postgres envia as
+    linhas em stream, e o parser nativo do Polars as converte em colunas Arrow
+    (`parse_copy_text`), sem objetos Python por valor como no SQLAlchemy/`read_sql`. As
+    colunas (`columns`) e os filtros (`filters`) são empurrados para o SELECT, portanto
+    apenas as linhas e colunas necessárias saem do banco.
+
+    Sem `chunk_rows`, o `load` retorna um DataFrame. Com `chunk_rows`, retorna um
+    iterador de DataFrames de pelo menos `chunk_rows` linhas (o último pode ser menor),
+    lidos sob demanda: a conexão fica emprestada do pool até o fim da iteração.
+
+    As conexões vêm do pool compartilhado das credenciais (`POSTGRES_POOLS`), o mesmo do
+    dataset `postgres_pool`. Somente leitura.
+
+    Exemplo (catalog.yml):
+        ```yaml
+        analytics_orders:
+          type: thelook_ecommerce_analysis.datasets.PostgresPolarsDataset
+          credentials: postgres
+          table: orders
+          columns: [order_id, user_id, status, created_at]
+          filters:
+            - [created_at, ">=", "2025-06-01"]
+            - [status, in, [Complete, Shipped]]
+          chunk_rows: 500_000
+        ```
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        credentials: dict[str, Any],
+        table: str | None = None,
+        schema: str = "public",
+        query: str | None = None,
+        columns: list[str] | None = None,
+        filters: list[list[Any]] | None = None,
+        chunk_rows: int | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            credentials (dict[str, Any]): Entrada do credentials.yml.
+            table (str | None): Tabela lida (ou `query`).
+            schema (str): Schema do Postgres da tabela.
+            query (str | None): SELECT arbitrário (subquery), no lugar de `table`.
+            columns (list[str] | None): Colunas lidas (padrão: todas).
+            filters (list[list[Any]] | None): Condições `[coluna, operador, valor]` (AND).
+            chunk_rows (int | None): Linhas por lote da iteração (padrão: sem lotes).
+            metadata (dict[str, Any] | None): Metadados arbitrários (ex: kedro-viz).
+
+        Raises:
+            DatasetError: Sem `table` nem `query`, ou filtro inválido.
+        """
+        self._credentials = credentials
+        self._statement = build_select(table, schema, query, columns, filters)
+        self._source = f"{schema}.{table}" if table else "query"
+        self._columns = columns
+        self._filters = filters
+        self._chunk_rows = chunk_rows
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "source": self._source,
+            "columns": self._columns,
+            "filters": self._filters,
+            "chunk_rows": self._chunk_rows,
+        }
+
+    def _iter_chunks(self, chunk_rows: int | None) -> Iterator[pl.DataFrame]:
+        """Lê o COPY em stream, convertendo cada lote de linhas completas."""
+        pool = POSTGRES_POOLS.get_pool(self._credentials)
+        with pool.connection() as conn, conn.transaction():
+            for name, value in SESSION_SETTINGS.items():
+                conn.execute(
+                    sql.SQL("SET LOCAL {} = {}").format(
+                        sql.Identifier(name), sql.Literal(value)
+                    )
+                )
+            schema, type_names = _describe_result(conn, self._statement)
+            copy_sql = sql.SQL("COPY ({}) TO STDOUT").format(self._statement)
+
+            buffer = bytearray()
+            with conn.cursor().copy(copy_sql) as copy:
+                if chunk_rows is None:
+                    for data in iter_copy_data(copy, conn.pgconn):
+                        buffer += data
+                    yield parse_copy_text(bytes(buffer), schema, type_names)
+                    return
+
+                rows = 0
+                for data in iter_copy_data(copy, conn.pgconn):
+                    start = len(buffer)
+                    buffer += data
+                    rows += buffer.count(b"\n", start)
+                    if rows >= chunk_rows:
+                        # Lote até a última linha completa; o restante fica no buffer
+                        end = buffer.rindex(b"\n") + 1
+                        with memoryview(buffer) as view:
+                            lines = bytes(view[:end])
+                        del buffer[:end]
+                        rows = 0
+                        yield parse_copy_text(lines, schema, type_names)
+            if buffer:
+                yield parse_copy_text(bytes(buffer), schema, type_names)
+
+    def load(self) -> pl.DataFrame | Iterator[pl.DataFrame]:
+        """DataFrame com o resultado (ou iterador de lotes, com `chunk_rows`)."""
+        if self._chunk_rows:
+            return self._iter_chunks(self._chunk_rows)
+
+        start = time.perf_counter()
+        # Consome o gerador até o fim, devolvendo a conexão ao pool
+        [df] = self._iter_chunks(None)
+        logger.info(
+            f"Leitura '{self._source}': {df.height} linha(s), "
+            f"{df.estimated_size() / 1024**2:.1f} MB em {time.perf_counter() - start:.1f}s."
+        )
+        return df
+
+    def save(self, data: Any) -> None:
+        raise DatasetError("PostgresPolarsDataset é somente leitura.")
+
+
+def _best_of(repeat: int, func: Any) -> tuple[float, Any]:
+    """Menor tempo de `repeat` execuções e o último resultado."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _read_sqlalchemy(engine: sa.Engine, query: str) -> pl.DataFrame:
+    """Leitura de referência: cursor do SQLAlchemy, uma tupla Python por linha."""
+    with engine.connect() as conn:
+        result = conn.execute(sa.text(query))
+        return pl.DataFrame(
+            result.fetchall(),
+            schema=list(result.keys()),
+            orient="row",
+            infer_schema_length=None,
+        )
+
+
+def benchmark_read(
+    credentials: dict[str, Any],
+    table: str,
+    columns: list[str] | None = None,
+    repeat: int = 3,
+) -> dict[str, float]:
+    """
+    Compara a leitura via COPY (`PostgresPolarsDataset`) com o SQLAlchemy.
+
+    O caminho do SQLAlchemy lê o mesmo SELECT por uma engine psycopg e monta o DataFrame
+    a partir das tuplas Python de cada linha (como o `read_sql` do pandas ou o
+    `pl.read_database`). Os dois resultados são conferidos.
+
+    Args:
+        credentials (dict[str, Any]): Entrada do credentials.yml.
+        table (str): Tabela lida (schema `public`).
+        columns (list[str] | None): Colunas lidas (padrão: todas).
+        repeat (int): Execuções de cada caminho (vale o menor tempo).
+
+    Returns:
+        dict[str, float]: Tempos (segundos) e vazão (linhas/s) de cada caminho.
+
+    Raises:
+        AssertionError: Resultados diferentes entre os dois caminhos.
+    """
+    dataset = PostgresPolarsDataset(
+        credentials=credentials, table=table, columns=columns
+    )
+    engine = sa.create_engine(
+        sa.URL.create(
+            "postgresql+psycopg",
+            username=credentials["user"],
+            password=credentials["password"],
+            host=credentials["host"],
+            port=credentials["port"],
+            database=credentials["dbname"],
+        )
+    )
+    query = dataset._statement.as_string()
+
+    try:
+        copy_seconds, copied = _best_of(repeat, dataset.load)
+        sqlalchemy_seconds, fetched = _best_of(
+            repeat, lambda: _read_sqlalchemy(engine, query)
+        )
+    finally:
+        engine.dispose()
+        POSTGRES_POOLS.close_all()
+
+    if copied.height != fetched.height or copied.columns != fetched.columns:
+        msg = "Leitura via COPY diferente da leitura via SQLAlchemy."
+        raise AssertionError(msg)
+
+    rows = copied.height
+    results = {
+        "copy_seconds": copy_seconds,
+        "sqlalchemy_seconds": sqlalchemy_seconds,
+        "copy_rows_per_second": rows / copy_seconds,
+        "sqlalchemy_rows_per_second": rows / sqlalchemy_seconds,
+    }
+    logger.info(
+        f"Leitura '{table}' ({rows:,} linhas, {len(copied.columns)} colunas): COPY "
+        f"{results['copy_rows_per_second']:,.0f} linhas/s ({copy_seconds:.2f}s), "
+        f"SQLAlchemy {results['sqlalchemy_rows_per_second']:,.0f} linhas/s "
+        f"({sqlalchemy_seconds:.2f}s)."
+    )
+    return results
+
+
+def main(argv: list[str] | None = None):
+    """
+    Executa o benchmark de leitura (COPY x SQLAlchemy) com as credenciais do projeto.
+
+    Ex: python -m thelook_ecommerce_analysis.datasets.postgres_polars_dataset orders
+    """
+    parser = argparse.ArgumentParser(description="Benchmark de leitura do Postgres.")
+    parser.add_argument("table")
+    parser.add_argument("--columns", nargs="*")
+    parser.add_argument("--credentials", default="postgres")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    benchmark_read(
+        get_credentials(args.credentials), args.table, args.columns, args.repeat
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+from typing import Any
+
+from kedro.io import AbstractDataset, DatasetError
+
+from thelook_ecommerce_analysis.utils.postgres_pool import POSTGRES_POOLS, PostgresPool
+
+
+class PostgresPoolDataset(AbstractDataset[Any, PostgresPool]):
+    """
+    Pool de conexões com o Postgres compartilhado pelos nós (somente leitura).
+
+    O `load` retorna o pool do processo para as credenciais (`POSTGRES_POOLS`), criado na
+    primeira leitura: nós que recebem o mesmo dataset (ou as mesmas credenciais) dividem
+    as conexões em vez de abrir as próprias. O nó empresta conexões com
+    `pool.connection()` e as devolve ao final do bloco. Os pools são fechados pelo
+    `PostgresPoolHook` ao final do pipeline.
+
+    No `ParallelRunner`, cada processo abre o próprio pool na primeira leitura (o dataset
+    guarda apenas a configuração, e é serializável).
+
+    Exemplo (catalog.yml):
+        ```yaml
+        postgres_pool:
+          type: thelook_ecommerce_analysis.datasets.PostgresPoolDataset
+          credentials: postgres
+          pool_size: 4
+          timeout: 30
+        ```
+    """
+
+    def __init__(
+        self,
+        *,
+        credentials: dict[str, Any],
+        pool_size: int = 4,
+        timeout: float = 30.0,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            credentials (dict[str, Any]): Entrada do credentials.yml (host, port, dbname,
+                user e password).
+            pool_size (int): Máximo de conexões abertas do pool.
+            timeout (float): Segundos de espera por uma conexão livre.
+            metadata (dict[str, Any] | None): Metadados arbitrários (ex: kedro-viz).
+        """
+        self._credentials = credentials
+        self._pool_size = pool_size
+        self._timeout = timeout
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        # Sem as credenciais, que aparecem nos logs e no kedro-viz
+        return {
+            "host": self._credentials.get("host"),
+            "dbname": self._credentials.get("dbname"),
+            "pool_size": self._pool_size,
+            "timeout": self._timeout,
+        }
+
+    def load(self) -> PostgresPool:
+        """Retorna o pool compartilhado das credenciais, criando-o se necessário."""
+        return POSTGRES_POOLS.get_pool(
+            self._credentials, self._pool_size, self._timeout
+        )
+
+    def save(self, data: Any) -> None:
+        raise DatasetError("PostgresPoolDataset é somente leitura.")
@@ -0,0 +1,282 @@
+import logging
+import os
+import shutil
+from copy import deepcopy
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+from kedro.io import AbstractDataset, DatasetError
+
+logger = logging.getLogger(__name__)
+
+Frame = pl.DataFrame | pl.LazyFrame
+
+# Sem eliminação de subplanos comuns: ao reutilizar um ramo do plano (ex: deduplicação por
+# semi join), o Polars guardaria a entrada inteira em cache, anulando o streaming.
+SINK_OPTIMIZATIONS = pl.QueryOptFlags(comm_subplan_elim=False)
+
+# Coluna que, no modo diretório, distribui as linhas em partes (`part-<valor>.parquet`)
+PART_COLUMN = "_part"
+
+# Chaves Hive do layout particionado por data (`year=<ano>/month=<mês>/part-0.parquet`)
+HIVE_KEYS = ("year", "month")
+HIVE_NULL = "__HIVE_DEFAULT_PARTITION__"  # Partição das linhas sem data
+
+
+class StreamingPolarsDataset(AbstractDataset[Frame | dict[str, Frame], pl.LazyFrame]):
+    """
+    Dataset parquet local que grava LazyFrames em stream, sem materializar a tabela.
+
+    Diferente do `polars.LazyPolarsDataset`, que executa `collect()` antes de salvar, este
+    dataset usa `sink_parquet` (engine streaming do Polars). A escrita é feita em um
+    destino temporário e movida com `os.replace`, portanto um LazyFrame que lê do próprio
+    destino pode ser salvo com segurança.
+
+    No modo diretório, as partes são lidas em ordem de nome (a ordem de extração da
+    ingestão), o que permite ao processamento manter a versão mais recente de cada linha.
+
+    O `filepath` pode ser um arquivo (`*.parquet`) ou um diretório de partes. No modo
+    diretório:
+        * Salvar um DataFrame/LazyFrame substitui todas as partes. Se o frame tiver a
+          coluna `_part`, cada linha vai para a parte `part-<_part>.parquet` (uma única
+          passada em stream) e a coluna não é gravada.
+        * Salvar um dicionário `{nome_da_parte: DataFrame/LazyFrame}` grava (ou substitui)
+          apenas as partes informadas e mantém as demais, permitindo cargas por append.
+
+    Layout particionado (`partition_by`, apenas no modo diretório): as linhas são
+    distribuídas por ano/mês da coluna de data em diretórios Hive
+    (`year=2025/month=3/part-0.parquet`), e cada arquivo é ordenado por `sort_by`. O
+    `load` expõe as colunas `year` e `month`, e filtros sobre elas descartam diretórios
+    sem abrir os arquivos. Filtros na própria coluna de data ou nas colunas de `sort_by`
+    descartam arquivos e row groups pelas estatísticas do parquet (`statistics` e
+    `row_group_size` em `save_args`).
+
+    Exemplo (catalog.yml):
+        ```yaml
+        "{namespace}_raw_{table}":
+          type: thelook_ecommerce_analysis.datasets.StreamingPolarsDataset
+          filepath: data/01_raw/{table}
+          save_args:
+            compression: zstd
+
+        processing_intermediate_events:
+          type: thelook_ecommerce_analysis.datasets.StreamingPolarsDataset
+          filepath: data/02_intermediate/events
+          partition_by: created_at
+          sort_by: [id]
+          save_args:
+            row_group_size: 100_000
+            statistics: true
+        ```
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        *,
+        filepath: str,
+        partition_by: str | None = None,
+        sort_by: list[str] | None = None,
+        load_args: dict[str, Any] | None = None,
+        save_args: dict[str, Any] | None = None,
+        metadata: dict[str, Any] | None = None,
+    ) -> None:
+        """
+        Args:
+            filepath (str): Arquivo parquet ou diretório de partes parquet local.
+            partition_by (str | None): Coluna de data do layout particionado por ano/mês.
+            sort_by (list[str] | None): Colunas de ordenação das linhas em cada arquivo.
+            load_args (dict[str, Any] | None): Argumentos repassados para `pl.scan_parquet`.
+            save_args (dict[str, Any] | None): Argumentos repassados para `sink_parquet`/`write_parquet`.
+            metadata (dict[str, Any] | None): Metadados arbitrários (ex: kedro-viz).
+
+        Raises:
+            DatasetError: `partition_by` com um `filepath` de arquivo único.
+        """
+        self._filepath = Path(filepath)
+        self._partition_by = partition_by
+        self._sort_by = list(sort_by or [])
+        self._load_args = deepcopy(load_args) or {}
+        self._save_args = deepcopy(save_args) or {}
+        self.metadata = metadata
+
+        if partition_by and not self._is_directory:
+            raise DatasetError(
+                f"Layout particionado exige um diretório, recebido: '{self._filepath}'."
+            )
+        if partition_by:
+            self._load_args.setdefault("hive_partitioning", True)
+
+    @property
+    def _is_directory(self) -> bool:
+        return self._filepath.suffix != ".parquet"
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "partition_by": self._partition_by,
+            "sort_by": self._sort_by,
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
+
+    def load(self) -> pl.LazyFrame:
+        """Retorna um LazyFrame sobre o arquivo (ou sobre todas as partes do diretório)."""
+        if not self._exists():
+            raise DatasetError(f"Arquivo não encontrado: {self._filepath}.")
+
+        source: Path | list[Path] = self._filepath
+        if source.is_dir():
+            source = sorted(source.glob("**/*.parquet"))
+
+        return pl.scan_parquet(source, **self._load_args)
+
+    def save(self, data: Frame | dict[str, Frame]) -> None:
+        """Grava o dado em um destino temporário e substitui o destino de forma atômica."""
+        if self._partition_by and (
+            isinstance(data, dict) or PART_COLUMN in data.collect_schema().names()
+        ):
+            # Ex: modo incremental, que particiona o Intermediate por faixas da chave
+            raise DatasetError(
+                f"'{self._filepath}' usa o layout particionado por data: gravação por "
+                "partes não é suportada. Use o layout de arquivo único nesta tabela."
+            )
+
+        if isinstance(data, dict):
+            if not self._is_directory:
+                raise DatasetError(
+                    f"Gravação por partes exige um diretório, recebido: '{self._filepath}'."
+                )
+            self._save_parts(data)
+            return
+
+        if not self._is_directory:
+            self._write_atomic(data, self._filepath)
+            return
+
+        # Modo diretório: monta o novo diretório ao lado e troca com o atual
+        tmp_dir = self._filepath.with_name(f".{self._filepath.name}.tmp")
+        old_dir = self._filepath.with_name(f".{self._filepath.name}.old")
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir(parents=True)
+
+        try:
+            if self._partition_by:
+                self._write_date_partitioned(data, tmp_dir)
+            elif PART_COLUMN in data.collect_schema().names():
+                self._write_partitioned(data, tmp_dir)
+            else:
+                self._write_atomic(data, tmp_dir / "part-0.parquet")
+        except DatasetError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if self._filepath.exists():
+            os.replace(self._filepath, old_dir)
+        os.replace(tmp_dir, self._filepath)
+        shutil.rmtree(old_dir, ignore_errors=True)
+
+    def _save_parts(self, parts: dict[str, Frame]) -> None:
+        """Grava (ou substitui) apenas as partes informadas, mantendo as demais."""
+        self._filepath.mkdir(parents=True, exist_ok=True)
+
+        for name, frame in parts.items():
+            self._write_atomic(frame, self._filepath / f"part-{name}.parquet")
+
+        logger.info(
+            f"Dataset '{self._filepath}': {len(parts)} parte(s) gravada(s) por append."
+        )
+
+    def _write_partitioned(self, data: Frame, directory: Path) -> None:
+        """Distribui as linhas em partes pelo valor de `_part`, em uma única passada."""
+
+        def _part_path(args: pl.io.partition.FileProviderArgs) -> str:
+            return f"part-{args.partition_keys[PART_COLUMN][0]}.parquet"
+
+        try:
+            data.lazy().sink_parquet(
+                pl.PartitionBy(
+                    directory,
+                    key=PART_COLUMN,
+                    include_key=False,
+                    file_path_provider=_part_path,
+                    approximate_bytes_per_file=None,  # Uma parte = um arquivo
+                ),
+                optimizations=SINK_OPTIMIZATIONS,
+                **self._save_args,
+            )
+        except Exception as e:
+            raise DatasetError(f"Falha ao gravar '{directory}' por partes: {e}") from e
+
+        logger.debug(f"Dataset gravado por partes em '{directory}'.")
+
+    def _write_date_partitioned(self, data: Frame, directory: Path) -> None:
+        """
+        Distribui as linhas por ano/mês em diretórios Hive e ordena cada arquivo.
+
+        A distribuição é uma única passada em stream. A ordenação é feita depois, arquivo
+        por arquivo, portanto a memória é limitada pela maior partição, não pela tabela.
+        """
+        date_col = pl.col(self._partition_by)
+        keys = [date_col.dt.year().alias("year"), date_col.dt.month().alias("month")]
+
+        def _hive_path(args: pl.io.partition.FileProviderArgs) -> str:
+            values = args.partition_keys.row(0, named=True)
+            hive = [
+                f"{k}={HIVE_NULL if values[k] is None else values[k]}"
+                for k in HIVE_KEYS
+            ]
+            return "/".join(hive) + "/part-0.parquet"
+
+        try:
+            data.lazy().sink_parquet(
+                pl.PartitionBy(
+                    directory,
+                    key=keys,
+                    include_key=False,
+                    file_path_provider=_hive_path,
+                    approximate_bytes_per_file=None,  # Uma partição = um arquivo
+                ),
+                optimizations=SINK_OPTIMIZATIONS,
+                **self._save_args,
+            )
+        except Exception as e:
+            raise DatasetError(f"Falha ao gravar '{directory}' por data: {e}") from e
+
+        files = sorted(directory.glob("**/*.parquet"))
+        if not files:
+            # Tabela vazia: mantém o schema em uma parte sem partição
+            self._write_atomic(data.lazy().head(0), directory / "part-0.parquet")
+        if self._sort_by:
+            for path in files:
+                self._write_atomic(pl.scan_parquet(path).sort(self._sort_by), path)
+
+        logger.info(
+            f"Dataset '{self._filepath}': {len(files)} partição(ões) por "
+            f"'{self._partition_by}' (ano/mês), ordenadas por {self._sort_by}."
+        )
+
+    def _write_atomic(self, data: Frame, target: Path) -> None:
+        """Grava em um arquivo temporário (ignorado pelo `load`) e o move para `target`."""
+        target.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.tmp")
+
+        try:
+            if isinstance(data, pl.LazyFrame):
+                data.sink_parquet(
+                    tmp_path, optimizations=SINK_OPTIMIZATIONS, **self._save_args
+                )
+            else:
+                data.write_parquet(tmp_path, **self._save_args)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            raise DatasetError(f"Falha ao gravar '{target}' em stream: {e}") from e
+
+        os.replace(tmp_path, target)
+        logger.debug(f"Dataset gravado em '{target}'.")
+
+    def _exists(self) -> bool:
+        if self._is_directory:
+            return self._filepath.is_dir() and any(self._filepath.glob("**/*.parquet"))
+        return self._filepath.exists()
@@ -8,6 +8,14 @@ from kedro.io import DataCatalog
 from kedro.pipeline import Pipeline
 from kedro.pipeline.node import Node
 
+from thelook_ecommerce_analysis.pipelines.data_ingestion.client_registry import (
+    CLIENT_REGISTRY,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
+from thelook_ecommerce_analysis.utils.postgres_pool import POSTGRES_POOLS
+
 
 class ResourceMonitoringHook:
     """
@@ -17,12 +25,14 @@ class ResourceMonitoringHook:
         1. Logs de início/fim de Pipeline.
         2. Logs de sucesso/erro global.
         3. Monitoramento de tempo e memória (RAM) por nó individual.
+        4. Uso dos pools do Postgres por nó (empréstimos, espera e utilização).
     """
 
     def __init__(self):
         self._logger = logging.getLogger(__name__)
         self._pipeline_start_time = 0.0
         self._memory_threshold = 1000  # Caso não esteja especificado no parameters.yml
+        self._node_start_pools: dict[str, dict[str, float]] = {}
 
     @property
     def _current_memory_usage(self) -> float:
@@ -106,6 +116,7 @@ class ResourceMonitoringHook:
         """Executando antes de cada nó."""
         self._node_start_time = time.time()
         self._node_start_mem = self._current_memory_usage
+        self._node_start_pools = POSTGRES_POOLS.stats
         self._logger.info(f"Executando: {node.name}...")
 
     @hook_impl
@@ -126,8 +137,160 @@ class ResourceMonitoringHook:
         self._logger.info(
             f"{node.name:<30} | {duration:>6.2f}s | Mem: {end_mem:>7.1f}MB (delta mem: {mem_delta:>+6.1f}MB) {mem_flag}"
         )
+        self._log_pool_usage(node, duration)
+
+    def _log_pool_usage(self, node: Node, duration: float):
+        """Empréstimos, espera e utilização dos pools do Postgres durante o nó."""
+        for name, stats in POSTGRES_POOLS.stats.items():
+            before = self._node_start_pools.get(name, {})
+            borrows = stats["borrows"] - before.get("borrows", 0)
+            if not borrows:
+                continue
+
+            waits = stats["waits"] - before.get("waits", 0)
+            wait = stats["wait_seconds"] - before.get("wait_seconds", 0.0)
+            busy = stats["busy_seconds"] - before.get("busy_seconds", 0.0)
+            utilization = busy / (stats["size"] * duration) if duration else 0.0
+            self._logger.info(
+                f"{node.name:<30} | Postgres '{name}': {borrows} empréstimo(s), "
+                f"{waits} com espera ({wait:.2f}s) | Uso do pool: {utilization:.0%} "
+                f"(pico de {stats['peak']}/{stats['size']} conexões)"
+            )
 
     @hook_impl
     def on_node_error(self, node: Node, error: Exception):
         """Executando se um nó específico falhar."""
         self._logger.error(f"Erro no nó '{node.name}': {str(error)}")
+
+
+class BigQueryClientHook:
+    """
+    Hook que encerra os clientes BigQuery compartilhados (`CLIENT_REGISTRY`) ao final do
+    pipeline, com sucesso ou erro, e reporta quantos clientes foram criados e reutilizados.
+    """
+
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+
+    def _close_clients(self):
+        stats = CLIENT_REGISTRY.stats
+        CLIENT_REGISTRY.close_all()
+
+        if stats["created"] or stats["reused"]:
+            self._logger.info(
+                f"Clientes BigQuery (queries): {stats['created']} criados | "
+                f"{stats['reused']} reutilizados."
+            )
+
+        if stats["storage_created"] or stats["storage_reused"]:
+            self._logger.info(
+                f"Clientes BigQuery Storage API: {stats['storage_created']} criados | "
+                f"{stats['storage_reused']} reutilizados."
+            )
+
+    @hook_impl
+    def after_pipeline_run(
+        self, run_params: dict[str, Any], pipeline: Pipeline, catalog: DataCatalog
+    ):
+        """Executando apenas se o pipeline inteiro finalizar com sucesso."""
+        self._close_clients()
+
+    @hook_impl
+    def on_pipeline_error(
+        self,
+        error: Exception,
+        run_params: dict[str, Any],
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+    ):
+        """Executando se o pipeline falhar."""
+        self._close_clients()
+
+
+class PostgresPoolHook:
+    """
+    Hook que fecha os pools de conexão do Postgres (`POSTGRES_POOLS`) ao final do
+    pipeline, com sucesso ou erro, e reporta o uso de cada pool na execução.
+    """
+
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+
+    def _close_pools(self):
+        for name, stats in POSTGRES_POOLS.stats.items():
+            mean_wait = (
+                stats["wait_seconds"] / stats["borrows"] if stats["borrows"] else 0
+            )
+            self._logger.info(
+                f"Pool do Postgres '{name}': {stats['borrows']} empréstimo(s), "
+                f"{stats['waits']} com espera (média {mean_wait:.3f}s, máx "
+                f"{stats['max_wait']:.3f}s) | Uso: {stats['utilization']:.0%} "
+                f"(pico de {stats['peak']}/{stats['size']} conexões)."
+            )
+        POSTGRES_POOLS.close_all()
+
+    @hook_impl
+    def after_pipeline_run(
+        self, run_params: dict[str, Any], pipeline: Pipeline, catalog: DataCatalog
+    ):
+        """Executando apenas se o pipeline inteiro finalizar com sucesso."""
+        self._close_pools()
+
+    @hook_impl
+    def on_pipeline_error(
+        self,
+        error: Exception,
+        run_params: dict[str, Any],
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+    ):
+        """Executando se o pipeline falhar."""
+        self._close_pools()
+
+
+class IngestionStateHook:
+    """
+    Hook que aplica o estado da ingestão (`POST_SAVE_ACTIONS`) somente depois que o dataset
+    Raw foi gravado: limpeza do staging, watermark e impressão digital dos snapshots.
+
+    Se o nó ou a gravação falharem, as ações pendentes são descartadas e a próxima execução
+    extrai novamente a mesma janela.
+    """
+
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name: str, data: Any, node: Node):
+        """Executando após cada dataset gravado com sucesso."""
+        POST_SAVE_ACTIONS.run(dataset_name)
+
+    @hook_impl
+    def on_node_error(self, error: Exception, node: Node):
+        """Executando se um nó específico falhar."""
+        POST_SAVE_ACTIONS.discard(node.outputs)
+
+    @hook_impl
+    def after_pipeline_run(
+        self, run_params: dict[str, Any], pipeline: Pipeline, catalog: DataCatalog
+    ):
+        """Executando apenas se o pipeline inteiro finalizar com sucesso."""
+        self._discard_pending()
+
+    @hook_impl
+    def on_pipeline_error(
+        self,
+        error: Exception,
+        run_params: dict[str, Any],
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+    ):
+        """Executando se o pipeline falhar."""
+        self._discard_pending()
+
+    def _discard_pending(self):
+        discarded = POST_SAVE_ACTIONS.discard()
+        if discarded:
+            self._logger.warning(
+                f"Estado de ingestão descartado (dataset não gravado): {discarded}."
+            )
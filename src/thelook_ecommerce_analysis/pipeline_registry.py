@@ -13,5 +13,11 @@ def register_pipelines() -> dict[str, Pipeline]:
         A mapping from pipeline names to ``Pipeline`` objects.
     """
     pipelines = find_pipelines()
-    pipelines["__default__"] = sum(pipelines.values())  # type: ignore
+    # Sob demanda: kedro run --pipeline data_profiling (perfil de tipos) e
+    # kedro run --pipeline data_loading (carga no Postgres, exige o banco)
+    pipelines["__default__"] = sum(  # type: ignore
+        pipeline
+        for name, pipeline in pipelines.items()
+        if name not in ("data_profiling", "data_loading")
+    )
     return pipelines
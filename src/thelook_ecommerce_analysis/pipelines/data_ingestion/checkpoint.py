@@ -0,0 +1,103 @@
+import json
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "_manifest.json"
+
+
+class SliceCheckpoint:
+    """
+    Manifesto das fatias já extraídas de uma tabela, gravado no diretório de staging.
+
+    Cada fatia concluída é registrada com a quantidade de linhas. Se a extração (ou a
+    gravação do Raw) falhar no meio, a próxima execução com a mesma query reaproveita as
+    fatias registradas e busca apenas as que faltam. O manifesto só é marcado como
+    concluído depois que o Kedro grava o dataset Raw (`finalize` via `POST_SAVE_ACTIONS`);
+    a partir daí, a execução seguinte começa do zero.
+
+    Formato do manifesto:
+        ```json
+        {"signature": "<hash da query>", "complete": false, "slices": {"<fatia>": 123}}
+        ```
+    """
+
+    def __init__(self, table_dir: Path, signature: str, slices: dict[str, int]):
+        """
+        Args:
+            table_dir (Path): Diretório de staging da tabela.
+            signature (str): Identificador da query (mudou -> recomeça do zero).
+            slices (dict[str, int]): Fatias concluídas e suas quantidades de linhas.
+        """
+        self._table_dir = table_dir
+        self._path = table_dir / MANIFEST_NAME
+        self._signature = signature
+        self._slices = slices
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, table_dir: Path, signature: str) -> "SliceCheckpoint":
+        """
+        Abre o checkpoint da tabela, limpando o diretório se não houver o que retomar.
+
+        Args:
+            table_dir (Path): Diretório de staging da tabela.
+            signature (str): Identificador da query atual.
+
+        Returns:
+            SliceCheckpoint: Checkpoint com as fatias reaproveitáveis.
+        """
+        manifest = {}
+        try:
+            manifest = json.loads((table_dir / MANIFEST_NAME).read_text("utf8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+
+        resumable = manifest.get("signature") == signature and not manifest.get(
+            "complete"
+        )
+        if not resumable:
+            # Execução nova: descarta arquivos de execuções anteriores
+            shutil.rmtree(table_dir, ignore_errors=True)
+            table_dir.mkdir(parents=True, exist_ok=True)
+            return cls(table_dir, signature, {})
+
+        # Mantém apenas as fatias cujo arquivo ainda existe
+        slices = {
+            name: rows
+            for name, rows in manifest.get("slices", {}).items()
+            if (table_dir / f"part-{name}.parquet").exists()
+        }
+        return cls(table_dir, signature, slices)
+
+    @property
+    def completed(self) -> dict[str, int]:
+        """Fatias concluídas e suas quantidades de linhas."""
+        with self._lock:
+            return dict(self._slices)
+
+    def mark_done(self, name: str, rows: int) -> None:
+        """Registra a fatia como concluída (o arquivo da fatia já deve estar gravado)."""
+        with self._lock:
+            self._slices[name] = rows
+            self._write(complete=False)
+
+    def finalize(self) -> None:
+        """Marca a extração como concluída (Raw gravado): a próxima execução não retoma estas fatias."""
+        with self._lock:
+            self._write(complete=True)
+
+    def _write(self, complete: bool) -> None:
+        """Gravação atômica do manifesto (arquivo temporário + os.replace)."""
+        payload = {
+            "signature": self._signature,
+            "complete": complete,
+            "slices": self._slices,
+        }
+        tmp_path = self._path.with_name(f".{self._path.name}.tmp")
+        tmp_path.write_text(json.dumps(payload, indent=2, sort_keys=True), "utf8")
+        os.replace(tmp_path, self._path)
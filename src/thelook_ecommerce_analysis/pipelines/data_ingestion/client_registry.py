@@ -0,0 +1,151 @@
+import logging
+import threading
+from pathlib import Path
+
+from google.cloud import bigquery, bigquery_storage
+from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+
+class BigQueryClientRegistry:
+    """
+    Registro thread-safe de clientes BigQuery compartilhados pelo processo.
+
+    Credenciais são lidas uma única vez por arquivo de chave e os clientes são reutilizados
+    por (arquivo de chave, projeto), mantendo as sessões HTTP/gRPC abertas entre os nós
+    e entre as fatias da extração paralela. Os clientes são fechados pelo hook
+    `BigQueryClientHook` ao final do pipeline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._credentials: dict[str, service_account.Credentials] = {}
+        self._clients: dict[tuple[str, str], bigquery.Client] = {}
+        self._storage_clients: dict[str, bigquery_storage.BigQueryReadClient] = {}
+        self._created = 0
+        self._reused = 0
+        self._storage_created = 0
+        self._storage_reused = 0
+
+    def _get_credentials(self, key_filepath: str) -> service_account.Credentials:
+        """Lê o JSON da Service Account uma única vez por arquivo (chamado com o lock)."""
+        key_path = Path(key_filepath)
+        cache_key = str(key_path.resolve())
+
+        if cache_key not in self._credentials:
+            if not key_path.exists():
+                raise FileNotFoundError(f"Chave GCP não encontrada: {key_path}.")
+            self._credentials[cache_key] = (
+                service_account.Credentials.from_service_account_file(key_path)
+            )
+
+        return self._credentials[cache_key]
+
+    def get_credentials(self, key_filepath: str) -> service_account.Credentials:
+        """
+        Retorna as credenciais da Service Account, lidas apenas na primeira chamada.
+
+        Args:
+            key_filepath (str): Diretório onde está o arquivo JSON com as credenciais.
+
+        Returns:
+            service_account.Credentials: Credenciais da Service Account.
+        """
+        with self._lock:
+            return self._get_credentials(key_filepath)
+
+    def get_client(
+        self, key_filepath: str, project: str | None = None
+    ) -> bigquery.Client:
+        """
+        Retorna o cliente BigQuery de (arquivo de chave, projeto), criando-o se necessário.
+
+        Args:
+            key_filepath (str): Diretório onde está o arquivo JSON com as credenciais.
+            project (str | None): Projeto de cobrança. Padrão: projeto da Service Account.
+
+        Returns:
+            bigquery.Client: Cliente compartilhado.
+        """
+        with self._lock:
+            creds = self._get_credentials(key_filepath)
+            cache_key = (str(Path(key_filepath).resolve()), project or creds.project_id)
+
+            if cache_key in self._clients:
+                self._reused += 1
+                return self._clients[cache_key]
+
+            client = bigquery.Client(credentials=creds, project=cache_key[1])
+            self._clients[cache_key] = client
+            self._created += 1
+            return client
+
+    def get_storage_client(
+        self, key_filepath: str
+    ) -> bigquery_storage.BigQueryReadClient:
+        """
+        Retorna o cliente da BigQuery Storage API do arquivo de chave (canal gRPC compartilhado).
+
+        Args:
+            key_filepath (str): Diretório onde está o arquivo JSON com as credenciais.
+
+        Returns:
+            bigquery_storage.BigQueryReadClient: Cliente de leitura compartilhado.
+        """
+        with self._lock:
+            creds = self._get_credentials(key_filepath)
+            cache_key = str(Path(key_filepath).resolve())
+
+            if cache_key in self._storage_clients:
+                self._storage_reused += 1
+                return self._storage_clients[cache_key]
+
+            client = bigquery_storage.BigQueryReadClient(credentials=creds)
+            self._storage_clients[cache_key] = client
+            self._storage_created += 1
+            return client
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """
+        Quantidade de clientes criados, reutilizados e abertos no momento.
+
+        `created`/`reused` contam os `bigquery.Client` (queries) e `storage_created`/
+        `storage_reused` os `BigQueryReadClient` (Storage API). `open` soma os dois tipos.
+        """
+        with self._lock:
+            return {
+                "created": self._created,
+                "reused": self._reused,
+                "storage_created": self._storage_created,
+                "storage_reused": self._storage_reused,
+                "open": len(self._clients) + len(self._storage_clients),
+            }
+
+    def close_all(self) -> None:
+        """Fecha todos os clientes abertos e zera o registro (credenciais e contadores)."""
+        with self._lock:
+            for client in self._clients.values():
+                try:
+                    client.close()
+                except Exception as e:
+                    logger.warning(f"Falha ao fechar cliente BigQuery: {e}")
+
+            for storage_client in self._storage_clients.values():
+                try:
+                    storage_client.transport.close()
+                except Exception as e:
+                    logger.warning(f"Falha ao fechar cliente BigQuery Storage: {e}")
+
+            self._clients.clear()
+            self._storage_clients.clear()
+            self._credentials.clear()
+            self._created = 0
+            self._reused = 0
+            self._storage_created = 0
+            self._storage_reused = 0
+
+
+# Registro único do processo
+CLIENT_REGISTRY = BigQueryClientRegistry()
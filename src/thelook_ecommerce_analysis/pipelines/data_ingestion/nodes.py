@@ -1,32 +1,107 @@
+import hashlib
+import json
 import logging
+import os
 import re
-from datetime import datetime, timedelta
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Any
 
 import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
 import sqlalchemy as sa
-from google.cloud import bigquery
-from google.oauth2 import service_account
+from google.api_core import exceptions as gcp_exceptions
+from google.cloud import bigquery, bigquery_storage
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.checkpoint import (
+    SliceCheckpoint,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.client_registry import (
+    CLIENT_REGISTRY,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.query_cache import (
+    QueryResultCache,
+    create_query_cache,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.sources import (
+    SourceClient,
+    create_source_client,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.watermark import (
+    create_watermark_store,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.geo import POINT_DTYPE
+from thelook_ecommerce_analysis.pipelines.data_processing.money import decimal_type
+from thelook_ecommerce_analysis.pipelines.data_processing.schema_plan import (
+    SCHEMA_PLANS,
+    cast_expr,
+)
 
 logger = logging.getLogger(__name__)
 
+# Tamanhos de fatia aceitos na extração incremental paralela
+SLICE_SIZES = ("day", "week", "month")
+
+# Dataset do catálogo que recebe a saída de cada nó de extração
+RAW_DATASET_TEMPLATE = "ingestion_raw_{table}"
+
+# Falhas transitórias (cota, timeout, indisponibilidade) repetidas com backoff por fatia
+RETRYABLE_ERRORS = (
+    gcp_exceptions.TooManyRequests,
+    gcp_exceptions.ServerError,
+    ConnectionError,
+    TimeoutError,
+)
+
+# O BigQuery responde 403 (Forbidden) quando a cota ou o rate limit são excedidos
+RETRYABLE_REASONS = frozenset({"rateLimitExceeded", "quotaExceeded"})
+
+
+def _get_bq_client(
+    key_filepath: str, source: dict[str, Any] | None = None
+) -> SourceClient:
+    """
+    Retorna o cliente da fonte de ingestão configurada em 'ingestion.source'.
+
+    Na fonte `bigquery` (padrão), o cliente autenticado com as credenciais é reutilizado
+    entre os nós através do `CLIENT_REGISTRY`. Com `source: {type: local}`, retorna a fonte
+    offline (arquivos locais) no lugar do BigQuery.
+
+    Args:
+        key_filepath (str): Diretório onde está o arquivo JSON com as credenciais.
+        source (dict[str, Any] | None): Configuração da fonte ('ingestion.source').
+
+    Returns:
+        SourceClient: Cliente com as credenciais (ou fonte local).
+    """
+    return create_source_client(source, key_filepath)
+
 
-def _get_bq_client(key_filepath: str) -> bigquery.Client:
+def _get_bqstorage_client(
+    key_filepath: str, source: dict[str, Any] | None = None
+) -> bigquery_storage.BigQueryReadClient | None:
     """
-    Registrar as credenciais no BigQuery Client.
+    Retorna o cliente da BigQuery Storage API, usado na leitura em stream (Arrow).
 
     Args:
         key_filepath (str): Diretório onde está o arquivo JSON com as credenciais.
+        source (dict[str, Any] | None): Configuração da fonte ('ingestion.source').
 
     Returns:
-        bigquery.Client: Cliente com as credenciais
+        bigquery_storage.BigQueryReadClient | None: Cliente de leitura, ou None na fonte local.
     """
-    key_path = Path(key_filepath)
-    if not key_path.exists():
-        raise FileNotFoundError(f"Chave GCP não encontrada: {key_path}.")
+    if (source or {}).get("type", "bigquery") != "bigquery":
+        return None
 
-    creds = service_account.Credentials.from_service_account_file(key_path)
-    return bigquery.Client(credentials=creds, project=creds.project_id)
+    return CLIENT_REGISTRY.get_storage_client(key_filepath)
 
 
 def _validate_table_name(table_name: str):
@@ -38,147 +113,1093 @@ def _validate_table_name(table_name: str):
         )
 
 
-# Node 1: Extração Incremental
-def extract_incremental_data(
-    table_name: str,
-    date_col: str,
-    key_filepath: str,
-    start_date: str,
-    lookback_days: int = 2,
-) -> pl.DataFrame:
+def _build_date_slices(
+    start_date: str, end_date: str, slice_size: str
+) -> list[tuple[str, str]]:
     """
-    Extrai apenas o delta de dados baseado em um janela de tempo.
+    Divide a janela [start_date, end_date) em fatias contíguas e sem sobreposição.
 
     Args:
-        table_name (str): Nome da tabela no BigQuery.
-        date_col (str): Nome da coluna de data que será utilizado como filtro.
-        key_filepath (str): Diretório onde está o arquivo JSON com as credenciais do GCP.
-        start_date (str): Data de ínício dos dados extraídos.
-        lookback_days (int): Define o limite da data para hoje - lookback_days.
+        start_date (str): Data inicial (inclusiva) no formato YYYY-MM-DD.
+        end_date (str): Data final (exclusiva) no formato YYYY-MM-DD.
+        slice_size (str): Tamanho da fatia: 'day', 'week' ou 'month'.
 
     Returns:
-        pl.DataFrame: DataFrame com dados extraídos
+        list[tuple[str, str]]: Lista de pares (início, fim) no formato YYYY-MM-DD.
     """
-    # Validar table_name
-    _validate_table_name(table_name)
+    if slice_size not in SLICE_SIZES:
+        raise ValueError(
+            f"slice_size inválido: '{slice_size}'. Use um de {SLICE_SIZES}."
+        )
 
-    client = _get_bq_client(key_filepath)
+    current = date.fromisoformat(str(start_date))
+    end = date.fromisoformat(str(end_date))
 
-    # Lógica Temporal
-    today = datetime.now()
-    end_date = (today - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+    slices = []
+    while current < end:
+        if slice_size == "day":
+            next_date = current + timedelta(days=1)
+        elif slice_size == "week":
+            next_date = current + timedelta(weeks=1)
+        else:
+            # Alinha ao primeiro dia do mês seguinte
+            next_date = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
 
-    logger.info(f"Ingestão Incremental: '{table_name}' | {start_date} -> {end_date}")
+        next_date = min(next_date, end)
+        slices.append((current.isoformat(), next_date.isoformat()))
+        current = next_date
+
+    return slices
+
+
+def _resolve_columns(
+    schema: dict[str, str] | None,
+    extra_columns: list[str] | None = None,
+    required: tuple[str, ...] = (),
+) -> list[str] | None:
+    """
+    Define as colunas extraídas a partir do schema de processamento da mesma tabela.
+
+    Args:
+        schema (dict[str, str] | None): Entrada 'processing.schemas.<tabela>'. None mantém `SELECT *`.
+        extra_columns (list[str] | None): Colunas adicionais, fora do schema de processamento.
+        required (tuple[str, ...]): Colunas sempre necessárias na ingestão (ex: `date_col`).
+
+    Returns:
+        list[str] | None: Colunas na ordem do schema, sem repetição, ou None para todas.
+    """
+    if not schema:
+        return None
+
+    columns = list(dict.fromkeys([*schema, *(extra_columns or []), *required]))
 
+    # Mesma validação de segurança aplicada ao nome da tabela
+    invalid = [c for c in columns if not re.fullmatch(r"^[a-zA-Z0-9_]+$", c)]
+    if invalid:
+        raise ValueError(
+            f"Nome de coluna inválido/inseguro: {invalid}. "
+            "Use apenas letras, números e sublinhados."
+        )
+
+    return columns
+
+
+def _build_select(table_name: str, columns: list[str] | None = None) -> sa.Select:
+    """Monta o SELECT da tabela, com projeção das colunas quando informadas."""
     # Nome da tabela completo
     full_table_id = f"`bigquery-public-data.thelook_ecommerce.{table_name}`"
 
-    # SELECT * FROM table
-    stmt = sa.select(sa.literal_column("*")).select_from(sa.text(full_table_id))
+    # SELECT * FROM table | SELECT col_a, col_b FROM table
+    projection = (
+        [sa.column(c) for c in columns] if columns else [sa.literal_column("*")]
+    )
+    return sa.select(*projection).select_from(sa.text(full_table_id))
+
+
+def _build_incremental_query(
+    table_name: str, date_col: str, columns: list[str] | None = None
+) -> str:
+    """
+    Compila a query incremental com placeholders @start_date e @end_date.
+
+    Args:
+        table_name (str): Nome da tabela no BigQuery (já validado).
+        date_col (str): Nome da coluna de data que será utilizado como filtro.
+        columns (list[str] | None): Colunas projetadas. None extrai todas (`SELECT *`).
+
+    Returns:
+        str: Query SQL compilada.
+    """
+    stmt = _build_select(table_name, columns)
 
     # Criamos um objeto Coluna para usar o WHERE
     target_col = sa.column(date_col)
 
-    # 2. Construção da query
     # Adiciona filtros
     stmt = stmt.where(target_col >= sa.text("@start_date"))
     stmt = stmt.where(target_col < sa.text("@end_date"))
 
-    # 3. Compilação
     # Compilamos o objeto para string
-    query_str = str(stmt.compile(compile_kwargs={"literal_binds": True}))
+    return str(stmt.compile(compile_kwargs={"literal_binds": True}))
 
-    # 4. Execução
-    job_config = bigquery.QueryJobConfig(
+
+def _dry_run_bytes(
+    client: SourceClient,
+    query_str: str,
+    job_config: bigquery.QueryJobConfig | None = None,
+) -> int:
+    """Retorna os bytes que a query processaria, via dry run (sem custo)."""
+    dry_run_config = bigquery.QueryJobConfig(
+        dry_run=True,
+        use_query_cache=False,
+        query_parameters=job_config.query_parameters if job_config else [],
+    )
+    job = client.query(query_str, job_config=dry_run_config)
+    return int(job.total_bytes_processed or 0)
+
+
+def _report_projection(  # noqa: PLR0913
+    client: SourceClient,
+    table_name: str,
+    full_query: str,
+    projected_query: str,
+    columns: list[str],
+    job_config: bigquery.QueryJobConfig | None = None,
+):
+    """
+    Loga as colunas e os bytes evitados pela projeção, comparando os dois dry runs.
+
+    A projeção reduz colunas, não linhas: a quantidade de linhas extraídas não muda.
+    """
+    try:
+        full_bytes = _dry_run_bytes(client, full_query, job_config)
+        projected_bytes = _dry_run_bytes(client, projected_query, job_config)
+    except Exception as e:
+        logger.warning(f"Não foi possível estimar a projeção de '{table_name}': {e}")
+        return
+
+    avoided_mb = (full_bytes - projected_bytes) / 1024 / 1024
+    pct = 100 * (full_bytes - projected_bytes) / full_bytes if full_bytes else 0.0
+
+    logger.info(
+        f"Projeção '{table_name}': {len(columns)} colunas | "
+        f"{projected_bytes / 1024 / 1024:.1f}MB lidos | "
+        f"{avoided_mb:.1f}MB evitados ({pct:.0f}%) | linhas evitadas: 0."
+    )
+
+
+def _build_window_job_config(start_date: str, end_date: str) -> bigquery.QueryJobConfig:
+    """Cria o QueryJobConfig com a janela temporal parametrizada."""
+    return bigquery.QueryJobConfig(
         query_parameters=[
-            bigquery.ScalarQueryParameter("start_date", "STRING", start_date),
-            bigquery.ScalarQueryParameter("end_date", "STRING", end_date),
+            bigquery.ScalarQueryParameter("start_date", "STRING", str(start_date)),
+            bigquery.ScalarQueryParameter("end_date", "STRING", str(end_date)),
         ]
     )
 
+
+def _prepare_table_dir(staging_dir: str, table_name: str) -> Path:
+    """Recria o diretório de staging da tabela, descartando arquivos de execuções anteriores."""
+    table_dir = Path(staging_dir) / table_name
+    shutil.rmtree(table_dir, ignore_errors=True)
+    table_dir.mkdir(parents=True, exist_ok=True)
+    return table_dir
+
+
+def _defer_staging_cleanup(staging_dir: str, table_name: str):
+    """
+    Agenda a remoção do staging da tabela para depois da gravação do dataset Raw.
+
+    Os arquivos de staging são a origem do LazyFrame retornado pelo nó: só podem ser
+    apagados depois que o catálogo terminar de copiá-los para a camada Raw.
+    """
+    table_dir = Path(staging_dir) / table_name
+    if not table_dir.exists():
+        return
+
+    def _cleanup():
+        shutil.rmtree(table_dir, ignore_errors=True)
+        logger.info(f"Staging '{table_name}' removido após a gravação do Raw.")
+
+    POST_SAVE_ACTIONS.register(RAW_DATASET_TEMPLATE.format(table=table_name), _cleanup)
+
+
+def _resolve_dtypes(target_schema: dict[str, str] | None) -> dict[str, pl.DataType]:
+    """
+    Converte o schema do parameters.yml (`coluna: tipo`) em tipos Polars (plano em cache).
+
+    Colunas `Money` são gravadas no Raw como Decimal (valor exato). A conversão para o
+    inteiro escalado fica com o processamento, que assim não escala o valor duas vezes.
+    Colunas `Point` continuam String (WKT, como chegam da origem) e são convertidas no
+    processamento.
+    """
+    if not target_schema:
+        return {}
+
+    plan = SCHEMA_PLANS.get(target_schema)
+    dtypes = {}
+    for col, dtype in plan.dtypes.items():
+        if col in plan.money_scales:
+            dtypes[col] = decimal_type(plan.money_scales[col])
+        elif dtype == POINT_DTYPE:
+            dtypes[col] = pl.String
+        else:
+            dtypes[col] = dtype
+    return dtypes
+
+
+def _cast_frame(
+    df: pl.DataFrame, dtypes: dict[str, pl.DataType], source: str, batch_index: int
+) -> pl.DataFrame:
+    """
+    Converte as colunas do lote para os tipos do schema (mesmas regras do processamento).
+
+    Colunas fora do schema (ex: `extra_columns`) são mantidas como chegaram.
+
+    Args:
+        df (pl.DataFrame): Lote extraído.
+        dtypes (dict[str, pl.DataType]): Tipos de destino por coluna.
+        source (str): Origem do lote (tabela ou arquivo), usada na mensagem de erro.
+        batch_index (int): Posição do lote na extração.
+
+    Returns:
+        pl.DataFrame: Lote convertido.
+
+    Raises:
+        ValueError: Coluna ausente ou valor incompatível com o tipo, indicando lote e coluna.
+    """
+    casted = []
+    for col_name, dtype in dtypes.items():
+        if col_name not in df.columns:
+            msg = (
+                f"Lote {batch_index} de '{source}': coluna '{col_name}' não encontrada."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        try:
+            casted.append(df.select(cast_expr(col_name, dtype)).to_series())
+        except Exception as e:
+            msg = (
+                f"Lote {batch_index} de '{source}': falha ao converter a coluna "
+                f"'{col_name}' para {dtype}: {e}"
+            )
+            logger.error(msg)
+            raise ValueError(msg) from e
+
+    return df.with_columns(casted)
+
+
+def _cast_arrow(
+    batch: pa.RecordBatch | pa.Table,
+    dtypes: dict[str, pl.DataType],
+    source: str,
+    batch_index: int,
+) -> pa.Table:
+    """Aplica `_cast_frame` em um lote Arrow e devolve o lote convertido em Arrow."""
+    return _cast_frame(pl.DataFrame(batch), dtypes, source, batch_index).to_arrow()
+
+
+@dataclass(frozen=True)
+class _WriteOptions:
+    """Opções de gravação do resultado de cada query em parquet."""
+
+    streaming: bool = False
+    bqstorage_client: bigquery_storage.BigQueryReadClient | None = None
+    max_queue_size: int = 2
+    max_stream_count: int | None = 2
+    cache: QueryResultCache | None = None
+    dtypes: dict[str, pl.DataType] | None = None
+    max_attempts: int = 3
+    backoff_seconds: float = 2.0
+
+
+def _stream_to_parquet(
+    job: bigquery.QueryJob, part_path: Path, options: _WriteOptions
+) -> int:
+    """
+    Grava o resultado da query em parquet lote a lote (Arrow RecordBatch).
+
+    Apenas `max_queue_size` páginas por stream (`max_stream_count` streams) ficam em memória
+    ao mesmo tempo, além do lote que está sendo escrito, independente do tamanho total do
+    resultado. Com `dtypes`, cada lote é convertido para os tipos do schema antes de ser
+    gravado.
+
+    Args:
+        job (bigquery.QueryJob): Job da query já submetido.
+        part_path (Path): Arquivo parquet de destino.
+        options (_WriteOptions): Cliente da Storage API, tetos de memória e tipos de destino.
+
+    Returns:
+        int: Quantidade de linhas gravadas.
+    """
+    dtypes = options.dtypes
+    batches = job.result().to_arrow_iterable(
+        bqstorage_client=options.bqstorage_client,
+        max_queue_size=options.max_queue_size,
+        max_stream_count=options.max_stream_count,
+    )
+
+    writer = None
+    total_rows = 0
     try:
+        for batch_index, batch in enumerate(batches):
+            typed_batch = (
+                _cast_arrow(batch, dtypes, part_path.name, batch_index)
+                if dtypes
+                else batch
+            )
+
+            # O schema só é conhecido a partir do primeiro lote
+            if writer is None:
+                writer = pq.ParquetWriter(
+                    part_path, typed_batch.schema, compression="zstd"
+                )
+            writer.write(typed_batch)
+            total_rows += typed_batch.num_rows
+    finally:
+        if writer is not None:
+            writer.close()
+
+    # Resultado vazio: grava um arquivo sem linhas, mas com o schema da query
+    if writer is None:
+        arrow_table = job.to_arrow()
+        if dtypes:
+            arrow_table = _cast_arrow(arrow_table, dtypes, part_path.name, 0)
+        pq.write_table(arrow_table, part_path, compression="zstd")
+
+    return total_rows
+
+
+def _query_to_parquet(
+    client: SourceClient,
+    query_str: str,
+    job_config: bigquery.QueryJobConfig | None,
+    part_path: Path,
+    options: _WriteOptions,
+) -> int:
+    """
+    Camada comum de execução: grava o resultado da query em parquet, passando pelo cache.
+
+    Args:
+        client (SourceClient): Cliente da fonte (BigQuery ou local).
+        query_str (str): Query compilada.
+        job_config (bigquery.QueryJobConfig | None): Parâmetros da query.
+        part_path (Path): Arquivo parquet de destino.
+        options (_WriteOptions): Modo stream e cache de resultados.
+
+    Returns:
+        int: Quantidade de linhas gravadas.
+    """
+    cache_key = None
+    if options.cache is not None:
+        params = (
+            {p.name: p.value for p in job_config.query_parameters} if job_config else {}
+        )
+        if options.dtypes:
+            # O arquivo em cache já está convertido: o schema faz parte da chave
+            params["cast"] = {col: str(dtype) for col, dtype in options.dtypes.items()}
+        cache_key = options.cache.make_key(query_str, params)
+
+        rows = options.cache.fetch(cache_key, part_path)
+        if rows is not None:
+            return rows
+
+    if job_config is None:
+        job = client.query(query_str)
+    else:
         job = client.query(query_str, job_config=job_config)
+
+    if options.streaming:
+        rows = _stream_to_parquet(job, part_path, options)
+    else:
         arrow_table = job.to_arrow()
-        df = pl.from_arrow(arrow_table)
+        if options.dtypes:
+            arrow_table = _cast_arrow(arrow_table, options.dtypes, part_path.name, 0)
+        pq.write_table(arrow_table, part_path, compression="zstd")
+        rows = arrow_table.num_rows
+
+    if options.cache is not None and cache_key is not None:
+        options.cache.store(cache_key, part_path)
+
+    return rows
 
-        if isinstance(df, pl.Series):
+
+def _is_retryable(error: Exception) -> bool:
+    """Indica se a falha é transitória (`RETRYABLE_ERRORS` ou 403 por cota/rate limit)."""
+    if isinstance(error, RETRYABLE_ERRORS):
+        return True
+
+    if isinstance(error, gcp_exceptions.Forbidden):
+        reasons = {detail.get("reason") for detail in error.errors or []}
+        return not reasons.isdisjoint(RETRYABLE_REASONS)
+
+    return False
+
+
+def _extract_slice(
+    client: SourceClient,
+    query_str: str,
+    window: tuple[str, str],
+    part_path: Path,
+    options: _WriteOptions,
+) -> int:
+    """
+    Extrai uma fatia da janela temporal e grava o resultado em um arquivo parquet próprio.
+
+    Falhas transitórias (`_is_retryable`) são repetidas até `options.max_attempts` vezes,
+    com espera exponencial (`backoff_seconds * 2^(tentativa - 1)`) apenas para a fatia.
+    O arquivo é gravado em um temporário e movido no final, portanto uma fatia
+    interrompida nunca deixa um parquet incompleto.
+
+    Args:
+        client (SourceClient): Cliente compartilhado entre as threads.
+        query_str (str): Query compilada com placeholders.
+        window (tuple[str, str]): Par (início, fim) da fatia.
+        part_path (Path): Arquivo parquet de destino da fatia.
+        options (_WriteOptions): Modo stream, cache de resultados e tentativas.
+
+    Returns:
+        int: Quantidade de linhas gravadas.
+    """
+    job_config = _build_window_job_config(*window)
+    tmp_path = part_path.with_name(f".{part_path.name}.tmp")
+    attempts = max(1, options.max_attempts)
+    attempt = 1
+
+    while True:
+        try:
+            rows = _query_to_parquet(client, query_str, job_config, tmp_path, options)
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            if attempt >= attempts or not _is_retryable(e):
+                raise e
+
+            delay = options.backoff_seconds * 2 ** (attempt - 1)
             logger.warning(
-                "A extração retornou uma Series. Convertendo para DataFrame."
+                f"Fatia '{part_path.name}': tentativa {attempt}/{attempts} "
+                f"falhou ({e}). Nova tentativa em {delay:.1f}s."
             )
-            df = df.to_frame()
+            time.sleep(delay)
+            attempt += 1
+            continue
+
+        os.replace(tmp_path, part_path)
+        return rows
+
+
+def _checkpoint_signature(query_str: str, options: _WriteOptions) -> str:
+    """Identifica a query (e a conversão de tipos) cujas fatias podem ser retomadas."""
+    dtypes = {col: str(dtype) for col, dtype in (options.dtypes or {}).items()}
+    payload = json.dumps({"sql": query_str, "cast": dtypes}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+def _extract_sliced(  # noqa: PLR0913
+    client: SourceClient,
+    query_str: str,
+    table_name: str,
+    slices: list[tuple[str, str]],
+    max_workers: int,
+    staging_dir: str,
+    options: _WriteOptions,
+) -> pl.LazyFrame | pl.DataFrame | dict[str, pl.DataFrame]:
+    """
+    Executa as fatias em paralelo (pool de threads limitado), cada uma em seu arquivo parquet.
+
+    As fatias concluídas são registradas em um checkpoint (`_manifest.json`) no diretório
+    de staging. Se uma execução anterior da mesma query falhou no meio (na extração ou na
+    gravação do Raw), apenas as fatias ausentes são extraídas. O checkpoint só é concluído
+    depois que o Kedro grava o dataset Raw.
+
+    Args:
+        client (SourceClient): Cliente da fonte (BigQuery ou local).
+        query_str (str): Query compilada com placeholders.
+        table_name (str): Nome da tabela.
+        slices (list[tuple[str, str]]): Fatias geradas por `_build_date_slices`.
+        max_workers (int): Quantidade máxima de fatias executadas ao mesmo tempo.
+        staging_dir (str): Diretório onde os arquivos parciais são gravados.
+        options (_WriteOptions): Modo stream, cache de resultados e tentativas.
+
+    Returns:
+        pl.LazyFrame | pl.DataFrame | dict: Leitura lazy dos arquivos parciais, ou `{}`
+            (nenhuma parte a gravar) se a janela estiver vazia.
+    """
+    if not slices:
+        # Um frame vazio substituiria o Raw existente: nenhuma parte é gravada
+        logger.warning(f"Incremental '{table_name}': janela vazia, nada a extrair.")
+        return {}
+
+    table_dir = Path(staging_dir) / table_name
+    checkpoint = SliceCheckpoint.open(
+        table_dir, _checkpoint_signature(query_str, options)
+    )
+    completed = checkpoint.completed
+
+    names = [f"{start}_{end}" for start, end in slices]
+    part_paths = [table_dir / f"part-{name}.parquet" for name in names]
+    pending = [
+        (window, name, path)
+        for window, name, path in zip(slices, names, part_paths, strict=True)
+        if name not in completed
+    ]
+    total_rows = sum(rows for name, rows in completed.items() if name in names)
+
+    if len(pending) < len(slices):
+        logger.info(
+            f"Checkpoint '{table_name}': {len(slices) - len(pending)} de {len(slices)} "
+            "fatias já concluídas. Retomando as restantes."
+        )
 
-        logger.info(f"Incremental '{table_name}': {df.height} linhas.")
-        return df
+    workers = max(1, min(max_workers, len(pending)))
+    logger.info(
+        f"Incremental '{table_name}': {len(pending)} fatias | {workers} workers."
+    )
+
+    error = None
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_extract_slice, client, query_str, window, path, options): (
+                window,
+                name,
+            )
+            for window, name, path in pending
+        }
+        for future in as_completed(futures):
+            (start, end), name = futures[future]
+            if future.cancelled():
+                continue
+
+            try:
+                rows = future.result()
+            except Exception as e:
+                logger.error(f"Falha na fatia '{table_name}' {start} -> {end}: {e}")
+                if error is None:
+                    error = e
+                    # Evita iniciar fatias pendentes; as que já estão em execução
+                    # terminam e entram no checkpoint
+                    for other in futures:
+                        other.cancel()
+                continue
+
+            total_rows += rows
+            checkpoint.mark_done(name, rows)
+            logger.info(f"Fatia '{table_name}' {start} -> {end}: {rows} linhas.")
+
+    if error is not None:
+        raise error
+
+    # Concluído apenas depois que o catálogo gravar o Raw (até lá, a extração é retomável)
+    POST_SAVE_ACTIONS.register(
+        RAW_DATASET_TEMPLATE.format(table=table_name), checkpoint.finalize
+    )
+
+    logger.info(f"Incremental '{table_name}': {total_rows} linhas.")
+    return pl.scan_parquet([str(path) for path in part_paths])
+
+
+def _log_cache_stats(table_name: str, cache: QueryResultCache | None):
+    """Loga os hits/misses do cache de resultados da tabela."""
+    if cache is None:
+        return
+
+    stats = cache.stats
+    logger.info(
+        f"Cache '{table_name}': {stats['hits']} hits | {stats['misses']} misses | "
+        f"{stats['evictions']} removidos."
+    )
+
+
+def _schema_signature(
+    columns: list[str] | None, target_schema: dict[str, str] | None
+) -> str:
+    """
+    Assinatura do schema gravado no Raw: colunas projetadas e tipos aplicados na ingestão.
+
+    Partes gravadas com assinaturas diferentes têm dtypes/colunas diferentes e não podem
+    ser lidas juntas (`SchemaError` no `scan_parquet` do diretório).
+    """
+    return json.dumps({"columns": columns, "cast": target_schema}, sort_keys=True)
+
+
+def _watermark_window(
+    watermark: str, lookback_days: int, start_date: str
+) -> tuple[str, str]:
+    """
+    Calcula a janela incremental a partir do último watermark: (watermark - lookback_days, hoje).
+
+    Args:
+        watermark (str): Maior valor de `date_col` já carregado (ISO 8601).
+        lookback_days (int): Dias recarregados antes do watermark (dados atrasados).
+        start_date (str): Data mínima configurada, nunca ultrapassada para trás.
+
+    Returns:
+        tuple[str, str]: Par (início, fim) no formato YYYY-MM-DD.
+    """
+    start = date.fromisoformat(str(watermark)[:10]) - timedelta(days=lookback_days)
+    start = max(start, date.fromisoformat(str(start_date)))
+    end = datetime.now().date()
+    return start.isoformat(), end.isoformat()
+
+
+def _max_date(data: pl.DataFrame | pl.LazyFrame, date_col: str) -> str | None:
+    """Retorna o maior valor de `date_col` extraído (ISO 8601) ou None se não houver linhas."""
+    if data.collect_schema().len() == 0:
+        return None
+
+    value = data.lazy().select(pl.col(date_col).max()).collect().item()
+    if value is None:
+        return None
+
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _extract_window(  # noqa: PLR0913
+    client: SourceClient,
+    query_str: str,
+    table_name: str,
+    start_date: str,
+    end_date: str,
+    slice_size: str | None,
+    max_workers: int,
+    staging_dir: str,
+    options: _WriteOptions,
+) -> pl.DataFrame | pl.LazyFrame | dict[str, pl.DataFrame]:
+    """Extrai a janela [start_date, end_date) fatiada, em stream ou em uma única query."""
+    # 1. Execução Fatiada
+    if slice_size:
+        slices = _build_date_slices(start_date, end_date, slice_size)
+        return _extract_sliced(
+            client, query_str, table_name, slices, max_workers, staging_dir, options
+        )
+
+    # 2. Execução em Stream ou via cache (janela inteira em um único arquivo)
+    if options.streaming or options.cache is not None:
+        return _extract_sliced(
+            client,
+            query_str,
+            table_name,
+            [(str(start_date), end_date)],
+            1,
+            staging_dir,
+            options,
+        )
+
+    # 3. Execução
+    job_config = _build_window_job_config(start_date, end_date)
+    job = client.query(query_str, job_config=job_config)
+    arrow_table = job.to_arrow()
+    df = pl.from_arrow(arrow_table)
+
+    if isinstance(df, pl.Series):
+        logger.warning("A extração retornou uma Series. Convertendo para DataFrame.")
+        df = df.to_frame()
+
+    if options.dtypes:
+        df = _cast_frame(df, options.dtypes, table_name, 0)
+
+    logger.info(f"Incremental '{table_name}': {df.height} linhas.")
+    return df
+
+
+# Node 1: Extração Incremental
+def extract_incremental_data(  # noqa: PLR0913
+    table_name: str,
+    date_col: str,
+    key_filepath: str,
+    start_date: str,
+    lookback_days: int = 2,
+    slice_size: str | None = None,
+    max_workers: int = 1,
+    staging_dir: str = "data/01_raw/_staging",
+    streaming: bool = False,
+    max_queue_size: int = 2,
+    max_stream_count: int | None = 2,
+    watermark: dict[str, Any] | None = None,
+    columns: dict[str, str] | None = None,
+    extra_columns: list[str] | None = None,
+    query_cache: dict[str, Any] | None = None,
+    target_schema: dict[str, str] | None = None,
+    source: dict[str, Any] | None = None,
+    retry: dict[str, Any] | None = None,
+) -> pl.DataFrame | pl.LazyFrame | dict[str, pl.DataFrame | pl.LazyFrame]:
+    """
+    Extrai apenas o delta de dados baseado em um janela de tempo.
+
+    Quando `slice_size` é informado, a janela é dividida em fatias (dia/semana/mês) que são
+    extraídas em paralelo, cada uma gravada em seu próprio arquivo parquet em `staging_dir`.
+    Com `streaming`, o resultado é gravado lote a lote e o nó retorna um LazyFrame.
+
+    Com `watermark`, a janela começa no último watermark da tabela (menos `lookback_days`)
+    e termina hoje. O delta é retornado como `{janela: dados}`, que o `StreamingPolarsDataset`
+    grava como uma nova parte, sem reescrever o histórico. O watermark só avança depois que
+    essa parte for gravada (`IngestionStateHook`). Linhas recarregadas pelo `lookback_days`
+    aparecem em mais de uma parte e são resolvidas no processamento (a parte mais recente
+    vence, ver `process_table`). Se a projeção ou o `target_schema` mudarem desde a última
+    carga, o watermark é ignorado e a tabela inteira é retornada como frame, substituindo
+    as partes antigas (que têm outros dtypes) em vez de adicionar uma nova.
+
+    Com `columns` (schema 'processing.schemas.<tabela>'), apenas as colunas usadas no
+    processamento (mais `extra_columns` e `date_col`) são extraídas, em vez de `SELECT *`.
+
+    Com `target_schema`, cada lote é convertido para os tipos do processamento (UInt32,
+    Categorical, Decimal...) antes de ser gravado, e a camada Raw já nasce compacta.
+
+    As extrações em stream, fatiadas ou com cache são retomáveis: cada fatia concluída é
+    registrada em um checkpoint no staging, e uma nova execução após uma falha busca
+    apenas as fatias ausentes. Falhas transitórias são repetidas por fatia (`retry`).
+
+    Args:
+        table_name (str): Nome da tabela no BigQuery.
+        date_col (str): Nome da coluna de data que será utilizado como filtro.
+        key_filepath (str): Diretório onde está o arquivo JSON com as credenciais do GCP.
+        start_date (str): Data de ínício dos dados extraídos.
+        lookback_days (int): Define o limite da data para hoje - lookback_days.
+        slice_size (str | None): Tamanho da fatia ('day', 'week', 'month'). None extrai a janela inteira.
+        max_workers (int): Quantidade máxima de fatias extraídas ao mesmo tempo.
+        staging_dir (str): Diretório dos arquivos parciais de cada fatia.
+        streaming (bool): Grava o resultado em stream (Arrow RecordBatch), com memória limitada.
+        max_queue_size (int): Quantidade máxima de páginas enfileiradas no modo stream.
+        max_stream_count (int | None): Streams paralelos da Storage API no modo stream.
+        watermark (dict[str, Any] | None): Configuração do WatermarkStore ('ingestion.watermark').
+        columns (dict[str, str] | None): Schema de processamento usado na projeção de colunas.
+        extra_columns (list[str] | None): Colunas extraídas além das do schema.
+        query_cache (dict[str, Any] | None): Configuração do cache local de resultados ('ingestion.query_cache').
+        target_schema (dict[str, str] | None): Schema de processamento aplicado em cada lote durante a ingestão.
+        source (dict[str, Any] | None): Fonte da extração ('ingestion.source'). None usa o BigQuery.
+        retry (dict[str, Any] | None): Tentativas por fatia ('ingestion.retry': max_attempts, backoff_seconds).
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame | dict: Dados extraídos, ou `{janela: dados}` no modo watermark.
+    """
+    # Validar table_name
+    _validate_table_name(table_name)
+
+    client = _get_bq_client(key_filepath, source)
+
+    projection = _resolve_columns(columns, extra_columns, required=(date_col,))
+    dtypes = _resolve_dtypes(target_schema)
+
+    store = create_watermark_store(watermark) if watermark else None
+    last_watermark = store.get(table_name) if store else None
+
+    # Projeção ou cast alterados: as partes antigas não combinam com as novas
+    schema_key = f"schema:{table_name}"
+    signature = _schema_signature(projection, target_schema)
+    rewrite = bool(last_watermark) and store.get(schema_key) != signature
+    if rewrite:
+        logger.warning(
+            f"Schema do Raw de '{table_name}' mudou (projeção ou cast_on_ingest). "
+            f"Ignorando o watermark e reescrevendo a tabela desde {start_date}."
+        )
+        last_watermark = None
+
+    # Lógica Temporal
+    if last_watermark:
+        start_date, end_date = _watermark_window(
+            last_watermark, lookback_days, start_date
+        )
+        logger.info(f"Watermark '{table_name}': {last_watermark}.")
+    else:
+        today = datetime.now()
+        end_date = (today - timedelta(days=lookback_days)).strftime("%Y-%m-%d")
+
+    logger.info(f"Ingestão Incremental: '{table_name}' | {start_date} -> {end_date}")
+
+    # Construção e compilação da query
+    query_str = _build_incremental_query(table_name, date_col, projection)
+
+    if projection:
+        _report_projection(
+            client,
+            table_name,
+            _build_incremental_query(table_name, date_col),
+            query_str,
+            projection,
+            _build_window_job_config(start_date, end_date),
+        )
+
+    options = _WriteOptions(
+        streaming=streaming,
+        bqstorage_client=(
+            _get_bqstorage_client(key_filepath, source) if streaming else None
+        ),
+        max_queue_size=max_queue_size,
+        max_stream_count=max_stream_count,
+        cache=create_query_cache(query_cache),
+        dtypes=dtypes,
+        **(retry or {}),
+    )
+
+    try:
+        data = _extract_window(
+            client,
+            query_str,
+            table_name,
+            start_date,
+            end_date,
+            slice_size,
+            max_workers,
+            staging_dir,
+            options,
+        )
     except Exception as e:
         logger.error(f"Erro SQL Gerado: {query_str}")
         logger.error(f"Falha: {e}")
         raise e
 
+    _log_cache_stats(table_name, options.cache)
+    _defer_staging_cleanup(staging_dir, table_name)
 
-def extract_snapshot_data(
-    table_name: str, key_filepath: str, safety_limit: int = 100_000
-) -> pl.DataFrame:
+    if isinstance(data, dict):
+        # Janela vazia: o Raw existente é mantido e o watermark não muda
+        return data
+
+    if store is None:
+        return data
+
+    new_watermark = _max_date(data, date_col)
+    if new_watermark is None and not rewrite:
+        logger.info(f"Incremental '{table_name}': nenhum dado novo desde o watermark.")
+        return {}
+
+    # O watermark e a assinatura só mudam depois que o catálogo gravar o Raw
+    def _advance_watermark():
+        store.set(schema_key, signature)
+        if new_watermark is not None:
+            store.set(table_name, new_watermark)
+            logger.info(f"Watermark '{table_name}' atualizado: {new_watermark}.")
+
+    POST_SAVE_ACTIONS.register(
+        RAW_DATASET_TEMPLATE.format(table=table_name), _advance_watermark
+    )
+
+    # Schema alterado: a tabela inteira substitui o diretório Raw (sem partes antigas)
+    if rewrite:
+        return data
+
+    return {f"{start_date}_{end_date}": data}
+
+
+def _has_raw_parts(raw_dir: str, table_name: str) -> bool:
+    """Indica se o diretório Raw da tabela existe e contém ao menos uma parte parquet."""
+    table_dir = Path(raw_dir) / table_name
+    return table_dir.is_dir() and any(table_dir.glob("**/*.parquet"))
+
+
+def _table_fingerprint(
+    client: SourceClient,
+    table_name: str,
+    columns: list[str] | None = None,
+    target_schema: dict[str, str] | None = None,
+) -> tuple[str, int]:
+    """
+    Gera a impressão digital da tabela a partir dos metadados (sem executar query).
+
+    Args:
+        client (SourceClient): Cliente da fonte (BigQuery ou local).
+        table_name (str): Nome da tabela (já validado).
+        columns (list[str] | None): Colunas projetadas. Mudanças na projeção também invalidam o Raw.
+        target_schema (dict[str, str] | None): Schema aplicado na ingestão. Mudanças nos tipos também invalidam o Raw.
+
+    Returns:
+        tuple[str, int]: Impressão digital (JSON com linhas, bytes e última modificação) e total de linhas.
+    """
+    table = client.get_table(f"bigquery-public-data.thelook_ecommerce.{table_name}")
+    modified = table.modified.isoformat() if table.modified else None
+
+    fingerprint = json.dumps(
+        {
+            "num_rows": table.num_rows,
+            "num_bytes": table.num_bytes,
+            "modified": modified,
+            "columns": columns,
+            "cast": target_schema,
+        },
+        sort_keys=True,
+    )
+    return fingerprint, table.num_rows or 0
+
+
+def _check_safety_limit(table_name: str, total_rows: int, safety_limit: int):
+    """Aborta o Snapshot se a tabela possuir mais linhas que o limite de segurança."""
+    logger.info(f"Tabela '{table_name}' possui {total_rows} linhas.")
+
+    if total_rows > safety_limit:
+        raise ValueError(
+            f"Tabela '{table_name}' é muito grande para Snapshot ({total_rows}). "
+            f"Limite de segurança: {safety_limit}. Use ingestão incremental se for tabela temporal ou aumente o limite."
+        )
+
+
+def _snapshot_row_count(client: SourceClient, table_name: str) -> int:
+    """Conta as linhas da tabela com `COUNT(*)` (modo sem store de estado)."""
+    full_table_id = f"`bigquery-public-data.thelook_ecommerce.{table_name}`"
+    count_stmt = sa.select(sa.func.count()).select_from(sa.text(full_table_id))
+    count_sql = str(count_stmt.compile(compile_kwargs={"literal_binds": True}))
+
+    try:
+        count_job = client.query(count_sql)
+        return list(count_job.result())[0][0]
+
+    except Exception as e:
+        logger.error(f"Falha ao contar linhas de '{table_name}': {e}")
+        raise e
+
+
+def _download_snapshot(
+    client: SourceClient,
+    table_name: str,
+    query_str: str,
+    staging_dir: str,
+    options: _WriteOptions,
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Executa o SELECT do snapshot.
+
+    No modo stream (ou com cache) o resultado é gravado no staging e retornado como
+    LazyFrame; caso contrário, é carregado em memória.
+
+    Args:
+        client (SourceClient): Cliente da fonte de ingestão.
+        table_name (str): Nome da tabela.
+        query_str (str): SELECT da tabela (já com a projeção).
+        staging_dir (str): Diretório do arquivo parcial no modo stream.
+        options (_WriteOptions): Opções de leitura e escrita.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Dados extraídos.
+    """
+    try:
+        if options.streaming or options.cache is not None:
+            part_path = _prepare_table_dir(staging_dir, table_name) / "part-0.parquet"
+            rows = _query_to_parquet(client, query_str, None, part_path, options)
+            logger.info(f"Snapshot '{table_name}': {rows} linhas.")
+            _log_cache_stats(table_name, options.cache)
+            _defer_staging_cleanup(staging_dir, table_name)
+            data = pl.scan_parquet(part_path)
+        else:
+            job = client.query(query_str)
+            arrow_table = job.to_arrow()
+            data = pl.from_arrow(arrow_table)
+
+            if isinstance(data, pl.Series):
+                logger.warning(
+                    "A extração retornou uma Series. Convertendo para DataFrame."
+                )
+                data = data.to_frame()
+
+            if options.dtypes:
+                data = _cast_frame(data, options.dtypes, table_name, 0)
+
+            logger.info(f"Snapshot '{table_name}': {data.height} linhas.")
+
+    except Exception as e:
+        logger.error(f"Falha Snapshot: {e}")
+        raise e
+
+    return data
+
+
+def extract_snapshot_data(  # noqa: PLR0913
+    table_name: str,
+    key_filepath: str,
+    safety_limit: int = 100_000,
+    staging_dir: str = "data/01_raw/_staging",
+    streaming: bool = False,
+    max_queue_size: int = 2,
+    max_stream_count: int | None = 2,
+    watermark: dict[str, Any] | None = None,
+    force_refresh: bool = False,
+    columns: dict[str, str] | None = None,
+    extra_columns: list[str] | None = None,
+    query_cache: dict[str, Any] | None = None,
+    target_schema: dict[str, str] | None = None,
+    source: dict[str, Any] | None = None,
+    raw_dir: str = "data/01_raw",
+) -> pl.DataFrame | pl.LazyFrame | dict:
     """
     Extrai toda a tabela quando a tabela não é temporal.
 
+    Com `watermark`, o store também guarda a impressão digital da tabela (linhas, bytes e
+    última modificação, lidas dos metadados). Se nada mudou desde a última extração e o
+    parquet Raw ainda existe em `raw_dir`, o nó não executa nenhuma query e retorna `{}`.
+    A impressão digital só é gravada depois que o Kedro salva o dataset Raw.
+
+    Com `target_schema`, o resultado é convertido para os tipos do processamento antes de
+    ser gravado.
+
     Args:
         table_name (str): Nome da tabela no BigQuery.
         key_filepath (str): Diretório onde está o arquivo JSON com as credenciais do GCP.
         safety_limit (int): Quantidade máxima de linhas esperada.
+        staging_dir (str): Diretório do arquivo parcial no modo stream.
+        streaming (bool): Grava o resultado em stream (Arrow RecordBatch), com memória limitada.
+        max_queue_size (int): Quantidade máxima de páginas enfileiradas no modo stream.
+        max_stream_count (int | None): Streams paralelos da Storage API no modo stream.
+        watermark (dict[str, Any] | None): Configuração do store de estado ('ingestion.watermark').
+        force_refresh (bool): Ignora a impressão digital e extrai a tabela mesmo sem mudanças.
+        columns (dict[str, str] | None): Schema de processamento usado na projeção de colunas.
+        extra_columns (list[str] | None): Colunas extraídas além das do schema.
+        query_cache (dict[str, Any] | None): Configuração do cache local de resultados ('ingestion.query_cache').
+        target_schema (dict[str, str] | None): Schema de processamento aplicado em cada lote durante a ingestão.
+        source (dict[str, Any] | None): Fonte da extração ('ingestion.source'). None usa o BigQuery.
+        raw_dir (str): Diretório da camada Raw, onde o parquet existente é procurado.
 
     Returns:
-        pl.DataFrame: DataFrame com dados extraídos
+        pl.DataFrame | pl.LazyFrame | dict: Dados extraídos, ou `{}` quando a tabela não mudou.
     """
     # Valida table_name
     _validate_table_name(table_name)
 
-    client = _get_bq_client(key_filepath)
+    client = _get_bq_client(key_filepath, source)
     logger.info(f"Ingestão Snapshot: '{table_name}'")
 
-    full_table_id = f"`bigquery-public-data.thelook_ecommerce.{table_name}`"
+    projection = _resolve_columns(columns, extra_columns)
+    dtypes = _resolve_dtypes(target_schema)
 
-    # 1. Verificar tamanho da tabela
-    count_stmt = sa.select(sa.func.count()).select_from(sa.text(full_table_id))
-    count_sql = str(count_stmt.compile(compile_kwargs={"literal_binds": True}))
-
-    try:
-        count_job = client.query(count_sql)
-        total_rows = list(count_job.result())[0][0]
+    store = create_watermark_store(watermark) if watermark else None
+    store_key = f"snapshot:{table_name}"
+    fingerprint = None
 
-        logger.info(f"Tabela '{table_name}' possui {total_rows} linhas.")
+    # 1. Verificar tamanho da tabela
+    if store is not None:
+        # Metadados da tabela: dispensa o COUNT(*) e permite pular tabelas inalteradas
+        fingerprint, total_rows = _table_fingerprint(
+            client, table_name, projection, target_schema
+        )
 
-        if total_rows > safety_limit:
-            raise ValueError(
-                f"Tabela '{table_name}' é muito grande para Snapshot ({total_rows}). "
-                f"Limite de segurança: {safety_limit}. Use ingestão incremental se for tabela temporal ou aumente o limite."
+        if (
+            not force_refresh
+            and store.get(store_key) == fingerprint
+            and _has_raw_parts(raw_dir, table_name)
+        ):
+            logger.info(
+                f"Snapshot '{table_name}' inalterado desde a última extração. "
+                "Reutilizando o parquet Raw existente (use force_refresh para forçar)."
             )
+            return {}
 
-    except Exception as e:
-        logger.error(f"Falha ao contar linhas de '{table_name}': {e}")
-        raise e
+        _check_safety_limit(table_name, total_rows, safety_limit)
+    else:
+        total_rows = _snapshot_row_count(client, table_name)
+        _check_safety_limit(table_name, total_rows, safety_limit)
 
     # 2. Extração REAL
     logger.info(f"Volume seguro. Iniciando download de '{table_name}'...")
 
-    stmt = sa.select(sa.literal_column("*")).select_from(sa.text(full_table_id))
+    stmt = _build_select(table_name, projection)
 
     query_str = str(stmt.compile(compile_kwargs={"literal_binds": True}))
 
-    try:
-        job = client.query(query_str)
-        arrow_table = job.to_arrow()
-        df = pl.from_arrow(arrow_table)
+    if projection:
+        full_stmt = _build_select(table_name)
+        _report_projection(
+            client,
+            table_name,
+            str(full_stmt.compile(compile_kwargs={"literal_binds": True})),
+            query_str,
+            projection,
+        )
 
-        if isinstance(df, pl.Series):
-            logger.warning(
-                "A extração retornou uma Series. Convertendo para DataFrame."
-            )
-            df = df.to_frame()
+    options = _WriteOptions(
+        streaming=streaming,
+        bqstorage_client=(
+            _get_bqstorage_client(key_filepath, source) if streaming else None
+        ),
+        max_queue_size=max_queue_size,
+        max_stream_count=max_stream_count,
+        cache=create_query_cache(query_cache),
+        dtypes=dtypes,
+    )
 
-        logger.info(f"Snapshot '{table_name}': {df.height} linhas.")
+    data = _download_snapshot(client, table_name, query_str, staging_dir, options)
 
-        return df
+    if store is not None and fingerprint is not None:
+        # A impressão digital só vale depois que o parquet Raw for gravado
+        POST_SAVE_ACTIONS.register(
+            RAW_DATASET_TEMPLATE.format(table=table_name),
+            lambda: store.set(store_key, fingerprint),
+        )
 
-    except Exception as e:
-        logger.error(f"Falha Snapshot: {e}")
-        raise e
+    return data
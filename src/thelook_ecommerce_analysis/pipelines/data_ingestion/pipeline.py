@@ -12,27 +12,154 @@ from thelook_ecommerce_analysis.pipelines.data_ingestion.nodes import (
 from thelook_ecommerce_analysis.utils.get_params import get_params
 from thelook_ecommerce_analysis.utils.partial_func import create_node_func
 
+# Opções por tabela aceitas em 'ingestion.incremental_tables.<tabela>'
+INCREMENTAL_TABLE_OPTIONS = ("slice_size", "max_workers")
+
+# Parâmetros de escrita em stream, comuns a todos os nós de extração
+STREAMING_INPUTS = {
+    "staging_dir": "params:ingestion.staging_dir",
+    "streaming": "params:ingestion.streaming",
+    "max_queue_size": "params:ingestion.max_queue_size",
+    "max_stream_count": "params:ingestion.max_stream_count",
+}
+
+
+def _incremental_inputs(
+    table: str, table_config: str | dict, use_watermark: bool = False
+) -> dict[str, str]:
+    """
+    Monta os inputs do nó incremental a partir da configuração da tabela.
+
+    A tabela pode ser declarada de forma curta (`orders: created_at`) ou completa
+    (`events: {date_col: created_at, slice_size: week, max_workers: 4}`).
+
+    Args:
+        table (str): Nome da tabela.
+        table_config (str | dict): Valor de 'ingestion.incremental_tables.<tabela>'.
+        use_watermark (bool): Conecta 'ingestion.watermark' para a carga incremental real.
+
+    Returns:
+        dict[str, str]: Mapeamento argumento -> parâmetro do Kedro.
+    """
+    prefix = f"params:ingestion.incremental_tables.{table}"
+
+    inputs = {
+        "key_filepath": "params:ingestion.gcp_service_account",
+        "start_date": "params:ingestion.start_date",
+        **STREAMING_INPUTS,
+    }
+
+    if use_watermark:
+        inputs["watermark"] = "params:ingestion.watermark"
+
+    # Forma curta: o valor é o próprio nome da coluna de data
+    if not isinstance(table_config, dict):
+        return {"date_col": prefix, **inputs}
+
+    inputs["date_col"] = f"{prefix}.date_col"
+    for option in INCREMENTAL_TABLE_OPTIONS:
+        if option in table_config:
+            inputs[option] = f"{prefix}.{option}"
+
+    return inputs
+
+
+def _projection_inputs(
+    table: str, projection: dict, schemas: dict[str, dict]
+) -> dict[str, str]:
+    """
+    Conecta o schema de processamento da tabela para projetar as colunas na extração.
+
+    Args:
+        table (str): Nome da tabela.
+        projection (dict): Valor de 'ingestion.projection'.
+        schemas (dict[str, dict]): Valor de 'processing.schemas'.
+
+    Returns:
+        dict[str, str]: Mapeamento argumento -> parâmetro do Kedro (vazio sem projeção).
+    """
+    if not projection.get("enabled") or table not in schemas:
+        return {}
+
+    inputs = {"columns": f"params:processing.schemas.{table}"}
+    if table in projection.get("extra_columns", {}):
+        inputs["extra_columns"] = f"params:ingestion.projection.extra_columns.{table}"
+
+    return inputs
+
+
+def _cast_inputs(
+    table: str, cast_on_ingest: bool, schemas: dict[str, dict]
+) -> dict[str, str]:
+    """
+    Conecta o schema de processamento da tabela para converter os tipos já na ingestão.
+
+    Args:
+        table (str): Nome da tabela.
+        cast_on_ingest (bool): Valor de 'ingestion.cast_on_ingest'.
+        schemas (dict[str, dict]): Valor de 'processing.schemas'.
+
+    Returns:
+        dict[str, str]: Mapeamento argumento -> parâmetro do Kedro (vazio sem conversão).
+    """
+    if not cast_on_ingest or table not in schemas:
+        return {}
+
+    return {"target_schema": f"params:processing.schemas.{table}"}
+
 
 def create_pipeline(**kwargs) -> Pipeline:
     # 1. Leitura Dinâmica
     config = get_params("ingestion")
 
     # Extrai as chaves do dicionário
-    incremental_tables = list(config.get("incremental_tables", {}).keys())
+    incremental_tables: dict = config.get("incremental_tables", {})
     snapshot_tables: list[str] = config["snapshot_tables"]
 
+    # Projeção: colunas extraídas definidas pelo schema de processamento
+    projection: dict = config.get("projection", {})
+    schemas: dict = get_params("processing").get("schemas", {})
+    cast_on_ingest: bool = config.get("cast_on_ingest", False)
+
+    # Impressão digital das tabelas snapshot (guardada no mesmo store do watermark)
+    snapshot_state_inputs = {}
+    if "watermark" in config:
+        snapshot_state_inputs = {
+            "watermark": "params:ingestion.watermark",
+            "force_refresh": "params:ingestion.force_refresh",
+        }
+        if "raw_dir" in config:
+            snapshot_state_inputs["raw_dir"] = "params:ingestion.raw_dir"
+
+    # Cache local de resultados (reexecuções da mesma query não vão ao BigQuery)
+    # e fonte da extração (BigQuery ou arquivos locais para benchmarks)
+    shared_inputs = {}
+    if "query_cache" in config:
+        shared_inputs["query_cache"] = "params:ingestion.query_cache"
+    if "source" in config:
+        shared_inputs["source"] = "params:ingestion.source"
+
+    # Tentativas com backoff exponencial por fatia (extração incremental)
+    retry_inputs = {}
+    if "retry" in config:
+        retry_inputs["retry"] = "params:ingestion.retry"
+
     nodes = []
 
     # 2. Pipeline Factory
     # 2.1 Tabelas Incrementais
-    for table in incremental_tables:
+    for table, table_config in incremental_tables.items():
         nodes.append(
             Node(
                 func=create_node_func(extract_incremental_data, table_name=table),
                 inputs={
-                    "date_col": f"params:ingestion.incremental_tables.{table}",
-                    "key_filepath": "params:ingestion.gcp_service_account",
-                    "start_date": "params:ingestion.start_date",
+                    **_incremental_inputs(
+                        table, table_config, use_watermark="watermark" in config
+                    ),
+                    **_projection_inputs(table, projection, schemas),
+                    **_cast_inputs(table, cast_on_ingest, schemas),
+                    **shared_inputs,
+                    **retry_inputs,
                 },
                 outputs=f"ingestion_raw_{table}",
                 name=f"extract_{table}_node",
@@ -48,6 +175,11 @@ def create_pipeline(**kwargs) -> Pipeline:
                 inputs={
                     "key_filepath": "params:ingestion.gcp_service_account",
                     "safety_limit": "params:ingestion.safety_limit",
+                    **STREAMING_INPUTS,
+                    **snapshot_state_inputs,
+                    **_projection_inputs(table, projection, schemas),
+                    **_cast_inputs(table, cast_on_ingest, schemas),
+                    **shared_inputs,
                 },
                 outputs=f"ingestion_raw_{table}",
                 name=f"extract_{table}_node",
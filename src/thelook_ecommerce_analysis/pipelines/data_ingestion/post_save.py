@@ -0,0 +1,63 @@
+import logging
+import threading
+from collections.abc import Callable, Iterable
+
+logger = logging.getLogger(__name__)
+
+
+class PostSaveActions:
+    """
+    Ações adiadas até que o dataset de saída de um nó seja gravado no catálogo.
+
+    Os nós de ingestão retornam LazyFrames que só são materializados quando o Kedro salva
+    o dataset. Qualquer estado que dependa desse resultado (limpeza do staging, watermark,
+    impressão digital) é registrado aqui e executado pelo `IngestionStateHook` no
+    `after_dataset_saved`. Se o nó ou a gravação falharem, as ações são descartadas.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._actions: dict[str, list[Callable[[], None]]] = {}
+
+    def register(self, dataset_name: str, action: Callable[[], None]) -> None:
+        """Agenda `action` para depois da gravação de `dataset_name`."""
+        with self._lock:
+            self._actions.setdefault(dataset_name, []).append(action)
+
+    def run(self, dataset_name: str) -> int:
+        """
+        Executa (na ordem de registro) as ações agendadas para `dataset_name`.
+
+        Args:
+            dataset_name (str): Dataset que acabou de ser gravado.
+
+        Returns:
+            int: Quantidade de ações executadas.
+        """
+        with self._lock:
+            actions = self._actions.pop(dataset_name, [])
+
+        for action in actions:
+            action()
+
+        return len(actions)
+
+    def discard(self, dataset_names: Iterable[str] | None = None) -> list[str]:
+        """
+        Descarta as ações pendentes (de todos os datasets, se `dataset_names` for None).
+
+        Returns:
+            list[str]: Datasets cujas ações foram descartadas.
+        """
+        with self._lock:
+            names = list(self._actions) if dataset_names is None else dataset_names
+            return [name for name in names if self._actions.pop(name, None)]
+
+    @property
+    def pending(self) -> list[str]:
+        """Datasets com ações aguardando a gravação."""
+        with self._lock:
+            return list(self._actions)
+
+
+POST_SAVE_ACTIONS = PostSaveActions()
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Cria um hard link (sem cópia de dados) ou copia o arquivo se não for possível."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+class QueryResultCache:
+    """
+    Cache local de resultados de extração, endereçado pelo conteúdo da query.
+
+    A chave é o hash (SHA-256) da query compilada mais os parâmetros da query, e cada
+    resultado é guardado como um arquivo parquet `<chave>.parquet`. O tempo de gravação
+    (`mtime`) controla o TTL e o último acesso (`atime`, atualizado a cada hit) define a
+    ordem de remoção (LRU) quando o tamanho total passa de `max_size_mb`.
+    """
+
+    def __init__(
+        self, cache_dir: str, ttl_hours: float = 24, max_size_mb: float = 2048
+    ):
+        """
+        Args:
+            cache_dir (str): Diretório do cache.
+            ttl_hours (float): Validade de cada resultado, em horas.
+            max_size_mb (float): Tamanho máximo do cache, em MB.
+        """
+        self._dir = Path(cache_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._ttl_seconds = ttl_hours * 3600
+        self._max_bytes = max_size_mb * 1024 * 1024
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(query_str: str, params: dict[str, Any] | None = None) -> str:
+        """Gera a chave do resultado a partir da query compilada e dos seus parâmetros."""
+        payload = json.dumps(
+            {"sql": query_str, "params": params or {}}, sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}.parquet"
+
+    def fetch(self, key: str, target: Path) -> int | None:
+        """
+        Copia o resultado em cache para `target`.
+
+        Args:
+            key (str): Chave gerada por `make_key`.
+            target (Path): Arquivo parquet de destino.
+
+        Returns:
+            int | None: Quantidade de linhas do resultado, ou None se não houver (ou expirou).
+        """
+        path = self._path(key)
+
+        with self._lock:
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                self.misses += 1
+                return None
+
+            if time.time() - stat.st_mtime > self._ttl_seconds:
+                path.unlink(missing_ok=True)
+                self.misses += 1
+                return None
+
+            # Marca o acesso (LRU) preservando o tempo de gravação (TTL)
+            os.utime(path, (time.time(), stat.st_mtime))
+            self.hits += 1
+
+        _link_or_copy(path, target)
+        return pq.ParquetFile(target).metadata.num_rows
+
+    def store(self, key: str, source: Path) -> None:
+        """Guarda o arquivo parquet `source` no cache e aplica a remoção por tamanho (LRU)."""
+        path = self._path(key)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+
+        _link_or_copy(source, tmp_path)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove os resultados expirados e os menos acessados até caber em `max_size_mb`."""
+        now = time.time()
+        entries = []
+
+        for path in self._dir.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            if now - stat.st_mtime > self._ttl_seconds:
+                path.unlink(missing_ok=True)
+                self.evictions += 1
+                continue
+
+            entries.append((stat.st_atime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self._max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            self.evictions += 1
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Contadores de hits, misses e remoções desta instância."""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+def create_query_cache(config: dict[str, Any] | None) -> QueryResultCache | None:
+    """
+    Cria o cache a partir de 'ingestion.query_cache' do parameters.yml.
+
+    Args:
+        config (dict[str, Any] | None): `enabled`, `cache_dir`, `ttl_hours` e `max_size_mb`.
+
+    Returns:
+        QueryResultCache | None: Cache configurado, ou None se desabilitado.
+    """
+    if not config or not config.get("enabled", False):
+        return None
+
+    return QueryResultCache(
+        cache_dir=config.get("cache_dir", "data/01_raw/_query_cache"),
+        ttl_hours=config.get("ttl_hours", 24),
+        max_size_mb=config.get("max_size_mb", 2048),
+    )
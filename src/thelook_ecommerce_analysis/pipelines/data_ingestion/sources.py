@@ -0,0 +1,212 @@
+import logging
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from google.cloud import bigquery
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.client_registry import (
+    CLIENT_REGISTRY,
+)
+
+logger = logging.getLogger(__name__)
+
+# Identificador das tabelas nas queries geradas pelos nós de ingestão
+TABLE_ID_PATTERN = re.compile(r"`bigquery-public-data\.thelook_ecommerce\.(\w+)`")
+
+# Placeholders de parâmetros (@start_date, @end_date)
+PARAM_PATTERN = re.compile(r"@(\w+)")
+
+
+class SourceClient(Protocol):
+    """
+    Interface da fonte de ingestão: o subconjunto do `bigquery.Client` usado pelos nós.
+
+    O job retornado por `query` precisa expor `to_arrow()`, `result()` (iterável de
+    linhas com `to_arrow_iterable(...)`) e `total_bytes_processed` (dry run).
+    """
+
+    def query(self, query: str, job_config: Any = None) -> Any: ...
+
+    def get_table(self, table: str) -> Any: ...
+
+    def close(self) -> None: ...
+
+
+@dataclass(frozen=True)
+class LocalTable:
+    """Metadados de uma tabela local, no formato lido de `bigquery.Table`."""
+
+    num_rows: int
+    num_bytes: int
+    modified: datetime
+
+
+class LocalQueryJob:
+    """Stand-in de `bigquery.QueryJob` sobre um LazyFrame do Polars."""
+
+    def __init__(self, frame: pl.LazyFrame, batch_size: int, bytes_processed: int):
+        self._frame = frame
+        self._batch_size = batch_size
+        self.total_bytes_processed = bytes_processed
+
+    def result(self) -> "LocalQueryJob":
+        return self
+
+    def __iter__(self) -> Iterator[tuple]:
+        return self._frame.collect().iter_rows()
+
+    def to_arrow(self, *args, **kwargs) -> pa.Table:
+        return self._frame.collect().to_arrow()
+
+    def to_arrow_iterable(
+        self,
+        bqstorage_client: Any = None,
+        max_queue_size: int | None = None,
+        max_stream_count: int | None = None,
+    ) -> Iterator[pa.RecordBatch]:
+        """Entrega o resultado em lotes de até `batch_size` linhas (engine streaming)."""
+        for chunk in self._frame.collect_batches(
+            chunk_size=self._batch_size, engine="streaming"
+        ):
+            yield from chunk.to_arrow().to_batches()
+
+
+class LocalBigQueryClient:
+    """
+    Fonte offline que serve as tabelas do thelook a partir de arquivos locais.
+
+    Cada tabela é lida de `<data_dir>/<tabela>.parquet`, `<data_dir>/<tabela>.arrow` ou de
+    um diretório de partes `<data_dir>/<tabela>/` (ex: a própria camada Raw). As queries
+    geradas pelos nós são executadas com o SQL do Polars, com os mesmos filtros de janela,
+    o que permite medir a ingestão de ponta a ponta sem rede nem credenciais.
+    """
+
+    def __init__(self, data_dir: str, batch_size: int = 100_000):
+        """
+        Args:
+            data_dir (str): Diretório com os arquivos das tabelas.
+            batch_size (int): Linhas por lote em `to_arrow_iterable`.
+        """
+        self._data_dir = Path(data_dir)
+        self._batch_size = batch_size
+
+    def _files(self, table_name: str) -> list[Path]:
+        for suffix in (".parquet", ".arrow"):
+            path = self._data_dir / f"{table_name}{suffix}"
+            if path.exists():
+                return [path]
+
+        table_dir = self._data_dir / table_name
+        files = sorted(table_dir.glob("**/*.parquet")) if table_dir.is_dir() else []
+        if not files:
+            raise FileNotFoundError(
+                f"Tabela local '{table_name}' não encontrada em '{self._data_dir}'."
+            )
+        return files
+
+    def _scan(self, table_name: str) -> pl.LazyFrame:
+        files = self._files(table_name)
+        if files[0].suffix == ".arrow":
+            return pl.scan_ipc(files[0])
+        return pl.scan_parquet(files)
+
+    def _scanned_bytes(self, table_name: str, columns: list[str]) -> int:
+        """Estimativa de bytes lidos: tamanho das colunas projetadas nos arquivos."""
+        total = 0
+        for path in self._files(table_name):
+            if path.suffix != ".parquet":
+                total += path.stat().st_size
+                continue
+
+            metadata = pq.ParquetFile(path).metadata
+            for rg in range(metadata.num_row_groups):
+                row_group = metadata.row_group(rg)
+                for c in range(row_group.num_columns):
+                    chunk = row_group.column(c)
+                    if chunk.path_in_schema.split(".")[0] in columns:
+                        total += chunk.total_uncompressed_size
+        return total
+
+    def query(
+        self, query: str, job_config: bigquery.QueryJobConfig | None = None
+    ) -> LocalQueryJob:
+        """Executa a query sobre os arquivos locais (parâmetros @nome substituídos)."""
+        tables = set(TABLE_ID_PATTERN.findall(query))
+        sql = TABLE_ID_PATTERN.sub(r"\1", query)
+
+        params = (
+            {p.name: p.value for p in job_config.query_parameters} if job_config else {}
+        )
+
+        def _literal(match: re.Match) -> str:
+            name = match.group(1)
+            if name not in params:
+                raise ValueError(f"Parâmetro '@{name}' não informado na query local.")
+            return "'" + str(params[name]).replace("'", "''") + "'"
+
+        sql = PARAM_PATTERN.sub(_literal, sql)
+
+        context = pl.SQLContext({table: self._scan(table) for table in tables})
+        frame = context.execute(sql, eager=False)
+
+        bytes_processed = 0
+        if job_config is not None and job_config.dry_run:
+            columns = frame.collect_schema().names()
+            bytes_processed = sum(self._scanned_bytes(t, columns) for t in tables)
+
+        return LocalQueryJob(frame, self._batch_size, bytes_processed)
+
+    def get_table(self, table: str) -> LocalTable:
+        """Metadados da tabela (linhas, bytes e última modificação dos arquivos)."""
+        table_name = str(table).rsplit(".", 1)[-1]
+        files = self._files(table_name)
+
+        return LocalTable(
+            num_rows=self._scan(table_name).select(pl.len()).collect().item(),
+            num_bytes=sum(path.stat().st_size for path in files),
+            modified=datetime.fromtimestamp(
+                max(path.stat().st_mtime for path in files), tz=UTC
+            ),
+        )
+
+    def close(self) -> None:
+        """Nada a liberar: mantido por compatibilidade com o `bigquery.Client`."""
+
+
+def create_source_client(
+    config: dict[str, Any] | None, key_filepath: str
+) -> SourceClient:
+    """
+    Cria o cliente da fonte de ingestão a partir de 'ingestion.source' do parameters.yml.
+
+    Args:
+        config (dict[str, Any] | None): `type` (bigquery ou local) e as opções da fonte.
+        key_filepath (str): Credenciais do GCP (fonte bigquery).
+
+    Returns:
+        SourceClient: Cliente do BigQuery (via `CLIENT_REGISTRY`) ou fonte local.
+
+    Raises:
+        ValueError: Tipo de fonte desconhecido.
+    """
+    source_type = (config or {}).get("type", "bigquery")
+
+    if source_type == "bigquery":
+        return CLIENT_REGISTRY.get_client(key_filepath)
+
+    if source_type == "local":
+        logger.info(f"Fonte local: '{config['data_dir']}' (sem BigQuery).")
+        return LocalBigQueryClient(
+            data_dir=config["data_dir"], batch_size=config.get("batch_size", 100_000)
+        )
+
+    raise ValueError(
+        f"Fonte de ingestão desconhecida: '{source_type}'. Use 'bigquery' ou 'local'."
+    )
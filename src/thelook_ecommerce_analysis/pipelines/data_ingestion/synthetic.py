@@ -0,0 +1,213 @@
+import argparse
+import logging
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ["Complete", "Shipped", "Processing", "Cancelled", "Returned"]
+GENDERS = ["F", "M"]
+CATEGORIES = ["Jeans", "Tops & Tees", "Accessories", "Shorts", "Sweaters"]
+DEPARTMENTS = ["Women", "Men"]
+BROWSERS = ["Chrome", "Firefox", "Safari", "IE", "Other"]
+TRAFFIC_SOURCES = ["Search", "Email", "Facebook", "Organic", "Display"]
+EVENT_TYPES = ["home", "department", "product", "cart", "purchase"]
+COUNTRIES = ["Brasil", "United States", "China", "Germany", "Japan"]
+
+
+def _random(n: int, seed: int, high: int) -> pl.Expr:
+    """Inteiros pseudoaleatórios e determinísticos em [0, high) para `n` linhas."""
+    return (pl.int_range(n, dtype=pl.UInt64).hash(seed) % high).cast(pl.Int64)
+
+
+def _hex_id(values: pl.Expr, seed: int) -> pl.Expr:
+    """
+    Identificadores de 32 dígitos hexadecimais, como o `sku` (md5) e o `session_id`
+    (UUID) do TheLook: carregáveis como `uuid` no Postgres.
+    """
+    return pl.concat_str(
+        values.hash(seed).cast(pl.String).str.zfill(20),
+        values.hash(seed + 1).cast(pl.String).str.zfill(20),
+    ).str.slice(0, 32)
+
+
+def _choice(values: list[str], n: int, seed: int) -> pl.Expr:
+    """Escolhe um valor de `values` por linha."""
+    return pl.lit(pl.Series(values)).gather(_random(n, seed, len(values)))
+
+
+def _timestamp(n: int, seed: int, start: datetime, days: int) -> pl.Expr:
+    """Timestamps distribuídos em `days` dias a partir de `start`."""
+    return pl.lit(start) + pl.duration(seconds=_random(n, seed, days * 86_400))
+
+
+def _money(n: int, seed: int, high: int) -> pl.Expr:
+    """Valores monetários com 2 casas decimais em [0, high)."""
+    return _random(n, seed, high * 100) / 100
+
+
+def generate_local_source(
+    data_dir: str,
+    n_orders: int = 10_000,
+    start: datetime = datetime(2025, 1, 1),
+    days: int = 365,
+    seed: int = 0,
+) -> dict[str, int]:
+    """
+    Gera as tabelas do thelook com dados sintéticos para a fonte local.
+
+    Os arquivos `<data_dir>/<tabela>.parquet` têm as colunas de 'processing.schemas' com
+    os tipos retornados pelo BigQuery (INT64, STRING, TIMESTAMP, FLOAT64), e podem ser
+    lidos pelo `LocalBigQueryClient` (`ingestion.source.type: local`). Os dados são
+    determinísticos para um mesmo `seed`, o que torna os benchmarks reprodutíveis.
+
+    Args:
+        data_dir (str): Diretório de destino ('ingestion.source.data_dir').
+        n_orders (int): Quantidade de pedidos. As demais tabelas são proporcionais.
+        start (datetime): Início do período coberto por `created_at`.
+        days (int): Dias cobertos por `created_at`.
+        seed (int): Semente dos valores pseudoaleatórios.
+
+    Returns:
+        dict[str, int]: Linhas geradas por tabela.
+    """
+    n_users = max(100, n_orders // 2)
+    n_products = max(100, n_orders // 10)
+    n_items = n_orders * 2
+    n_events = n_orders * 5
+
+    tables = {
+        "distribution_centers": pl.select(
+            id=pl.int_range(1, 11),
+            name=pl.format("DC {}", pl.int_range(1, 11)),
+            latitude=_random(10, seed, 180) - 90.0,
+            longitude=_random(10, seed + 1, 360) - 180.0,
+        ).with_columns(
+            distribution_center_geom=pl.format(
+                "POINT({} {})", pl.col("longitude"), pl.col("latitude")
+            )
+        ),
+        "products": pl.select(
+            id=pl.int_range(1, n_products + 1),
+            cost=_money(n_products, seed, 100),
+            category=_choice(CATEGORIES, n_products, seed + 1),
+            name=pl.format("Produto {}", pl.int_range(1, n_products + 1)),
+            brand=pl.format("Marca {}", _random(n_products, seed + 2, 50)),
+            retail_price=_money(n_products, seed + 3, 200),
+            department=_choice(DEPARTMENTS, n_products, seed + 4),
+            sku=_hex_id(pl.int_range(n_products), seed),
+            distribution_center_id=_random(n_products, seed + 5, 10) + 1,
+        ),
+        "users": pl.select(
+            id=pl.int_range(1, n_users + 1),
+            first_name=pl.format("Nome {}", _random(n_users, seed, 500)),
+            last_name=pl.format("Sobrenome {}", _random(n_users, seed + 1, 500)),
+            email=pl.format("user{}@example.com", pl.int_range(1, n_users + 1)),
+            age=_random(n_users, seed + 2, 60) + 12,
+            gender=_choice(GENDERS, n_users, seed + 3),
+            state=pl.format("Estado {}", _random(n_users, seed + 4, 27)),
+            street_address=pl.format("Rua {}", _random(n_users, seed + 5, 1000)),
+            postal_code=_random(n_users, seed + 6, 99_999).cast(pl.String),
+            city=pl.format("Cidade {}", _random(n_users, seed + 7, 300)),
+            country=_choice(COUNTRIES, n_users, seed + 8),
+            latitude=_random(n_users, seed + 9, 180) - 90.0,
+            longitude=_random(n_users, seed + 10, 360) - 180.0,
+            traffic_source=_choice(TRAFFIC_SOURCES, n_users, seed + 11),
+            created_at=_timestamp(n_users, seed + 12, start, days),
+        ).with_columns(
+            user_geom=pl.format("POINT({} {})", pl.col("longitude"), pl.col("latitude"))
+        ),
+        "orders": pl.select(
+            order_id=pl.int_range(1, n_orders + 1),
+            user_id=_random(n_orders, seed, n_users) + 1,
+            status=_choice(STATUSES, n_orders, seed + 1),
+            gender=_choice(GENDERS, n_orders, seed + 2),
+            created_at=_timestamp(n_orders, seed + 3, start, days),
+            num_of_item=_random(n_orders, seed + 4, 4) + 1,
+        ).with_columns(
+            shipped_at=pl.col("created_at") + pl.duration(days=1),
+            delivered_at=pl.col("created_at") + pl.duration(days=4),
+            returned_at=pl.lit(None, dtype=pl.Datetime("us")),
+        ),
+        "order_items": pl.select(
+            id=pl.int_range(1, n_items + 1),
+            order_id=pl.int_range(n_items) // 2 + 1,
+            user_id=_random(n_items, seed, n_users) + 1,
+            product_id=_random(n_items, seed + 1, n_products) + 1,
+            inventory_item_id=pl.int_range(1, n_items + 1),
+            status=_choice(STATUSES, n_items, seed + 2),
+            created_at=_timestamp(n_items, seed + 3, start, days),
+            sale_price=_money(n_items, seed + 4, 200),
+        ).with_columns(
+            shipped_at=pl.col("created_at") + pl.duration(days=1),
+            delivered_at=pl.col("created_at") + pl.duration(days=4),
+            returned_at=pl.lit(None, dtype=pl.Datetime("us")),
+        ),
+        "inventory_items": pl.select(
+            id=pl.int_range(1, n_items + 1),
+            product_id=_random(n_items, seed, n_products) + 1,
+            created_at=_timestamp(n_items, seed + 1, start, days),
+            cost=_money(n_items, seed + 2, 100),
+            product_category=_choice(CATEGORIES, n_items, seed + 3),
+            product_name=pl.format("Produto {}", _random(n_items, seed, n_products)),
+            product_brand=pl.format("Marca {}", _random(n_items, seed + 4, 50)),
+            product_retail_price=_money(n_items, seed + 5, 200),
+            product_department=_choice(DEPARTMENTS, n_items, seed + 6),
+            product_sku=_hex_id(pl.int_range(n_items), seed + 7),
+            product_distribution_center_id=_random(n_items, seed + 8, 10) + 1,
+        ).with_columns(sold_at=pl.col("created_at") + pl.duration(days=7)),
+        "events": pl.select(
+            id=pl.int_range(1, n_events + 1),
+            user_id=_random(n_events, seed, n_users) + 1,
+            sequence_number=_random(n_events, seed + 1, 10) + 1,
+            session_id=_hex_id(pl.int_range(n_events) // 5, seed),
+            created_at=_timestamp(n_events, seed + 2, start, days),
+            ip_address=pl.format(
+                "10.0.{}.{}",
+                _random(n_events, seed + 3, 256),
+                _random(n_events, seed + 4, 256),
+            ),
+            city=pl.format("Cidade {}", _random(n_events, seed + 5, 300)),
+            state=pl.format("Estado {}", _random(n_events, seed + 6, 27)),
+            postal_code=_random(n_events, seed + 7, 99_999).cast(pl.String),
+            browser=_choice(BROWSERS, n_events, seed + 8),
+            traffic_source=_choice(TRAFFIC_SOURCES, n_events, seed + 9),
+            uri=pl.format("/product/{}", _random(n_events, seed + 10, n_products)),
+            event_type=_choice(EVENT_TYPES, n_events, seed + 11),
+        ),
+    }
+
+    output_dir = Path(data_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    for table_name, frame in tables.items():
+        frame.write_parquet(output_dir / f"{table_name}.parquet", compression="zstd")
+        logger.info(f"Tabela sintética '{table_name}': {frame.height} linhas.")
+
+    return {table_name: frame.height for table_name, frame in tables.items()}
+
+
+def main(argv: list[str] | None = None):
+    """
+    Gera a fonte local para benchmarks da ingestão.
+
+    Ex: python -m thelook_ecommerce_analysis.pipelines.data_ingestion.synthetic
+    data/00_local_source --orders 1000000
+    """
+    parser = argparse.ArgumentParser(description="Gera a fonte local da ingestão.")
+    parser.add_argument("data_dir", nargs="?", default="data/00_local_source")
+    parser.add_argument("--orders", type=int, default=10_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    generate_local_source(
+        args.data_dir, n_orders=args.orders, days=args.days, seed=args.seed
+    )
+
+
+if __name__ == "__main__":
+    main()
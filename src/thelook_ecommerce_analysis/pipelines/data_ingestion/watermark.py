@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+from typing import Any
+
+from thelook_ecommerce_analysis.utils.get_credentials import get_credentials
+from thelook_ecommerce_analysis.utils.postgres_pool import POSTGRES_POOLS
+
+logger = logging.getLogger(__name__)
+
+WATERMARK_TABLE = "ingestion_watermarks"
+
+
+class WatermarkStore(ABC):
+    """Armazena o maior valor de `date_col` já carregado por tabela."""
+
+    @abstractmethod
+    def get(self, table_name: str) -> str | None:
+        """Retorna o watermark (ISO 8601) da tabela ou None se nunca foi carregada."""
+
+    @abstractmethod
+    def set(self, table_name: str, value: str) -> None:
+        """Registra o watermark (ISO 8601) da tabela."""
+
+
+class JsonWatermarkStore(WatermarkStore):
+    """Watermarks em um arquivo JSON local `{tabela: watermark}`."""
+
+    def __init__(self, filepath: str):
+        self._filepath = Path(filepath)
+
+    def _read(self) -> dict[str, str]:
+        if not self._filepath.exists():
+            return {}
+        return json.loads(self._filepath.read_text(encoding="utf8"))
+
+    def get(self, table_name: str) -> str | None:
+        return self._read().get(table_name)
+
+    def set(self, table_name: str, value: str) -> None:
+        data = self._read()
+        data[table_name] = value
+
+        # Escrita atômica para não corromper o arquivo em caso de falha
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._filepath.with_name(f".{self._filepath.name}.tmp")
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf8")
+        os.replace(tmp_path, self._filepath)
+
+
+class SqliteWatermarkStore(WatermarkStore):
+    """Watermarks em um banco SQLite local (stand-in do Postgres)."""
+
+    def __init__(self, filepath: str):
+        self._filepath = Path(filepath)
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} "
+                "(table_name TEXT PRIMARY KEY, watermark TEXT NOT NULL, "
+                "updated_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Abre uma conexão, faz commit ao final do bloco e a fecha."""
+        with closing(sqlite3.connect(self._filepath)) as conn, conn:
+            yield conn
+
+    def get(self, table_name: str) -> str | None:
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT watermark FROM {WATERMARK_TABLE} WHERE table_name = ?",  # noqa: S608
+                (table_name,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, table_name: str, value: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                f"INSERT INTO {WATERMARK_TABLE} (table_name, watermark) VALUES (?, ?) "  # noqa: S608
+                "ON CONFLICT(table_name) DO UPDATE SET "
+                "watermark = excluded.watermark, updated_at = CURRENT_TIMESTAMP",
+                (table_name, value),
+            )
+
+
+class PostgresWatermarkStore(WatermarkStore):
+    """
+    Watermarks em uma tabela do PostgreSQL (credenciais do credentials.yml).
+
+    As conexões vêm do pool compartilhado do processo (`POSTGRES_POOLS`), o mesmo do
+    dataset `postgres_pool`, em vez de uma conexão nova por leitura/gravação.
+    """
+
+    def __init__(self, credentials: dict[str, Any]):
+        self._pool = POSTGRES_POOLS.get_pool(credentials)
+
+        with self._pool.connection() as conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {WATERMARK_TABLE} "
+                "(table_name TEXT PRIMARY KEY, watermark TEXT NOT NULL, "
+                "updated_at TIMESTAMPTZ DEFAULT now())"
+            )
+
+    def get(self, table_name: str) -> str | None:
+        with self._pool.connection() as conn:
+            row = conn.execute(
+                f"SELECT watermark FROM {WATERMARK_TABLE} WHERE table_name = %s",  # noqa: S608
+                (table_name,),
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, table_name: str, value: str) -> None:
+        with self._pool.connection() as conn:
+            conn.execute(
+                f"INSERT INTO {WATERMARK_TABLE} (table_name, watermark) VALUES (%s, %s) "  # noqa: S608
+                "ON CONFLICT (table_name) DO UPDATE SET "
+                "watermark = EXCLUDED.watermark, updated_at = now()",
+                (table_name, value),
+            )
+
+
+def create_watermark_store(config: dict[str, Any]) -> WatermarkStore:
+    """
+    Cria o WatermarkStore a partir de 'ingestion.watermark' do parameters.yml.
+
+    Args:
+        config (dict[str, Any]): `backend` ('json', 'sqlite' ou 'postgres'), `filepath`
+            (backends locais) e `credentials` (chave do credentials.yml para o postgres).
+
+    Returns:
+        WatermarkStore: Store configurado.
+    """
+    backend = config.get("backend", "sqlite")
+
+    if backend == "json":
+        return JsonWatermarkStore(config["filepath"])
+
+    if backend == "sqlite":
+        return SqliteWatermarkStore(config["filepath"])
+
+    if backend == "postgres":
+        return PostgresWatermarkStore(
+            get_credentials(config.get("credentials", "postgres"))
+        )
+
+    raise ValueError(
+        f"Backend de watermark desconhecido: '{backend}'. Use 'json', 'sqlite' ou 'postgres'."
+    )
@@ -0,0 +1,9 @@
+"""
+Pipeline 'data_loading': carga do Intermediate no PostgreSQL via COPY binário.
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
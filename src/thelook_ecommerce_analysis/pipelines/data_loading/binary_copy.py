@@ -0,0 +1,353 @@
+import logging
+import re
+import struct
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from thelook_ecommerce_analysis.pipelines.data_processing.geo import (
+    POINT_DTYPE,
+    parse_wkt_point,
+    to_wkb,
+)
+
+logger = logging.getLogger(__name__)
+
+# Tipos Polars sem parâmetros e o equivalente no Postgres (sem sinal: tipo seguinte;
+# UInt64 passa do bigint e vira numeric com os 20 dígitos de 2^64 - 1)
+POSTGRES_TYPES = {
+    pl.Int8: "smallint",
+    pl.UInt8: "smallint",
+    pl.Int16: "smallint",
+    pl.UInt16: "integer",
+    pl.Int32: "integer",
+    pl.UInt32: "bigint",
+    pl.Int64: "bigint",
+    pl.UInt64: "numeric(20, 0)",
+    pl.Float32: "real",
+    pl.Float64: "double precision",
+    pl.Boolean: "boolean",
+    pl.String: "text",
+    pl.Categorical: "text",
+    pl.Enum: "text",
+    pl.Date: "date",
+    pl.Binary: "bytea",
+}
+
+# Cabeçalho (assinatura, flags e extensão) e final do formato binário do COPY
+COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_TRAILER = struct.pack(">h", -1)
+NULL_FIELD = struct.pack(">i", -1)
+
+# Épocas do Postgres (2000-01-01) em relação à do Arrow (1970-01-01)
+PG_EPOCH_DAYS = 10_957
+PG_EPOCH_MICROSECONDS = PG_EPOCH_DAYS * 86_400 * 1_000_000
+
+# Tipos inteiros/flutuantes do Postgres: largura (bytes) e tipo Polars de origem
+FIXED_WIDTH_TYPES = {
+    "smallint": (2, pl.Int16),
+    "integer": (4, pl.Int32),
+    "bigint": (8, pl.Int64),
+    "real": (4, pl.Float32),
+    "double precision": (8, pl.Float64),
+}
+
+# Dígitos base 10000 da parte inteira de um `numeric` (10^18 < 10000^5)
+NUMERIC_INTEGER_GROUPS = 5
+NUMERIC_NEGATIVE = 0x4000
+
+UUID_WIDTH = 16
+
+# `nome(argumentos)` de um tipo do Postgres (ex: 'numeric(10, 2)')
+PG_TYPE_PATTERN = re.compile(r"^\s*([a-z0-9 ]+?)\s*(?:\((.*)\))?\s*$")
+
+# Nomes equivalentes (ex: saída do `format_type` para uma tabela já existente)
+PG_TYPE_ALIASES = {
+    "int2": "smallint",
+    "int4": "integer",
+    "int": "integer",
+    "int8": "bigint",
+    "float4": "real",
+    "float8": "double precision",
+    "bool": "boolean",
+    "decimal": "numeric",
+    "timestamp without time zone": "timestamp",
+    "timestamp with time zone": "timestamptz",
+}
+
+# Inteiro sem sinal de cada largura (os bytes do Arrow são reinterpretados por ele)
+_UNSIGNED = {1: pa.uint8(), 2: pa.uint16(), 4: pa.uint32(), 8: pa.uint64()}
+_POLARS_UNSIGNED = {1: pl.UInt8, 2: pl.UInt16, 4: pl.UInt32, 8: pl.UInt64}
+
+
+def postgres_type(dtype: pl.DataType, money_scale: int | None = None) -> str:
+    """
+    Tipo do Postgres equivalente a um tipo Polars.
+
+    Inteiros sem sinal usam o tipo com sinal seguinte (UInt32 -> bigint, UInt64 ->
+    numeric(20, 0)), já que o Postgres não tem inteiros sem sinal. Colunas `Money`
+    (Int64 escalado) viram `numeric(18, S)`, e colunas `Point` viram
+    `geography(Point, 4326)`.
+
+    Args:
+        dtype (pl.DataType): Tipo da coluna no Intermediate.
+        money_scale (int | None): Escala, se a coluna for `Money`.
+
+    Returns:
+        str: Tipo do Postgres.
+
+    Raises:
+        ValueError: Tipo sem equivalente no Postgres.
+    """
+    if money_scale is not None:
+        return f"numeric(18, {money_scale})"
+    if dtype == POINT_DTYPE:
+        return "geography(Point, 4326)"
+    # Tipos do schema sem parâmetros ('Datetime', 'Decimal') chegam como a classe
+    if dtype.base_type() == pl.Datetime:
+        return "timestamptz" if getattr(dtype, "time_zone", None) else "timestamp"
+    if dtype.base_type() == pl.Decimal:
+        precision = getattr(dtype, "precision", None)
+        return f"numeric({precision}, {dtype.scale})" if precision else "numeric"
+
+    pg_type = POSTGRES_TYPES.get(dtype.base_type())
+    if pg_type is not None:
+        return pg_type
+
+    msg = f"Tipo '{dtype}' sem equivalente no Postgres."
+    logger.error(msg)
+    raise ValueError(msg)
+
+
+def split_type(pg_type: str) -> tuple[str, list[str]]:
+    """Nome base e argumentos de um tipo do Postgres ('numeric(10, 2)' -> numeric, [10, 2])."""
+    match = PG_TYPE_PATTERN.match(pg_type.lower())
+    if match is None:
+        msg = f"Tipo do Postgres inválido: '{pg_type}'."
+        logger.error(msg)
+        raise ValueError(msg)
+    args = [arg.strip() for arg in (match.group(2) or "").split(",") if arg.strip()]
+    return PG_TYPE_ALIASES.get(match.group(1), match.group(1)), args
+
+
+def _byteswap(values: pl.Series, width: int) -> pa.Array:
+    """Bytes big-endian (ordem de rede) de inteiros sem sinal de `width` bytes."""
+    unsigned = values.cast(pl.UInt64)
+    swapped = sum(
+        (unsigned // 256**i % 256) * 256 ** (width - 1 - i) for i in range(width)
+    )
+    return swapped.cast(_POLARS_UNSIGNED[width]).to_arrow()
+
+
+def _as_bytes(values: pa.Array, width: int) -> pa.Array:
+    """Reinterpreta os buffers de um array numérico como binários de `width` bytes."""
+    fixed = pa.Array.from_buffers(
+        pa.binary(width), len(values), [None, values.buffers()[1]], offset=values.offset
+    )
+    return fixed.cast(pa.large_binary())
+
+
+def _big_endian(values: pl.Series, width: int) -> pa.Array:
+    """Bytes big-endian de uma coluna numérica de `width` bytes (nulos viram zero)."""
+    native = values.fill_null(0).rechunk().to_arrow()
+    unsigned = pa.Array.from_buffers(
+        _UNSIGNED[width], len(native), [None, native.buffers()[1]], offset=native.offset
+    )
+    return _as_bytes(_byteswap(pl.Series(unsigned), width), width)
+
+
+def _prefixed(data: pa.Array, width: int | None = None) -> pa.Array:
+    """Campo do COPY: tamanho (int32) seguido dos bytes (tamanho fixo ou por linha)."""
+    if width is not None:
+        prefix = pa.scalar(struct.pack(">i", width), pa.large_binary())
+        return pc.binary_join_element_wise(
+            prefix, data, pa.scalar(b"", pa.large_binary())
+        )
+
+    lengths = pl.Series(pc.binary_length(data)).fill_null(0).cast(pl.UInt32)
+    return pc.binary_join_element_wise(
+        _as_bytes(_byteswap(lengths, 4), 4), data, pa.scalar(b"", pa.large_binary())
+    )
+
+
+def _numeric_field(unscaled: pl.Series, scale: int) -> pa.Array:
+    """
+    Campo `numeric` a partir do valor inteiro escalado (ex: 1234 com escala 2 = 12.34).
+
+    O `numeric` binário é uma lista de dígitos base 10000 (peso, sinal e escala no
+    cabeçalho). Todas as linhas usam a mesma quantidade de dígitos: o Postgres descarta os
+    zeros à esquerda e à direita na leitura.
+    """
+    fraction_groups = -(-scale // 4)
+    groups = NUMERIC_INTEGER_GROUPS + fraction_groups
+    absolute = unscaled.abs().cast(pl.UInt64)
+    integer = absolute // 10**scale
+    fraction = absolute % 10**scale
+
+    digits = [
+        integer // 10000 ** (NUMERIC_INTEGER_GROUPS - 1 - k) % 10000
+        for k in range(NUMERIC_INTEGER_GROUPS)
+    ]
+    for j in range(fraction_groups):
+        remaining = scale - 4 * (j + 1)
+        if remaining >= 0:
+            digits.append(fraction // 10**remaining % 10000)
+        else:
+            digits.append(fraction % 10 ** (scale - 4 * j) * 10**-remaining)
+
+    header = pa.scalar(
+        struct.pack(">ihh", 8 + 2 * groups, groups, NUMERIC_INTEGER_GROUPS - 1),
+        pa.large_binary(),
+    )
+    sign = pc.if_else(
+        (unscaled < 0).fill_null(value=False).to_arrow(),
+        pa.scalar(struct.pack(">H", NUMERIC_NEGATIVE), pa.large_binary()),
+        pa.scalar(b"\x00\x00", pa.large_binary()),
+    )
+    dscale = pa.scalar(struct.pack(">h", scale), pa.large_binary())
+    return pc.binary_join_element_wise(
+        header,
+        sign,
+        dscale,
+        *(_big_endian(digit.cast(pl.UInt16), 2) for digit in digits),
+        pa.scalar(b"", pa.large_binary()),
+    )
+
+
+def _unscaled(
+    column: pl.Series, args: list[str], money_scale: int | None
+) -> tuple[pl.Series, int]:
+    """Valor inteiro escalado e escala de uma coluna `numeric` (Decimal, Money ou outra)."""
+    if isinstance(column.dtype, pl.Decimal):
+        return column.to_physical().cast(pl.Int64), column.dtype.scale
+    if money_scale is not None:
+        return column.cast(pl.Int64), money_scale
+    scale = int(args[1]) if len(args) > 1 else 0
+    if column.dtype.is_integer() and scale == 0:
+        # Sem escala, o próprio inteiro (inclusive UInt64 acima do Int64)
+        return column, 0
+    return column.cast(pl.Decimal(18, scale)).to_physical().cast(pl.Int64), scale
+
+
+def _uuid_field(column: pl.Series) -> pa.Array:
+    """Campo `uuid` (16 bytes) a partir do texto hexadecimal, com ou sem hífens."""
+    raw = column.cast(pl.String).str.replace_all("-", "", literal=True)
+    decoded = raw.str.decode("hex", strict=False)
+    invalid = column.is_not_null() & (decoded.bin.size() != UUID_WIDTH).fill_null(
+        value=True
+    )
+    if invalid.any():
+        msg = (
+            f"Coluna '{column.name}' com valor(es) que não são UUID, ex: "
+            f"'{column.filter(invalid)[0]}'."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+    return _prefixed(_to_large_binary(decoded), UUID_WIDTH)
+
+
+def _point_field(column: pl.Series) -> pa.Array:
+    """Campo de um ponto em WKB, a partir de uma coluna `Point` ou WKT."""
+    points = column.to_frame()
+    if column.dtype != POINT_DTYPE:
+        points = points.select(parse_wkt_point(column.name))
+    return _prefixed(_to_large_binary(points.select(to_wkb(column.name)).to_series()))
+
+
+def _cast_in_range(column: pl.Series, dtype: pl.DataType, pg_type: str) -> pl.Series:
+    """Converte para o tipo de largura fixa, com erro (em vez de truncar) fora da faixa."""
+    values = column.cast(dtype, strict=False)
+    overflow = values.is_null() & column.is_not_null()
+    if overflow.any():
+        msg = (
+            f"Coluna '{column.name}' com valor(es) fora da faixa de '{pg_type}', ex: "
+            f"'{column.filter(overflow)[0]}'."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+    return values
+
+
+def _encode_column(
+    column: pl.Series, pg_type: str, money_scale: int | None = None
+) -> pa.Array:
+    """Campos binários do COPY (tamanho + valor) de uma coluna, sem laço por linha."""
+    name, args = split_type(pg_type)
+
+    if name in FIXED_WIDTH_TYPES:
+        width, dtype = FIXED_WIDTH_TYPES[name]
+        field = _prefixed(
+            _big_endian(_cast_in_range(column, dtype, name), width), width
+        )
+    elif name == "boolean":
+        field = _prefixed(_big_endian(column.cast(pl.UInt8), 1), 1)
+    elif name in ("timestamp", "timestamptz"):
+        micros = column.dt.cast_time_unit("us").to_physical() - PG_EPOCH_MICROSECONDS
+        field = _prefixed(_big_endian(micros, 8), 8)
+    elif name == "date":
+        days = column.to_physical().cast(pl.Int32) - PG_EPOCH_DAYS
+        field = _prefixed(_big_endian(days, 4), 4)
+    elif name == "numeric":
+        field = _numeric_field(*_unscaled(column, args, money_scale))
+    elif name == "uuid":
+        field = _uuid_field(column)
+    elif name in ("geography", "geometry") or (
+        name == "bytea" and column.dtype == POINT_DTYPE
+    ):
+        # Pontos em WKB (também em colunas bytea, ex: banco sem PostGIS)
+        field = _point_field(column)
+    elif name == "bytea":
+        field = _prefixed(_to_large_binary(column))
+    else:
+        # Texto e demais tipos com representação textual (text, varchar, jsonb...)
+        field = _prefixed(_to_large_binary(column.cast(pl.String)))
+
+    return pc.if_else(
+        column.is_not_null().to_arrow(),
+        field,
+        pa.scalar(NULL_FIELD, pa.large_binary()),
+    )
+
+
+def _to_large_binary(column: pl.Series) -> pa.Array:
+    """Bytes de uma coluna String/Binary como `large_binary` do Arrow."""
+    return column.rechunk().to_arrow().cast(pa.large_binary())
+
+
+def encode_copy_rows(
+    df: pl.DataFrame,
+    columns: dict[str, str],
+    money_scales: dict[str, int] | None = None,
+) -> memoryview:
+    """
+    Codifica as linhas de um lote no formato binário do `COPY ... FROM STDIN`.
+
+    Cada coluna é convertida de uma vez sobre os buffers Arrow (inteiros e datas em
+    big-endian, textos com o tamanho à frente, `numeric` em dígitos base 10000), e as
+    linhas são montadas com um único `binary_join_element_wise`. O resultado é o buffer
+    contíguo de todas as linhas, sem objetos Python por valor.
+
+    Args:
+        df (pl.DataFrame): Lote a gravar.
+        columns (dict[str, str]): Tipo do Postgres de cada coluna (ordem do COPY).
+        money_scales (dict[str, int] | None): Escala das colunas `Money` (Int64).
+
+    Returns:
+        memoryview: Bytes das linhas (sem o cabeçalho e o final do COPY).
+    """
+    money_scales = money_scales or {}
+    fields = [
+        _encode_column(df[col], pg_type, money_scales.get(col))
+        for col, pg_type in columns.items()
+    ]
+    count = pa.scalar(struct.pack(">h", len(fields)), pa.large_binary())
+    rows = pc.binary_join_element_wise(
+        count, *fields, pa.scalar(b"", pa.large_binary())
+    )
+
+    offsets = pa.Array.from_buffers(
+        pa.int64(), len(rows) + 1, [None, rows.buffers()[1]], offset=rows.offset
+    )
+    start, end = offsets[0].as_py(), offsets[-1].as_py()
+    return memoryview(rows.buffers()[2])[start:end]
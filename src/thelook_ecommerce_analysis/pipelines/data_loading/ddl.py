@@ -0,0 +1,247 @@
+import logging
+from dataclasses import dataclass
+from datetime import date
+from typing import Any
+
+from psycopg import sql
+
+from thelook_ecommerce_analysis.pipelines.data_loading.binary_copy import (
+    postgres_type,
+    split_type,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.schema_plan import (
+    SCHEMA_PLANS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Colunas com índice B-tree para os joins (chaves estrangeiras: user_id, order_id...)
+FOREIGN_KEY_SUFFIX = "_id"
+
+# Tipos do Postgres com índice BRIN (valores correlacionados com a ordem de inserção)
+BRIN_TYPES = ("timestamp", "timestamptz", "date")
+
+# Tipos espaciais (PostGIS), com índice GiST
+SPATIAL_TYPES = ("geography", "geometry")
+
+
+@dataclass(frozen=True)
+class TableDDL:
+    """
+    DDL de uma tabela, em duas etapas.
+
+    `create` cria a tabela (e as partições), `indexes` cria a chave primária e os índices.
+    Na carga por substituição, os índices são criados depois do COPY: construídos de uma
+    vez, são mais rápidos que mantidos linha a linha.
+    """
+
+    create: tuple[str, ...]
+    indexes: tuple[str, ...]
+    primary_key: tuple[str, ...]
+    partitioned: bool
+
+    @property
+    def statements(self) -> tuple[str, ...]:
+        return self.create + self.indexes
+
+
+def schema_columns(
+    target_schema: dict[str, str],
+    table_name: str,
+    column_types: dict[str, str] | None = None,
+) -> dict[str, str]:
+    """
+    Tipo do Postgres de cada coluna do schema 'processing.schemas.<tabela>'.
+
+    Args:
+        target_schema (dict[str, str]): Schema da tabela.
+        table_name (str): Nome da tabela.
+        column_types (dict[str, str] | None): Tipos do Postgres por coluna (ex: `sku: uuid`).
+
+    Returns:
+        dict[str, str]: Tipos do Postgres, na ordem do schema.
+    """
+    column_types = column_types or {}
+    plan = SCHEMA_PLANS.get(target_schema, table_name)
+    return {
+        col: column_types.get(col) or postgres_type(dtype, plan.money_scales.get(col))
+        for col, dtype in plan.dtypes.items()
+    }
+
+
+def _months(start: date, end: date) -> list[date]:
+    """Primeiro dia de cada mês de `start` até o mês de `end` (inclusive)."""
+    months = []
+    current = start.replace(day=1)
+    while current <= end:
+        months.append(current)
+        current = date(current.year + current.month // 12, current.month % 12 + 1, 1)
+    return months
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _partitions(
+    table: sql.Identifier,
+    table_name: str,
+    schema_name: str,
+    config: dict[str, Any],
+    today: date,
+) -> list[sql.Composed]:
+    """Partições mensais de `partition_start` até `partition_months_ahead` e a DEFAULT."""
+    start = date.fromisoformat(str(config.get("partition_start", today.replace(day=1))))
+    end = _add_months(today, config.get("partition_months_ahead", 12))
+
+    statements = []
+    for month in _months(start, end):
+        statements.append(
+            sql.SQL(
+                "CREATE TABLE {} PARTITION OF {} FOR VALUES FROM ({}) TO ({})"
+            ).format(
+                sql.Identifier(schema_name, f"{table_name}_y{month:%Y}m{month:%m}"),
+                table,
+                sql.Literal(month.isoformat()),
+                sql.Literal(_add_months(month, 1).isoformat()),
+            )
+        )
+    # Linhas fora das partições mensais (ex: anteriores a `partition_start`)
+    statements.append(
+        sql.SQL("CREATE TABLE {} PARTITION OF {} DEFAULT").format(
+            sql.Identifier(schema_name, f"{table_name}_default"), table
+        )
+    )
+    return statements
+
+
+def _index(table: sql.Identifier, name: str, column: str, method: str) -> sql.Composed:
+    return sql.SQL("CREATE INDEX {} ON {} USING {} ({})").format(
+        sql.Identifier(name), table, sql.SQL(method), sql.Identifier(column)
+    )
+
+
+def table_ddl(  # noqa: PLR0913
+    table_name: str,
+    columns: dict[str, str],
+    config: dict[str, Any] | None = None,
+    primary_key: str = "id",
+    schema_name: str = "public",
+    today: date | None = None,
+) -> TableDDL:
+    """
+    DDL de uma tabela: particionamento, chave primária e índices.
+
+    * Tabelas de `partitioned_tables` são particionadas por faixa mensal de
+      `partition_column` (padrão `created_at`), com uma partição DEFAULT. A chave
+      primária inclui a coluna de partição, exigência do Postgres.
+    * B-tree nas colunas `*_id` (joins com as dimensões), BRIN nas datas (pequeno e
+      eficiente em colunas correlacionadas com a ordem de inserção) e GiST nas colunas
+      espaciais.
+
+    Args:
+        table_name (str): Nome da tabela.
+        columns (dict[str, str]): Tipo do Postgres de cada coluna (`schema_columns`).
+        config (dict[str, Any] | None): 'loading.ddl' (`partitioned_tables`,
+            `partition_column`, `partition_start` e `partition_months_ahead`).
+        primary_key (str): Chave primária ('processing.primary_keys', padrão 'id').
+        schema_name (str): Schema do Postgres.
+        today (date | None): Data de referência das partições futuras (padrão: hoje).
+
+    Returns:
+        TableDDL: Comandos de criação e de índices.
+    """
+    config = config or {}
+    today = today or date.today()
+    table = sql.Identifier(schema_name, table_name)
+
+    partition_column = config.get("partition_column", "created_at")
+    partitioned = (
+        table_name in config.get("partitioned_tables", [])
+        and partition_column in columns
+    )
+
+    key = [primary_key] if primary_key in columns else []
+    if partitioned and key:
+        key.append(partition_column)
+
+    definitions = [
+        sql.SQL("{} {}{}").format(
+            sql.Identifier(col),
+            sql.SQL(pg_type),
+            sql.SQL(" NOT NULL" if col in key else ""),
+        )
+        for col, pg_type in columns.items()
+    ]
+    create = [
+        sql.SQL("CREATE TABLE {} ({}){}").format(
+            table,
+            sql.SQL(", ").join(definitions),
+            sql.SQL(" PARTITION BY RANGE ({})").format(sql.Identifier(partition_column))
+            if partitioned
+            else sql.SQL(""),
+        )
+    ]
+    if partitioned:
+        create += _partitions(table, table_name, schema_name, config, today)
+
+    indexes = []
+    if key:
+        indexes.append(
+            sql.SQL("ALTER TABLE {} ADD PRIMARY KEY ({})").format(
+                table, sql.SQL(", ").join(map(sql.Identifier, key))
+            )
+        )
+    for col, pg_type in columns.items():
+        name, _ = split_type(pg_type)
+        if col.endswith(FOREIGN_KEY_SUFFIX) and col not in key:
+            indexes.append(_index(table, f"{table_name}_{col}_idx", col, "btree"))
+        elif name in BRIN_TYPES:
+            indexes.append(_index(table, f"{table_name}_{col}_brin", col, "brin"))
+        elif name in SPATIAL_TYPES:
+            indexes.append(_index(table, f"{table_name}_{col}_gist", col, "gist"))
+
+    return TableDDL(
+        tuple(statement.as_string() for statement in create),
+        tuple(statement.as_string() for statement in indexes),
+        tuple(key),
+        partitioned,
+    )
+
+
+def generate_ddl(
+    config: dict[str, Any],
+    schemas: dict[str, dict[str, str]],
+    primary_keys: dict[str, str],
+) -> str:
+    """
+    Script SQL com as tabelas de 'processing.schemas' no Postgres.
+
+    Os tipos vêm do schema (os mesmos usados pela carga na criação das tabelas), com os
+    ajustes de 'loading.column_types' (ex: `session_id`/`sku` como `uuid`).
+
+    Args:
+        config (dict[str, Any]): 'loading' (`schema`, `column_types` e `ddl`).
+        schemas (dict[str, dict[str, str]]): 'processing.schemas'.
+        primary_keys (dict[str, str]): 'processing.primary_keys' (padrão: 'id').
+
+    Returns:
+        str: Comandos separados por `;`, um por linha.
+    """
+    column_types = config.get("column_types", {})
+    statements = []
+    for table_name, target_schema in schemas.items():
+        ddl = table_ddl(
+            table_name,
+            schema_columns(target_schema, table_name, column_types.get(table_name)),
+            config.get("ddl", {}),
+            primary_keys.get(table_name, "id"),
+            config.get("schema", "public"),
+        )
+        statements.append(f"-- {table_name}")
+        statements += [f"{statement};" for statement in ddl.statements]
+        statements.append("")
+
+    logger.info(f"DDL gerado para {len(schemas)} tabela(s).")
+    return "\n".join(statements)
@@ -0,0 +1,79 @@
+import logging
+from pathlib import Path
+
+import psycopg
+from psycopg import sql
+from psycopg.types.json import Jsonb
+
+logger = logging.getLogger(__name__)
+
+# Arquivos do Intermediate já carregados, por tabela (no próprio Postgres)
+LOAD_STATE_TABLE = "_load_state"
+
+
+def intermediate_files(table_dir: str | Path) -> dict[str, list[int]]:
+    """Arquivos parquet do Intermediate da tabela (em ordem de nome), com tamanho e mtime."""
+    table_dir = Path(table_dir)
+    files = {}
+    for path in sorted(table_dir.glob("**/*.parquet")):
+        stat = path.stat()
+        files[path.relative_to(table_dir).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+    return files
+
+
+def changed_files(
+    files: dict[str, list[int]], loaded: dict[str, list[int]]
+) -> list[str]:
+    """Arquivos novos ou reescritos desde a última carga."""
+    return [name for name, stat in files.items() if loaded.get(name) != stat]
+
+
+def _state_table(schema_name: str) -> sql.Identifier:
+    return sql.Identifier(schema_name, LOAD_STATE_TABLE)
+
+
+def create_load_state(conn: psycopg.Connection, schema_name: str) -> None:
+    """Cria a tabela de registro (uma vez por carga, antes das tabelas em paralelo)."""
+    with conn.transaction():
+        conn.execute(
+            sql.SQL(
+                "CREATE TABLE IF NOT EXISTS {} (table_name text PRIMARY KEY, "
+                "files jsonb NOT NULL, loaded_at timestamptz NOT NULL DEFAULT now())"
+            ).format(_state_table(schema_name))
+        )
+
+
+def read_load_state(
+    conn: psycopg.Connection, schema_name: str, table_name: str
+) -> dict[str, list[int]]:
+    """Arquivos registrados na última carga da tabela (vazio se nunca carregada)."""
+    row = conn.execute(
+        sql.SQL("SELECT files FROM {} WHERE table_name = %s").format(
+            _state_table(schema_name)
+        ),
+        (table_name,),
+    ).fetchone()
+    return row[0] if row else {}
+
+
+def write_load_state(
+    conn: psycopg.Connection,
+    schema_name: str,
+    table_name: str,
+    files: dict[str, list[int]],
+) -> None:
+    """
+    Registra os arquivos carregados, na mesma transação da última gravação da tabela.
+
+    Se a carga falhar antes, o registro anterior é mantido e os arquivos são carregados
+    de novo na próxima execução (o upsert é idempotente).
+    """
+    conn.execute(
+        sql.SQL(
+            "INSERT INTO {} (table_name, files) VALUES (%s, %s) "
+            "ON CONFLICT (table_name) DO UPDATE "
+            "SET files = EXCLUDED.files, loaded_at = now()"
+        ).format(_state_table(schema_name)),
+        (table_name, Jsonb(files)),
+    )
+    logger.debug(f"Carga '{table_name}': {len(files)} arquivo(s) registrados.")
@@ -0,0 +1,601 @@
+import logging
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+import psycopg
+from psycopg import sql
+
+from thelook_ecommerce_analysis.pipelines.data_loading.binary_copy import (
+    COPY_HEADER,
+    COPY_TRAILER,
+    encode_copy_rows,
+    postgres_type,
+)
+from thelook_ecommerce_analysis.pipelines.data_loading.ddl import TableDDL, table_ddl
+from thelook_ecommerce_analysis.pipelines.data_loading.load_state import (
+    changed_files,
+    create_load_state,
+    intermediate_files,
+    read_load_state,
+    write_load_state,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.money import money_scale
+from thelook_ecommerce_analysis.utils.postgres_pool import PostgresPool
+
+logger = logging.getLogger(__name__)
+
+REPORT_SCHEMA = {
+    "table": pl.String,
+    "mode": pl.String,
+    "rows": pl.Int64,
+    "inserted": pl.Int64,
+    "updated": pl.Int64,
+    "unchanged": pl.Int64,
+    "bytes": pl.Int64,
+    "seconds": pl.Float64,
+    "rows_per_second": pl.Float64,
+    "mb_per_second": pl.Float64,
+}
+
+# Tabela particionada no Postgres (pg_class.relkind): não aceita COPY FREEZE
+PARTITIONED_RELKIND = "p"
+
+# Tabela UNLOGGED que recebe o delta antes do upsert (no mesmo schema do Postgres)
+STAGING_TEMPLATE = "_staging_{table}"
+
+LOAD_MODES = ("replace", "upsert")
+
+
+@dataclass(frozen=True)
+class TableInfo:
+    """Tabela existente no Postgres: tipo de relação, tipos das colunas e chave primária."""
+
+    relkind: str
+    columns: dict[str, str]
+    primary_key: tuple[str, ...]
+
+
+def _existing_table(
+    conn: psycopg.Connection, schema_name: str, table_name: str
+) -> TableInfo | None:
+    """Tabela no Postgres (`None` se não existir)."""
+    row = conn.execute(
+        "SELECT c.oid, c.relkind FROM pg_class c "
+        "JOIN pg_namespace n ON n.oid = c.relnamespace "
+        "WHERE n.nspname = %s AND c.relname = %s",
+        (schema_name, table_name),
+    ).fetchone()
+    if row is None:
+        return None
+
+    oid, relkind = row
+    columns = conn.execute(
+        "SELECT attname, format_type(atttypid, atttypmod) FROM pg_attribute "
+        "WHERE attrelid = %s AND attnum > 0 AND NOT attisdropped ORDER BY attnum",
+        (oid,),
+    ).fetchall()
+    primary_key = conn.execute(
+        "SELECT a.attname FROM pg_index i "
+        "JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey) "
+        "WHERE i.indrelid = %s AND i.indisprimary "
+        "ORDER BY array_position(i.indkey::int2[], a.attnum)",
+        (oid,),
+    ).fetchall()
+    return TableInfo(relkind, dict(columns), tuple(col for (col,) in primary_key))
+
+
+def resolve_columns(
+    schema: pl.Schema,
+    target_schema: dict[str, str],
+    table_name: str,
+    column_types: dict[str, str] | None = None,
+    existing: dict[str, str] | None = None,
+) -> tuple[dict[str, str], dict[str, int]]:
+    """
+    Tipo do Postgres de cada coluna carregada e as escalas das colunas `Money`.
+
+    As colunas são as do schema 'processing.schemas.<tabela>' presentes no Intermediate
+    (as chaves Hive `year`/`month` ficam de fora). Com a tabela já existente, valem os
+    tipos dela; senão, o `column_types` da tabela ou o equivalente do tipo Polars.
+
+    Args:
+        schema (pl.Schema): Schema do Intermediate.
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela.
+        column_types (dict[str, str] | None): Tipos do Postgres por coluna
+            ('loading.column_types.<tabela>', ex: `sku: uuid`).
+        existing (dict[str, str] | None): Tipos da tabela já existente no Postgres.
+
+    Returns:
+        tuple[dict[str, str], dict[str, int]]: Tipos do Postgres (ordem do COPY) e
+            escalas das colunas `Money`.
+
+    Raises:
+        ValueError: Coluna ausente na tabela existente ou tipo sem equivalente.
+    """
+    column_types = column_types or {}
+    columns = [col for col in target_schema if col in schema]
+    scales = {
+        col: scale
+        for col in columns
+        if (scale := money_scale(target_schema[col])) is not None
+    }
+
+    if existing:
+        missing = [col for col in columns if col not in existing]
+        if missing:
+            msg = (
+                f"LOAD ERROR: Colunas {missing} de '{table_name}' não existem na "
+                "tabela do Postgres."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+        return {col: existing[col] for col in columns}, scales
+
+    types = {
+        col: column_types.get(col) or postgres_type(schema[col], scales.get(col))
+        for col in columns
+    }
+    return types, scales
+
+
+def _prepare_table(  # noqa: PLR0913
+    conn: psycopg.Connection,
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    schema_name: str,
+    primary_key: str,
+    column_types: dict[str, str] | None,
+    ddl_config: dict[str, Any] | None,
+) -> tuple[TableInfo, dict[str, str], dict[str, int], TableDDL | None]:
+    """
+    Tipos das colunas carregadas, criando a tabela (e as partições) se necessário.
+
+    A chave primária e os índices de uma tabela criada aqui (`TableDDL.indexes`) são
+    criados por quem chama (`_create_indexes`): na substituição, depois do COPY, os
+    índices são construídos de uma vez, mais rápido que mantidos linha a linha.
+
+    Returns:
+        tuple: Tabela, tipos do Postgres e escalas `Money` das colunas (ordem do COPY) e
+            o DDL da tabela, se criada agora.
+    """
+    info = _existing_table(conn, schema_name, table_name)
+    columns, scales = resolve_columns(
+        df.collect_schema(),
+        target_schema,
+        table_name,
+        column_types,
+        info.columns if info else None,
+    )
+    if info is not None:
+        return info, columns, scales, None
+
+    ddl = table_ddl(table_name, columns, ddl_config, primary_key, schema_name)
+    for statement in ddl.create:
+        conn.execute(statement)
+    logger.info(
+        f"Tabela '{schema_name}.{table_name}' criada"
+        f"{f' com {len(ddl.create) - 1} partição(ões)' if ddl.partitioned else ''}."
+    )
+    relkind = PARTITIONED_RELKIND if ddl.partitioned else "r"
+    return TableInfo(relkind, columns, ddl.primary_key), columns, scales, ddl
+
+
+def _create_indexes(conn: psycopg.Connection, ddl: TableDDL | None) -> None:
+    """Chave primária e índices de uma tabela criada pela carga."""
+    if ddl is not None:
+        for statement in ddl.indexes:
+            conn.execute(statement)
+
+
+def _copy_statement(
+    table: sql.Identifier, columns: dict[str, str], freeze: bool
+) -> sql.Composed:
+    options = "FORMAT BINARY, FREEZE" if freeze else "FORMAT BINARY"
+    return sql.SQL("COPY {} ({}) FROM STDIN ({})").format(
+        table, sql.SQL(", ").join(map(sql.Identifier, columns)), sql.SQL(options)
+    )
+
+
+def _copy_batches(  # noqa: PLR0913
+    conn: psycopg.Connection,
+    statement: sql.Composed,
+    batches: Iterator[pl.DataFrame],
+    columns: dict[str, str],
+    scales: dict[str, int],
+    max_rows: int | None = None,
+) -> tuple[int, int, bool]:
+    """
+    Envia lotes em um único COPY binário, até esgotar os lotes ou passar de `max_rows`.
+
+    Returns:
+        tuple[int, int, bool]: Linhas e bytes enviados, e se os lotes acabaram.
+    """
+    rows, size, exhausted = 0, len(COPY_HEADER) + len(COPY_TRAILER), True
+    with conn.cursor().copy(statement) as copy:
+        copy.write(COPY_HEADER)
+        for batch in batches:
+            payload = encode_copy_rows(batch, columns, scales)
+            copy.write(payload)
+            rows += batch.height
+            size += len(payload)
+            if max_rows is not None and rows >= max_rows:
+                exhausted = False
+                break
+        copy.write(COPY_TRAILER)
+    return rows, size, exhausted
+
+
+def _table_report(  # noqa: PLR0913
+    table_name: str,
+    schema_name: str,
+    mode: str,
+    start: float,
+    rows: int,
+    size: int,
+    inserted: int,
+    updated: int,
+) -> dict[str, Any]:
+    seconds = time.perf_counter() - start
+    report = {
+        "table": table_name,
+        "mode": mode,
+        "rows": rows,
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": rows - inserted - updated,
+        "bytes": size,
+        "seconds": seconds,
+        "rows_per_second": rows / seconds if seconds else None,
+        "mb_per_second": size / 1024**2 / seconds if seconds else None,
+    }
+    logger.info(
+        f"Carga '{schema_name}.{table_name}' ({mode}): {rows} linha(s) "
+        f"({inserted} inserida(s), {updated} atualizada(s), "
+        f"{report['unchanged']} sem alteração), {size / 1024**2:.1f} MB em "
+        f"{seconds:.1f}s ({report['rows_per_second']:,.0f} linhas/s, "
+        f"{report['mb_per_second']:.1f} MB/s)."
+    )
+    return report
+
+
+def copy_table(  # noqa: PLR0913
+    conn: psycopg.Connection,
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    primary_key: str = "id",
+    schema_name: str = "public",
+    batch_rows: int = 100_000,
+    column_types: dict[str, str] | None = None,
+    files: dict[str, list[int]] | None = None,
+    ddl_config: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Substitui o conteúdo de uma tabela do Postgres pelo Intermediate, via COPY binário.
+
+    Em uma única transação: cria a tabela (se não existir, com o DDL de `table_ddl`:
+    partições, chave primária e índices, estes depois do COPY), esvazia com `TRUNCATE` e
+    grava os lotes do engine streaming com `COPY ... FROM STDIN (FORMAT BINARY)`. Cada
+    lote é codificado direto dos buffers Arrow (`encode_copy_rows`), sem objetos Python
+    por valor. Como a tabela foi esvaziada na mesma transação, o COPY usa `FREEZE` (as
+    linhas já nascem congeladas, sem o VACUUM posterior), exceto em tabelas particionadas.
+
+    Args:
+        conn (psycopg.Connection): Conexão com o Postgres.
+        df (pl.LazyFrame): Intermediate da tabela.
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela (o mesmo no Postgres).
+        primary_key (str): Chave primária, usada na criação da tabela.
+        schema_name (str): Schema do Postgres.
+        batch_rows (int): Linhas por lote do COPY.
+        column_types (dict[str, str] | None): Tipos do Postgres por coluna, usados na
+            criação da tabela.
+        files (dict[str, list[int]] | None): Arquivos do Intermediate lidos, registrados
+            para que o modo `upsert` carregue depois apenas os alterados.
+        ddl_config (dict[str, Any] | None): 'loading.ddl', usado na criação da tabela.
+
+    Returns:
+        dict[str, Any]: Linhas, bytes e tempo da carga (`REPORT_SCHEMA`).
+    """
+    start = time.perf_counter()
+    table = sql.Identifier(schema_name, table_name)
+
+    with conn.transaction():
+        info, columns, scales, ddl = _prepare_table(
+            conn,
+            df,
+            target_schema,
+            table_name,
+            schema_name,
+            primary_key,
+            column_types,
+            ddl_config,
+        )
+        conn.execute(sql.SQL("TRUNCATE {}").format(table))
+
+        batches = df.select(list(columns)).collect_batches(chunk_size=batch_rows)
+        rows, size, _ = _copy_batches(
+            conn,
+            _copy_statement(table, columns, info.relkind != PARTITIONED_RELKIND),
+            batches,
+            columns,
+            scales,
+        )
+        _create_indexes(conn, ddl)
+        if files is not None:
+            write_load_state(conn, schema_name, table_name, files)
+
+    return _table_report(table_name, schema_name, "replace", start, rows, size, rows, 0)
+
+
+def _upsert_statement(
+    table: sql.Identifier,
+    staging: sql.Identifier,
+    columns: dict[str, str],
+    conflict: tuple[str, ...],
+) -> sql.Composed:
+    """
+    `INSERT ... ON CONFLICT` da staging na tabela, com as contagens de inseridas e
+    atualizadas.
+
+    Linhas idênticas às atuais (`IS DISTINCT FROM` falso) não são reescritas: não geram
+    versões mortas nem WAL e não voltam no `RETURNING`. Uma linha inserida tem `xmax = 0`,
+    uma atualizada tem o `xmax` da transação.
+    """
+    names = sql.SQL(", ").join(map(sql.Identifier, columns))
+    values = [col for col in columns if col not in conflict]
+    if values:
+        action = sql.SQL(
+            "DO UPDATE SET {} WHERE ROW({}) IS DISTINCT FROM ROW({})"
+        ).format(
+            sql.SQL(", ").join(
+                sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(col))
+                for col in values
+            ),
+            sql.SQL(", ").join(sql.Identifier("t", col) for col in values),
+            sql.SQL(", ").join(sql.Identifier("excluded", col) for col in values),
+        )
+    else:
+        action = sql.SQL("DO NOTHING")
+
+    return sql.SQL(
+        "WITH upserted AS ("
+        "INSERT INTO {table} AS t ({names}) SELECT {names} FROM {staging} "
+        "ON CONFLICT ({conflict}) {action} RETURNING (xmax = 0) AS inserted) "
+        "SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) "
+        "FROM upserted"
+    ).format(
+        table=table,
+        names=names,
+        staging=staging,
+        conflict=sql.SQL(", ").join(map(sql.Identifier, conflict)),
+        action=action,
+    )
+
+
+def upsert_table(  # noqa: PLR0913
+    conn: psycopg.Connection,
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    primary_key: str = "id",
+    schema_name: str = "public",
+    batch_rows: int = 100_000,
+    column_types: dict[str, str] | None = None,
+    files: dict[str, list[int]] | None = None,
+    table_dir: str | Path | None = None,
+    commit_rows: int = 1_000_000,
+    ddl_config: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """
+    Incorpora à tabela do Postgres apenas o delta do Intermediate, por upsert em lote.
+
+    O delta são os arquivos do Intermediate novos ou reescritos desde a última carga
+    (`files` comparado ao registro em `_load_state`; no processamento incremental, apenas
+    as partições com chaves novas ou alteradas). Ele é enviado por COPY binário a uma
+    tabela UNLOGGED de staging e incorporado com um único `INSERT ... ON CONFLICT` por
+    intervalo de commit (`commit_rows`), pela chave primária da tabela. Linhas iguais às
+    atuais não são reescritas, e o tempo de carga acompanha o tamanho do delta.
+
+    Args:
+        conn (psycopg.Connection): Conexão com o Postgres.
+        df (pl.LazyFrame): Intermediate da tabela (lido inteiro sem `files`).
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela (o mesmo no Postgres).
+        primary_key (str): Chave primária, usada na criação da tabela. Em tabelas já
+            existentes vale a chave primária delas (ex: `(id, created_at)` particionada).
+        schema_name (str): Schema do Postgres.
+        batch_rows (int): Linhas por lote do COPY.
+        column_types (dict[str, str] | None): Tipos do Postgres por coluna, usados na
+            criação da tabela.
+        files (dict[str, list[int]] | None): Arquivos atuais do Intermediate
+            (`intermediate_files`).
+        table_dir (str | Path | None): Diretório do Intermediate da tabela.
+        commit_rows (int): Linhas do delta por transação (staging + upsert + commit).
+        ddl_config (dict[str, Any] | None): 'loading.ddl', usado na criação da tabela.
+
+    Returns:
+        dict[str, Any]: Linhas do delta, inseridas, atualizadas, sem alteração, bytes e
+            tempo da carga (`REPORT_SCHEMA`).
+
+    Raises:
+        ValueError: Tabela existente sem chave primária.
+    """
+    start = time.perf_counter()
+    table = sql.Identifier(schema_name, table_name)
+    staging = sql.Identifier(schema_name, STAGING_TEMPLATE.format(table=table_name))
+
+    with conn.transaction():
+        info, columns, scales, ddl = _prepare_table(
+            conn,
+            df,
+            target_schema,
+            table_name,
+            schema_name,
+            primary_key,
+            column_types,
+            ddl_config,
+        )
+        _create_indexes(conn, ddl)
+        if not info.primary_key:
+            msg = (
+                f"LOAD ERROR: Upsert em '{schema_name}.{table_name}' exige uma chave "
+                "primária na tabela."
+            )
+            logger.error(msg)
+            raise ValueError(msg)
+
+        # Tabela recém-criada: todos os arquivos entram no delta
+        loaded = {} if ddl else read_load_state(conn, schema_name, table_name)
+        conn.execute(
+            sql.SQL(
+                "CREATE UNLOGGED TABLE IF NOT EXISTS {} (LIKE {} INCLUDING DEFAULTS)"
+            ).format(staging, table)
+        )
+        conn.execute(sql.SQL("TRUNCATE {}").format(staging))
+
+    delta = df
+    if files is not None and table_dir is not None:
+        changed = changed_files(files, loaded)
+        logger.info(
+            f"Carga '{table_name}': {len(changed)} de {len(files)} arquivo(s) do "
+            "Intermediate novos ou alterados."
+        )
+        delta = (
+            pl.scan_parquet([Path(table_dir) / name for name in changed])
+            if changed
+            else None
+        )
+
+    rows = size = inserted = updated = 0
+    statement = _upsert_statement(table, staging, columns, info.primary_key)
+    try:
+        batches = (
+            iter(delta.select(list(columns)).collect_batches(chunk_size=batch_rows))
+            if delta is not None
+            else iter(())
+        )
+        exhausted = False
+        while not exhausted:
+            with conn.transaction():
+                staged, staged_size, exhausted = _copy_batches(
+                    conn,
+                    _copy_statement(staging, columns, freeze=False),
+                    batches,
+                    columns,
+                    scales,
+                    max_rows=commit_rows,
+                )
+                if staged:
+                    added, changed_rows = conn.execute(statement).fetchone()
+                    conn.execute(sql.SQL("TRUNCATE {}").format(staging))
+                    rows, size = rows + staged, size + staged_size
+                    inserted, updated = inserted + added, updated + changed_rows
+                if exhausted and files is not None:
+                    write_load_state(conn, schema_name, table_name, files)
+    finally:
+        with conn.transaction():
+            conn.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(staging))
+
+    return _table_report(
+        table_name, schema_name, "upsert", start, rows, size, inserted, updated
+    )
+
+
+def load_tables(
+    pool: PostgresPool,
+    config: dict[str, Any],
+    schemas: dict[str, dict[str, str]],
+    primary_keys: dict[str, str],
+    **frames: pl.LazyFrame,
+) -> pl.DataFrame:
+    """
+    Carrega as tabelas do Intermediate no Postgres em paralelo, via COPY binário.
+
+    Cada tabela é carregada por uma thread (`max_workers`, limitado ao tamanho do pool),
+    com uma conexão emprestada do pool compartilhado (`postgres_pool`). A codificação (Polars/Arrow) e o envio pela rede
+    liberam o GIL, portanto as tabelas avançam de fato em paralelo.
+
+    Modos (`mode`): `replace` substitui o conteúdo das tabelas (`copy_table`) e `upsert`
+    incorpora apenas os arquivos do Intermediate alterados desde a última carga
+    (`upsert_table`), sem bloquear as tabelas para leitura.
+
+    Args:
+        pool (PostgresPool): Pool de conexões com o Postgres (`postgres_pool`).
+        config (dict[str, Any]): 'loading' (`schema`, `mode`,
+            `intermediate_dir`, `batch_rows`, `commit_rows`, `max_workers`,
+            `column_types` e `ddl`).
+        schemas (dict[str, dict[str, str]]): 'processing.schemas'.
+        primary_keys (dict[str, str]): 'processing.primary_keys' (padrão: 'id').
+        **frames (pl.LazyFrame): Intermediate de cada tabela, pelo nome da tabela.
+
+    Returns:
+        pl.DataFrame: Linhas (inseridas, atualizadas e sem alteração), bytes, tempo,
+            linhas/s e MB/s por tabela (`REPORT_SCHEMA`).
+
+    Raises:
+        ValueError: Modo de carga inválido.
+    """
+    mode = config.get("mode", "replace")
+    if mode not in LOAD_MODES:
+        msg = f"LOAD ERROR: Modo '{mode}' inválido, esperado um de {LOAD_MODES}."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    column_types = config.get("column_types", {})
+    intermediate_dir = config.get("intermediate_dir")
+    workers = max(1, min(config.get("max_workers", 4), pool.size, len(frames)))
+    start = time.perf_counter()
+
+    def _load(conn: psycopg.Connection, table_name: str) -> dict[str, Any]:
+        table_dir = Path(intermediate_dir) / table_name if intermediate_dir else None
+        # Arquivos listados antes da leitura: alterações posteriores ficam para a próxima
+        files = intermediate_files(table_dir) if table_dir else None
+        kwargs = {
+            "primary_key": primary_keys.get(table_name, "id"),
+            "schema_name": config.get("schema", "public"),
+            "batch_rows": config.get("batch_rows", 100_000),
+            "column_types": column_types.get(table_name),
+            "files": files,
+            "ddl_config": config.get("ddl"),
+        }
+        df, target_schema = frames[table_name], schemas[table_name]
+        if mode == "upsert":
+            return upsert_table(
+                conn,
+                df,
+                target_schema,
+                table_name,
+                table_dir=table_dir,
+                commit_rows=config.get("commit_rows", 1_000_000),
+                **kwargs,
+            )
+        return copy_table(conn, df, target_schema, table_name, **kwargs)
+
+    if intermediate_dir:
+        with pool.connection() as conn:
+            create_load_state(conn, config.get("schema", "public"))
+
+    def _borrow(table_name: str) -> dict[str, Any]:
+        with pool.connection() as conn:
+            return _load(conn, table_name)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        reports = list(executor.map(_borrow, frames))
+
+    seconds = time.perf_counter() - start
+    report = pl.DataFrame(reports, schema=REPORT_SCHEMA)
+    logger.info(
+        f"Carga concluída ({mode}): {len(reports)} tabela(s), "
+        f"{report['rows'].sum()} linha(s) em {seconds:.1f}s "
+        f"({report['bytes'].sum() / 1024**2 / seconds:.1f} MB/s agregados, "
+        f"{workers} conexão(ões))."
+    )
+    return report
@@ -0,0 +1,40 @@
+from kedro.pipeline import Node, Pipeline
+
+from thelook_ecommerce_analysis.pipelines.data_loading.ddl import generate_ddl
+from thelook_ecommerce_analysis.pipelines.data_loading.nodes import load_tables
+from thelook_ecommerce_analysis.utils.get_params import get_params
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    # Tabelas do processamento (ou apenas as listadas em 'loading.tables')
+    schemas: dict = get_params("processing").get("schemas", {})
+    tables = get_params("loading").get("tables") or list(schemas)
+
+    return Pipeline(
+        [
+            Node(
+                func=load_tables,
+                inputs={
+                    "pool": "postgres_pool",
+                    "config": "params:loading",
+                    "schemas": "params:processing.schemas",
+                    "primary_keys": "params:processing.primary_keys",
+                    **{table: f"processing_intermediate_{table}" for table in tables},
+                },
+                outputs="loading_report",
+                name="load_tables_node",
+                tags=["loading"],
+            ),
+            Node(
+                func=generate_ddl,
+                inputs={
+                    "config": "params:loading",
+                    "schemas": "params:processing.schemas",
+                    "primary_keys": "params:processing.primary_keys",
+                },
+                outputs="loading_ddl",
+                name="generate_ddl_node",
+                tags=["loading"],
+            ),
+        ]
+    )
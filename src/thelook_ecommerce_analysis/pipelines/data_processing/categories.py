@@ -0,0 +1,122 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+
+class CategoryRegistry:
+    """
+    Registro persistido (JSON) das categorias de cada domínio `{domínio: [valores]}`.
+
+    Os valores só são acrescentados, nunca reordenados ou removidos: a posição de cada
+    valor é o código físico do `pl.Enum`, o mesmo em todas as tabelas e execuções. Um
+    domínio é, por padrão, o nome da coluna (`status` de orders e de order_items
+    compartilham o mesmo Enum). `aliases` agrupa colunas de nomes diferentes (ex:
+    `product_category` -> `category`).
+    """
+
+    def __init__(self, filepath: str, aliases: dict[str, str] | None = None):
+        self._filepath = Path(filepath)
+        self._aliases = aliases or {}
+        self._categories: dict[str, list[str]] = (
+            json.loads(self._filepath.read_text(encoding="utf8"))
+            if self._filepath.exists()
+            else {}
+        )
+
+    def domain(self, column: str) -> str:
+        """Domínio (chave do registro) da coluna."""
+        return self._aliases.get(column, column)
+
+    def extend(self, column: str, values: list[str]) -> list[str]:
+        """
+        Acrescenta ao domínio da coluna os valores ainda não registrados (em ordem).
+
+        Args:
+            column (str): Nome da coluna.
+            values (list[str]): Valores observados nos dados.
+
+        Returns:
+            list[str]: Valores novos acrescentados.
+        """
+        registered = self._categories.setdefault(self.domain(column), [])
+        known = set(registered)
+        new_values = sorted({v for v in values if v is not None and v not in known})
+        registered.extend(new_values)
+        return new_values
+
+    def values(self, column: str) -> list[str]:
+        """Categorias do domínio da coluna, na ordem dos códigos."""
+        return list(self._categories.get(self.domain(column), []))
+
+    def save(self) -> None:
+        """Grava o registro de forma atômica."""
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._filepath.with_name(f".{self._filepath.name}.tmp")
+        tmp_path.write_text(json.dumps(self._categories, indent=2), encoding="utf8")
+        os.replace(tmp_path, self._filepath)
+
+
+def _categorical_columns(target_schema: dict[str, str]) -> list[str]:
+    return [col for col, type_str in target_schema.items() if type_str == "Categorical"]
+
+
+def update_category_registry(
+    schemas: dict[str, dict[str, str]],
+    config: dict[str, Any],
+    *frames: pl.LazyFrame,
+    table_names: list[str],
+) -> dict[str, dict[str, list[str]]]:
+    """
+    Acrescenta ao registro as categorias novas das tabelas Raw e o persiste.
+
+    As colunas `Categorical` de 'processing.schemas' são lidas em uma única passada por
+    tabela (apenas essas colunas, com `strip_chars` como no `process_table`). Os valores
+    inéditos são acrescentados ao final de cada domínio, e os códigos existentes não mudam.
+
+    Args:
+        schemas (dict[str, dict[str, str]]): 'processing.schemas'.
+        config (dict[str, Any]): 'processing.categories' (`filepath` e `aliases`).
+        *frames (pl.LazyFrame): Camada Raw de cada tabela, na ordem de `table_names`.
+        table_names (list[str]): Tabelas com colunas categóricas.
+
+    Returns:
+        dict[str, dict[str, list[str]]]: Categorias por tabela e coluna
+            (`{tabela: {coluna: valores}}`), usadas pelo `process_table` para o `pl.Enum`.
+    """
+    registry = CategoryRegistry(config["filepath"], config.get("aliases"))
+    table_columns = {}
+
+    for table_name, frame in zip(table_names, frames, strict=True):
+        available = frame.collect_schema().names()
+        columns = [
+            c for c in _categorical_columns(schemas[table_name]) if c in available
+        ]
+
+        observed = frame.select(
+            pl.col(c).cast(pl.String).str.strip_chars().drop_nulls().unique().implode()
+            for c in columns
+        ).collect(engine="streaming")
+
+        for column in columns:
+            new_values = registry.extend(column, observed[column][0].to_list())
+            if new_values:
+                logger.info(
+                    f"Categorias novas em '{table_name}.{column}' "
+                    f"(domínio '{registry.domain(column)}'): {new_values}"
+                )
+
+        table_columns[table_name] = columns
+
+    registry.save()
+
+    # Depois de todas as tabelas: domínios compartilhados recebem o mesmo Enum
+    return {
+        table_name: {column: registry.values(column) for column in columns}
+        for table_name, columns in table_columns.items()
+    }
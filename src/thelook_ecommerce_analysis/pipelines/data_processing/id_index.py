@@ -0,0 +1,299 @@
+import logging
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+import polars as pl
+import pyarrow as pa
+from pyarrow import ipc
+
+logger = logging.getLogger(__name__)
+
+IDS_FILE = "_ids.arrow"
+BLOOM_FILE = "_bloom.arrow"
+
+# Máscara de cada bit de uma palavra de 64 bits do filtro de Bloom
+_BIT_MASKS = pl.Series("mask", [1 << bit for bit in range(64)], dtype=pl.UInt64)
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom em blocos de 64 bits, vetorizado com o Polars.
+
+    Cada chave usa uma única palavra de 64 bits (escolhida por um hash) e liga nela
+    `num_hashes` bits (tirados de um segundo hash). Inserir e consultar custam um `gather`
+    por lote, sem laço por linha. Um resultado negativo é definitivo; um positivo precisa
+    ser confirmado no índice. O hash do Polars não é estável entre versões, por isso o
+    filtro é persistido com a versão e reconstruído a partir do índice quando ela muda.
+
+    O filtro guarda a capacidade (número de chaves) para a qual foi dimensionado; acima
+    dela a taxa de falsos positivos passa de `fpr` e o `IdIndex` o reconstrói maior.
+    """
+
+    def __init__(
+        self, words: pl.Series, num_hashes: int, capacity: int, fpr: float = 0.01
+    ):
+        self.words = words
+        self.num_hashes = num_hashes
+        self.capacity = capacity
+        self.fpr = fpr
+
+    @classmethod
+    def build(
+        cls, ids: pl.Series, fpr: float = 0.01, capacity: int = 0
+    ) -> "BloomFilter":
+        """
+        Cria o filtro dimensionado para `ids` com a taxa de falsos positivos `fpr`.
+
+        Args:
+            ids (pl.Series): Chaves a inserir.
+            fpr (float): Taxa de falsos positivos desejada (ex: 0.01).
+            capacity (int): Número de chaves a reservar, se maior que `len(ids)`.
+
+        Returns:
+            BloomFilter: Filtro com todas as chaves.
+        """
+        n = max(len(ids), capacity, 1)
+        num_bits = math.ceil(-n * math.log(fpr) / math.log(2) ** 2)
+        num_words = max(1, math.ceil(num_bits / 64))
+        # Até 10 bits por chave: cada bit consome 6 bits do segundo hash
+        num_hashes = min(10, max(1, round(num_words * 64 / n * math.log(2))))
+
+        bloom = cls(
+            pl.zeros(num_words, pl.UInt64, eager=True).rename("words"),
+            num_hashes,
+            n,
+            fpr,
+        )
+        bloom.add(ids)
+        return bloom
+
+    def _locate(self, ids: pl.Series) -> tuple[pl.Series, pl.Series]:
+        """Palavra e máscara de bits de cada chave."""
+        word = ids.hash(seed=1) % len(self.words)
+        h2 = ids.hash(seed=2)
+
+        mask = _BIT_MASKS.gather(h2 % 64)
+        for i in range(1, self.num_hashes):
+            mask |= _BIT_MASKS.gather(h2 // 64**i % 64)
+        return word, mask
+
+    def add(self, ids: pl.Series) -> None:
+        """Liga os bits das chaves (agrupados por palavra, sem laço por linha)."""
+        if ids.is_empty():
+            return
+
+        word, mask = self._locate(ids)
+        bits = (
+            pl.DataFrame({"word": word, "mask": mask})
+            .group_by("word")
+            .agg(pl.col("mask").bitwise_or())
+        )
+
+        words = self.words.clone()
+        words.scatter(bits["word"], words.gather(bits["word"]) | bits["mask"])
+        self.words = words
+
+    def might_contain(self, ids: pl.Series) -> pl.Series:
+        """True para chaves possivelmente presentes; False para ausentes com certeza."""
+        word, mask = self._locate(ids)
+        return (self.words.gather(word) & mask) == mask
+
+    @property
+    def nbytes(self) -> int:
+        return self.words.estimated_size()
+
+
+class IdIndex:
+    """
+    Índice persistido das chaves já gravadas no Intermediate de uma tabela.
+
+    As chaves ficam em um array ordenado e sem repetição (UInt32 quando cabem, senão
+    UInt64), e a busca é uma busca binária vetorizada (`search_sorted`). O filtro de Bloom
+    opcional descarta chaves novas antes da busca. Com ele, um lote novo pode ser
+    deduplicado contra todo o histórico sem ler o Intermediate.
+
+    Arquivos (Arrow IPC) no diretório da tabela: `_ids.arrow` e `_bloom.arrow`.
+    """
+
+    def __init__(self, ids: pl.Series, bloom: BloomFilter | None = None):
+        self._lock = threading.Lock()
+        self.ids = ids
+        self.bloom = bloom
+        self._lookups = 0
+        self._bloom_rejections = 0
+        self._lookup_seconds = 0.0
+
+    @staticmethod
+    def _normalize(ids: pl.Series) -> pl.Series:
+        """Chaves distintas, ordenadas e no menor tipo sem sinal que as comporta."""
+        ids = ids.drop_nulls().unique().sort()
+        dtype = pl.UInt32 if ids.is_empty() or ids.max() < 2**32 else pl.UInt64
+        return ids.cast(dtype).rename("id")
+
+    @classmethod
+    def build(cls, ids: pl.Series, bloom: bool = True, fpr: float = 0.01) -> "IdIndex":
+        """
+        Cria o índice a partir das chaves.
+
+        Args:
+            ids (pl.Series): Chaves (repetições e nulos são descartados).
+            bloom (bool): Se True, cria também o filtro de Bloom.
+            fpr (float): Taxa de falsos positivos do filtro.
+
+        Returns:
+            IdIndex: Índice pronto para consulta.
+        """
+        ids = cls._normalize(ids)
+        return cls(ids, BloomFilter.build(ids, fpr) if bloom else None)
+
+    def contains(self, ids: pl.Series) -> pl.Series:
+        """
+        Indica, para cada chave, se ela já está no índice.
+
+        Args:
+            ids (pl.Series): Chaves a consultar.
+
+        Returns:
+            pl.Series: Booleano alinhado com `ids`.
+        """
+        start = time.perf_counter()
+        keys = ids.cast(self.ids.dtype, strict=False)
+        found = pl.repeat(False, len(keys), eager=True).rename("found")
+
+        candidates = keys.is_not_null()
+        if self.bloom is not None:
+            candidates &= self.bloom.might_contain(keys).fill_null(False)
+
+        positions = candidates.arg_true()
+        if not self.ids.is_empty() and len(positions):
+            probe = keys.gather(positions)
+            slot = self.ids.search_sorted(probe).clip(upper_bound=len(self.ids) - 1)
+            found.scatter(positions, self.ids.gather(slot) == probe)
+
+        with self._lock:
+            self._lookups += len(keys)
+            self._bloom_rejections += len(keys) - len(positions)
+            self._lookup_seconds += time.perf_counter() - start
+
+        return found
+
+    def add(self, ids: pl.Series) -> None:
+        """Incorpora novas chaves ao índice (e ao filtro de Bloom)."""
+        new_ids = ids.filter(~self.contains(ids))
+        if new_ids.is_empty():
+            return
+
+        dtype = self.ids.dtype
+        self.ids = self._normalize(
+            pl.concat([self.ids.cast(pl.UInt64), new_ids.cast(pl.UInt64)])
+        )
+
+        if self.bloom is None:
+            return
+        if self.ids.dtype != dtype or len(self.ids) > self.bloom.capacity:
+            # O hash depende do tipo: com o índice promovido a UInt64, o filtro é refeito.
+            # Acima da capacidade, é refeito com o dobro das chaves para manter o `fpr`.
+            self.bloom = BloomFilter.build(
+                self.ids, self.bloom.fpr, capacity=2 * len(self.ids)
+            )
+        else:
+            self.bloom.add(new_ids.cast(dtype))
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Tamanho do índice, memória ocupada e desempenho das consultas."""
+        with self._lock:
+            return {
+                "ids": len(self.ids),
+                "index_bytes": self.ids.estimated_size(),
+                "bloom_bytes": self.bloom.nbytes if self.bloom is not None else 0,
+                "lookups": self._lookups,
+                "bloom_rejections": self._bloom_rejections,
+                "lookups_per_second": (
+                    self._lookups / self._lookup_seconds
+                    if self._lookup_seconds
+                    else 0.0
+                ),
+            }
+
+    def save(self, directory: str | Path) -> None:
+        """Grava o índice (e o filtro) em Arrow IPC, de forma atômica."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        _write_ipc(directory / IDS_FILE, self.ids.to_arrow(), {})
+        if self.bloom is not None:
+            _write_ipc(
+                directory / BLOOM_FILE,
+                self.bloom.words.to_arrow(),
+                {
+                    "num_hashes": str(self.bloom.num_hashes),
+                    "capacity": str(self.bloom.capacity),
+                    "fpr": str(self.bloom.fpr),
+                    "polars_version": pl.__version__,
+                },
+            )
+        else:
+            (directory / BLOOM_FILE).unlink(missing_ok=True)
+
+    @classmethod
+    def load(
+        cls, directory: str | Path, bloom: bool = True, fpr: float = 0.01
+    ) -> "IdIndex | None":
+        """
+        Lê o índice gravado em `directory` (None se não existir).
+
+        O filtro de Bloom é reconstruído a partir das chaves quando está ausente, foi
+        gravado por outra versão do Polars (hash diferente) ou com outro `fpr`.
+        """
+        directory = Path(directory)
+        if not (directory / IDS_FILE).is_file():
+            return None
+
+        ids = pl.Series(_read_ipc(directory / IDS_FILE)[0].column(0))
+        if not bloom:
+            return cls(ids)
+
+        bloom_path = directory / BLOOM_FILE
+        if bloom_path.is_file():
+            table, metadata = _read_ipc(bloom_path)
+            if (
+                metadata.get("polars_version") == pl.__version__
+                and metadata.get("fpr") == str(fpr)
+                and "capacity" in metadata
+            ):
+                words = pl.Series("words", table.column(0))
+                return cls(
+                    ids,
+                    BloomFilter(
+                        words,
+                        int(metadata["num_hashes"]),
+                        int(metadata["capacity"]),
+                        fpr,
+                    ),
+                )
+
+        logger.info(
+            f"Filtro de Bloom de '{directory}' reconstruído a partir do índice."
+        )
+        return cls(ids, BloomFilter.build(ids, fpr))
+
+
+def _write_ipc(path: Path, array: pa.Array, metadata: dict[str, str]) -> None:
+    table = pa.table({"values": array}).replace_schema_metadata(metadata)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with ipc.new_file(tmp_path, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def _read_ipc(path: Path) -> tuple[pa.Table, dict[str, str]]:
+    with ipc.open_file(path) as reader:
+        table = reader.read_all()
+    metadata = {
+        k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()
+    }
+    return table, metadata
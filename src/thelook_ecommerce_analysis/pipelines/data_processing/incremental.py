@@ -0,0 +1,289 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+import polars as pl
+
+from thelook_ecommerce_analysis.datasets import PART_COLUMN
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.id_index import IdIndex
+from thelook_ecommerce_analysis.pipelines.data_processing.nodes import (
+    apply_narrowed_types,
+    process_table,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.quality import (
+    INTERMEDIATE_DATASET_TEMPLATE,
+    QualityMonitor,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.schema_plan import (
+    SCHEMA_PLANS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Partes Raw já incorporadas ao Intermediate (gravado dentro do diretório da tabela)
+MARKER_NAME = "_processed.json"
+
+
+def _signature(
+    target_schema: dict[str, str], key: str, bucket_size: int, enums: dict
+) -> str:
+    """Assinatura do layout do Intermediate: mudou, as partições são reconstruídas."""
+    payload = json.dumps([list(target_schema.items()), key, bucket_size, enums])
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+def _raw_parts(raw_dir: str, table_name: str) -> dict[str, list[int]]:
+    """Partes Raw da tabela (em ordem de nome) com tamanho e mtime de cada arquivo."""
+    table_dir = Path(raw_dir) / table_name
+    parts = {}
+    for path in sorted(table_dir.glob("**/*.parquet")):
+        stat = path.stat()
+        parts[path.relative_to(table_dir).as_posix()] = [stat.st_size, stat.st_mtime_ns]
+    return parts
+
+
+def _read_marker(table_dir: Path) -> dict:
+    """Marcador da última execução (vazio se inexistente ou ilegível)."""
+    try:
+        return json.loads((table_dir / MARKER_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_marker(table_dir: Path, marker: dict) -> None:
+    """Grava o marcador de forma atômica."""
+    tmp_path = table_dir / f".{MARKER_NAME}.tmp"
+    tmp_path.write_text(json.dumps(marker, indent=2))
+    os.replace(tmp_path, table_dir / MARKER_NAME)
+
+
+def _needs_rebuild(marker: dict, signature: str, parts: dict, table_dir: Path) -> str:
+    """Motivo para reconstruir o Intermediate inteiro ('' se o merge é possível)."""
+    if not marker:
+        return "sem marcador de partes processadas"
+    if marker.get("signature") != signature:
+        return "schema, chave, bucket_size ou categorias alterados"
+    if not any(table_dir.glob("part-*.parquet")):
+        return "Intermediate sem partições"
+
+    # Partes já processadas que sumiram ou mudaram: o Raw foi reescrito
+    for name, stat in marker.get("parts", {}).items():
+        if parts.get(name) != stat:
+            return f"parte Raw '{name}' removida ou alterada"
+    return ""
+
+
+def _bucket_expr(key: str, bucket_size: int) -> pl.Expr:
+    """Nome da partição de cada linha: faixa de `bucket_size` chaves (ex: '000042')."""
+    return (pl.col(key) // bucket_size).cast(pl.String).str.zfill(6).alias(PART_COLUMN)
+
+
+def _load_id_index(table_dir: Path, key: str, config: dict) -> IdIndex:
+    """Índice de chaves da tabela, criado a partir das partições se ainda não existir."""
+    bloom = config.get("bloom", False)
+    fpr = config.get("fpr", 0.01)
+
+    index = IdIndex.load(table_dir, bloom=bloom, fpr=fpr)
+    if index is None:
+        keys = pl.scan_parquet(table_dir / "part-*.parquet").select(key).collect()
+        index = IdIndex.build(keys.to_series(), bloom=bloom, fpr=fpr)
+        logger.info(f"Índice de chaves criado a partir de '{table_dir}'.")
+    return index
+
+
+def _log_index_stats(table_name: str, index: IdIndex):
+    stats = index.stats
+    logger.info(
+        f"Índice de chaves '{table_name}': {stats['ids']} chaves, "
+        f"{(stats['index_bytes'] + stats['bloom_bytes']) / 1024**2:.1f} MB "
+        f"(Bloom: {stats['bloom_bytes'] / 1024**2:.1f} MB), "
+        f"{stats['lookups']} consultas a {stats['lookups_per_second']:,.0f} chaves/s "
+        f"({stats['bloom_rejections']} descartadas pelo Bloom)."
+    )
+
+
+def _merge_buckets(
+    delta: pl.DataFrame, table_dir: Path, key: str, indexed: bool
+) -> dict[str, pl.LazyFrame]:
+    """Partições reescritas: linhas atuais mescladas com as linhas do delta."""
+    merged = {}
+    for (bucket,), frame in delta.partition_by(PART_COLUMN, as_dict=True).items():
+        rows = frame.drop(PART_COLUMN, "_existing", strict=False).lazy()
+        path = table_dir / f"part-{bucket}.parquet"
+
+        if not path.is_file():
+            merged[bucket] = rows
+        elif indexed and not frame["_existing"].any():
+            # Apenas chaves novas (segundo o índice): basta acrescentar as linhas
+            merged[bucket] = pl.concat([pl.scan_parquet(path), rows])
+        else:
+            # Upsert: linhas antigas das chaves do delta são substituídas pela versão nova
+            merged[bucket] = pl.concat(
+                [pl.scan_parquet(path).join(rows.select(key), on=key, how="anti"), rows]
+            )
+    return merged
+
+
+def process_table_incremental(  # noqa: PLR0913
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    primary_key: str | None = None,
+    raw_dir: str = "data/01_raw",
+    intermediate_dir: str = "data/02_intermediate",
+    bucket_size: int = 1_000_000,
+    id_index: dict | None = None,
+    categories: dict[str, dict[str, list[str]]] | None = None,
+    narrowed_types: dict[str, dict[str, str]] | None = None,
+    monitor: QualityMonitor | None = None,
+) -> pl.LazyFrame | dict[str, pl.LazyFrame]:
+    """
+    Incorpora ao Intermediate apenas as partes Raw ainda não processadas.
+
+    O Intermediate de cada tabela é um diretório particionado por faixas da chave
+    (`part-<chave // bucket_size>.parquet`). As partes Raw novas são processadas com o
+    `process_table` e mescladas por upsert (a versão nova de cada chave vence), e somente
+    as partições com chaves do delta são reescritas. O tempo de execução acompanha o
+    tamanho do delta, e não o da tabela.
+
+    O marcador `_processed.json` (no diretório do Intermediate) registra as partes Raw
+    incorporadas e só é atualizado depois que o catálogo grava o resultado. Sem marcador,
+    com o schema alterado ou com partes Raw já processadas removidas/alteradas (ex:
+    snapshot ou reescrita da ingestão), a tabela é reconstruída a partir de `df`.
+
+    Com `id_index.enabled`, as chaves já gravadas ficam em um `IdIndex` persistido no
+    diretório da tabela. O delta é separado em chaves novas e atualizadas sem ler o
+    Intermediate, e partições que só recebem chaves novas dispensam o anti join.
+
+    Args:
+        df (pl.LazyFrame): Camada Raw completa (usada na reconstrução).
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela.
+        primary_key (str | None): Chave do upsert ('processing.primary_keys.<tabela>').
+        raw_dir (str): Diretório da camada Raw (mesmo caminho do catálogo).
+        intermediate_dir (str): Diretório da camada Intermediate (mesmo caminho do catálogo).
+        bucket_size (int): Chaves por partição do Intermediate.
+        id_index (dict | None): Índice de chaves ('processing.incremental.id_index':
+            `enabled`, `bloom` e `fpr`).
+        categories (dict | None): Registro de categorias repassado ao `process_table`.
+            Partes com Enums diferentes não são lidas juntas, por isso categorias novas
+            na tabela reconstroem o Intermediate.
+        narrowed_types (dict | None): Tipos sugeridos pelo perfil. O schema efetivo (após
+            a proteção de overflow) faz parte da assinatura do layout.
+        monitor (QualityMonitor | None): Métricas de qualidade repassadas ao
+            `process_table` (sobre a tabela inteira na reconstrução, ou sobre o delta).
+
+    Returns:
+        pl.LazyFrame | dict[str, pl.LazyFrame]: Tabela inteira (reconstrução), ou apenas
+            as partições reescritas, ou `{}` quando não há partes Raw novas.
+
+    Raises:
+        ValueError: Tabela sem chave inteira no schema.
+    """
+    key = primary_key or "id"
+    target_schema = apply_narrowed_types(df, target_schema, table_name, narrowed_types)
+    dtype = SCHEMA_PLANS.get(target_schema, table_name).dtypes.get(key)
+    if dtype is None or not dtype.is_integer():
+        msg = (
+            f"SCHEMA ERROR: Processamento incremental de '{table_name}' exige uma "
+            f"chave inteira no schema, recebido: '{key}' ({dtype})."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+
+    table_dir = Path(intermediate_dir) / table_name
+    categories = categories or {}
+    signature = _signature(
+        target_schema, key, bucket_size, categories.get(table_name, {})
+    )
+    parts = _raw_parts(raw_dir, table_name)
+    marker = _read_marker(table_dir)
+
+    index_config = id_index if (id_index or {}).get("enabled", False) else None
+
+    def _mark_processed():
+        _write_marker(table_dir, {"signature": signature, "parts": parts})
+        logger.info(f"Incremental '{table_name}': {len(parts)} parte(s) Raw marcadas.")
+
+    reason = _needs_rebuild(marker, signature, parts, table_dir)
+    if reason:
+        if index_config is not None:
+            # O diretório é substituído: o índice é refeito a partir das novas partições
+            def _rebuild_index():
+                index = _load_id_index(table_dir, key, index_config)
+                index.save(table_dir)
+                _log_index_stats(table_name, index)
+
+            POST_SAVE_ACTIONS.register(
+                INTERMEDIATE_DATASET_TEMPLATE.format(table=table_name), _rebuild_index
+            )
+
+        logger.info(f"Incremental '{table_name}': reconstrução completa ({reason}).")
+        # Depois do índice (ações executadas na ordem de registro)
+        POST_SAVE_ACTIONS.register(
+            INTERMEDIATE_DATASET_TEMPLATE.format(table=table_name), _mark_processed
+        )
+        return process_table(
+            df, target_schema, table_name, key, categories, monitor=monitor
+        ).with_columns(_bucket_expr(key, bucket_size))
+
+    new_parts = [name for name in parts if name not in marker["parts"]]
+    if not new_parts:
+        logger.info(f"Incremental '{table_name}': nenhuma parte Raw nova.")
+        return {}
+
+    # Delta: apenas as partes novas, deduplicado (a parte mais recente vence)
+    raw_table_dir = Path(raw_dir) / table_name
+    delta = (
+        process_table(
+            pl.scan_parquet([raw_table_dir / name for name in new_parts]),
+            target_schema,
+            table_name,
+            key,
+            categories,
+            monitor=monitor,
+        )
+        .with_columns(_bucket_expr(key, bucket_size))
+        .collect(engine="streaming")
+    )
+
+    # Chaves já gravadas, consultadas no índice (sem ler o Intermediate)
+    index = _load_id_index(table_dir, key, index_config) if index_config else None
+    if index is not None:
+        delta = delta.with_columns(_existing=index.contains(delta[key]))
+        updated = delta["_existing"].sum()
+        logger.info(
+            f"Incremental '{table_name}': {delta.height - updated} chave(s) nova(s), "
+            f"{updated} atualizada(s)."
+        )
+
+    merged = _merge_buckets(delta, table_dir, key, index is not None)
+
+    logger.info(
+        f"Incremental '{table_name}': {len(new_parts)} parte(s) Raw nova(s), "
+        f"{delta.height} linha(s), {len(merged)} partição(ões) reescrita(s)."
+    )
+
+    if index is not None:
+
+        def _update_index():
+            index.add(delta[key])
+            index.save(table_dir)
+            _log_index_stats(table_name, index)
+
+        POST_SAVE_ACTIONS.register(
+            INTERMEDIATE_DATASET_TEMPLATE.format(table=table_name), _update_index
+        )
+
+    # Por último: se o índice falhar, as partes continuam novas e são reprocessadas
+    # (o merge é idempotente) em vez de ficarem fora do índice
+    POST_SAVE_ACTIONS.register(
+        INTERMEDIATE_DATASET_TEMPLATE.format(table=table_name), _mark_processed
+    )
+
+    return merged
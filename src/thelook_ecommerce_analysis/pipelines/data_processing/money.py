@@ -0,0 +1,234 @@
+import argparse
+import logging
+import re
+import time
+from decimal import Decimal
+from typing import Any
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# `Money` (centavos) ou `Money(S)` (S casas decimais)
+MONEY_PATTERN = re.compile(r"^Money(?:\(\s*(\d+)\s*\))?$")
+DEFAULT_SCALE = 2
+
+# Dígitos que cabem em um Int64 sem overflow
+MAX_PRECISION = 18
+
+
+def money_scale(type_str: str) -> int | None:
+    """
+    Escala (casas decimais) de um tipo `Money` do schema, ou None para outros tipos.
+
+    Args:
+        type_str (str): Tipo do schema (ex: 'Money', 'Money(4)').
+
+    Returns:
+        int | None: Casas decimais representadas pelo inteiro.
+
+    Raises:
+        ValueError: Escala maior que a precisão de um Int64.
+    """
+    match = MONEY_PATTERN.match(type_str.strip())
+    if match is None:
+        return None
+
+    scale = int(match.group(1)) if match.group(1) else DEFAULT_SCALE
+    if scale > MAX_PRECISION:
+        msg = (
+            f"Escala ({scale}) de '{type_str}' não cabe em Int64 (máx {MAX_PRECISION})."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+    return scale
+
+
+def decimal_type(scale: int) -> pl.Decimal:
+    """Decimal equivalente a um `Money` de escala `scale` (usado nas fronteiras)."""
+    return pl.Decimal(MAX_PRECISION, scale)
+
+
+def to_money(col_name: str, scale: int) -> pl.Expr:
+    """
+    Converte uma coluna para inteiro escalado (ex: 12.34 -> 1234 centavos) em Int64.
+
+    O valor passa antes pelo mesmo cast para Decimal do tipo `Decimal(P, S)`, portanto o
+    arredondamento é idêntico ao do caminho Decimal. O inteiro escalado é a própria
+    representação física do Decimal, sem multiplicação. Valores com mais de 18 dígitos
+    falham no cast, em vez de estourar o Int64.
+
+    Args:
+        col_name (str): Nome da coluna (Float, String, Decimal ou inteiro).
+        scale (int): Casas decimais.
+
+    Returns:
+        pl.Expr: Expressão Int64.
+    """
+    return (
+        pl.col(col_name)
+        .cast(decimal_type(scale))
+        .to_physical()
+        .cast(pl.Int64)
+        .alias(col_name)
+    )
+
+
+def money_to_decimal(col_name: str, scale: int) -> pl.Expr:
+    """
+    Converte uma coluna `Money` (Int64 escalado) de volta para Decimal, sem perda.
+
+    Args:
+        col_name (str): Nome da coluna.
+        scale (int): Casas decimais.
+
+    Returns:
+        pl.Expr: Expressão `Decimal(18, scale)`.
+    """
+    unit = Decimal(1).scaleb(-scale)
+    return (
+        (pl.col(col_name).cast(pl.Decimal(38, 0)) * pl.lit(unit, pl.Decimal(38, scale)))
+        .cast(decimal_type(scale))
+        .alias(col_name)
+    )
+
+
+def restore_money(
+    df: pl.DataFrame | pl.LazyFrame, target_schema: dict[str, str]
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Converte as colunas `Money` do schema de volta para Decimal (fronteira de saída).
+
+    Somas, subtrações e multiplicações por inteiros sobre `Money` são exatas em Int64. Na
+    saída (relatórios, exportações, carga em banco), esta função devolve os valores como
+    Decimal. As demais colunas não são alteradas.
+
+    Args:
+        df (pl.DataFrame | pl.LazyFrame): Tabela com colunas `Money` em Int64.
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+
+    Returns:
+        pl.DataFrame | pl.LazyFrame: Mesma tabela com as colunas `Money` em Decimal.
+    """
+    available = df.collect_schema().names()
+    expressions = [
+        money_to_decimal(col, scale)
+        for col, type_str in target_schema.items()
+        if col in available and (scale := money_scale(type_str)) is not None
+    ]
+    return df.with_columns(expressions) if expressions else df
+
+
+def _benchmark_query(df: pl.DataFrame) -> pl.DataFrame:
+    """GMV e margem por grupo (mesma consulta para os dois tipos)."""
+    return (
+        df.lazy()
+        .group_by("group")
+        .agg(
+            gmv=pl.col("sale_price").sum(),
+            margin=(pl.col("sale_price") - pl.col("cost")).sum(),
+        )
+        .sort("group")
+        .collect()
+    )
+
+
+def _best_of(repeat: int, func: Any) -> tuple[float, Any]:
+    """Menor tempo de `repeat` execuções e o último resultado."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_money(
+    rows: int = 10_000_000, groups: int = 1_000, repeat: int = 3, seed: int = 0
+) -> dict[str, float]:
+    """
+    Compara `Decimal(10, 2)` e `Money` em uma agregação de GMV e margem por grupo.
+
+    Os preços são gerados como Float64 (como chegam do BigQuery) e convertidos pelos dois
+    caminhos. O resultado do `Money`, convertido de volta com `restore_money`, precisa ser
+    idêntico ao do Decimal.
+
+    Args:
+        rows (int): Linhas geradas.
+        groups (int): Quantidade de grupos da agregação.
+        repeat (int): Execuções de cada etapa (vale o menor tempo).
+        seed (int): Semente dos valores pseudoaleatórios.
+
+    Returns:
+        dict[str, float]: Tempos (segundos) de conversão e agregação de cada caminho, e
+            o ganho da agregação (`speedup`).
+
+    Raises:
+        AssertionError: Resultados diferentes entre os dois caminhos.
+    """
+    index = pl.int_range(rows, dtype=pl.UInt64)
+    prices = pl.select(
+        group=index.hash(seed) % groups,
+        sale_price=(index.hash(seed + 1) % 20_000).cast(pl.Int64) / 100,
+        cost=(index.hash(seed + 2) % 10_000).cast(pl.Int64) / 100,
+    )
+
+    decimal_cast, decimal = _best_of(
+        repeat,
+        lambda: prices.with_columns(
+            pl.col("sale_price", "cost").cast(pl.Decimal(10, 2))
+        ),
+    )
+    money_cast, money = _best_of(
+        repeat,
+        lambda: prices.with_columns(
+            to_money("sale_price", DEFAULT_SCALE), to_money("cost", DEFAULT_SCALE)
+        ),
+    )
+
+    decimal_seconds, decimal_result = _best_of(
+        repeat, lambda: _benchmark_query(decimal)
+    )
+    money_seconds, money_result = _best_of(repeat, lambda: _benchmark_query(money))
+
+    restored = restore_money(money_result, {"gmv": "Money", "margin": "Money"})
+    common = {"gmv": pl.Decimal(38, 2), "margin": pl.Decimal(38, 2)}
+    if not restored.cast(common).equals(decimal_result.cast(common)):
+        msg = "Resultados do Money diferentes do Decimal."
+        raise AssertionError(msg)
+
+    results = {
+        "decimal_cast_seconds": decimal_cast,
+        "money_cast_seconds": money_cast,
+        "decimal_seconds": decimal_seconds,
+        "money_seconds": money_seconds,
+        "speedup": decimal_seconds / money_seconds,
+    }
+    logger.info(
+        f"Money vs Decimal ({rows:,} linhas, {groups:,} grupos): agregação "
+        f"{money_seconds:.3f}s vs {decimal_seconds:.3f}s ({results['speedup']:.1f}x), "
+        f"conversão {money_cast:.3f}s vs {decimal_cast:.3f}s. Resultados idênticos."
+    )
+    return results
+
+
+def main(argv: list[str] | None = None):
+    """
+    Executa o benchmark Money vs Decimal.
+
+    Ex: python -m thelook_ecommerce_analysis.pipelines.data_processing.money
+    --rows 100000000
+    """
+    parser = argparse.ArgumentParser(description="Benchmark Money vs Decimal.")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--groups", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    benchmark_money(args.rows, args.groups, args.repeat, args.seed)
+
+
+if __name__ == "__main__":
+    main()
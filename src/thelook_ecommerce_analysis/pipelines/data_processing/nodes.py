@@ -1,130 +1,204 @@
 import logging
-from typing import cast
 
 import polars as pl
 
+from thelook_ecommerce_analysis.pipelines.data_processing.quality import QualityMonitor
+from thelook_ecommerce_analysis.pipelines.data_processing.schema_plan import (
+    SCHEMA_PLANS,
+    cast_expr,
+    get_polars_type,
+    is_lenient_cast,
+)
+
 logger = logging.getLogger(__name__)
 
-TYPE_MAPPING = {
-    # Inteiros
-    "UInt8": pl.UInt8,
-    "UInt16": pl.UInt16,
-    "UInt32": pl.UInt32,
-    "UInt64": pl.UInt64,
-    "Int8": pl.Int8,
-    "Int16": pl.Int16,
-    "Int32": pl.Int32,
-    "Int64": pl.Int64,
-    # Flutuantes
-    "Float32": pl.Float32,
-    "Float64": pl.Float64,
-    # Textos e Categorias
-    "String": pl.String,
-    "Categorical": pl.Categorical,
-    # Tempo
-    "Date": pl.Date,
-    "Datetime": pl.Datetime,  # Padrão (microssegundos)
-    "Boolean": pl.Boolean,
-}
-
-
-def _get_polars_type(type_str: str) -> pl.DataType:
+# Posição de cada linha no Raw. O `StreamingPolarsDataset` lê as partes em ordem de nome
+# (`part-<início>_<fim>.parquet`, ou seja, ordem de extração): a maior posição de uma chave
+# é a sua versão mais recente.
+ROW_INDEX_COLUMN = "_row_index"
+
+
+def apply_narrowed_types(
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    narrowed_types: dict[str, dict[str, str]] | None,
+) -> dict[str, str]:
     """
-    Resolve a string do YAML para um tipo Polars usando mapeamento direto.
+    Aplica ao schema os tipos sugeridos pelo perfil (pipeline 'data_profiling').
+
+    Proteção contra overflow: antes de estreitar, uma passada sobre as colunas afetadas
+    (apenas elas) conta os valores que não cabem no tipo sugerido. Se os dados cresceram
+    além dele, a coluna mantém o tipo do schema e um aviso é logado.
 
     Args:
-        type_str (str): String do tipo Polars esperado.
+        df (pl.LazyFrame): LazyFrame da camada Raw.
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela.
+        narrowed_types (dict | None): Tipos sugeridos `{tabela: {coluna: tipo}}`.
 
     Returns:
-        pl.DataType: Tipo Polars convertido.
+        dict[str, str]: Schema efetivo da tabela.
     """
-    clean_str = type_str.strip()
-
-    # 1. Busca Direta
-    if clean_str in TYPE_MAPPING:
-        return cast("pl.DataType", TYPE_MAPPING[clean_str])
-
-    # 2. Caso Especial: Quando há argumentos
-    if clean_str.startswith("Decimal"):
-        try:
-            content = clean_str.split("(")[1].split(")")[0]
-            precision, scale = map(int, content.split(","))
-
-            # Validação
-            if precision < scale:
-                msg = (
-                    f"Precisão ({precision}) não pode ser menor que a Escala ({scale})."
-                )
-                logger.error(msg)
-                raise ValueError(msg)
-
-            return pl.Decimal(precision, scale)
-        except Exception as e:
-            logger.error(f"Erro ao parsear Decimal '{clean_str}' : {e}")
-            raise ValueError(
-                f"Decimal inválido: {clean_str}. Use formato 'Decimal(P, S)'."
-            ) from e
-
-    raise ValueError(f"Tipo desconhecido ou não permitido: '{clean_str}'.")
-
-
-def process_table(
-    df: pl.LazyFrame, target_schema: dict[str, str], table_name: str
+    available = df.collect_schema().names()
+    candidates = {
+        col: type_str
+        for col, type_str in (narrowed_types or {}).get(table_name, {}).items()
+        if col in target_schema and col in available
+    }
+    if not candidates:
+        return target_schema
+
+    # Valores não nulos que viram nulo no cast (não cabem no tipo sugerido)
+    overflow = (
+        df.select(
+            (
+                pl.col(col).cast(get_polars_type(type_str), strict=False).is_null()
+                & pl.col(col).is_not_null()
+            )
+            .sum()
+            .alias(col)
+            for col, type_str in candidates.items()
+        )
+        .collect(engine="streaming")
+        .row(0, named=True)
+    )
+
+    schema = dict(target_schema)
+    for col, type_str in candidates.items():
+        if overflow[col]:
+            logger.warning(
+                f"Overflow em '{table_name}.{col}': {overflow[col]} valor(es) não cabem "
+                f"em {type_str}. Mantendo {target_schema[col]} do schema."
+            )
+            continue
+        schema[col] = type_str
+
+    return schema
+
+
+def process_table(  # noqa: PLR0913
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    primary_key: str | None = None,
+    categories: dict[str, dict[str, list[str]]] | None = None,
+    narrowed_types: dict[str, dict[str, str]] | None = None,
+    monitor: QualityMonitor | None = None,
 ) -> pl.LazyFrame:
     """
     Aplica limpeza e tipagem baseada em schema externo.
 
+    O schema é compilado uma única vez por configuração (`SCHEMA_PLANS`): os tipos são
+    resolvidos e as expressões de cast montadas apenas na primeira chamada.
+
+    A deduplicação usa `primary_key` (ou `id`, quando existir) e mantém a última linha de
+    cada chave na ordem do Raw (partes em ordem de extração): é assim que as linhas
+    recarregadas pelo `lookback_days` da ingestão substituem as versões anteriores. O
+    plano pode ser executado pelo engine streaming (`StreamingPolarsDataset`) com memória
+    proporcional ao número de chaves. Sem chave, apenas linhas inteiramente iguais são
+    removidas.
+
     Args:
         df (pl.LazyFrame): LazyFrame da camada Raw.
         target_schema (dict[str, str]): Dicionário do parameters.yml contendo o schema.
         table_name (str): Nome da tabela.
+        primary_key (str | None): Chave de deduplicação ('processing.primary_keys.<tabela>').
+        categories (dict | None): Registro de categorias (`{tabela: {coluna: valores}}`).
+            As colunas registradas viram `pl.Enum` fixos em vez de `pl.Categorical`.
+        narrowed_types (dict | None): Tipos sugeridos pelo perfil (`{tabela: {coluna:
+            tipo}}`), aplicados com a proteção de overflow de `apply_narrowed_types`.
+        monitor (QualityMonitor | None): Métricas de qualidade calculadas no mesmo plano
+            (ver `quality.process_with_quality`).
 
     Returns:
         pl.LazyFrame: Dataset processado.
 
     Raises:
-        ValueError: Levanta erro se a coluna esperada no schema não for encontrada na tabela.
+        ValueError: Colunas do schema ausentes na tabela e/ou tipos inválidos (todos
+            listados no mesmo erro).
     """
     logger.info(f"Processando '{table_name}'...")
 
-    expressions = []
-
-    for col_name, type_str in target_schema.items():
-        # 1. Validação de Existência (Fail Fast)
-        if col_name not in df.collect_schema().names():
-            msg = f"SCHEMA ERROR: Coluna '{col_name}' não encontrada na tabela '{table_name}'."
-            logger.error(msg)
-            raise ValueError(msg)
+    if narrowed_types:
+        target_schema = apply_narrowed_types(
+            df, target_schema, table_name, narrowed_types
+        )
+
+    # 1. Schema de entrada resolvido uma única vez
+    input_columns = df.collect_schema().names()
+
+    # 2. Validação completa: todas as colunas ausentes e tipos inválidos em um só erro
+    errors = [
+        f"Coluna '{col_name}' não encontrada na tabela '{table_name}'."
+        for col_name in target_schema
+        if col_name not in input_columns
+    ]
+
+    plan = None
+    try:
+        plan = SCHEMA_PLANS.get(target_schema, table_name)
+    except ValueError as e:
+        errors.append(str(e))
+
+    if errors:
+        msg = "SCHEMA ERROR: " + " | ".join(errors)
+        logger.error(msg)
+        raise ValueError(msg)
+
+    # 3. Expressões compiladas (reaproveitadas entre tabelas e execuções)
+    enums = (categories or {}).get(table_name, {})
+    expressions = [
+        cast_expr(col, pl.Enum(enums[col])) if col in enums else expr
+        for col, expr in zip(plan.dtypes, plan.expressions, strict=True)
+    ]
+
+    # Falhas de cast (Datetime com strict=False) marcadas no mesmo select do cast
+    flags = []
+    if monitor is not None:
+        flags = monitor.prepare(
+            dict(zip(plan.dtypes, expressions, strict=True)),
+            [col for col, dtype in plan.dtypes.items() if is_lenient_cast(dtype)],
+            plan.money_scales,
+        )
 
-        # 2. Resolução do Tipo
-        try:
-            dtype = _get_polars_type(type_str)
-        except ValueError as e:
-            logger.error(f"Configuração inválida em '{table_name}.{col_name}': {e}")
-            raise e
-
-        # 3. Construção da Expressão
-        expr = pl.col(col_name)
+    # 4. Projeção e Deduplicação
+    key = primary_key or ("id" if "id" in input_columns else None)
+
+    if key is None:
+        result = df.select(*expressions, *flags).unique(subset=list(plan.dtypes))
+    elif key not in target_schema:
+        msg = (
+            f"SCHEMA ERROR: Chave '{key}' não está no schema da tabela '{table_name}'."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+    else:
+        result = _keep_latest(df.select(*expressions, *flags), key)
 
-        # Lógicas específicas de Cast
-        if dtype == pl.Categorical:
-            expr = expr.str.strip_chars().cast(dtype)
+    # 5. Métricas coletadas lote a lote, sobre as linhas que serão gravadas
+    return monitor.attach(result) if monitor is not None else result
 
-        # O Polars trata Datetime diferente dependendo da entrada, strict=False é seguro
-        elif isinstance(dtype, pl.Datetime) or dtype == pl.Datetime:
-            expr = expr.cast(dtype, strict=False)
 
-        else:
-            expr = expr.cast(dtype)
+def _keep_latest(df: pl.LazyFrame, key: str) -> pl.LazyFrame:
+    """
+    Mantém a última ocorrência de cada chave, na ordem de leitura do Raw.
 
-        expressions.append(expr)
+    Equivale a `unique(subset=[key], keep="last")`, mas no engine streaming o `unique`
+    mantém as linhas inteiras em memória. Aqui o agrupamento guarda apenas (chave, posição)
+    e as linhas vencedoras são selecionadas por um semi join sobre a posição, portanto a
+    memória cresce com o número de chaves, e não com o tamanho das linhas.
 
-    # 4. Projeção e Deduplicação
-    df_clean = df.select(expressions)
+    Args:
+        df (pl.LazyFrame): Tabela já projetada e tipada.
+        key (str): Coluna de deduplicação.
 
-    if "id" in df.collect_schema().names():
-        df_clean = df_clean.unique(subset=["id"], keep="any")
-    else:
-        df_clean = df_clean.unique()
+    Returns:
+        pl.LazyFrame: Uma linha por chave.
+    """
+    indexed = df.with_row_index(ROW_INDEX_COLUMN)
+    latest = indexed.group_by(key).agg(pl.col(ROW_INDEX_COLUMN).max())
 
-    return df_clean
+    return indexed.join(
+        latest.select(ROW_INDEX_COLUMN), on=ROW_INDEX_COLUMN, how="semi"
+    ).drop(ROW_INDEX_COLUMN)
@@ -1,9 +1,49 @@
+import logging
+
 from kedro.pipeline import Node, Pipeline
 
+from thelook_ecommerce_analysis.pipelines.data_processing.categories import (
+    update_category_registry,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.geo import (
+    assign_nearest_distribution_center,
+    assign_order_distribution_center,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.incremental import (
+    process_table_incremental,
+)
 from thelook_ecommerce_analysis.pipelines.data_processing.nodes import process_table
+from thelook_ecommerce_analysis.pipelines.data_processing.quality import (
+    process_with_quality,
+    report_quality,
+)
+from thelook_ecommerce_analysis.utils.get_catalog import get_catalog_entry
 from thelook_ecommerce_analysis.utils.get_params import get_params
 from thelook_ecommerce_analysis.utils.partial_func import create_node_func
 
+logger = logging.getLogger(__name__)
+
+
+def _check_incremental_layout(tables: list[str]) -> None:
+    """
+    Falha na criação do pipeline se alguma tabela do Intermediate usa o layout
+    particionado por data, que não aceita as gravações por faixas da chave do modo
+    incremental.
+    """
+    partitioned = [
+        table
+        for table in tables
+        if get_catalog_entry(f"processing_intermediate_{table}").get("partition_by")
+    ]
+    if partitioned:
+        msg = (
+            f"Modo incremental incompatível com o layout particionado por data "
+            f"(partition_by) em: {partitioned}. Remova 'partition_by' dessas entradas "
+            "do catálogo ou desabilite 'processing.incremental.enabled'."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+
 
 def create_pipeline(**kwargs) -> Pipeline:
     # 1. Obter o parâmetro 'data_processing'
@@ -12,16 +52,81 @@ def create_pipeline(**kwargs) -> Pipeline:
     # 2. Extrair o nome das tabelas
     tables = list(config.get("schemas", {}).keys())
 
+    # Chaves de deduplicação que não são 'id' (ex: orders -> order_id)
+    primary_keys: dict = config.get("primary_keys", {})
+
+    # Modo incremental: apenas as partes Raw novas são mescladas ao Intermediate
+    incremental: dict = config.get("incremental", {})
+    if incremental.get("enabled", False):
+        _check_incremental_layout(tables)
+        func = process_table_incremental
+        incremental_inputs = {
+            name: f"params:processing.incremental.{name}"
+            for name in ("raw_dir", "intermediate_dir", "bucket_size", "id_index")
+            if name in incremental
+        }
+    else:
+        func = process_table
+        incremental_inputs = {}
+
     nodes = []
 
+    # Registro de categorias: colunas Categorical viram pl.Enum fixos entre tabelas e execuções
+    categories: dict = config.get("categories", {})
+    shared_inputs = {}  # Entradas comuns a todos os nós de processamento
+    if categories.get("enabled", False):
+        categorical_tables = [
+            table
+            for table, schema in config["schemas"].items()
+            if "Categorical" in schema.values()
+        ]
+        nodes.append(
+            Node(
+                func=create_node_func(
+                    update_category_registry, table_names=categorical_tables
+                ),
+                inputs=[
+                    "params:processing.schemas",
+                    "params:processing.categories",
+                    *(f"ingestion_raw_{table}" for table in categorical_tables),
+                ],
+                outputs="processing_categories",
+                name="update_category_registry_node",
+                tags=["processing", "categories"],
+            )
+        )
+        shared_inputs = {"categories": "processing_categories"}
+
+    # Tipos sugeridos pelo pipeline 'data_profiling' (opt-in, com proteção de overflow)
+    if config.get("narrowing", {}).get("enabled", False):
+        shared_inputs["narrowed_types"] = "profiling_narrowed_types"
+
+    # Métricas de qualidade no mesmo plano do processamento (relatório em um nó seguinte)
+    quality_enabled = config.get("quality", {}).get("enabled", False)
+    if quality_enabled:
+        shared_inputs["quality"] = "params:processing.quality"
+
     # 3. Pipeline Factory
     for table in tables:
         nodes.append(
             Node(
-                func=create_node_func(process_table, table_name=table),
+                func=(
+                    create_node_func(
+                        process_with_quality, process=func, table_name=table
+                    )
+                    if quality_enabled
+                    else create_node_func(func, table_name=table)
+                ),
                 inputs={
                     "df": f"ingestion_raw_{table}",
                     "target_schema": f"params:processing.schemas.{table}",
+                    **(
+                        {"primary_key": f"params:processing.primary_keys.{table}"}
+                        if table in primary_keys
+                        else {}
+                    ),
+                    **incremental_inputs,
+                    **shared_inputs,
                 },
                 outputs=f"processing_intermediate_{table}",
                 name=f"process_{table}_node",
@@ -29,4 +134,50 @@ def create_pipeline(**kwargs) -> Pipeline:
             )
         )
 
+        # O relatório depende do Intermediate gravado: os totais das métricas são
+        # gravados logo depois dele
+        if quality_enabled:
+            nodes.append(
+                Node(
+                    func=create_node_func(report_quality, table_name=table),
+                    inputs={
+                        "intermediate": f"processing_intermediate_{table}",
+                        "quality": "params:processing.quality",
+                    },
+                    outputs=f"processing_quality_{table}",
+                    name=f"report_{table}_quality_node",
+                    tags=["processing", "quality", table],
+                )
+            )
+
+    # Centro de distribuição mais próximo de cada usuário (e, por join, de cada pedido)
+    geo_enabled = config.get("geo", {}).get("enabled", False)
+    if geo_enabled and {"users", "distribution_centers"} <= set(tables):
+        nodes.append(
+            Node(
+                func=assign_nearest_distribution_center,
+                inputs=[
+                    "processing_intermediate_users",
+                    "processing_intermediate_distribution_centers",
+                    "params:processing.geo",
+                ],
+                outputs="processing_intermediate_user_distribution_centers",
+                name="assign_nearest_distribution_center_node",
+                tags=["processing", "geo"],
+            )
+        )
+        if "orders" in tables:
+            nodes.append(
+                Node(
+                    func=assign_order_distribution_center,
+                    inputs=[
+                        "processing_intermediate_orders",
+                        "processing_intermediate_user_distribution_centers",
+                    ],
+                    outputs="processing_intermediate_order_distribution_centers",
+                    name="assign_order_distribution_center_node",
+                    tags=["processing", "geo"],
+                )
+            )
+
     return Pipeline(nodes)
@@ -0,0 +1,304 @@
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import polars as pl
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
+
+logger = logging.getLogger(__name__)
+
+INTERMEDIATE_DATASET_TEMPLATE = "processing_intermediate_{table}"
+
+# Colunas auxiliares (valor presente no Raw que virou nulo no cast strict=False)
+CAST_FLAG_PREFIX = "__cast_failed__"
+
+METRICS_SCHEMA = {
+    "table": pl.String,
+    "column": pl.String,
+    "metric": pl.String,
+    "count": pl.Int64,
+    "rate": pl.Float64,
+    "threshold": pl.Float64,
+    "failed": pl.Boolean,
+}
+
+# Regras de faixa/ordem por coluna e o nome da métrica de cada uma
+RULE_METRICS = {"min": "below_min", "max": "above_max", "not_before": "before_{other}"}
+
+# Chave do limite de cada métrica (na coluna em 'rules' ou em 'defaults')
+THRESHOLD_KEYS = {
+    "null_rate": "max_null_rate",
+    "cast_failure_rate": "max_cast_failure_rate",
+}
+
+
+class QualityMonitor:
+    """
+    Métricas de qualidade de uma tabela, acumuladas lote a lote durante a gravação.
+
+    As agregações (nulos, datas descartadas pelo cast `strict=False` e violações das
+    regras de 'processing.quality.rules') são calculadas por um `map_batches` no próprio
+    plano do `process_table`, sobre as linhas que serão gravadas. Não há uma segunda
+    leitura dos dados: cada lote do engine streaming gera uma linha de somas parciais, e
+    os totais são gravados depois que o catálogo grava o Intermediate (ver
+    `process_with_quality`). O plano monitorado deve ser executado uma única vez.
+    """
+
+    def __init__(self, table_name: str, config: dict[str, Any]):
+        self.table_name = table_name
+        self._rules: dict[str, dict] = config.get("rules", {}).get(table_name, {})
+
+        self._lock = threading.Lock()
+        self._partials: list[pl.DataFrame] = []
+        self._aggregations: list[pl.Expr] = []
+        self._columns: list[str] = []
+        self._cast_checked: list[str] = []
+
+    def prepare(
+        self,
+        cast_expressions: dict[str, pl.Expr],
+        lenient_columns: list[str],
+        money_scales: dict[str, int],
+    ) -> list[pl.Expr]:
+        """
+        Monta as agregações da tabela e as colunas auxiliares de falha de cast.
+
+        Args:
+            cast_expressions (dict[str, pl.Expr]): Expressão de cast de cada coluna.
+            lenient_columns (list[str]): Colunas convertidas com `strict=False`
+                (Datetime), que ganham uma coluna auxiliar de falha de cast.
+            money_scales (dict[str, int]): Colunas `Money` (os limites das regras são
+                escalados, ex: `min: 0.5` -> 50 centavos).
+
+        Returns:
+            list[pl.Expr]: Colunas auxiliares, calculadas no mesmo `select` do cast.
+        """
+        self._columns = list(cast_expressions)
+        self._cast_checked = [c for c in lenient_columns if c in cast_expressions]
+        flags = [
+            (pl.col(col).is_not_null() & cast_expressions[col].is_null()).alias(
+                f"{CAST_FLAG_PREFIX}{col}"
+            )
+            for col in self._cast_checked
+        ]
+
+        aggregations = [pl.len().alias("rows")]
+        for col in self._columns:
+            aggregations.append(pl.col(col).null_count().alias(f"{col}:null_rate"))
+        for col in self._cast_checked:
+            aggregations.append(
+                pl.col(f"{CAST_FLAG_PREFIX}{col}")
+                .sum()
+                .alias(f"{col}:cast_failure_rate")
+            )
+
+        for col, rule in self._rules.items():
+            scale = 10 ** money_scales.get(col, 0)
+            for name, template in RULE_METRICS.items():
+                if name not in rule:
+                    continue
+                value = rule[name]
+                if name == "min":
+                    violated = pl.col(col) < value * scale
+                elif name == "max":
+                    violated = pl.col(col) > value * scale
+                else:
+                    violated = pl.col(col) < pl.col(value)
+                metric = template.format(other=value)
+                aggregations.append(violated.sum().alias(f"{col}:{metric}"))
+
+        self._aggregations = aggregations
+        return flags
+
+    def attach(self, df: pl.LazyFrame) -> pl.LazyFrame:
+        """Acrescenta ao plano a coleta das métricas (lote a lote) e remove as auxiliares."""
+        flags = [f"{CAST_FLAG_PREFIX}{col}" for col in self._cast_checked]
+        schema = df.drop(flags).collect_schema()
+
+        def _observe(batch: pl.DataFrame) -> pl.DataFrame:
+            partial = batch.select(self._aggregations)
+            with self._lock:
+                self._partials.append(partial)
+            return batch.drop(flags)
+
+        return df.map_batches(_observe, streamable=True, schema=schema)
+
+    def totals(self) -> dict[str, int]:
+        """Somas das métricas dos lotes executados (`{"rows": 0}` sem execução)."""
+        with self._lock:
+            partials = list(self._partials)
+
+        if not partials:
+            return {"rows": 0}
+        return pl.concat(partials).sum().row(0, named=True)
+
+    def save_totals(self, path: Path) -> None:
+        """Grava os totais (JSON) de forma atômica, para o nó do relatório."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(json.dumps(self.totals(), indent=2))
+        os.replace(tmp_path, path)
+
+
+def _totals_path(quality: dict[str, Any], table_name: str) -> Path:
+    totals_dir = quality.get("totals_dir", "data/08_reporting/quality/_totals")
+    return Path(totals_dir) / f"{table_name}.json"
+
+
+def _threshold(
+    quality: dict[str, Any], table_name: str, col: str, metric: str
+) -> float | None:
+    """Limite da métrica: o da coluna em 'rules' ou o padrão em 'defaults'."""
+    key = THRESHOLD_KEYS.get(metric, "max_violation_rate")
+    rules = quality.get("rules", {}).get(table_name, {})
+    return rules.get(col, {}).get(key, quality.get("defaults", {}).get(key))
+
+
+def build_report(
+    totals: dict[str, int], table_name: str, quality: dict[str, Any]
+) -> pl.DataFrame:
+    """
+    Consolida os totais em uma linha por métrica, avalia os limites e falha se configurado.
+
+    Args:
+        totals (dict[str, int]): Totais do `QualityMonitor` (`rows` e `<coluna>:<métrica>`).
+        table_name (str): Nome da tabela.
+        quality (dict[str, Any]): 'processing.quality' (`fail`, `defaults` e `rules`).
+
+    Returns:
+        pl.DataFrame: Relatório de métricas (`METRICS_SCHEMA`).
+
+    Raises:
+        ValueError: Com `fail: true` e algum limite excedido.
+    """
+    rows = totals["rows"]
+
+    report = [
+        {
+            "table": table_name,
+            "column": "*",
+            "metric": "rows",
+            "count": rows,
+            "failed": False,
+        }
+    ]
+    for name, count in totals.items():
+        if name == "rows":
+            continue
+        col, _, metric = name.rpartition(":")
+        rate = count / rows if rows else None
+        threshold = _threshold(quality, table_name, col, metric)
+        failed = threshold is not None and rate is not None and rate > threshold
+        report.append(
+            {
+                "table": table_name,
+                "column": col,
+                "metric": metric,
+                "count": count,
+                "rate": rate,
+                "threshold": threshold,
+                "failed": failed,
+            }
+        )
+
+    report_df = pl.DataFrame(report, schema=METRICS_SCHEMA)
+    failures = report_df.filter(pl.col("failed"))
+    for row in failures.iter_rows(named=True):
+        logger.warning(
+            f"Qualidade '{table_name}.{row['column']}': {row['metric']} = "
+            f"{row['rate']:.2%} ({row['count']} linha(s)), limite {row['threshold']:.2%}."
+        )
+    logger.info(
+        f"Qualidade '{table_name}': {rows} linha(s), {len(report)} métrica(s), "
+        f"{failures.height} acima do limite."
+    )
+
+    if failures.height and quality.get("fail", True):
+        checks = ", ".join(
+            f"{row['column']}:{row['metric']}" for row in failures.iter_rows(named=True)
+        )
+        msg = f"QUALITY ERROR: '{table_name}' excedeu os limites em: {checks}."
+        logger.error(msg)
+        raise ValueError(msg)
+
+    return report_df
+
+
+def process_with_quality(
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    quality: dict[str, Any],
+    process: Callable[..., Any],
+    **kwargs: Any,
+) -> Any:
+    """
+    Executa o processamento da tabela com as métricas de qualidade no mesmo plano.
+
+    As métricas são acumuladas enquanto o catálogo grava o Intermediate, e os totais são
+    gravados em `totals_dir` logo depois dessa gravação (`POST_SAVE_ACTIONS`). O
+    relatório é montado pelo `report_quality`, que recebe o Intermediate gravado como
+    entrada.
+
+    Args:
+        df (pl.LazyFrame): Camada Raw da tabela.
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela.
+        quality (dict[str, Any]): 'processing.quality' (`totals_dir`).
+        process (Callable): Função de processamento (`process_table` ou
+            `process_table_incremental`), que recebe o `monitor`.
+        **kwargs: Demais argumentos repassados para `process`.
+
+    Returns:
+        Any: Resultado de `process`.
+    """
+    monitor = QualityMonitor(table_name, quality)
+    path = _totals_path(quality, table_name)
+    path.unlink(missing_ok=True)  # Totais de uma execução anterior
+
+    # Antes das ações do `process` (ex: marcador do incremental): se os totais não forem
+    # gravados, as partes Raw continuam novas e são reprocessadas
+    POST_SAVE_ACTIONS.register(
+        INTERMEDIATE_DATASET_TEMPLATE.format(table=table_name),
+        lambda: monitor.save_totals(path),
+    )
+    return process(df, target_schema, table_name, monitor=monitor, **kwargs)
+
+
+def report_quality(
+    intermediate: Any, table_name: str, quality: dict[str, Any]
+) -> pl.DataFrame:
+    """
+    Monta o relatório de qualidade da tabela a partir dos totais do processamento.
+
+    Args:
+        intermediate (Any): Intermediate gravado. Não é lido: a entrada garante que o nó
+            só execute depois da gravação, que produz os totais.
+        table_name (str): Nome da tabela.
+        quality (dict[str, Any]): 'processing.quality' (`fail`, `defaults`, `rules` e
+            `totals_dir`).
+
+    Returns:
+        pl.DataFrame: Relatório de métricas (`METRICS_SCHEMA`).
+
+    Raises:
+        ValueError: Totais ausentes, ou `fail: true` e algum limite excedido.
+    """
+    path = _totals_path(quality, table_name)
+    if not path.is_file():
+        msg = (
+            f"QUALITY ERROR: Totais de '{table_name}' não encontrados em '{path}'. "
+            "O processamento da tabela deve ser executado antes do relatório."
+        )
+        logger.error(msg)
+        raise ValueError(msg)
+
+    totals = json.loads(path.read_text())
+    return build_report(totals, table_name, quality)
@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from typing import cast
+
+import polars as pl
+
+from thelook_ecommerce_analysis.pipelines.data_processing.geo import (
+    POINT_DTYPE,
+    parse_wkt_point,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.money import (
+    money_scale,
+    to_money,
+)
+
+logger = logging.getLogger(__name__)
+
+TYPE_MAPPING = {
+    # Inteiros
+    "UInt8": pl.UInt8,
+    "UInt16": pl.UInt16,
+    "UInt32": pl.UInt32,
+    "UInt64": pl.UInt64,
+    "Int8": pl.Int8,
+    "Int16": pl.Int16,
+    "Int32": pl.Int32,
+    "Int64": pl.Int64,
+    # Flutuantes
+    "Float32": pl.Float32,
+    "Float64": pl.Float64,
+    # Textos e Categorias
+    "String": pl.String,
+    "Categorical": pl.Categorical,
+    # Tempo
+    "Date": pl.Date,
+    "Datetime": pl.Datetime,  # Padrão (microssegundos)
+    "Boolean": pl.Boolean,
+    # Geografia: WKT `POINT(lon lat)` convertido em coordenadas (ver `geo.parse_wkt_point`)
+    "Point": POINT_DTYPE,
+}
+
+
+def get_polars_type(type_str: str) -> pl.DataType:
+    """
+    Resolve a string do YAML para um tipo Polars usando mapeamento direto.
+
+    `Money` e `Money(S)` resolvem para Int64: o valor é armazenado como inteiro escalado
+    (ver `money.to_money`). `Point` resolve para `Struct{longitude, latitude}`.
+
+    Args:
+        type_str (str): String do tipo Polars esperado.
+
+    Returns:
+        pl.DataType: Tipo Polars convertido.
+    """
+    clean_str = type_str.strip()
+
+    # 1. Busca Direta
+    if clean_str in TYPE_MAPPING:
+        return cast("pl.DataType", TYPE_MAPPING[clean_str])
+
+    # 2. Dinheiro: inteiro escalado (ex: centavos) em Int64
+    if money_scale(clean_str) is not None:
+        return pl.Int64
+
+    # 3. Caso Especial: Quando há argumentos
+    if clean_str.startswith("Decimal"):
+        try:
+            content = clean_str.split("(")[1].split(")")[0]
+            precision, scale = map(int, content.split(","))
+
+            # Validação
+            if precision < scale:
+                msg = (
+                    f"Precisão ({precision}) não pode ser menor que a Escala ({scale})."
+                )
+                logger.error(msg)
+                raise ValueError(msg)
+
+            return pl.Decimal(precision, scale)
+        except Exception as e:
+            logger.error(f"Erro ao parsear Decimal '{clean_str}' : {e}")
+            raise ValueError(
+                f"Decimal inválido: {clean_str}. Use formato 'Decimal(P, S)'."
+            ) from e
+
+    raise ValueError(f"Tipo desconhecido ou não permitido: '{clean_str}'.")
+
+
+def is_lenient_cast(dtype: pl.DataType) -> bool:
+    """Tipos convertidos com `strict=False`: valores inválidos viram nulo, sem erro."""
+    return isinstance(dtype, pl.Datetime) or dtype in (pl.Datetime, POINT_DTYPE)
+
+
+def cast_expr(col_name: str, dtype: pl.DataType) -> pl.Expr:
+    """
+    Monta a expressão de conversão de uma coluna para o tipo do schema.
+
+    Args:
+        col_name (str): Nome da coluna.
+        dtype (pl.DataType): Tipo Polars de destino.
+
+    Returns:
+        pl.Expr: Expressão de cast.
+    """
+    expr = pl.col(col_name)
+
+    # Lógicas específicas de Cast
+    if dtype == pl.Categorical or isinstance(dtype, pl.Enum):
+        # Passa por String: a coluna pode já chegar Categorical da ingestão
+        return expr.cast(pl.String).str.strip_chars().cast(dtype)
+
+    # O Polars trata Datetime diferente dependendo da entrada, strict=False é seguro
+    if is_lenient_cast(dtype):
+        return expr.cast(dtype, strict=False)
+
+    return expr.cast(dtype)
+
+
+@dataclass(frozen=True)
+class SchemaPlan:
+    """Schema de processamento compilado: tipos já resolvidos e expressões de cast prontas."""
+
+    config_hash: str
+    dtypes: dict[str, pl.DataType]
+    expressions: tuple[pl.Expr, ...]
+    money_scales: dict[str, int]
+
+
+def _schema_hash(target_schema: dict[str, str]) -> str:
+    """Hash da configuração do schema (a ordem das colunas faz parte do plano)."""
+    payload = json.dumps(list(target_schema.items()))
+    return hashlib.sha256(payload.encode("utf8")).hexdigest()
+
+
+def compile_schema_plan(target_schema: dict[str, str], table_name: str) -> SchemaPlan:
+    """
+    Resolve todos os tipos do schema e monta as expressões de cast.
+
+    Args:
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela (apenas para as mensagens de erro).
+
+    Returns:
+        SchemaPlan: Plano reutilizável para qualquer tabela com o mesmo schema.
+
+    Raises:
+        ValueError: Um ou mais tipos inválidos, todos listados na mesma mensagem.
+    """
+    dtypes = {}
+    money_scales = {}
+    errors = []
+
+    for col_name, type_str in target_schema.items():
+        try:
+            dtypes[col_name] = get_polars_type(type_str)
+            scale = money_scale(type_str)
+            if scale is not None:
+                money_scales[col_name] = scale
+        except ValueError as e:
+            errors.append(f"Configuração inválida em '{table_name}.{col_name}': {e}")
+
+    if errors:
+        raise ValueError(" | ".join(errors))
+
+    return SchemaPlan(
+        config_hash=_schema_hash(target_schema),
+        dtypes=dtypes,
+        expressions=tuple(
+            to_money(col, money_scales[col])
+            if col in money_scales
+            else parse_wkt_point(col)
+            if dtype == POINT_DTYPE
+            else cast_expr(col, dtype)
+            for col, dtype in dtypes.items()
+        ),
+        money_scales=money_scales,
+    )
+
+
+class SchemaPlanCache:
+    """
+    Planos de schema compilados, indexados pelo hash da configuração.
+
+    Compartilhado pela ingestão (cast dos lotes), pelo processamento e pela carga no
+    Postgres (DDL): tabelas com o mesmo schema e execuções seguintes no mesmo processo
+    (ex: sessões do Kedro em um notebook) reutilizam o plano, sem resolver os tipos
+    novamente.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plans: dict[str, SchemaPlan] = {}
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, target_schema: dict[str, str], table_name: str = "") -> SchemaPlan:
+        """
+        Retorna o plano do schema, compilando-o apenas na primeira vez.
+
+        Args:
+            target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+            table_name (str): Nome da tabela (apenas para as mensagens de erro).
+
+        Returns:
+            SchemaPlan: Plano compilado.
+        """
+        key = _schema_hash(target_schema)
+
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._hits += 1
+                return plan
+
+        plan = compile_schema_plan(target_schema, table_name)
+
+        with self._lock:
+            self._misses += 1
+            return self._plans.setdefault(key, plan)
+
+    def clear(self) -> None:
+        """Descarta os planos e zera as estatísticas."""
+        with self._lock:
+            self._plans.clear()
+            self._hits = 0
+            self._misses = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Planos em cache, reutilizações (hits) e compilações (misses)."""
+        with self._lock:
+            return {
+                "plans": len(self._plans),
+                "hits": self._hits,
+                "misses": self._misses,
+            }
+
+
+SCHEMA_PLANS = SchemaPlanCache()
@@ -0,0 +1,9 @@
+"""
+Pipeline 'data_profiling': perfil de tipos das tabelas Raw e sugestões de estreitamento.
+"""
+
+from .pipeline import create_pipeline
+
+__all__ = ["create_pipeline"]
+
+__version__ = "0.1"
@@ -0,0 +1,216 @@
+import logging
+from typing import Any
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Faixa de valores dos inteiros, do mais estreito para o mais largo
+UNSIGNED_TYPES = {"UInt8": 8, "UInt16": 16, "UInt32": 32, "UInt64": 64}
+SIGNED_TYPES = {"Int8": 8, "Int16": 16, "Int32": 32, "Int64": 64}
+
+# Bytes por valor em memória (Arrow/Polars)
+TYPE_WIDTHS = {
+    **{name: bits // 8 for name, bits in {**UNSIGNED_TYPES, **SIGNED_TYPES}.items()},
+    "Float32": 4,
+    "Float64": 8,
+    "Date": 4,
+    "Datetime": 8,
+    "Boolean": 1,
+    "Categorical": 4,
+    "Point": 16,  # Longitude e latitude em Float64
+}
+DECIMAL_WIDTH = 16
+STRING_VIEW_WIDTH = 16  # Cada String do Polars tem uma "view" de 16 bytes
+
+REPORT_SCHEMA = {
+    "table": pl.String,
+    "column": pl.String,
+    "current_type": pl.String,
+    "rows": pl.Int64,
+    "nulls": pl.Int64,
+    "cardinality": pl.Int64,
+    "min": pl.Int64,
+    "max": pl.Int64,
+    "suggested_type": pl.String,
+    "current_bytes": pl.Int64,
+    "suggested_bytes": pl.Int64,
+    "saved_bytes": pl.Int64,
+}
+
+
+def _is_integer_type(type_str: str) -> bool:
+    return type_str in UNSIGNED_TYPES or type_str in SIGNED_TYPES
+
+
+def _narrowest_integer(low: int, high: int) -> str:
+    """Menor tipo inteiro que comporta [low, high] (sem sinal quando possível)."""
+    types = UNSIGNED_TYPES if low >= 0 else SIGNED_TYPES
+    for name, bits in types.items():
+        if low >= 0 and high < 2**bits:
+            return name
+        if low < 0 and -(2 ** (bits - 1)) <= low and high < 2 ** (bits - 1):
+            return name
+    return "Int64"
+
+
+def suggest_type(type_str: str, stats: dict[str, Any], config: dict[str, Any]) -> str:
+    """
+    Sugere o tipo mais estreito e seguro para uma coluna a partir do seu perfil.
+
+    * Inteiros: o menor tipo que comporta [min, max * headroom].
+    * Strings: `Categorical` com poucos valores distintos (absolutos e relativos).
+    * Demais tipos (Float, Decimal, Datetime...) são mantidos.
+
+    Args:
+        type_str (str): Tipo atual no schema.
+        stats (dict[str, Any]): Perfil da coluna (`rows`, `nulls`, `cardinality`,
+            `min`, `max`).
+        config (dict[str, Any]): 'profiling' (`headroom`, `categorical_max_unique` e
+            `categorical_max_ratio`).
+
+    Returns:
+        str: Tipo sugerido (o próprio `type_str` quando não há ganho seguro).
+    """
+    non_null = stats["rows"] - stats["nulls"]
+
+    if _is_integer_type(type_str) and stats["min"] is not None:
+        high = int(stats["max"] * config.get("headroom", 2.0))
+        suggested = _narrowest_integer(stats["min"], max(high, stats["max"]))
+        # Só estreita: um tipo mais largo que o atual fica a cargo do schema
+        if TYPE_WIDTHS[suggested] < TYPE_WIDTHS[type_str]:
+            return suggested
+        return type_str
+
+    if type_str == "String" and non_null > 0:
+        cardinality = stats["cardinality"]
+        if cardinality <= config.get(
+            "categorical_max_unique", 1_000
+        ) and cardinality / non_null <= config.get("categorical_max_ratio", 0.05):
+            return "Categorical"
+
+    return type_str
+
+
+def _estimated_bytes(type_str: str, stats: dict[str, Any]) -> int:
+    """Memória estimada da coluna com o tipo `type_str`."""
+    rows = stats["rows"]
+    if type_str == "String":
+        return rows * STRING_VIEW_WIDTH + stats["string_bytes"]
+    if type_str == "Categorical":
+        # Códigos UInt32 + dicionário com os valores distintos
+        average = stats["string_bytes"] / max(rows - stats["nulls"], 1)
+        return rows * 4 + int(stats["cardinality"] * average)
+    if type_str.startswith("Decimal"):
+        return rows * DECIMAL_WIDTH
+    return rows * TYPE_WIDTHS.get(type_str, 8)
+
+
+def profile_table_dtypes(
+    df: pl.LazyFrame,
+    target_schema: dict[str, str],
+    table_name: str,
+    config: dict[str, Any] | None = None,
+) -> pl.DataFrame:
+    """
+    Perfila as colunas do schema em uma única passada vetorizada sobre o Raw.
+
+    Todas as agregações (nulos, cardinalidade aproximada, mínimo e máximo dos inteiros,
+    bytes das strings) fazem parte do mesmo `select`, executado pelo engine streaming.
+
+    Args:
+        df (pl.LazyFrame): Camada Raw da tabela.
+        target_schema (dict[str, str]): Schema 'processing.schemas.<tabela>'.
+        table_name (str): Nome da tabela.
+        config (dict[str, Any] | None): 'profiling' (folga e limites de categorias).
+
+    Returns:
+        pl.DataFrame: Uma linha por coluna, com o perfil, o tipo sugerido e os bytes
+            estimados (`REPORT_SCHEMA`).
+    """
+    config = config or {}
+    available = df.collect_schema().names()
+    columns = {c: t for c, t in target_schema.items() if c in available}
+
+    aggregations = [pl.len().alias("__rows")]
+    for col_name, type_str in columns.items():
+        col = pl.col(col_name)
+        aggregations += [
+            col.null_count().alias(f"{col_name}__nulls"),
+            col.approx_n_unique().alias(f"{col_name}__cardinality"),
+        ]
+        if _is_integer_type(type_str):
+            as_int = col.cast(pl.Int64, strict=False)
+            aggregations += [
+                as_int.min().alias(f"{col_name}__min"),
+                as_int.max().alias(f"{col_name}__max"),
+            ]
+        if type_str in ("String", "Categorical"):
+            aggregations.append(
+                col.cast(pl.String).str.len_bytes().sum().alias(f"{col_name}__bytes")
+            )
+
+    profile = df.select(aggregations).collect(engine="streaming").row(0, named=True)
+
+    rows = []
+    for col_name, type_str in columns.items():
+        stats = {
+            "rows": profile["__rows"],
+            "nulls": profile[f"{col_name}__nulls"],
+            "cardinality": profile[f"{col_name}__cardinality"],
+            "min": profile.get(f"{col_name}__min"),
+            "max": profile.get(f"{col_name}__max"),
+            "string_bytes": profile.get(f"{col_name}__bytes") or 0,
+        }
+        suggested = suggest_type(type_str, stats, config)
+        current_bytes = _estimated_bytes(type_str, stats)
+        suggested_bytes = _estimated_bytes(suggested, stats)
+
+        rows.append(
+            {
+                "table": table_name,
+                "column": col_name,
+                "current_type": type_str,
+                **{k: stats[k] for k in ("rows", "nulls", "cardinality", "min", "max")},
+                "suggested_type": suggested,
+                "current_bytes": current_bytes,
+                "suggested_bytes": suggested_bytes,
+                "saved_bytes": current_bytes - suggested_bytes,
+            }
+        )
+
+    return pl.DataFrame(rows, schema=REPORT_SCHEMA)
+
+
+def build_narrowing_advice(
+    *reports: pl.DataFrame,
+) -> tuple[pl.DataFrame, dict[str, dict[str, str]]]:
+    """
+    Consolida os perfis e extrai os tipos sugeridos diferentes dos atuais.
+
+    Args:
+        *reports (pl.DataFrame): Perfil de cada tabela (`profile_table_dtypes`).
+
+    Returns:
+        tuple[pl.DataFrame, dict[str, dict[str, str]]]: Relatório completo e os tipos
+            sugeridos `{tabela: {coluna: tipo}}` ('processing.narrowing').
+    """
+    report = pl.concat(reports) if reports else pl.DataFrame(schema=REPORT_SCHEMA)
+    changes = report.filter(pl.col("suggested_type") != pl.col("current_type"))
+
+    narrowed: dict[str, dict[str, str]] = {}
+    for row in changes.iter_rows(named=True):
+        narrowed.setdefault(row["table"], {})[row["column"]] = row["suggested_type"]
+        logger.info(
+            f"Sugestão '{row['table']}.{row['column']}': {row['current_type']} -> "
+            f"{row['suggested_type']} ({row['saved_bytes'] / 1024**2:.1f} MB a menos)."
+        )
+
+    saved = report["saved_bytes"].sum()
+    total = report["current_bytes"].sum()
+    logger.info(
+        f"Estreitamento de tipos: {changes.height} coluna(s), {saved / 1024**2:.1f} MB "
+        f"de {total / 1024**2:.1f} MB estimados em memória."
+    )
+
+    return report, narrowed
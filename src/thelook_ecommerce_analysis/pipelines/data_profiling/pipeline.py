@@ -0,0 +1,40 @@
+from kedro.pipeline import Node, Pipeline
+
+from thelook_ecommerce_analysis.pipelines.data_profiling.nodes import (
+    build_narrowing_advice,
+    profile_table_dtypes,
+)
+from thelook_ecommerce_analysis.utils.get_params import get_params
+from thelook_ecommerce_analysis.utils.partial_func import create_node_func
+
+
+def create_pipeline(**kwargs) -> Pipeline:
+    # Mesmas tabelas do processamento
+    tables = list(get_params("processing").get("schemas", {}).keys())
+
+    nodes = [
+        Node(
+            func=create_node_func(profile_table_dtypes, table_name=table),
+            inputs={
+                "df": f"ingestion_raw_{table}",
+                "target_schema": f"params:processing.schemas.{table}",
+                "config": "params:profiling",
+            },
+            outputs=f"profiling_dtypes_{table}",
+            name=f"profile_{table}_node",
+            tags=["profiling", table],
+        )
+        for table in tables
+    ]
+
+    nodes.append(
+        Node(
+            func=build_narrowing_advice,
+            inputs=[f"profiling_dtypes_{table}" for table in tables],
+            outputs=["profiling_dtype_report", "profiling_narrowed_types"],
+            name="build_narrowing_advice_node",
+            tags=["profiling"],
+        )
+    )
+
+    return Pipeline(nodes)
@@ -2,9 +2,19 @@
 from the Kedro defaults. For further information, including these default values, see
 https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 
-from thelook_ecommerce_analysis.hooks import ResourceMonitoringHook
+from thelook_ecommerce_analysis.hooks import (
+    BigQueryClientHook,
+    IngestionStateHook,
+    PostgresPoolHook,
+    ResourceMonitoringHook,
+)
 
-HOOKS = (ResourceMonitoringHook(),)
+HOOKS = (
+    ResourceMonitoringHook(),
+    BigQueryClientHook(),
+    IngestionStateHook(),
+    PostgresPoolHook(),
+)
 
 # Keyword arguments to pass to the `CONFIG_LOADER_CLASS` constructor.
 CONFIG_LOADER_ARGS = {
@@ -0,0 +1,20 @@
+from kedro.config import OmegaConfigLoader
+from kedro.framework.project import settings
+
+
+def get_catalog_entry(name: str) -> dict:
+    """
+    Helper interno para ler a entrada explícita de um dataset no catalog.yml antes do pipeline executar.
+
+    Args:
+        name (str): Nome do dataset no catálogo (ex: 'processing_intermediate_events').
+
+    Returns:
+        dict: Configuração do dataset (vazia se ele só existir via dataset factory)
+    """
+    conf_loader = OmegaConfigLoader(
+        conf_source=settings.CONF_SOURCE, base_env="base", default_run_env="local"
+    )
+    catalog = conf_loader["catalog"]
+
+    return catalog.get(name, {})
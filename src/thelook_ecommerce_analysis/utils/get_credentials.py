@@ -0,0 +1,23 @@
+from kedro.config import OmegaConfigLoader
+from kedro.framework.project import settings
+
+
+def get_credentials(key: str) -> dict:
+    """
+    Helper interno para carregar uma entrada do credentials.yml fora do catálogo.
+
+    Args:
+        key (str): Chave do credentials.yml que deseja extrair (ex: 'postgres').
+
+    Returns:
+        dict: Dicionário com as credenciais
+    """
+    conf_loader = OmegaConfigLoader(
+        conf_source=settings.CONF_SOURCE, base_env="base", default_run_env="local"
+    )
+    credentials = conf_loader["credentials"]
+
+    if key not in credentials:
+        raise KeyError(f"Chave '{key}' não encontrada em credentials.yml.")
+
+    return credentials[key]
@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+import psycopg
+from psycopg import pq
+
+logger = logging.getLogger(__name__)
+
+# Chaves de uma entrada do credentials.yml repassadas ao libpq (ex: sem `driver`)
+CONNINFO_KEYS = ("host", "port", "dbname", "user", "password")
+
+
+def build_conninfo(credentials: dict[str, Any]) -> str:
+    """Conn string (formato libpq) a partir de uma entrada do credentials.yml."""
+    return psycopg.conninfo.make_conninfo(
+        **{key: credentials[key] for key in CONNINFO_KEYS}
+    )
+
+
+class PostgresPool:
+    """
+    Pool thread-safe de conexões com o Postgres, aberto sob demanda.
+
+    As conexões são abertas na primeira vez em que faltam (até `size`) e reutilizadas
+    pelos nós e threads do processo: quem pede uma conexão com todas emprestadas espera
+    até `timeout` segundos pela próxima devolvida. O pool registra o tempo de espera e o
+    tempo de uso das conexões (`stats`), reportados pelo `ResourceMonitoringHook`.
+    """
+
+    def __init__(self, conninfo: str, size: int = 4, timeout: float = 30.0):
+        """
+        Args:
+            conninfo (str): Conn string do Postgres (`build_conninfo`).
+            size (int): Máximo de conexões abertas.
+            timeout (float): Segundos de espera por uma conexão livre.
+        """
+        self.size = max(1, size)
+        self._conninfo = conninfo
+        self._timeout = timeout
+        self._condition = threading.Condition()
+        self._idle: list[psycopg.Connection] = []
+        self._closed = False
+        self._opened = 0
+        self._in_use = 0
+        self._peak = 0
+        self._borrows = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._max_wait = 0.0
+        self._busy_seconds = 0.0
+        self._created_at = time.perf_counter()
+
+    def _acquire(self) -> psycopg.Connection:
+        """Conexão livre (ou nova, abaixo de `size`), esperando se necessário."""
+        start = time.perf_counter()
+        with self._condition:
+            waited = False
+            while not self._idle and self._opened >= self.size:
+                remaining = self._timeout - (time.perf_counter() - start)
+                if remaining <= 0:
+                    msg = (
+                        f"POOL ERROR: Nenhuma conexão livre em {self._timeout}s "
+                        f"({self.size} em uso)."
+                    )
+                    logger.error(msg)
+                    raise TimeoutError(msg)
+                waited = True
+                self._condition.wait(remaining)
+
+            wait = time.perf_counter() - start
+            self._borrows += 1
+            self._waits += waited
+            self._wait_seconds += wait
+            self._max_wait = max(self._max_wait, wait)
+            self._in_use += 1
+            self._peak = max(self._peak, self._in_use)
+            if self._idle:
+                return self._idle.pop()
+            self._opened += 1
+
+        # Conexão nova aberta fora do lock, sem bloquear as devoluções
+        try:
+            return psycopg.connect(self._conninfo)
+        except Exception:
+            self._release(None, 0.0)
+            raise
+
+    def _release(self, conn: psycopg.Connection | None, busy: float) -> None:
+        """Devolve a conexão (ou descarta, se quebrada ou com o pool fechado)."""
+        with self._condition:
+            self._in_use -= 1
+            self._busy_seconds += busy
+            if conn is None or conn.closed or self._closed:
+                self._opened -= 1
+                if conn is not None:
+                    _close_connection(conn)
+            else:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[psycopg.Connection]:
+        """
+        Empresta uma conexão até o fim do bloco.
+
+        Ao final, uma transação em aberto é confirmada (ou desfeita, se o bloco falhar),
+        e a conexão volta ao pool limpa. Conexões quebradas são fechadas e descartadas.
+        """
+        conn = self._acquire()
+        start = time.perf_counter()
+        try:
+            yield conn
+            if conn.info.transaction_status == pq.TransactionStatus.INTRANS:
+                conn.commit()
+        finally:
+            if conn.info.transaction_status != pq.TransactionStatus.IDLE:
+                # Bloco com erro (ou conexão em estado inesperado): desfaz ou descarta
+                try:
+                    conn.rollback()
+                except psycopg.Error:
+                    conn.close()
+            self._release(conn, time.perf_counter() - start)
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """
+        Uso do pool desde a abertura.
+
+        `borrows` empréstimos, dos quais `waits` esperaram por uma conexão livre
+        (`wait_seconds` no total, `max_wait` o maior). `utilization` é a fração do tempo
+        de `size` conexões em que elas estiveram emprestadas (`busy_seconds`).
+        """
+        with self._condition:
+            elapsed = time.perf_counter() - self._created_at
+            return {
+                "size": self.size,
+                "open": self._opened,
+                "in_use": self._in_use,
+                "peak": self._peak,
+                "borrows": self._borrows,
+                "waits": self._waits,
+                "wait_seconds": self._wait_seconds,
+                "max_wait": self._max_wait,
+                "busy_seconds": self._busy_seconds,
+                "utilization": self._busy_seconds / (self.size * elapsed)
+                if elapsed
+                else 0.0,
+            }
+
+    def close(self) -> None:
+        """Fecha as conexões livres (as emprestadas são fechadas ao serem devolvidas)."""
+        with self._condition:
+            self._closed = True
+            for conn in self._idle:
+                _close_connection(conn)
+            self._opened -= len(self._idle)
+            self._idle.clear()
+
+
+def _close_connection(conn: psycopg.Connection) -> None:
+    try:
+        conn.close()
+    except Exception as e:
+        logger.warning(f"Falha ao fechar conexão do Postgres: {e}")
+
+
+class PostgresPoolRegistry:
+    """
+    Registro thread-safe dos pools de conexão do processo, um por banco.
+
+    Os pools são compartilhados pelos nós (dataset `PostgresPoolDataset` e stores que
+    recebem credenciais) e fechados pelo hook `PostgresPoolHook` ao final do pipeline.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pools: dict[str, PostgresPool] = {}
+
+    def get_pool(
+        self, credentials: dict[str, Any], size: int = 4, timeout: float = 30.0
+    ) -> PostgresPool:
+        """
+        Retorna o pool do banco das credenciais, criando-o se necessário.
+
+        O primeiro pedido define o tamanho: pedidos seguintes para o mesmo banco
+        reutilizam o pool existente.
+
+        Args:
+            credentials (dict[str, Any]): Entrada do credentials.yml (ex: 'postgres').
+            size (int): Máximo de conexões abertas.
+            timeout (float): Segundos de espera por uma conexão livre.
+
+        Returns:
+            PostgresPool: Pool compartilhado.
+        """
+        conninfo = build_conninfo(credentials)
+        with self._lock:
+            if conninfo not in self._pools:
+                self._pools[conninfo] = PostgresPool(conninfo, size, timeout)
+                logger.info(
+                    f"Pool do Postgres '{credentials['dbname']}' criado "
+                    f"({size} conexão(ões))."
+                )
+            return self._pools[conninfo]
+
+    @property
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Uso de cada pool (`PostgresPool.stats`), pelo host/banco."""
+        with self._lock:
+            pools = list(self._pools.items())
+        return {
+            "{host}/{dbname}".format(**psycopg.conninfo.conninfo_to_dict(conninfo)): (
+                pool.stats
+            )
+            for conninfo, pool in pools
+        }
+
+    def close_all(self) -> None:
+        """Fecha todos os pools e zera o registro."""
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
+
+
+# Registro único do processo
+POSTGRES_POOLS = PostgresPoolRegistry()
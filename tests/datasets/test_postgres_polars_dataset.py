@@ -0,0 +1,262 @@
+from collections.abc import Iterator
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from unittest.mock import MagicMock
+
+import polars as pl
+import psycopg
+import pytest
+from kedro.io import DatasetError
+from psycopg import pq
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.datasets import PostgresPolarsDataset
+from thelook_ecommerce_analysis.datasets.postgres_polars_dataset import (
+    _column_type,
+    build_select,
+    iter_copy_data,
+    parse_copy_text,
+)
+
+CREDENTIALS = {
+    "host": "localhost",
+    "port": 5432,
+    "dbname": "thelook_db",
+    "user": "admin",
+    "password": "secret",
+}
+
+TYPE_NAMES = {
+    "id": "int8",
+    "price": "numeric",
+    "active": "bool",
+    "created_at": "timestamp",
+    "day": "date",
+    "name": "text",
+    "raw": "bytea",
+}
+
+SCHEMA = {
+    "id": pl.Int64,
+    "price": pl.Decimal(10, 2),
+    "active": pl.Boolean,
+    "created_at": pl.Datetime("us"),
+    "day": pl.Date,
+    "name": pl.String,
+    "raw": pl.Binary,
+}
+
+COPY_LINES = [
+    b"1\t10.50\tt\t2025-01-02 03:04:05.5\t2025-01-02\ta\\tb\\nc\\\\d\t\\\\x00ff\n",
+    b"2\t\\N\tf\t2025-01-03 00:00:00\t\\N\t\t\\N\n",
+    b"3\t0.00\t\\N\t\\N\t2025-01-04\t\\N\t\\\\x\n",
+]
+
+
+def test_column_type_from_postgres_type():
+    """Testa o tipo Polars pelo tipo do Postgres (numeric sem precisão vira Float64)."""
+    assert _column_type("int4", None, None) == pl.Int32
+    assert _column_type("numeric", 18, 2) == pl.Decimal(18, 2)
+    assert _column_type("numeric", None, None) == pl.Float64
+    assert _column_type("timestamptz", None, None) == pl.Datetime("us", "UTC")
+    assert _column_type("uuid", None, None) == pl.String
+
+
+def test_parse_copy_text_types_nulls_and_escapes():
+    """Testa a conversão do texto do COPY: tipos, nulos (\\N), escapes e bytea em hex."""
+    df = parse_copy_text(b"".join(COPY_LINES), SCHEMA, TYPE_NAMES)
+
+    assert df.schema == pl.Schema(SCHEMA)
+    assert df.row(0) == (
+        1,
+        Decimal("10.50"),
+        True,
+        datetime(2025, 1, 2, 3, 4, 5, 500000),
+        date(2025, 1, 2),
+        "a\tb\nc\\d",
+        b"\x00\xff",
+    )
+    assert df.row(1) == (2, None, False, datetime(2025, 1, 3), None, "", None)
+    assert df["raw"][2] == b""
+
+
+def test_parse_copy_text_escapes_round_trip():
+    """Testa a volta de todos os escapes do COPY TO, inclusive a barra antes de letras."""
+    original = "a\\b\bc\fd\ne\rf\tg\vh\\\\n"
+    # Escapes como o Postgres os gera: a barra primeiro, depois os caracteres de controle
+    escaped = original.replace("\\", "\\\\")
+    for char, code in zip("\b\f\n\r\t\v", "bfnrtv", strict=True):
+        escaped = escaped.replace(char, f"\\{code}")
+
+    df = parse_copy_text(f"{escaped}\n".encode(), {"name": pl.String}, {"name": "text"})
+
+    assert df["name"][0] == original
+
+
+def test_parse_copy_text_numeric_nan():
+    """Testa `NaN` do numeric: nulo no Decimal (sem abortar a leitura) e NaN no Float64."""
+    df = parse_copy_text(
+        b"1.50\tNaN\nNaN\t2.5\n\\N\tInfinity\n",
+        {"price": pl.Decimal(10, 2), "ratio": pl.Float64},
+        {"price": "numeric", "ratio": "numeric"},
+    )
+
+    assert df["price"].to_list() == [Decimal("1.50"), None, None]
+    assert df["price"].dtype == pl.Decimal(10, 2)
+    assert df["ratio"].is_nan().to_list() == [True, False, False]
+    assert df["ratio"][2] == float("inf")
+
+
+def test_parse_copy_text_empty_keeps_schema():
+    """Testa que um resultado vazio mantém as colunas e os tipos."""
+    df = parse_copy_text(b"", SCHEMA, TYPE_NAMES)
+
+    assert df.is_empty()
+    assert df.schema == pl.Schema(SCHEMA)
+
+
+def test_build_select_pushdown():
+    """Testa a projeção e os filtros (com literais) empurrados para o SELECT."""
+    statement = build_select(
+        "orders",
+        columns=["order_id", "status"],
+        filters=[["created_at", ">=", "2025-06-01"], ["status", "in", ["A", "B'"]]],
+    )
+
+    assert statement.as_string() == (
+        'SELECT "order_id", "status" FROM "public"."orders" '
+        "WHERE \"created_at\" >= '2025-06-01' AND \"status\" IN ('A', 'B''')"
+    )
+    assert build_select(query="SELECT 1 AS x").as_string() == (
+        "SELECT * FROM (SELECT 1 AS x) AS q"
+    )
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"table": "orders", "query": "SELECT 1"},
+        {"table": "orders", "filters": [["id", "like", "1%"]]},
+        {"table": "orders", "filters": [["id", "="]]},
+    ],
+)
+def test_build_select_invalid(kwargs: dict[str, Any]):
+    """Testa a origem obrigatória (tabela ou query) e os filtros inválidos."""
+    with pytest.raises(DatasetError):
+        build_select(**kwargs)
+
+
+def _pgconn(messages: list[bytes], status: pq.ExecStatus) -> MagicMock:
+    """PGconn falso: mensagens já recebidas, fim do COPY e o resultado final."""
+    pgconn = MagicMock()
+    pgconn.get_copy_data.side_effect = [(len(m), m) for m in messages] + [(-1, b"")]
+    result = MagicMock(status=status, error_message=b"ERROR:  division by zero")
+    pgconn.get_result.side_effect = [result, None]
+    return pgconn
+
+
+def test_iter_copy_data_reads_buffered_messages():
+    """Testa a leitura das mensagens já recebidas direto do libpq e o fim do COPY."""
+    copy = MagicMock()
+    copy.read.return_value = COPY_LINES[0]
+    pgconn = _pgconn(COPY_LINES[1:], pq.ExecStatus.COMMAND_OK)
+
+    assert list(iter_copy_data(copy, pgconn)) == COPY_LINES
+    copy.read.assert_called_once()
+    assert pgconn.get_result.call_count == 2
+
+
+def test_iter_copy_data_waits_and_raises_database_error():
+    """Testa a espera pelo copy.read() sem mensagens recebidas e o erro do banco."""
+    copy = MagicMock()
+    copy.read.side_effect = [COPY_LINES[0], COPY_LINES[1]]
+    pgconn = _pgconn([], pq.ExecStatus.FATAL_ERROR)
+    pgconn.get_copy_data.side_effect = [(0, b""), (-1, b"")]
+
+    with pytest.raises(DatasetError, match="division by zero"):
+        list(iter_copy_data(copy, pgconn))
+    assert copy.read.call_count == 2
+
+
+@pytest.mark.parametrize("reader", ["copy.read", "pgconn.get_copy_data"])
+def test_iter_copy_data_wraps_psycopg_errors(reader: str):
+    """Testa que erros do psycopg durante o COPY (socket ou libpq) viram DatasetError."""
+    copy = MagicMock()
+    copy.read.return_value = COPY_LINES[0]
+    pgconn = _pgconn(COPY_LINES[1:], pq.ExecStatus.COMMAND_OK)
+    mocks = {"copy.read": copy.read, "pgconn.get_copy_data": pgconn.get_copy_data}
+    mocks[reader].side_effect = psycopg.OperationalError("server closed the connection")
+
+    with pytest.raises(DatasetError, match="Falha no COPY: server closed"):
+        list(iter_copy_data(copy, pgconn))
+
+
+@pytest.fixture
+def mock_read(mocker: MockerFixture) -> MagicMock:
+    """Pool, descrição do resultado e mensagens do COPY falsos (uma linha cada)."""
+    module = "thelook_ecommerce_analysis.datasets.postgres_polars_dataset"
+    mock_pools = mocker.patch(f"{module}.POSTGRES_POOLS")
+    conn = (
+        mock_pools.get_pool.return_value.connection.return_value.__enter__.return_value
+    )
+    mocker.patch(
+        f"{module}._describe_result",
+        return_value=(
+            {"id": pl.Int64, "name": pl.String},
+            {"id": "int8", "name": "text"},
+        ),
+    )
+
+    def _copy_data(copy: Any, pgconn: Any) -> Iterator[bytes]:
+        yield from (f"{i}\tn{i}\n".encode() for i in range(5))
+
+    mocker.patch(f"{module}.iter_copy_data", side_effect=_copy_data)
+    return conn
+
+
+def test_load_dataframe(mock_read: MagicMock):
+    """Testa o load como DataFrame, com o COPY do SELECT e os ajustes da sessão."""
+    dataset = PostgresPolarsDataset(
+        credentials=CREDENTIALS, table="users", columns=["id", "name"]
+    )
+
+    df = dataset.load()
+
+    assert df.to_dict(as_series=False) == {
+        "id": [0, 1, 2, 3, 4],
+        "name": ["n0", "n1", "n2", "n3", "n4"],
+    }
+    copy_sql = mock_read.cursor.return_value.copy.call_args.args[0]
+    assert copy_sql.as_string() == (
+        'COPY (SELECT "id", "name" FROM "public"."users") TO STDOUT'
+    )
+    settings = [call.args[0].as_string() for call in mock_read.execute.call_args_list]
+    assert "SET LOCAL \"TimeZone\" = 'UTC'" in settings
+    # Conexão devolvida ao pool ao final do load
+    mock_read.transaction.return_value.__exit__.assert_called_once()
+
+
+def test_load_chunks(mock_read: MagicMock):
+    """Testa o load em lotes de 'chunk_rows' linhas, com o restante no último."""
+    dataset = PostgresPolarsDataset(
+        credentials=CREDENTIALS, table="users", chunk_rows=2
+    )
+
+    chunks = list(dataset.load())
+
+    assert [chunk.height for chunk in chunks] == [2, 2, 1]
+    assert pl.concat(chunks)["id"].to_list() == [0, 1, 2, 3, 4]
+
+
+def test_describe_and_save_fails():
+    """Testa a descrição sem as credenciais e que o dataset é somente leitura."""
+    dataset = PostgresPolarsDataset(
+        credentials=CREDENTIALS, table="orders", filters=[["status", "=", "Complete"]]
+    )
+
+    assert "secret" not in str(dataset)
+    assert dataset._describe()["source"] == "public.orders"
+    with pytest.raises(DatasetError, match="somente leitura"):
+        dataset.save(pl.DataFrame())
@@ -0,0 +1,34 @@
+import pytest
+from kedro.io import DatasetError
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.datasets import PostgresPoolDataset
+
+CREDENTIALS = {
+    "host": "localhost",
+    "port": 5432,
+    "dbname": "thelook_db",
+    "user": "admin",
+    "password": "secret",
+}
+
+
+def test_load_returns_shared_pool(mocker: MockerFixture):
+    """Testa que o load retorna o pool compartilhado das credenciais, com o tamanho do dataset."""
+    mock_pools = mocker.patch(
+        "thelook_ecommerce_analysis.datasets.postgres_pool_dataset.POSTGRES_POOLS"
+    )
+    dataset = PostgresPoolDataset(credentials=CREDENTIALS, pool_size=8, timeout=5)
+
+    assert dataset.load() is mock_pools.get_pool.return_value
+    mock_pools.get_pool.assert_called_once_with(CREDENTIALS, 8, 5)
+
+
+def test_describe_hides_password_and_save_fails():
+    """Testa que a senha fica fora da descrição e que o dataset é somente leitura."""
+    dataset = PostgresPoolDataset(credentials=CREDENTIALS)
+
+    assert "secret" not in str(dataset)
+    assert dataset._describe()["pool_size"] == 4
+    with pytest.raises(DatasetError, match="somente leitura"):
+        dataset.save("pool")
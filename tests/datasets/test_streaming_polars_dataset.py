@@ -0,0 +1,262 @@
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+import pyarrow.parquet as pq
+import pytest
+from kedro.io import DatasetError
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.datasets import StreamingPolarsDataset
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> StreamingPolarsDataset:
+    """Dataset apontando para um arquivo temporário."""
+    return StreamingPolarsDataset(
+        filepath=str(tmp_path / "raw" / "orders.parquet"),
+        save_args={"compression": "zstd"},
+    )
+
+
+def test_save_lazyframe_and_load(dataset: StreamingPolarsDataset):
+    """Testa se um LazyFrame é gravado (sink) e lido de volta como LazyFrame."""
+    dataset.save(pl.LazyFrame({"id": [1, 2, 3]}))
+
+    loaded = dataset.load()
+
+    assert isinstance(loaded, pl.LazyFrame)
+    assert loaded.collect()["id"].to_list() == [1, 2, 3]
+
+
+def test_save_dataframe(dataset: StreamingPolarsDataset):
+    """Testa se um DataFrame eager também é aceito."""
+    dataset.save(pl.DataFrame({"id": [1]}))
+
+    assert dataset.exists()
+    assert dataset.load().collect().height == 1
+
+
+def test_save_lazyframe_reading_from_destination(dataset: StreamingPolarsDataset):
+    """Testa se é seguro salvar um LazyFrame que lê do próprio destino."""
+    dataset.save(pl.DataFrame({"id": [1, 2]}))
+
+    dataset.save(dataset.load().filter(pl.col("id") > 1))
+
+    assert dataset.load().collect()["id"].to_list() == [2]
+
+
+def test_load_directory_of_parts(tmp_path: Path):
+    """Testa se um diretório de arquivos parquet é lido como uma única tabela."""
+    parts_dir = tmp_path / "events"
+    parts_dir.mkdir()
+    pl.DataFrame({"id": [1]}).write_parquet(parts_dir / "part-1.parquet")
+    pl.DataFrame({"id": [2]}).write_parquet(parts_dir / "part-2.parquet")
+
+    dataset = StreamingPolarsDataset(filepath=str(parts_dir))
+
+    assert sorted(dataset.load().collect()["id"].to_list()) == [1, 2]
+
+
+def test_load_directory_parts_in_name_order(tmp_path: Path):
+    """Testa se as partes são lidas em ordem de nome (ordem de extração)."""
+    parts_dir = tmp_path / "orders"
+    parts_dir.mkdir()
+    pl.DataFrame({"id": [2]}).write_parquet(parts_dir / "part-2025-02.parquet")
+    pl.DataFrame({"id": [1]}).write_parquet(parts_dir / "part-2025-01.parquet")
+
+    dataset = StreamingPolarsDataset(filepath=str(parts_dir))
+
+    assert dataset.load().collect()["id"].to_list() == [1, 2]
+
+
+def test_sink_disables_common_subplan_elimination(
+    dataset: StreamingPolarsDataset, mocker: MockerFixture
+):
+    """Testa se o sink desliga o cache de subplanos, que reteria a entrada em memória."""
+    frame = pl.LazyFrame({"id": [1]})
+    sink = mocker.spy(pl.LazyFrame, "sink_parquet")
+
+    dataset.save(frame)
+
+    optimizations = sink.call_args.kwargs["optimizations"]
+    assert optimizations.comm_subplan_elim is False
+    assert sink.call_args.kwargs["compression"] == "zstd"
+
+
+def test_failed_save_keeps_previous_file(
+    dataset: StreamingPolarsDataset, mocker: MockerFixture
+):
+    """Testa se uma falha na escrita não corrompe o arquivo anterior nem deixa temporários."""
+    dataset.save(pl.DataFrame({"id": [1]}))
+
+    mocker.patch.object(pl.LazyFrame, "sink_parquet", side_effect=OSError("disk full"))
+
+    with pytest.raises(DatasetError, match="disk full"):
+        dataset.save(pl.LazyFrame({"id": [9]}))
+
+    assert dataset.load().collect()["id"].to_list() == [1]
+    assert not list(dataset._filepath.parent.glob(".*.tmp"))
+
+
+def test_load_missing_file_raises(dataset: StreamingPolarsDataset):
+    """Testa se carregar um arquivo inexistente gera DatasetError."""
+    with pytest.raises(DatasetError, match="não encontrado"):
+        dataset.load()
+
+
+def test_directory_save_parts_appends(tmp_path: Path):
+    """Testa se salvar um dicionário adiciona partes e mantém as existentes."""
+    dataset = StreamingPolarsDataset(filepath=str(tmp_path / "orders"))
+
+    dataset.save({"2025-01-01_2025-01-10": pl.DataFrame({"id": [1, 2]})})
+    dataset.save({"2025-01-08_2025-01-15": pl.LazyFrame({"id": [3]})})
+
+    assert sorted(dataset.load().collect()["id"].to_list()) == [1, 2, 3]
+    assert len(list((tmp_path / "orders").glob("part-*.parquet"))) == 2
+
+
+def test_directory_save_empty_parts_is_noop(tmp_path: Path):
+    """Testa se um dicionário vazio não altera o diretório."""
+    dataset = StreamingPolarsDataset(filepath=str(tmp_path / "orders"))
+    dataset.save({"a": pl.DataFrame({"id": [1]})})
+
+    dataset.save({})
+
+    assert dataset.load().collect()["id"].to_list() == [1]
+
+
+def test_directory_save_frame_replaces_all_parts(tmp_path: Path):
+    """Testa se salvar um frame no modo diretório substitui todas as partes."""
+    dataset = StreamingPolarsDataset(filepath=str(tmp_path / "products"))
+    dataset.save({"a": pl.DataFrame({"id": [1]}), "b": pl.DataFrame({"id": [2]})})
+
+    dataset.save(dataset.load().filter(pl.col("id") == 2))
+
+    assert dataset.load().collect()["id"].to_list() == [2]
+    assert [p.name for p in (tmp_path / "products").iterdir()] == ["part-0.parquet"]
+
+
+def test_file_dataset_rejects_parts(dataset: StreamingPolarsDataset):
+    """Testa se a gravação por partes exige um diretório."""
+    with pytest.raises(DatasetError, match="exige um diretório"):
+        dataset.save({"a": pl.DataFrame({"id": [1]})})
+
+
+def test_directory_save_splits_rows_by_part_column(tmp_path: Path):
+    """Testa se a coluna `_part` distribui as linhas em partes, sem ser gravada."""
+    dataset = StreamingPolarsDataset(filepath=str(tmp_path / "orders"))
+
+    dataset.save(pl.LazyFrame({"id": [1, 2, 3], "_part": ["a", "b", "a"]}))
+
+    part_a = pl.read_parquet(tmp_path / "orders" / "part-a.parquet")
+    assert part_a.columns == ["id"]
+    assert part_a["id"].to_list() == [1, 3]
+    assert (tmp_path / "orders" / "part-b.parquet").is_file()
+
+
+@pytest.fixture
+def events() -> pl.LazyFrame:
+    """Eventos fora de ordem em três meses (um sem data)."""
+    return pl.LazyFrame(
+        {
+            "id": [5, 1, 4, 2, 3, 6],
+            "created_at": [
+                datetime(2025, 2, 10),
+                datetime(2025, 1, 5),
+                datetime(2025, 1, 20),
+                datetime(2025, 2, 1),
+                datetime(2024, 12, 31),
+                None,
+            ],
+        }
+    )
+
+
+def test_date_partitioned_layout_is_hive_and_sorted(
+    tmp_path: Path, events: pl.LazyFrame
+):
+    """Testa se as linhas vão para year=/month= e cada arquivo é ordenado por sort_by."""
+    dataset = StreamingPolarsDataset(
+        filepath=str(tmp_path / "events"), partition_by="created_at", sort_by=["id"]
+    )
+
+    dataset.save(events)
+
+    january = pl.read_parquet(tmp_path / "events/year=2025/month=1/part-0.parquet")
+    assert january.columns == ["id", "created_at"]
+    assert january["id"].to_list() == [1, 4]
+    null_part = tmp_path / "events/year=__HIVE_DEFAULT_PARTITION__"
+    assert (null_part / "month=__HIVE_DEFAULT_PARTITION__/part-0.parquet").is_file()
+
+    loaded = dataset.load().collect().sort("id")
+    assert loaded["id"].to_list() == [1, 2, 3, 4, 5, 6]
+    assert loaded["year"].to_list() == [2025, 2025, 2024, 2025, 2025, None]
+
+
+def test_date_partitioned_prunes_partitions(tmp_path: Path, events: pl.LazyFrame):
+    """Testa se filtros em year/month descartam partições antes da leitura."""
+    dataset = StreamingPolarsDataset(
+        filepath=str(tmp_path / "events"), partition_by="created_at"
+    )
+    dataset.save(events)
+
+    plan = dataset.load().filter(pl.col("year") == 2025, pl.col("month") == 2).explain()
+
+    assert "month=2" in plan
+    assert "month=1/" not in plan
+
+
+def test_date_partitioned_row_groups_have_statistics(tmp_path: Path):
+    """Testa se row_group_size e statistics chegam aos arquivos ordenados."""
+    dataset = StreamingPolarsDataset(
+        filepath=str(tmp_path / "events"),
+        partition_by="created_at",
+        sort_by=["id"],
+        save_args={"row_group_size": 10, "statistics": True},
+    )
+    dataset.save(
+        pl.LazyFrame(
+            {"id": list(range(100, 0, -1)), "created_at": [datetime(2025, 1, 1)] * 100}
+        )
+    )
+
+    metadata = pq.ParquetFile(
+        tmp_path / "events/year=2025/month=1/part-0.parquet"
+    ).metadata
+    assert metadata.num_row_groups == 10
+    first = metadata.row_group(0).column(0).statistics
+    assert (first.min, first.max) == (1, 10)
+
+
+def test_date_partitioned_empty_frame_keeps_schema(tmp_path: Path):
+    """Testa se uma tabela vazia mantém o schema no layout particionado."""
+    dataset = StreamingPolarsDataset(
+        filepath=str(tmp_path / "events"), partition_by="created_at"
+    )
+
+    dataset.save(
+        pl.LazyFrame(schema={"id": pl.UInt32, "created_at": pl.Datetime("us")})
+    )
+
+    assert dataset.load().collect_schema()["id"] == pl.UInt32
+
+
+def test_date_partitioned_rejects_parts(tmp_path: Path):
+    """Testa se o layout particionado recusa gravações por partes (modo incremental)."""
+    dataset = StreamingPolarsDataset(
+        filepath=str(tmp_path / "events"), partition_by="created_at"
+    )
+
+    with pytest.raises(DatasetError, match="layout particionado por data"):
+        dataset.save({"000000": pl.DataFrame({"id": [1]})})
+    with pytest.raises(DatasetError, match="layout particionado por data"):
+        dataset.save(pl.LazyFrame({"id": [1], "_part": ["000000"]}))
+
+
+def test_date_partitioned_requires_directory(tmp_path: Path):
+    """Testa se partition_by com um arquivo único falha na criação do dataset."""
+    with pytest.raises(DatasetError, match="exige um diretório"):
+        StreamingPolarsDataset(
+            filepath=str(tmp_path / "events.parquet"), partition_by="created_at"
+        )
@@ -1,11 +1,27 @@
 from collections.abc import Generator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime
+from decimal import Decimal
 from pathlib import Path
 from typing import Any
 
+import polars as pl
 import psycopg
 import pytest
 import yaml
-from psycopg import Connection
+from kedro.io import DatasetError
+from psycopg import Connection, sql
+
+from thelook_ecommerce_analysis.datasets import PostgresPolarsDataset
+from thelook_ecommerce_analysis.pipelines.data_loading.nodes import (
+    copy_table,
+    upsert_table,
+)
+from thelook_ecommerce_analysis.utils.postgres_pool import (
+    POSTGRES_POOLS,
+    PostgresPool,
+    build_conninfo,
+)
 
 
 # Fixtures
@@ -31,16 +47,7 @@ def db_credentials() -> dict[str, Any]:
 @pytest.fixture(scope="module")
 def db_connection(db_credentials: dict[str, Any]) -> Generator[Connection]:
     """Abre uma conexão com o banco e a encerra automaticamente após os testes."""
-    # Monta conn string (formato libpq)
-    conn_info = (
-        f"host={db_credentials['host']} "
-        f"port={db_credentials['port']} "
-        f"dbname={db_credentials['dbname']} "
-        f"user={db_credentials['user']} "
-        f"password={db_credentials['password']}"
-    )
-
-    with psycopg.connect(conn_info) as conn:
+    with psycopg.connect(build_conninfo(db_credentials)) as conn:
         yield conn
 
 
@@ -57,3 +64,206 @@ def test_database_connection_is_alive(db_connection: Connection):
 
     except Exception as e:
         pytest.fail(f"Erro ao executar query simples: {e}")
+
+
+def test_binary_copy_round_trip(db_connection: Connection):
+    """Carga via COPY binário: os valores lidos de volta são os do Intermediate."""
+    df = pl.LazyFrame(
+        {
+            "id": [1, 4_294_967_295, 3],
+            "status": ["Complete", None, "Shipped"],
+            "sale_price": [1999, -5, None],
+            "created_at": [datetime(2025, 1, 2, 3, 4, 5), None, datetime(1999, 1, 1)],
+        },
+        schema={
+            "id": pl.UInt32,
+            "status": pl.Categorical,
+            "sale_price": pl.Int64,
+            "created_at": pl.Datetime("us"),
+        },
+    )
+    target_schema = {
+        "id": "UInt32",
+        "status": "Categorical",
+        "sale_price": "Money(2)",
+        "created_at": "Datetime",
+    }
+    table_name = "_test_binary_copy"
+    table = sql.Identifier(table_name)
+
+    try:
+        report = copy_table(db_connection, df, target_schema, table_name, batch_rows=2)
+        rows = db_connection.execute(
+            sql.SQL(
+                "SELECT id, status, sale_price, created_at FROM {} ORDER BY id"
+            ).format(table)
+        ).fetchall()
+    finally:
+        db_connection.execute(sql.SQL("DROP TABLE IF EXISTS {}").format(table))
+        db_connection.commit()
+
+    assert report["rows"] == 3
+    assert rows == [
+        (1, "Complete", Decimal("19.99"), datetime(2025, 1, 2, 3, 4, 5)),
+        (3, "Shipped", None, datetime(1999, 1, 1)),
+        (4_294_967_295, None, Decimal("-0.05"), None),
+    ]
+
+
+def test_upsert_counts(db_connection: Connection):
+    """Upsert pela staging: contagens de inseridas, atualizadas e sem alteração."""
+    schema = {"id": pl.UInt32, "status": pl.String}
+    target_schema = {"id": "UInt32", "status": "String"}
+    table_name = "_test_upsert"
+    current = pl.LazyFrame({"id": [1, 2, 3], "status": ["a", "b", "c"]}, schema=schema)
+    delta = pl.LazyFrame({"id": [2, 3, 4], "status": ["b", "x", "d"]}, schema=schema)
+
+    try:
+        copy_table(db_connection, current, target_schema, table_name)
+        report = upsert_table(
+            db_connection, delta, target_schema, table_name, commit_rows=2
+        )
+        rows = db_connection.execute(
+            sql.SQL("SELECT id, status FROM {} ORDER BY id").format(
+                sql.Identifier(table_name)
+            )
+        ).fetchall()
+    finally:
+        db_connection.execute(
+            sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table_name))
+        )
+        db_connection.commit()
+
+    assert (report["inserted"], report["updated"], report["unchanged"]) == (1, 1, 1)
+    assert rows == [(1, "a"), (2, "b"), (3, "x"), (4, "d")]
+
+
+def test_partitioned_table_ddl(db_connection: Connection):
+    """Tabela particionada criada pelo DDL: partição de cada linha e upsert pela chave."""
+    schema = {"id": pl.UInt32, "created_at": pl.Datetime("us")}
+    target_schema = {"id": "UInt32", "created_at": "Datetime"}
+    table_name = "_test_partitioned"
+    df = pl.LazyFrame(
+        {
+            "id": [1, 2, 3],
+            "created_at": [
+                datetime(2025, 1, 5),
+                datetime(2025, 2, 5),
+                datetime(2020, 1, 1),
+            ],
+        },
+        schema=schema,
+    )
+    ddl_config = {
+        "partitioned_tables": [table_name],
+        "partition_start": "2025-01-01",
+        "partition_months_ahead": 0,
+    }
+
+    try:
+        copy_table(db_connection, df, target_schema, table_name, ddl_config=ddl_config)
+        report = upsert_table(db_connection, df, target_schema, table_name)
+        partitions = db_connection.execute(
+            sql.SQL("SELECT id, tableoid::regclass::text FROM {} ORDER BY id").format(
+                sql.Identifier(table_name)
+            )
+        ).fetchall()
+    finally:
+        db_connection.execute(
+            sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table_name))
+        )
+        db_connection.commit()
+
+    assert partitions == [
+        (1, f"{table_name}_y2025m01"),
+        (2, f"{table_name}_y2025m02"),
+        (3, f"{table_name}_default"),
+    ]
+    assert report["unchanged"] == 3
+
+
+def test_connection_pool_under_threads(db_credentials: dict[str, Any]):
+    """Pool com 2 conexões para 6 tarefas em 4 threads: reuso, espera e devolução limpa."""
+    pool = PostgresPool(build_conninfo(db_credentials), size=2)
+
+    def _task(value: int) -> tuple[int, int]:
+        with pool.connection() as conn:
+            pid, slept = conn.execute(
+                "SELECT pg_backend_pid(), %s FROM pg_sleep(0.05)", (value,)
+            ).fetchone()
+        return pid, slept
+
+    try:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(_task, range(6)))
+        stats = pool.stats
+    finally:
+        pool.close()
+
+    assert [value for _, value in results] == list(range(6))
+    assert len({pid for pid, _ in results}) == 2
+    assert (stats["open"], stats["in_use"], stats["borrows"]) == (2, 0, 6)
+    assert stats["waits"] > 0
+    assert stats["peak"] == 2
+
+
+def test_copy_read_dataset(db_connection: Connection, db_credentials: dict[str, Any]):
+    """Leitura via COPY: tipos, nulos, escapes, projeção, filtros e lotes."""
+    table = "it_copy_read"
+    db_connection.execute(f"DROP TABLE IF EXISTS {table}")
+    db_connection.execute(
+        f"CREATE TABLE {table} (id int8, price numeric(10, 2), active bool, "
+        "created_at timestamptz, name text, raw bytea)"
+    )
+    db_connection.execute(
+        f"INSERT INTO {table} SELECT i, "  # noqa: S608
+        "CASE WHEN i = 3 THEN 'NaN' ELSE i / 100.0 END, i % 2 = 0, "
+        "timestamptz '2025-01-01 00:00:00+00' + i * interval '1 hour', "
+        "CASE WHEN i = 1 THEN E'a\\tb\\nc\\bd\\fe\\x0bf\\\\g' WHEN i = 2 THEN '' END, "
+        "'\\x00ff' "
+        "FROM generate_series(1, 1000) i"
+    )
+    db_connection.commit()
+
+    try:
+        df = PostgresPolarsDataset(credentials=db_credentials, table=table).load()
+        filtered = PostgresPolarsDataset(
+            credentials=db_credentials,
+            table=table,
+            columns=["id", "name"],
+            filters=[["id", "in", [1, 2, 3]], ["active", "=", False]],
+        ).load()
+        chunks = list(
+            PostgresPolarsDataset(
+                credentials=db_credentials, table=table, chunk_rows=300
+            ).load()
+        )
+    finally:
+        db_connection.execute(f"DROP TABLE {table}")
+        db_connection.commit()
+        POSTGRES_POOLS.close_all()
+
+    assert df.height == 1000
+    assert df.row(0) == (
+        1,
+        Decimal("0.01"),
+        False,
+        datetime(2025, 1, 1, 1, tzinfo=UTC),
+        "a\tb\nc\bd\fe\vf\\g",
+        b"\x00\xff",
+    )
+    assert df["name"].to_list()[1:3] == ["", None]
+    assert df["price"][2] is None  # NaN do numeric
+    assert filtered.sort("id").rows() == [(1, "a\tb\nc\bd\fe\vf\\g"), (3, None)]
+    assert sum(chunk.height for chunk in chunks) == 1000
+    assert all(chunk.height >= 300 for chunk in chunks[:-1])
+
+
+def test_copy_read_error_mid_stream(db_credentials: dict[str, Any]):
+    """Erro do banco no meio do COPY (após linhas já enviadas) vira DatasetError."""
+    query = "SELECT 1 / (5000 - i) AS x FROM generate_series(1, 10000) AS i"
+    try:
+        with pytest.raises(DatasetError, match="Falha no COPY: .*division by zero"):
+            PostgresPolarsDataset(credentials=db_credentials, query=query).load()
+    finally:
+        POSTGRES_POOLS.close_all()
@@ -8,7 +8,15 @@ from kedro.pipeline import Pipeline
 from kedro.pipeline.node import Node
 from pytest_mock import MockerFixture
 
-from thelook_ecommerce_analysis.hooks import ResourceMonitoringHook
+from thelook_ecommerce_analysis.hooks import (
+    BigQueryClientHook,
+    IngestionStateHook,
+    PostgresPoolHook,
+    ResourceMonitoringHook,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
 
 
 # Fixtures
@@ -149,6 +157,41 @@ def test_node_execution_logging_high_memory(
     assert "HIGH MEMORY" in caplog.text
 
 
+def test_node_execution_logging_pool_usage(
+    hook: ResourceMonitoringHook,
+    mock_node: Node,
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Simula um nó que emprestou conexões do pool do Postgres."""
+    mock_time = mocker.patch("thelook_ecommerce_analysis.hooks.time")
+    mock_time.time.side_effect = [100.0, 110.0]
+    mock_process = mocker.patch("psutil.Process")
+    mock_process.return_value.memory_info.return_value = MagicMock(rss=1024 * 1024)
+    mock_pools = mocker.patch("thelook_ecommerce_analysis.hooks.POSTGRES_POOLS")
+    before = {"borrows": 2, "waits": 0, "wait_seconds": 0.0, "busy_seconds": 1.0}
+    after = {
+        "borrows": 9,
+        "waits": 3,
+        "wait_seconds": 1.5,
+        "busy_seconds": 21.0,
+        "peak": 4,
+        "size": 4,
+    }
+    type(mock_pools).stats = mocker.PropertyMock(
+        side_effect=[{"localhost/thelook_db": before}, {"localhost/thelook_db": after}]
+    )
+
+    with caplog.at_level(logging.INFO, logger="thelook_ecommerce_analysis.hooks"):
+        hook.before_node_run(mock_node)
+        hook.after_node_run(mock_node, {}, {})
+
+    # 7 empréstimos no nó, 20s de uso em 4 conexões x 10s
+    assert "Postgres 'localhost/thelook_db': 7 empréstimo(s)" in caplog.text
+    assert "3 com espera (1.50s)" in caplog.text
+    assert "Uso do pool: 50% (pico de 4/4 conexões)" in caplog.text
+
+
 # Teste de Erro
 def test_on_pipeline_error_logs_details(
     hook: ResourceMonitoringHook,
@@ -171,3 +214,120 @@ def test_on_pipeline_error_logs_details(
     assert "FALHA CRÍTICA" in caplog.text
     assert "20.00s" in caplog.text
     assert "Erro simulado" in caplog.text
+
+
+# Testes do BigQueryClientHook
+def test_bigquery_hook_closes_clients_after_run(
+    mock_pipeline: Pipeline,
+    mock_catalog: DataCatalog,
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Verifica se os clientes compartilhados são fechados e as métricas de reuso logadas."""
+    mock_registry = mocker.patch("thelook_ecommerce_analysis.hooks.CLIENT_REGISTRY")
+    mock_registry.stats = {
+        "created": 2,
+        "reused": 12,
+        "storage_created": 1,
+        "storage_reused": 5,
+        "open": 3,
+    }
+
+    with caplog.at_level(logging.INFO, logger="thelook_ecommerce_analysis.hooks"):
+        BigQueryClientHook().after_pipeline_run({}, mock_pipeline, mock_catalog)
+
+    mock_registry.close_all.assert_called_once()
+    assert "(queries): 2 criados | 12 reutilizados" in caplog.text
+    assert "Storage API: 1 criados | 5 reutilizados" in caplog.text
+
+
+def test_bigquery_hook_closes_clients_on_error(
+    mock_pipeline: Pipeline, mock_catalog: DataCatalog, mocker: MockerFixture
+):
+    """Verifica se os clientes também são fechados quando o pipeline falha."""
+    mock_registry = mocker.patch("thelook_ecommerce_analysis.hooks.CLIENT_REGISTRY")
+    mock_registry.stats = {
+        "created": 0,
+        "reused": 0,
+        "storage_created": 0,
+        "storage_reused": 0,
+        "open": 0,
+    }
+
+    BigQueryClientHook().on_pipeline_error(
+        ValueError("erro"), {}, mock_pipeline, mock_catalog
+    )
+
+    mock_registry.close_all.assert_called_once()
+
+
+# Testes do PostgresPoolHook
+@pytest.mark.parametrize("failed", [False, True])
+def test_pool_hook_closes_pools(
+    failed: bool,
+    mock_pipeline: Pipeline,
+    mock_catalog: DataCatalog,
+    mocker: MockerFixture,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Verifica se os pools são fechados (com sucesso ou erro) e o uso é logado."""
+    mock_pools = mocker.patch("thelook_ecommerce_analysis.hooks.POSTGRES_POOLS")
+    mock_pools.stats = {
+        "localhost/thelook_db": {
+            "borrows": 8,
+            "waits": 2,
+            "wait_seconds": 0.4,
+            "max_wait": 0.3,
+            "utilization": 0.75,
+            "peak": 4,
+            "size": 4,
+        }
+    }
+
+    with caplog.at_level(logging.INFO, logger="thelook_ecommerce_analysis.hooks"):
+        if failed:
+            PostgresPoolHook().on_pipeline_error(
+                ValueError("erro"), {}, mock_pipeline, mock_catalog
+            )
+        else:
+            PostgresPoolHook().after_pipeline_run({}, mock_pipeline, mock_catalog)
+
+    mock_pools.close_all.assert_called_once()
+    assert "8 empréstimo(s), 2 com espera (média 0.050s, máx 0.300s)" in caplog.text
+    assert "Uso: 75% (pico de 4/4 conexões)" in caplog.text
+
+
+# Testes do IngestionStateHook
+def test_state_hook_runs_actions_after_dataset_saved():
+    """Verifica se as ações agendadas só rodam após a gravação do próprio dataset."""
+    calls = []
+    POST_SAVE_ACTIONS.register("ingestion_raw_orders", lambda: calls.append("orders"))
+    node = MagicMock(spec=Node)
+
+    hook = IngestionStateHook()
+    hook.after_dataset_saved("ingestion_raw_users", None, node)
+    assert calls == []
+
+    hook.after_dataset_saved("ingestion_raw_orders", None, node)
+    assert calls == ["orders"]
+    assert POST_SAVE_ACTIONS.pending == []
+
+
+def test_state_hook_discards_actions_on_node_error(
+    mock_pipeline: Pipeline, mock_catalog: DataCatalog
+):
+    """Verifica se uma falha descarta o estado pendente (nada é aplicado)."""
+    calls = []
+    POST_SAVE_ACTIONS.register("ingestion_raw_orders", lambda: calls.append("orders"))
+    POST_SAVE_ACTIONS.register("ingestion_raw_users", lambda: calls.append("users"))
+
+    node = MagicMock(spec=Node)
+    node.outputs = ["ingestion_raw_orders"]
+
+    hook = IngestionStateHook()
+    hook.on_node_error(ValueError("erro"), node)
+    assert POST_SAVE_ACTIONS.pending == ["ingestion_raw_users"]
+
+    hook.on_pipeline_error(ValueError("erro"), {}, mock_pipeline, mock_catalog)
+    assert POST_SAVE_ACTIONS.pending == []
+    assert calls == []
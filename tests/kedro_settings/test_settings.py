@@ -1,5 +1,10 @@
 from thelook_ecommerce_analysis import settings
-from thelook_ecommerce_analysis.hooks import ResourceMonitoringHook
+from thelook_ecommerce_analysis.hooks import (
+    BigQueryClientHook,
+    IngestionStateHook,
+    PostgresPoolHook,
+    ResourceMonitoringHook,
+)
 
 
 def test_hooks_registration():
@@ -13,6 +18,15 @@ def test_hooks_registration():
     has_monitoring_hook = any(isinstance(h, ResourceMonitoringHook) for h in hooks)
     assert has_monitoring_hook, "O ResourceMonitoringHook não está registrado em HOOKS"
 
+    has_bigquery_hook = any(isinstance(h, BigQueryClientHook) for h in hooks)
+    assert has_bigquery_hook, "O BigQueryClientHook não está registrado em HOOKS"
+
+    has_state_hook = any(isinstance(h, IngestionStateHook) for h in hooks)
+    assert has_state_hook, "O IngestionStateHook não está registrado em HOOKS"
+
+    has_pool_hook = any(isinstance(h, PostgresPoolHook) for h in hooks)
+    assert has_pool_hook, "O PostgresPoolHook não está registrado em HOOKS"
+
 
 def test_config_loader_args_structure():
     """Valida o 'CONFIG_LOADER_ARGS'. Garante que o projeto sempre busca configs em 'base' e 'local' por padrão."""
@@ -0,0 +1,89 @@
+import json
+from pathlib import Path
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.checkpoint import (
+    MANIFEST_NAME,
+    SliceCheckpoint,
+)
+
+
+def _write_part(table_dir: Path, name: str):
+    (table_dir / f"part-{name}.parquet").write_bytes(b"parquet")
+
+
+def test_open_starts_empty_and_cleans_directory(tmp_path: Path):
+    """Testa se um checkpoint novo descarta arquivos de execuções anteriores."""
+    table_dir = tmp_path / "orders"
+    table_dir.mkdir()
+    _write_part(table_dir, "old")
+
+    checkpoint = SliceCheckpoint.open(table_dir, "sig")
+
+    assert checkpoint.completed == {}
+    assert list(table_dir.iterdir()) == []
+
+
+def test_mark_done_persists_manifest(tmp_path: Path):
+    """Testa se cada fatia concluída é gravada no manifesto e retomada na reabertura."""
+    table_dir = tmp_path / "orders"
+    checkpoint = SliceCheckpoint.open(table_dir, "sig")
+
+    _write_part(table_dir, "2025-01-01_2025-02-01")
+    checkpoint.mark_done("2025-01-01_2025-02-01", 10)
+
+    manifest = json.loads((table_dir / MANIFEST_NAME).read_text("utf8"))
+    assert manifest == {
+        "signature": "sig",
+        "complete": False,
+        "slices": {"2025-01-01_2025-02-01": 10},
+    }
+
+    reopened = SliceCheckpoint.open(table_dir, "sig")
+    assert reopened.completed == {"2025-01-01_2025-02-01": 10}
+
+
+def test_open_ignores_slices_without_part_file(tmp_path: Path):
+    """Testa se fatias registradas cujo arquivo sumiu voltam a ser extraídas."""
+    table_dir = tmp_path / "orders"
+    checkpoint = SliceCheckpoint.open(table_dir, "sig")
+    _write_part(table_dir, "a")
+    checkpoint.mark_done("a", 1)
+    checkpoint.mark_done("b", 2)
+
+    assert SliceCheckpoint.open(table_dir, "sig").completed == {"a": 1}
+
+
+def test_signature_change_resets_checkpoint(tmp_path: Path):
+    """Testa se outra query (ou outros tipos) recomeça a extração do zero."""
+    table_dir = tmp_path / "orders"
+    checkpoint = SliceCheckpoint.open(table_dir, "sig")
+    _write_part(table_dir, "a")
+    checkpoint.mark_done("a", 1)
+
+    reopened = SliceCheckpoint.open(table_dir, "other-sig")
+
+    assert reopened.completed == {}
+    assert not (table_dir / "part-a.parquet").exists()
+
+
+def test_finalize_prevents_resume(tmp_path: Path):
+    """Testa se um checkpoint concluído (Raw gravado) não é retomado."""
+    table_dir = tmp_path / "orders"
+    checkpoint = SliceCheckpoint.open(table_dir, "sig")
+    _write_part(table_dir, "a")
+    checkpoint.mark_done("a", 1)
+
+    checkpoint.finalize()
+
+    manifest = json.loads((table_dir / MANIFEST_NAME).read_text("utf8"))
+    assert manifest["complete"] is True
+    assert SliceCheckpoint.open(table_dir, "sig").completed == {}
+
+
+def test_manifest_write_is_atomic(tmp_path: Path):
+    """Testa se o manifesto é gravado via arquivo temporário (sem sobras)."""
+    table_dir = tmp_path / "orders"
+    checkpoint = SliceCheckpoint.open(table_dir, "sig")
+    checkpoint.mark_done("a", 1)
+
+    assert sorted(p.name for p in table_dir.iterdir()) == [MANIFEST_NAME]
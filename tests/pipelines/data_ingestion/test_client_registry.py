@@ -0,0 +1,113 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.client_registry import (
+    BigQueryClientRegistry,
+)
+
+MODULE = "thelook_ecommerce_analysis.pipelines.data_ingestion.client_registry"
+
+
+@pytest.fixture
+def mock_gcp(mocker: MockerFixture) -> dict[str, MagicMock]:
+    """Mock das credenciais e dos clientes do GCP."""
+    mocker.patch("pathlib.Path.exists", return_value=True)
+    from_file = mocker.patch(
+        f"{MODULE}.service_account.Credentials.from_service_account_file"
+    )
+    from_file.return_value.project_id = "sa-project"
+
+    return {
+        "from_file": from_file,
+        "client": mocker.patch(f"{MODULE}.bigquery.Client"),
+        "storage": mocker.patch(f"{MODULE}.bigquery_storage.BigQueryReadClient"),
+    }
+
+
+def test_client_is_reused_for_same_key_and_project(mock_gcp: dict[str, MagicMock]):
+    """Testa se credenciais e cliente são criados uma única vez por (chave, projeto)."""
+    registry = BigQueryClientRegistry()
+
+    first = registry.get_client("key.json")
+    second = registry.get_client("key.json")
+
+    assert first is second
+    mock_gcp["from_file"].assert_called_once()
+    mock_gcp["client"].assert_called_once()
+    assert mock_gcp["client"].call_args.kwargs["project"] == "sa-project"
+    assert registry.stats["created"] == 1
+    assert registry.stats["reused"] == 1
+    assert registry.stats["open"] == 1
+
+
+def test_distinct_projects_get_distinct_clients(mock_gcp: dict[str, MagicMock]):
+    """Testa se projetos diferentes geram clientes diferentes, com a mesma credencial."""
+    mock_gcp["client"].side_effect = lambda **kwargs: MagicMock()
+    registry = BigQueryClientRegistry()
+
+    default_client = registry.get_client("key.json")
+    other_client = registry.get_client("key.json", project="billing-project")
+
+    assert default_client is not other_client
+    mock_gcp["from_file"].assert_called_once()
+    assert registry.stats["created"] == 2
+
+
+def test_registry_is_thread_safe(mock_gcp: dict[str, MagicMock]):
+    """Testa se chamadas concorrentes criam um único cliente."""
+    registry = BigQueryClientRegistry()
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(
+            executor.map(lambda _: registry.get_client("key.json"), range(32))
+        )
+
+    assert len({id(c) for c in clients}) == 1
+    assert registry.stats["created"] == 1
+    assert registry.stats["reused"] == 31
+
+
+def test_close_all_closes_and_resets(mock_gcp: dict[str, MagicMock]):
+    """Testa se close_all fecha clientes (HTTP e gRPC) e zera os contadores."""
+    registry = BigQueryClientRegistry()
+    client = registry.get_client("key.json")
+    storage_client = registry.get_storage_client("key.json")
+
+    registry.close_all()
+
+    client.close.assert_called_once()
+    storage_client.transport.close.assert_called_once()
+    assert registry.stats == {
+        "created": 0,
+        "reused": 0,
+        "storage_created": 0,
+        "storage_reused": 0,
+        "open": 0,
+    }
+
+
+def test_missing_key_file_raises(mocker: MockerFixture):
+    """Testa se a ausência da chave gera FileNotFoundError."""
+    mocker.patch("pathlib.Path.exists", return_value=False)
+
+    with pytest.raises(FileNotFoundError, match="Chave GCP não encontrada"):
+        BigQueryClientRegistry().get_client("missing.json")
+
+
+def test_stats_report_storage_clients_separately(mock_gcp: dict[str, MagicMock]):
+    """Testa se os clientes da Storage API são contados à parte dos clientes de query."""
+    registry = BigQueryClientRegistry()
+    registry.get_client("key.json")
+    registry.get_storage_client("key.json")
+    registry.get_storage_client("key.json")
+
+    assert registry.stats == {
+        "created": 1,
+        "reused": 0,
+        "storage_created": 1,
+        "storage_reused": 1,
+        "open": 2,
+    }
@@ -1,14 +1,40 @@
 import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock
 
 import polars as pl
+import pyarrow as pa
 import pytest
+from google.api_core import exceptions as gcp_exceptions
 from pytest_mock import MockerFixture
 
+from thelook_ecommerce_analysis.pipelines.data_ingestion import nodes
+from thelook_ecommerce_analysis.pipelines.data_ingestion.client_registry import (
+    CLIENT_REGISTRY,
+)
 from thelook_ecommerce_analysis.pipelines.data_ingestion.nodes import (
+    _build_date_slices,
+    _schema_signature,
     extract_incremental_data,
     extract_snapshot_data,
 )
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.watermark import (
+    create_watermark_store,
+)
+
+
+@pytest.fixture(autouse=True)
+def reset_client_registry():
+    """Garante que cada teste crie seus próprios clientes (sem cache entre testes)."""
+    CLIENT_REGISTRY.close_all()
+    yield
+    CLIENT_REGISTRY.close_all()
+    POST_SAVE_ACTIONS.discard()
 
 
 @pytest.fixture
@@ -196,3 +222,897 @@ def test_snapshot_if_size_ok(
     args_list = mock_bq_client.query.call_args_list
     assert "count" in args_list[0][0][0]
     assert "SELECT" in args_list[1][0][0]
+
+
+# Testes de Extração Fatiada
+def test_build_date_slices_day():
+    """Testa se a janela é dividida em dias contíguos, com fim exclusivo."""
+    slices = _build_date_slices("2025-01-01", "2025-01-04", "day")
+
+    assert slices == [
+        ("2025-01-01", "2025-01-02"),
+        ("2025-01-02", "2025-01-03"),
+        ("2025-01-03", "2025-01-04"),
+    ]
+
+
+def test_build_date_slices_week_truncates_last_slice():
+    """Testa se a última fatia semanal é truncada no fim da janela."""
+    slices = _build_date_slices("2025-01-01", "2025-01-10", "week")
+
+    assert slices == [("2025-01-01", "2025-01-08"), ("2025-01-08", "2025-01-10")]
+
+
+def test_build_date_slices_month_aligns_calendar():
+    """Testa se as fatias mensais se alinham ao primeiro dia de cada mês."""
+    slices = _build_date_slices("2025-01-15", "2025-03-10", "month")
+
+    assert slices == [
+        ("2025-01-15", "2025-02-01"),
+        ("2025-02-01", "2025-03-01"),
+        ("2025-03-01", "2025-03-10"),
+    ]
+
+
+def test_build_date_slices_invalid_size():
+    """Testa se um tamanho de fatia desconhecido é rejeitado."""
+    with pytest.raises(ValueError, match="slice_size inválido"):
+        _build_date_slices("2025-01-01", "2025-01-10", "year")
+
+
+def test_incremental_sliced_writes_one_part_per_slice(
+    mock_bq_client: MagicMock, mocker: MockerFixture, tmp_path: Path
+):
+    """Testa se cada fatia executa sua própria query e grava seu próprio arquivo parquet."""
+    # Fixa "hoje" para a janela ter exatamente 3 dias
+    mock_datetime = mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.datetime"
+    )
+    mock_datetime.now.return_value = datetime(2025, 1, 6)
+
+    mock_bq_client.query.return_value.to_arrow.return_value = pa.table(
+        {"id": [1, 2], "created_at": ["2025-01-01", "2025-01-01"]}
+    )
+
+    result = extract_incremental_data(
+        table_name="events",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        lookback_days=2,
+        slice_size="day",
+        max_workers=2,
+        staging_dir=str(tmp_path),
+    )
+
+    # 1 query por fatia, cada uma com sua própria janela
+    assert mock_bq_client.query.call_count == 3
+    windows = sorted(
+        {p.name: p.value for p in call.kwargs["job_config"].query_parameters}[
+            "start_date"
+        ]
+        for call in mock_bq_client.query.call_args_list
+    )
+    assert windows == ["2025-01-01", "2025-01-02", "2025-01-03"]
+
+    # 1 arquivo por fatia
+    assert len(list((tmp_path / "events").glob("part-*.parquet"))) == 3
+
+    assert isinstance(result, pl.LazyFrame)
+    assert result.collect().height == 6
+
+
+def test_incremental_empty_window_writes_no_parts(
+    mock_bq_client: MagicMock, mocker: MockerFixture, tmp_path: Path
+):
+    """Testa que uma janela vazia não retorna um frame vazio, que substituiria o Raw."""
+    # "Hoje" - lookback_days coincide com o start_date: nenhuma fatia
+    mock_datetime = mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.datetime"
+    )
+    mock_datetime.now.return_value = datetime(2025, 1, 3)
+
+    result = extract_incremental_data(
+        table_name="events",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        lookback_days=2,
+        slice_size="day",
+        staging_dir=str(tmp_path),
+    )
+
+    assert result == {}
+    mock_bq_client.query.assert_not_called()
+
+
+def test_incremental_sliced_propagates_slice_failure(
+    mock_bq_client: MagicMock, tmp_path: Path, caplog: pytest.LogCaptureFixture
+):
+    """Testa se a falha de uma fatia interrompe o nó e é logada."""
+    mock_bq_client.query.side_effect = RuntimeError("quota exceeded")
+
+    with pytest.raises(RuntimeError, match="quota exceeded"):
+        extract_incremental_data(
+            table_name="events",
+            date_col="created_at",
+            key_filepath="dummy.json",
+            start_date="2025-01-01",
+            slice_size="month",
+            staging_dir=str(tmp_path),
+        )
+
+    assert "Falha na fatia 'events'" in caplog.text
+
+
+# Testes de Extração em Stream
+@pytest.fixture
+def mock_stream_job(mock_bq_client: MagicMock, mocker: MockerFixture) -> MagicMock:
+    """Job cujo resultado é lido como iterador de RecordBatch (Storage API)."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.bigquery_storage.BigQueryReadClient"
+    )
+
+    batches = [
+        pa.record_batch({"id": [1, 2], "name": ["a", "b"]}),
+        pa.record_batch({"id": [3], "name": ["c"]}),
+    ]
+
+    mock_job = MagicMock()
+    mock_job.result.return_value.to_arrow_iterable.return_value = iter(batches)
+    mock_bq_client.query.return_value = mock_job
+    return mock_job
+
+
+def test_incremental_streaming_writes_batches_without_to_arrow(
+    mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se o modo stream grava lote a lote e retorna um LazyFrame."""
+    result = extract_incremental_data(
+        table_name="events",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        staging_dir=str(tmp_path),
+        streaming=True,
+        max_queue_size=3,
+    )
+
+    # Não materializa o resultado inteiro
+    mock_stream_job.to_arrow.assert_not_called()
+
+    # Teto de memória e paralelismo repassados separadamente para o iterador
+    kwargs = mock_stream_job.result.return_value.to_arrow_iterable.call_args.kwargs
+    assert kwargs["max_queue_size"] == 3
+    assert kwargs["max_stream_count"] == 2
+
+    assert isinstance(result, pl.LazyFrame)
+    assert result.collect()["id"].to_list() == [1, 2, 3]
+
+
+def test_snapshot_streaming_returns_lazy_handle(
+    mock_bq_client: MagicMock, mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se o snapshot em stream grava o parquet e retorna um LazyFrame."""
+    mock_count_job = MagicMock()
+    mock_count_job.result.return_value = [[3]]
+    mock_bq_client.query.side_effect = [mock_count_job, mock_stream_job]
+
+    result = extract_snapshot_data(
+        "products", "key.json", staging_dir=str(tmp_path), streaming=True
+    )
+
+    assert isinstance(result, pl.LazyFrame)
+    assert (tmp_path / "products" / "part-0.parquet").exists()
+    assert result.collect().height == 3
+
+
+def test_streaming_empty_result_keeps_schema(
+    mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se um resultado vazio gera um parquet sem linhas, mas com schema."""
+    mock_stream_job.result.return_value.to_arrow_iterable.return_value = iter([])
+    mock_stream_job.to_arrow.return_value = pa.table({"id": pa.array([], pa.int64())})
+
+    result = extract_incremental_data(
+        table_name="events",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        staging_dir=str(tmp_path),
+        streaming=True,
+    )
+
+    df = result.collect()
+    assert df.height == 0
+    assert df.columns == ["id"]
+
+
+# Testes de Watermark
+def _orders_store(tmp_path: Path) -> tuple[dict[str, str], Any]:
+    """Store com o watermark de 'orders' e a assinatura do Raw sem projeção nem cast."""
+    watermark = {"backend": "sqlite", "filepath": str(tmp_path / "wm.db")}
+    store = create_watermark_store(watermark)
+    store.set("orders", "2025-03-15T10:30:00")
+    store.set("schema:orders", _schema_signature(None, None))
+    return watermark, store
+
+
+def test_incremental_uses_watermark_window(
+    mock_bq_client: MagicMock, mocker: MockerFixture, tmp_path: Path
+):
+    """Testa se a janela começa no watermark - lookback_days e o delta é retornado por parte."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.datetime"
+    ).now.return_value = datetime(2025, 3, 20, 9)
+
+    watermark, store = _orders_store(tmp_path)
+
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.pl.from_arrow",
+        return_value=pl.DataFrame(
+            {"id": [1], "created_at": [datetime(2025, 3, 19, 8)]}
+        ),
+    )
+
+    result = extract_incremental_data(
+        table_name="orders",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        lookback_days=2,
+        watermark=watermark,
+    )
+
+    # Janela: (watermark - 2 dias, hoje)
+    job_config = mock_bq_client.query.call_args.kwargs["job_config"]
+    params = {p.name: p.value for p in job_config.query_parameters}
+    assert params == {"start_date": "2025-03-13", "end_date": "2025-03-20"}
+
+    # Delta retornado como nova parte
+    assert list(result) == ["2025-03-13_2025-03-20"]
+
+    # O watermark só avança após a gravação do Raw
+    assert store.get("orders") == "2025-03-15T10:30:00"
+    POST_SAVE_ACTIONS.run("ingestion_raw_orders")
+    assert store.get("orders") == "2025-03-19T08:00:00"
+
+
+def test_incremental_watermark_kept_when_raw_save_fails(
+    mock_bq_client: MagicMock, mocker: MockerFixture, tmp_path: Path
+):
+    """Testa se uma falha na gravação do Raw não avança o watermark (sem perda de dados)."""
+    watermark, store = _orders_store(tmp_path)
+
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.pl.from_arrow",
+        return_value=pl.DataFrame(
+            {"id": [1], "created_at": [datetime(2025, 3, 19, 8)]}
+        ),
+    )
+
+    extract_incremental_data(
+        "orders", "created_at", "dummy.json", "2025-01-01", watermark=watermark
+    )
+
+    # A gravação falhou: o hook descarta as ações pendentes
+    POST_SAVE_ACTIONS.discard(["ingestion_raw_orders"])
+
+    assert store.get("orders") == "2025-03-15T10:30:00"
+
+
+def test_incremental_watermark_without_new_rows(
+    mock_bq_client: MagicMock, mocker: MockerFixture, tmp_path: Path
+):
+    """Testa se uma janela sem dados novos não grava partes nem altera o watermark."""
+    watermark, store = _orders_store(tmp_path)
+
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.pl.from_arrow",
+        return_value=pl.DataFrame(
+            {"id": [], "created_at": []},
+            schema={"id": pl.Int64, "created_at": pl.Datetime},
+        ),
+    )
+
+    result = extract_incremental_data(
+        "orders", "created_at", "dummy.json", "2025-01-01", watermark=watermark
+    )
+
+    assert result == {}
+    assert store.get("orders") == "2025-03-15T10:30:00"
+
+
+def test_incremental_rewrites_raw_when_schema_changes(
+    mock_bq_client: MagicMock,
+    mocker: MockerFixture,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Testa se ligar o cast_on_ingest reescreve a tabela em vez de adicionar uma parte."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.datetime"
+    ).now.return_value = datetime(2025, 3, 20, 9)
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.pl.from_arrow",
+        return_value=pl.DataFrame(
+            {"id": [1], "created_at": [datetime(2025, 3, 19, 8)]}
+        ),
+    )
+    watermark, store = _orders_store(tmp_path)
+    target_schema = {"id": "UInt32", "created_at": "Datetime"}
+
+    with caplog.at_level(logging.WARNING):
+        result = extract_incremental_data(
+            "orders",
+            "created_at",
+            "dummy.json",
+            "2025-01-01",
+            watermark=watermark,
+            target_schema=target_schema,
+        )
+
+    # Janela completa desde start_date e frame único (substitui o diretório Raw)
+    job_config = mock_bq_client.query.call_args.kwargs["job_config"]
+    params = {p.name: p.value for p in job_config.query_parameters}
+    assert params["start_date"] == "2025-01-01"
+    assert isinstance(result, pl.DataFrame)
+    assert "Schema do Raw de 'orders' mudou" in caplog.text
+
+    # A nova assinatura só vale depois da gravação
+    assert store.get("schema:orders") == _schema_signature(None, None)
+    POST_SAVE_ACTIONS.run("ingestion_raw_orders")
+    assert store.get("schema:orders") == _schema_signature(None, target_schema)
+    assert store.get("orders") == "2025-03-19T08:00:00"
+
+
+# Testes de Impressão Digital (Snapshot)
+@pytest.fixture
+def snapshot_store(mock_bq_client: MagicMock, tmp_path: Path) -> dict[str, str]:
+    """Configuração de store e metadados estáveis da tabela no BigQuery."""
+    table = mock_bq_client.get_table.return_value
+    table.num_rows = 500
+    table.num_bytes = 12_345
+    table.modified = datetime(2025, 1, 1, 3)
+
+    return {"backend": "sqlite", "filepath": str(tmp_path / "state.db")}
+
+
+@pytest.fixture
+def raw_dir(tmp_path: Path) -> str:
+    """Camada Raw com o parquet de 'products' já gravado."""
+    table_dir = tmp_path / "raw" / "products"
+    table_dir.mkdir(parents=True)
+    pl.DataFrame({"id": [1]}).write_parquet(table_dir / "part-0.parquet")
+    return str(tmp_path / "raw")
+
+
+def _saved_snapshot(**kwargs) -> pl.DataFrame | pl.LazyFrame | dict:
+    """Executa o nó snapshot e as ações do `after_dataset_saved` (gravação do Kedro)."""
+    result = extract_snapshot_data("products", "key.json", **kwargs)
+    POST_SAVE_ACTIONS.run("ingestion_raw_products")
+    return result
+
+
+def test_snapshot_skips_unchanged_table(
+    mock_bq_client: MagicMock,
+    snapshot_store: dict[str, str],
+    raw_dir: str,
+    caplog: pytest.LogCaptureFixture,
+):
+    """Testa se a segunda execução, sem mudanças nos metadados, não executa nenhuma query."""
+    first = _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+    assert first is not None and first != {}
+
+    # Apenas o SELECT: o COUNT(*) é substituído pelos metadados
+    assert mock_bq_client.query.call_count == 1
+
+    mock_bq_client.query.reset_mock()
+
+    with caplog.at_level(logging.INFO):
+        second = _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+
+    assert second == {}
+    mock_bq_client.query.assert_not_called()
+    assert "inalterado desde a última extração" in caplog.text
+
+
+def test_snapshot_downloads_when_raw_is_missing(
+    mock_bq_client: MagicMock, snapshot_store: dict[str, str], tmp_path: Path
+):
+    """Testa se a tabela é extraída de novo quando o parquet Raw não existe mais."""
+    raw_dir = str(tmp_path / "raw")
+    _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+    mock_bq_client.query.reset_mock()
+
+    result = _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+
+    assert result != {}
+    mock_bq_client.query.assert_called_once()
+
+
+def test_snapshot_fingerprint_kept_when_raw_save_fails(
+    mock_bq_client: MagicMock, snapshot_store: dict[str, str], raw_dir: str
+):
+    """Testa se a impressão digital só é gravada depois do save do dataset Raw."""
+    extract_snapshot_data(
+        "products", "key.json", watermark=snapshot_store, raw_dir=raw_dir
+    )
+    # Falha na gravação: o hook descarta as ações pendentes
+    POST_SAVE_ACTIONS.discard(["ingestion_raw_products"])
+    mock_bq_client.query.reset_mock()
+
+    result = _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+
+    assert result != {}
+    mock_bq_client.query.assert_called_once()
+
+
+def test_snapshot_downloads_when_table_changes(
+    mock_bq_client: MagicMock, snapshot_store: dict[str, str], raw_dir: str
+):
+    """Testa se uma mudança na última modificação dispara nova extração."""
+    _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+    mock_bq_client.query.reset_mock()
+
+    mock_bq_client.get_table.return_value.modified = datetime(2025, 2, 1)
+    _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+
+    mock_bq_client.query.assert_called_once()
+
+
+def test_snapshot_force_refresh_bypasses_fingerprint(
+    mock_bq_client: MagicMock, snapshot_store: dict[str, str], raw_dir: str
+):
+    """Testa se force_refresh ignora a impressão digital."""
+    _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir)
+    mock_bq_client.query.reset_mock()
+
+    result = _saved_snapshot(
+        watermark=snapshot_store, raw_dir=raw_dir, force_refresh=True
+    )
+
+    assert result != {}
+    mock_bq_client.query.assert_called_once()
+
+
+def test_snapshot_metadata_respects_safety_limit(
+    mock_bq_client: MagicMock, snapshot_store: dict[str, str]
+):
+    """Testa se o limite de segurança usa o total de linhas dos metadados."""
+    with pytest.raises(ValueError, match="muito grande"):
+        extract_snapshot_data(
+            "products", "key.json", safety_limit=100, watermark=snapshot_store
+        )
+
+    mock_bq_client.query.assert_not_called()
+
+
+# Testes de Projeção de Colunas
+def test_incremental_projects_schema_columns(
+    mock_bq_client: MagicMock, caplog: pytest.LogCaptureFixture
+):
+    """Testa se a query extrai apenas as colunas do schema (+ extras e date_col)."""
+    mock_bq_client.query.return_value.total_bytes_processed = 4 * 1024 * 1024
+
+    with caplog.at_level(logging.INFO):
+        extract_incremental_data(
+            table_name="orders",
+            date_col="created_at",
+            key_filepath="dummy.json",
+            start_date="2025-01-01",
+            columns={"order_id": "UInt32", "status": "Categorical"},
+            extra_columns=["num_of_item"],
+        )
+
+    # Última chamada: extração real (as anteriores são dry runs)
+    sql = mock_bq_client.query.call_args_list[-1][0][0]
+    assert "*" not in sql
+    for col in ("order_id", "status", "num_of_item", "created_at"):
+        assert col in sql
+
+    dry_runs = [
+        c for c in mock_bq_client.query.call_args_list if c.kwargs["job_config"].dry_run
+    ]
+    assert len(dry_runs) == 2
+    assert "Projeção 'orders': 4 colunas" in caplog.text
+
+
+def test_projection_rejects_unsafe_column(mock_bq_client: MagicMock):
+    """Testa se nomes de coluna vindos da configuração são validados."""
+    with pytest.raises(ValueError, match="Nome de coluna inválido"):
+        extract_incremental_data(
+            "orders",
+            "created_at",
+            "dummy.json",
+            "2025-01-01",
+            columns={"id; DROP TABLE x": "UInt32"},
+        )
+
+    mock_bq_client.query.assert_not_called()
+
+
+def test_snapshot_projection_changes_fingerprint(
+    mock_bq_client: MagicMock, snapshot_store: dict[str, str], raw_dir: str
+):
+    """Testa se alterar a projeção invalida o Raw mesmo com a tabela inalterada."""
+    _saved_snapshot(watermark=snapshot_store, raw_dir=raw_dir, columns={"id": "UInt32"})
+    mock_bq_client.query.reset_mock()
+
+    _saved_snapshot(
+        watermark=snapshot_store,
+        raw_dir=raw_dir,
+        columns={"id": "UInt32", "sku": "String"},
+    )
+
+    # Dry runs da projeção + SELECT
+    sql = mock_bq_client.query.call_args_list[-1][0][0]
+    assert "sku" in sql
+
+
+def test_incremental_query_cache_skips_bigquery_on_rerun(
+    mock_bq_client: MagicMock, tmp_path: Path, caplog: pytest.LogCaptureFixture
+):
+    """Testa se a reexecução da mesma janela é servida pelo cache local."""
+    mock_bq_client.query.return_value.to_arrow.return_value = pa.table(
+        {"id": [1, 2], "created_at": ["2025-01-01", "2025-01-02"]}
+    )
+    query_cache = {"enabled": True, "cache_dir": str(tmp_path / "cache")}
+    kwargs = {
+        "table_name": "orders",
+        "date_col": "created_at",
+        "key_filepath": "dummy.json",
+        "start_date": "2025-01-01",
+        "staging_dir": str(tmp_path / "staging"),
+        "query_cache": query_cache,
+    }
+
+    first = extract_incremental_data(**kwargs).collect()
+    assert mock_bq_client.query.call_count == 1
+
+    # Raw gravado: checkpoint concluído e staging removido
+    POST_SAVE_ACTIONS.run("ingestion_raw_orders")
+
+    caplog.set_level(logging.INFO)
+    second = extract_incremental_data(**kwargs)
+
+    # Nenhuma nova query
+    assert mock_bq_client.query.call_count == 1
+    assert isinstance(second, pl.LazyFrame)
+    assert second.collect().equals(first)
+    assert "Cache 'orders': 1 hits | 0 misses" in caplog.text
+
+
+def test_snapshot_query_cache_hit(mock_bq_client: MagicMock, tmp_path: Path):
+    """Testa se o SELECT do snapshot também passa pelo cache local."""
+    mock_bq_client.query.return_value.result.return_value = [[10]]
+    mock_bq_client.query.return_value.to_arrow.return_value = pa.table({"id": [1]})
+    kwargs = {
+        "staging_dir": str(tmp_path / "staging"),
+        "query_cache": {"enabled": True, "cache_dir": str(tmp_path / "cache")},
+    }
+
+    extract_snapshot_data("products", "key.json", **kwargs)
+    mock_bq_client.query.reset_mock()
+
+    result = extract_snapshot_data("products", "key.json", **kwargs)
+
+    # Apenas o COUNT(*) de segurança é executado
+    assert mock_bq_client.query.call_count == 1
+    assert "count(*)" in mock_bq_client.query.call_args[0][0]
+    assert result.collect().height == 1
+
+
+def test_streaming_casts_each_batch_to_target_schema(
+    mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se os lotes são gravados já com os tipos do schema de processamento."""
+    result = extract_incremental_data(
+        table_name="events",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        staging_dir=str(tmp_path),
+        streaming=True,
+        target_schema={"id": "UInt32", "name": "Categorical"},
+    )
+
+    schema = pl.read_parquet_schema(next((tmp_path / "events").glob("*.parquet")))
+    assert schema["id"] == pl.UInt32
+    assert schema["name"] == pl.Categorical
+    assert result.collect()["id"].to_list() == [1, 2, 3]
+
+
+def test_streaming_cast_keeps_money_as_decimal_in_raw(
+    mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se colunas Money chegam ao Raw como Decimal (o processamento as escala)."""
+    mock_stream_job.result.return_value.to_arrow_iterable.return_value = iter(
+        [pa.record_batch({"id": [1, 2], "price": [10.5, 0.125]})]
+    )
+
+    result = extract_incremental_data(
+        table_name="orders",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        staging_dir=str(tmp_path),
+        streaming=True,
+        target_schema={"id": "UInt32", "price": "Money"},
+    )
+
+    schema = pl.read_parquet_schema(next((tmp_path / "orders").glob("*.parquet")))
+    assert schema["price"] == pl.Decimal(18, 2)
+    assert [str(v) for v in result.collect()["price"]] == ["10.50", "0.12"]
+
+
+def test_streaming_cast_keeps_point_as_wkt_in_raw(
+    mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se colunas Point chegam ao Raw como WKT (o processamento as converte)."""
+    mock_stream_job.result.return_value.to_arrow_iterable.return_value = iter(
+        [pa.record_batch({"id": [1], "geom": ["POINT(-46.6 -23.5)"]})]
+    )
+
+    result = extract_incremental_data(
+        table_name="users",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        staging_dir=str(tmp_path),
+        streaming=True,
+        target_schema={"id": "UInt32", "geom": "Point"},
+    )
+
+    assert result.collect()["geom"].to_list() == ["POINT(-46.6 -23.5)"]
+
+
+def test_streaming_cast_failure_reports_batch_and_column(
+    mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se a falha de conversão informa o lote e a coluna."""
+    mock_stream_job.result.return_value.to_arrow_iterable.return_value = iter(
+        [
+            pa.record_batch({"id": [1], "amount": ["10.5"]}),
+            pa.record_batch({"id": [2], "amount": ["abc"]}),
+        ]
+    )
+
+    with pytest.raises(ValueError, match=r"Lote 1 .* coluna 'amount'"):
+        extract_incremental_data(
+            table_name="orders",
+            date_col="created_at",
+            key_filepath="dummy.json",
+            start_date="2025-01-01",
+            staging_dir=str(tmp_path),
+            streaming=True,
+            target_schema={"id": "UInt32", "amount": "Float64"},
+        )
+
+
+def test_cast_rejects_invalid_target_schema(mock_bq_client: MagicMock):
+    """Testa se um tipo inválido no schema falha antes de executar qualquer query."""
+    with pytest.raises(ValueError, match="Tipo desconhecido"):
+        extract_incremental_data(
+            "orders",
+            "created_at",
+            "dummy.json",
+            "2025-01-01",
+            target_schema={"id": "X"},
+        )
+
+    mock_bq_client.query.assert_not_called()
+
+
+def test_incremental_end_to_end_with_local_source(
+    mocker: MockerFixture, tmp_path: Path
+):
+    """Testa o nó incremental fatiado e em stream contra a fonte local (sem BigQuery)."""
+    mock_datetime = mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.nodes.datetime"
+    )
+    mock_datetime.now.return_value = datetime(2025, 1, 12)
+
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    pl.DataFrame(
+        {
+            "id": list(range(20)),
+            "created_at": pl.datetime_range(
+                datetime(2025, 1, 1), datetime(2025, 1, 10, 12), "12h", eager=True
+            ),
+        }
+    ).write_parquet(source_dir / "events.parquet")
+
+    result = extract_incremental_data(
+        table_name="events",
+        date_col="created_at",
+        key_filepath="unused.json",
+        start_date="2025-01-01",
+        slice_size="day",
+        max_workers=4,
+        staging_dir=str(tmp_path / "staging"),
+        streaming=True,
+        target_schema={"id": "UInt32", "created_at": "Datetime"},
+        source={"type": "local", "data_dir": str(source_dir), "batch_size": 3},
+    )
+
+    # Janela 2025-01-01 -> 2025-01-10 (exclusivo): 9 dias, 2 linhas por dia
+    df = result.collect()
+    assert df.height == 18
+    assert df.schema["id"] == pl.UInt32
+    assert len(list((tmp_path / "staging" / "events").glob("*.parquet"))) == 9
+
+
+def test_staging_removed_only_after_raw_is_saved(
+    mock_stream_job: MagicMock, tmp_path: Path
+):
+    """Testa se o staging é mantido até a gravação do Raw e removido em seguida."""
+    result = extract_incremental_data(
+        table_name="events",
+        date_col="created_at",
+        key_filepath="dummy.json",
+        start_date="2025-01-01",
+        staging_dir=str(tmp_path),
+        streaming=True,
+        max_stream_count=4,
+    )
+
+    # O LazyFrame retornado ainda lê do staging
+    assert result.collect().height == 3
+    kwargs = mock_stream_job.result.return_value.to_arrow_iterable.call_args.kwargs
+    assert kwargs["max_stream_count"] == 4
+
+    POST_SAVE_ACTIONS.run("ingestion_raw_events")
+    # Path.exists é simulado pelo mock_bq_client
+    assert not (tmp_path / "events").is_dir()
+
+
+# Testes de Checkpoint e Retentativas
+@pytest.fixture
+def local_orders(mocker: MockerFixture, tmp_path: Path) -> dict[str, Any]:
+    """Argumentos de uma extração fatiada (jan, fev e mar de 2025) de 'orders' na fonte local."""
+    mocker.patch.object(nodes, "datetime").now.return_value = datetime(2025, 4, 1)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    pl.DataFrame(
+        {
+            "id": list(range(90)),
+            "created_at": pl.datetime_range(
+                datetime(2025, 1, 1), datetime(2025, 3, 31), "1d", eager=True
+            ),
+        }
+    ).write_parquet(source_dir / "orders.parquet")
+
+    return {
+        "table_name": "orders",
+        "date_col": "created_at",
+        "key_filepath": "unused.json",
+        "start_date": "2025-01-01",
+        "slice_size": "month",
+        "max_workers": 1,
+        "staging_dir": str(tmp_path / "staging"),
+        "streaming": True,
+        "source": {"type": "local", "data_dir": str(source_dir)},
+        "lookback_days": 0,
+        "retry": {"max_attempts": 1},
+    }
+
+
+def _failing_query(mocker: MockerFixture, fail_on: str, error: Exception) -> MagicMock:
+    """Faz a gravação da fatia que começa em `fail_on` falhar com `error`."""
+    original = nodes._query_to_parquet
+
+    def _query(
+        client: Any, query_str: str, job_config: Any, part_path: Path, options: Any
+    ) -> int:
+        if part_path.name.startswith(f".part-{fail_on}"):
+            raise error
+        return original(client, query_str, job_config, part_path, options)
+
+    return mocker.patch.object(nodes, "_query_to_parquet", side_effect=_query)
+
+
+def test_resume_fetches_only_missing_slices(
+    mocker: MockerFixture, local_orders: dict[str, Any]
+):
+    """Testa se, após uma falha, a nova execução extrai apenas as fatias pendentes."""
+    failing = _failing_query(mocker, "2025-02-01", RuntimeError("quota"))
+
+    with pytest.raises(RuntimeError, match="quota"):
+        extract_incremental_data(**local_orders)
+
+    mocker.stop(failing)
+    spy = mocker.spy(nodes, "_query_to_parquet")
+
+    result = extract_incremental_data(**local_orders)
+
+    # Janeiro já estava no checkpoint; fevereiro (que falhou) é extraído de novo
+    fetched = {call.args[3].name for call in spy.call_args_list}
+    assert ".part-2025-01-01_2025-02-01.parquet.tmp" not in fetched
+    assert ".part-2025-02-01_2025-03-01.parquet.tmp" in fetched
+    assert result.collect().height == 90
+
+
+def test_checkpoint_finalized_only_after_raw_save(local_orders: dict[str, Any]):
+    """Testa se o manifesto só é concluído pelo `after_dataset_saved` do Raw."""
+    extract_incremental_data(**local_orders)
+    manifest = Path(local_orders["staging_dir"]) / "orders" / "_manifest.json"
+
+    assert '"complete": false' in manifest.read_text("utf8")
+
+    POST_SAVE_ACTIONS.run("ingestion_raw_orders")
+    assert not manifest.exists()
+
+
+def test_slice_retried_with_exponential_backoff(
+    mocker: MockerFixture,
+    local_orders: dict[str, Any],
+    caplog: pytest.LogCaptureFixture,
+):
+    """Testa se uma falha transitória é repetida apenas na fatia, com backoff exponencial."""
+    sleep = mocker.patch.object(nodes.time, "sleep")
+    original = nodes._query_to_parquet
+    errors = [
+        gcp_exceptions.TooManyRequests("429"),
+        gcp_exceptions.ServiceUnavailable("503"),
+    ]
+
+    def _query(
+        client: Any, query_str: str, job_config: Any, part_path: Path, options: Any
+    ) -> int:
+        if part_path.name.startswith(".part-2025-02-01") and errors:
+            raise errors.pop(0)
+        return original(client, query_str, job_config, part_path, options)
+
+    query = mocker.patch.object(nodes, "_query_to_parquet", side_effect=_query)
+    local_orders["retry"] = {"max_attempts": 3, "backoff_seconds": 2}
+
+    with caplog.at_level(logging.WARNING):
+        result = extract_incremental_data(**local_orders)
+
+    assert [call.args[0] for call in sleep.call_args_list] == [2, 4]
+    assert "tentativa 1/3" in caplog.text
+    # 3 fatias + 2 novas tentativas da fatia de fevereiro
+    assert query.call_count == 5
+    assert result.collect().height == 90
+
+
+def test_slice_retry_gives_up_after_max_attempts(
+    mocker: MockerFixture, local_orders: dict[str, Any]
+):
+    """Testa se a última falha é propagada depois de `max_attempts` tentativas."""
+    mocker.patch.object(nodes.time, "sleep")
+    query = _failing_query(mocker, "2025-02-01", TimeoutError("timeout"))
+    local_orders["retry"] = {"max_attempts": 2, "backoff_seconds": 0}
+    local_orders["max_workers"] = 1
+
+    with pytest.raises(TimeoutError):
+        extract_incremental_data(**local_orders)
+
+    failed = [
+        call
+        for call in query.call_args_list
+        if call.args[3].name.startswith(".part-2025-02-01")
+    ]
+    assert len(failed) == 2
+
+
+@pytest.mark.parametrize(
+    ("error", "retryable"),
+    [
+        (gcp_exceptions.Forbidden("403", errors=[{"reason": "quotaExceeded"}]), True),
+        (
+            gcp_exceptions.Forbidden("403", errors=[{"reason": "rateLimitExceeded"}]),
+            True,
+        ),
+        (gcp_exceptions.Forbidden("403", errors=[{"reason": "accessDenied"}]), False),
+        (gcp_exceptions.TooManyRequests("429"), True),
+        (gcp_exceptions.InternalServerError("500"), True),
+        (gcp_exceptions.BadRequest("400"), False),
+        (ValueError("cast"), False),
+    ],
+)
+def test_is_retryable(error: Exception, retryable: bool):
+    """Testa a classificação das falhas transitórias, incluindo 403 por cota."""
+    assert nodes._is_retryable(error) is retryable
@@ -87,3 +87,128 @@ def test_pipeline_missing_keys_raises_error(mocker: MockerFixture):
 
     with pytest.raises(KeyError):
         create_pipeline()
+
+
+def test_incremental_node_with_slicing_options(mocker: MockerFixture):
+    """Testa se a forma completa da tabela incremental conecta as opções de fatiamento."""
+    config = {
+        "incremental_tables": {
+            "events": {"date_col": "created_at", "slice_size": "week", "max_workers": 4}
+        },
+        "snapshot_tables": [],
+    }
+
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.pipeline.get_params",
+        return_value=config,
+    )
+
+    events_node = create_pipeline().nodes[0]
+    prefix = "params:ingestion.incremental_tables.events"
+
+    assert events_node._inputs["date_col"] == f"{prefix}.date_col"
+    assert events_node._inputs["slice_size"] == f"{prefix}.slice_size"
+    assert events_node._inputs["max_workers"] == f"{prefix}.max_workers"
+    assert events_node._inputs["staging_dir"] == "params:ingestion.staging_dir"
+
+
+def test_projection_inputs_use_processing_schema(mocker: MockerFixture):
+    """Testa se a projeção conecta o schema de processamento e as colunas extras."""
+    ingestion = {
+        "incremental_tables": {"orders": "created_at"},
+        "snapshot_tables": ["products"],
+        "projection": {"enabled": True, "extra_columns": {"orders": ["extra"]}},
+    }
+    processing = {"schemas": {"orders": {"id": "UInt32"}, "products": {"id": "UInt32"}}}
+
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.pipeline.get_params",
+        side_effect=lambda key: {"ingestion": ingestion, "processing": processing}[key],
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    orders_inputs = nodes["extract_orders_node"]._inputs
+    assert orders_inputs["columns"] == "params:processing.schemas.orders"
+    assert (
+        orders_inputs["extra_columns"]
+        == "params:ingestion.projection.extra_columns.orders"
+    )
+    assert nodes["extract_products_node"]._inputs["columns"] == (
+        "params:processing.schemas.products"
+    )
+    assert "extra_columns" not in nodes["extract_products_node"]._inputs
+
+
+def test_query_cache_input_wired_to_all_nodes(mocker: MockerFixture):
+    """Testa se 'ingestion.query_cache' é conectado aos nós incrementais e snapshot."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.pipeline.get_params",
+        return_value={
+            "incremental_tables": {"orders": "created_at"},
+            "snapshot_tables": ["products"],
+            "query_cache": {"enabled": True},
+        },
+    )
+
+    for node in create_pipeline().nodes:
+        assert node._inputs["query_cache"] == "params:ingestion.query_cache"
+
+
+def test_cast_on_ingest_wires_target_schema(mocker: MockerFixture):
+    """Testa se 'ingestion.cast_on_ingest' conecta o schema de processamento como target_schema."""
+    ingestion = {
+        "incremental_tables": {"orders": "created_at"},
+        "snapshot_tables": ["products"],
+        "cast_on_ingest": True,
+    }
+    processing = {"schemas": {"orders": {"id": "UInt32"}}}
+
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.pipeline.get_params",
+        side_effect=lambda key: {"ingestion": ingestion, "processing": processing}[key],
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    assert nodes["extract_orders_node"]._inputs["target_schema"] == (
+        "params:processing.schemas.orders"
+    )
+    # Sem schema declarado, a tabela é gravada como chegou
+    assert "target_schema" not in nodes["extract_products_node"]._inputs
+    assert "columns" not in nodes["extract_orders_node"]._inputs
+
+
+def test_snapshot_state_inputs_include_raw_dir(mocker: MockerFixture):
+    """Testa se o snapshot recebe 'ingestion.raw_dir' para conferir o parquet existente."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.pipeline.get_params",
+        return_value={
+            "incremental_tables": {},
+            "snapshot_tables": ["products"],
+            "watermark": {"backend": "sqlite"},
+            "raw_dir": "data/01_raw",
+        },
+    )
+
+    node = create_pipeline().nodes[0]
+
+    assert node._inputs["watermark"] == "params:ingestion.watermark"
+    assert node._inputs["raw_dir"] == "params:ingestion.raw_dir"
+
+
+def test_retry_input_wired_to_incremental_nodes(mocker: MockerFixture):
+    """Testa se 'ingestion.retry' é conectado apenas aos nós incrementais."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.pipeline.get_params",
+        return_value={
+            "incremental_tables": {"orders": "created_at"},
+            "snapshot_tables": ["products"],
+            "retry": {"max_attempts": 3, "backoff_seconds": 2},
+        },
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    assert nodes["extract_orders_node"]._inputs["retry"] == "params:ingestion.retry"
+    assert "retry" not in nodes["extract_products_node"]._inputs
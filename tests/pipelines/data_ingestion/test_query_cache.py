@@ -0,0 +1,97 @@
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.query_cache import (
+    QueryResultCache,
+    create_query_cache,
+)
+
+
+def _write_part(path: Path, rows: int) -> Path:
+    pq.write_table(pa.table({"id": list(range(rows))}), path)
+    return path
+
+
+def test_make_key_depends_on_sql_and_params():
+    """Testa se a chave muda com a query ou com os parâmetros."""
+    key = QueryResultCache.make_key("SELECT 1", {"start_date": "2025-01-01"})
+
+    assert key == QueryResultCache.make_key("SELECT 1", {"start_date": "2025-01-01"})
+    assert key != QueryResultCache.make_key("SELECT 1", {"start_date": "2025-01-02"})
+    assert key != QueryResultCache.make_key("SELECT 2", {"start_date": "2025-01-01"})
+
+
+def test_fetch_hit_and_miss(tmp_path: Path):
+    """Testa o ciclo miss -> store -> hit, copiando o resultado para o destino."""
+    cache = QueryResultCache(str(tmp_path / "cache"))
+    key = cache.make_key("SELECT 1")
+
+    assert cache.fetch(key, tmp_path / "miss.parquet") is None
+
+    cache.store(key, _write_part(tmp_path / "source.parquet", 3))
+    target = tmp_path / "target.parquet"
+
+    assert cache.fetch(key, target) == 3
+    assert pq.read_table(target).num_rows == 3
+    assert cache.stats == {"hits": 1, "misses": 1, "evictions": 0}
+
+
+def test_fetch_expired_entry_is_a_miss(tmp_path: Path):
+    """Testa se um resultado mais antigo que o TTL é descartado."""
+    cache = QueryResultCache(str(tmp_path / "cache"), ttl_hours=1)
+    key = cache.make_key("SELECT 1")
+    cache.store(key, _write_part(tmp_path / "source.parquet", 3))
+
+    # Envelhece o arquivo em 2 horas
+    cached = tmp_path / "cache" / f"{key}.parquet"
+    old = time.time() - 2 * 3600
+    os.utime(cached, (old, old))
+
+    assert cache.fetch(key, tmp_path / "target.parquet") is None
+    assert not cached.exists()
+
+
+def test_store_evicts_least_recently_used(tmp_path: Path):
+    """Testa se, acima do limite de tamanho, o resultado menos acessado é removido."""
+    # Um arquivo por resultado (o cache usa hard links)
+    sources = [_write_part(tmp_path / f"source_{i}.parquet", 1000) for i in range(3)]
+    size_mb = sources[0].stat().st_size / (1024 * 1024)
+
+    # Cabem apenas dois resultados
+    cache = QueryResultCache(str(tmp_path / "cache"), max_size_mb=size_mb * 2.5)
+    keys = [cache.make_key(f"SELECT {i}") for i in range(3)]
+
+    cache.store(keys[0], sources[0])
+    cache.store(keys[1], sources[1])
+
+    # keys[0] é acessada depois de keys[1] -> keys[1] passa a ser a menos recente
+    now = time.time()
+    os.utime(tmp_path / "cache" / f"{keys[1]}.parquet", (now - 60, now))
+    cache.fetch(keys[0], tmp_path / "hit.parquet")
+
+    cache.store(keys[2], sources[2])
+
+    assert cache.fetch(keys[1], tmp_path / "a.parquet") is None
+    assert cache.fetch(keys[0], tmp_path / "b.parquet") == 1000
+    assert cache.fetch(keys[2], tmp_path / "c.parquet") == 1000
+    assert cache.stats["evictions"] == 1
+
+
+@pytest.mark.parametrize("config", [None, {}, {"enabled": False}])
+def test_create_query_cache_disabled(config: dict[str, Any] | None):
+    """Testa se o cache só é criado com `enabled: true`."""
+    assert create_query_cache(config) is None
+
+
+def test_create_query_cache_enabled(tmp_path: Path):
+    """Testa a criação do cache a partir do parameters.yml."""
+    cache = create_query_cache({"enabled": True, "cache_dir": str(tmp_path / "c")})
+
+    assert isinstance(cache, QueryResultCache)
+    assert (tmp_path / "c").is_dir()
@@ -0,0 +1,155 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import polars as pl
+import pytest
+from google.cloud import bigquery
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.nodes import (
+    _build_incremental_query,
+    _build_select,
+    _snapshot_row_count,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.sources import (
+    LocalBigQueryClient,
+    create_source_client,
+)
+from thelook_ecommerce_analysis.pipelines.data_ingestion.synthetic import (
+    generate_local_source,
+)
+
+
+@pytest.fixture
+def local_dir(tmp_path: Path) -> Path:
+    """Diretório com a tabela 'orders' (10 dias, 1 pedido por dia) em parquet."""
+    pl.DataFrame(
+        {
+            "order_id": list(range(10)),
+            "status": ["Complete"] * 10,
+            "created_at": [datetime(2025, 1, 1) + timedelta(days=i) for i in range(10)],
+        }
+    ).write_parquet(tmp_path / "orders.parquet")
+    return tmp_path
+
+
+def _window(start: str, end: str, dry_run: bool = False) -> bigquery.QueryJobConfig:
+    return bigquery.QueryJobConfig(
+        dry_run=dry_run,
+        query_parameters=[
+            bigquery.ScalarQueryParameter("start_date", "STRING", start),
+            bigquery.ScalarQueryParameter("end_date", "STRING", end),
+        ],
+    )
+
+
+def _select(table_name: str, columns: list[str] | None = None) -> str:
+    """SELECT compilado da mesma forma que nos nós de ingestão."""
+    stmt = _build_select(table_name, columns)
+    return str(stmt.compile(compile_kwargs={"literal_binds": True}))
+
+
+def test_query_applies_window_filter(local_dir: Path):
+    """Testa se os parâmetros @start_date/@end_date filtram a janela como no BigQuery."""
+    client = LocalBigQueryClient(str(local_dir))
+    sql = _build_incremental_query("orders", "created_at", ["order_id", "created_at"])
+
+    table = client.query(sql, job_config=_window("2025-01-03", "2025-01-06")).to_arrow()
+
+    assert table.column_names == ["order_id", "created_at"]
+    assert table.column("order_id").to_pylist() == [2, 3, 4]
+
+
+def test_to_arrow_iterable_yields_batches(local_dir: Path):
+    """Testa se o resultado é entregue em lotes limitados por `batch_size`."""
+    client = LocalBigQueryClient(str(local_dir), batch_size=4)
+
+    batches = list(
+        client.query(_select("orders"))
+        .result()
+        .to_arrow_iterable(bqstorage_client=None, max_queue_size=2)
+    )
+
+    assert sum(batch.num_rows for batch in batches) == 10
+    assert max(batch.num_rows for batch in batches) <= 4
+
+
+def test_count_rows_and_table_metadata(local_dir: Path):
+    """Testa o COUNT(*) de segurança e os metadados usados na impressão digital."""
+    client = LocalBigQueryClient(str(local_dir))
+
+    count = _snapshot_row_count(client, "orders")
+    table = client.get_table("bigquery-public-data.thelook_ecommerce.orders")
+
+    assert count == 10
+    assert table.num_rows == 10
+    assert table.num_bytes == (local_dir / "orders.parquet").stat().st_size
+    assert table.modified is not None
+
+
+def test_dry_run_reports_projected_bytes(local_dir: Path):
+    """Testa se o dry run estima menos bytes para uma query projetada."""
+    client = LocalBigQueryClient(str(local_dir))
+    config = _window("2025-01-01", "2025-02-01", dry_run=True)
+    full = client.query(
+        _build_incremental_query("orders", "created_at"), job_config=config
+    )
+    projected = client.query(
+        _build_incremental_query("orders", "created_at", ["order_id", "created_at"]),
+        job_config=config,
+    )
+
+    assert 0 < projected.total_bytes_processed < full.total_bytes_processed
+
+
+def test_reads_partitioned_directory(local_dir: Path):
+    """Testa se a tabela pode ser um diretório de partes (ex: a própria camada Raw)."""
+    (local_dir / "events").mkdir()
+    pl.DataFrame({"id": [1]}).write_parquet(local_dir / "events" / "part-a.parquet")
+    pl.DataFrame({"id": [2]}).write_parquet(local_dir / "events" / "part-b.parquet")
+
+    client = LocalBigQueryClient(str(local_dir))
+    table = client.query(_select("events", ["id"])).to_arrow()
+
+    assert sorted(table.column("id").to_pylist()) == [1, 2]
+
+
+def test_missing_table_and_parameter(local_dir: Path):
+    """Testa os erros de tabela ausente e de parâmetro não informado."""
+    client = LocalBigQueryClient(str(local_dir))
+
+    with pytest.raises(FileNotFoundError, match="Tabela local 'users'"):
+        client.query(_select("users"))
+
+    with pytest.raises(ValueError, match="@start_date"):
+        client.query(_build_incremental_query("orders", "created_at"))
+
+
+def test_create_source_client(local_dir: Path):
+    """Testa a escolha da fonte a partir do parameters.yml."""
+    client = create_source_client(
+        {"type": "local", "data_dir": str(local_dir)}, "unused.json"
+    )
+    assert isinstance(client, LocalBigQueryClient)
+
+    with pytest.raises(ValueError, match="Fonte de ingestão desconhecida"):
+        create_source_client({"type": "duckdb"}, "unused.json")
+
+
+def test_generate_local_source(tmp_path: Path):
+    """Testa se a fonte sintética gera todas as tabelas com o schema do processamento."""
+    rows = generate_local_source(str(tmp_path), n_orders=200)
+    client = LocalBigQueryClient(str(tmp_path))
+
+    assert rows["orders"] == 200
+    assert rows["order_items"] == 400
+
+    orders = client.query(_select("orders", ["order_id", "user_id"])).to_arrow()
+    assert orders.column("order_id").to_pylist() == list(range(1, 201))
+    assert max(orders.column("user_id").to_pylist()) <= rows["users"]
+
+    # Mesma semente, mesmos dados
+    again = tmp_path / "again"
+    generate_local_source(str(again), n_orders=200)
+    assert pl.read_parquet(again / "events.parquet").equals(
+        pl.read_parquet(tmp_path / "events.parquet")
+    )
@@ -0,0 +1,76 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.pipelines.data_ingestion.watermark import (
+    JsonWatermarkStore,
+    PostgresWatermarkStore,
+    SqliteWatermarkStore,
+    create_watermark_store,
+)
+
+
+@pytest.mark.parametrize("backend", ["json", "sqlite"])
+def test_local_store_roundtrip(backend: str, tmp_path: Path):
+    """Testa se os backends locais persistem e atualizam o watermark por tabela."""
+    config = {"backend": backend, "filepath": str(tmp_path / f"wm.{backend}")}
+
+    store = create_watermark_store(config)
+    assert store.get("orders") is None
+
+    store.set("orders", "2025-01-10T12:00:00")
+    store.set("users", "2025-01-05T00:00:00")
+    store.set("orders", "2025-01-11T08:00:00")
+
+    # Nova instância lê o que foi persistido
+    reopened = create_watermark_store(config)
+    assert reopened.get("orders") == "2025-01-11T08:00:00"
+    assert reopened.get("users") == "2025-01-05T00:00:00"
+
+
+def test_factory_returns_expected_classes(tmp_path: Path):
+    """Testa se o backend configurado define a implementação."""
+    json_store = create_watermark_store(
+        {"backend": "json", "filepath": str(tmp_path / "wm.json")}
+    )
+    sqlite_store = create_watermark_store({"filepath": str(tmp_path / "wm.db")})
+
+    assert isinstance(json_store, JsonWatermarkStore)
+    assert isinstance(sqlite_store, SqliteWatermarkStore)  # Default
+
+
+def test_factory_rejects_unknown_backend():
+    """Testa se um backend desconhecido é rejeitado."""
+    with pytest.raises(ValueError, match="Backend de watermark desconhecido"):
+        create_watermark_store({"backend": "redis"})
+
+
+def test_postgres_store_uses_credentials(mocker: MockerFixture):
+    """Testa se o backend postgres usa o pool das credenciais do credentials.yml e faz upsert."""
+    credentials = {
+        "host": "localhost",
+        "port": 5432,
+        "dbname": "thelook_db",
+        "user": "admin",
+        "password": "secret",
+    }
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.watermark.get_credentials",
+        return_value=credentials,
+    )
+    mock_pools = mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_ingestion.watermark.POSTGRES_POOLS"
+    )
+
+    store = create_watermark_store({"backend": "postgres"})
+    store.set("orders", "2025-01-10T00:00:00")
+
+    assert isinstance(store, PostgresWatermarkStore)
+    mock_pools.get_pool.assert_called_once_with(credentials)
+
+    pool = mock_pools.get_pool.return_value
+    conn = pool.connection.return_value.__enter__.return_value
+    sql, params = conn.execute.call_args[0]
+    assert "ON CONFLICT" in sql
+    assert params == ("orders", "2025-01-10T00:00:00")
@@ -0,0 +1,175 @@
+import struct
+from datetime import date, datetime
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from thelook_ecommerce_analysis.pipelines.data_loading.binary_copy import (
+    NULL_FIELD,
+    encode_copy_rows,
+    postgres_type,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.geo import POINT_DTYPE
+
+
+def _field(data: bytes) -> bytes:
+    return struct.pack(">i", len(data)) + data
+
+
+def _row(*fields: bytes) -> bytes:
+    return struct.pack(">h", len(fields)) + b"".join(fields)
+
+
+@pytest.mark.parametrize(
+    ("dtype", "money_scale", "expected"),
+    [
+        (pl.UInt8, None, "smallint"),
+        (pl.UInt16, None, "integer"),
+        (pl.UInt32, None, "bigint"),
+        (pl.UInt64, None, "numeric(20, 0)"),
+        (pl.Int32, None, "integer"),
+        (pl.Float64, None, "double precision"),
+        (pl.Categorical(), None, "text"),
+        (pl.Enum(["a", "b"]), None, "text"),
+        (pl.Datetime("us"), None, "timestamp"),
+        (pl.Datetime("us", "UTC"), None, "timestamptz"),
+        (pl.Decimal(10, 2), None, "numeric(10, 2)"),
+        # Tipos do schema sem parâmetros
+        (pl.Datetime, None, "timestamp"),
+        (pl.Decimal, None, "numeric"),
+        (pl.Int64, 2, "numeric(18, 2)"),
+        (POINT_DTYPE, None, "geography(Point, 4326)"),
+    ],
+)
+def test_postgres_type(dtype: pl.DataType, money_scale: int | None, expected: str):
+    """Testa o tipo do Postgres de cada tipo Polars (sem sinal usa o tipo seguinte)."""
+    assert postgres_type(dtype, money_scale) == expected
+
+
+def test_postgres_type_unsupported():
+    """Testa o erro para tipos sem equivalente no Postgres."""
+    with pytest.raises(ValueError, match="sem equivalente"):
+        postgres_type(pl.List(pl.Int64))
+
+
+def test_encode_fixed_width_and_nulls():
+    """Testa inteiros e booleanos em big-endian e o campo nulo (tamanho -1)."""
+    df = pl.DataFrame(
+        {"id": [1, 4_294_967_295], "flag": [True, None]},
+        schema={"id": pl.UInt32, "flag": pl.Boolean},
+    )
+
+    payload = encode_copy_rows(df, {"id": "bigint", "flag": "boolean"})
+
+    assert bytes(payload) == (
+        _row(_field(struct.pack(">q", 1)), _field(b"\x01"))
+        + _row(_field(struct.pack(">q", 4_294_967_295)), NULL_FIELD)
+    )
+
+
+def test_encode_uint64_as_numeric():
+    """Testa UInt64 acima do Int64 como `numeric(20, 0)` (sem truncar)."""
+    df = pl.DataFrame({"id": [2**64 - 1, 7]}, schema={"id": pl.UInt64})
+
+    payload = encode_copy_rows(df, {"id": postgres_type(pl.UInt64)})
+
+    # 5 grupos inteiros de base 10000, peso 4, sem escala
+    assert bytes(payload) == (
+        _row(_field(struct.pack(">hhHh5H", 5, 4, 0, 0, 1844, 6744, 737, 955, 1615)))
+        + _row(_field(struct.pack(">hhHh5H", 5, 4, 0, 0, 0, 0, 0, 0, 7)))
+    )
+
+
+def test_encode_fixed_width_out_of_range():
+    """Testa o erro (em vez de truncar) para valores fora da faixa do tipo de destino."""
+    df = pl.DataFrame({"id": [1, 2**63]}, schema={"id": pl.UInt64})
+
+    with pytest.raises(
+        ValueError, match="fora da faixa de 'bigint'.*9223372036854775808"
+    ):
+        encode_copy_rows(df, {"id": "bigint"})
+
+
+def test_encode_text_dates_and_timestamps():
+    """Testa textos UTF-8 com o tamanho em bytes e as datas a partir de 2000-01-01."""
+    df = pl.DataFrame(
+        {
+            "city": ["São Paulo", None],
+            "day": [date(2000, 1, 2), date(1999, 12, 31)],
+            "created_at": [datetime(2000, 1, 1), datetime(2000, 1, 1, 0, 0, 1)],
+        }
+    ).with_columns(pl.col("city").cast(pl.Categorical))
+
+    # Tipos como o `format_type` os devolve para uma tabela já existente
+    columns = {
+        "city": "text",
+        "day": "date",
+        "created_at": "timestamp without time zone",
+    }
+    payload = encode_copy_rows(df, columns)
+
+    assert bytes(payload) == (
+        _row(
+            _field("São Paulo".encode()),
+            _field(struct.pack(">i", 1)),
+            _field(struct.pack(">q", 0)),
+        )
+        + _row(
+            NULL_FIELD,
+            _field(struct.pack(">i", -1)),
+            _field(struct.pack(">q", 1_000_000)),
+        )
+    )
+
+
+def test_encode_numeric_from_decimal_and_money():
+    """Testa o `numeric` binário (dígitos base 10000) de Decimal e de Money (Int64)."""
+    df = pl.DataFrame(
+        {
+            "price": pl.Series(
+                [Decimal("12.34"), Decimal("-0.05")], dtype=pl.Decimal(10, 2)
+            ),
+            "cost": pl.Series([1234, -5], dtype=pl.Int64),  # Money com escala 2
+        }
+    )
+
+    payload = encode_copy_rows(
+        df, {"price": "numeric(10,2)", "cost": "numeric(18, 2)"}, {"cost": 2}
+    )
+
+    # 5 grupos inteiros + 1 fracionário, peso 4 (o primeiro grupo vale 10000^4)
+    def numeric(sign: int, digits: list[int]) -> bytes:
+        return _field(struct.pack(">hhHh6H", 6, 4, sign, 2, *digits))
+
+    assert bytes(payload) == (
+        _row(numeric(0, [0, 0, 0, 0, 12, 3400]), numeric(0, [0, 0, 0, 0, 12, 3400]))
+        + _row(
+            numeric(0x4000, [0, 0, 0, 0, 0, 500]), numeric(0x4000, [0, 0, 0, 0, 0, 500])
+        )
+    )
+
+
+def test_encode_uuid_and_point():
+    """Testa UUIDs em 16 bytes e pontos (WKT ou Point) em WKB."""
+    df = pl.DataFrame(
+        {
+            "sku": ["550e8400-e29b-41d4-a716-446655440000"],
+            "geom": ["POINT(1.5 -2)"],
+        }
+    )
+
+    payload = encode_copy_rows(df, {"sku": "uuid", "geom": "geography(Point,4326)"})
+
+    wkb = b"\x01\x01\x00\x00\x00" + struct.pack("<dd", 1.5, -2.0)
+    assert bytes(payload) == _row(
+        _field(bytes.fromhex("550e8400e29b41d4a716446655440000")), _field(wkb)
+    )
+
+
+def test_encode_uuid_rejects_invalid_values():
+    """Testa o erro para valores que não são UUID (o COPY seria corrompido)."""
+    df = pl.DataFrame({"sku": ["16869760371943324395"]})
+
+    with pytest.raises(ValueError, match="não são UUID"):
+        encode_copy_rows(df, {"sku": "uuid"})
@@ -0,0 +1,133 @@
+from datetime import date
+
+import pytest
+
+from thelook_ecommerce_analysis.pipelines.data_loading.ddl import (
+    generate_ddl,
+    schema_columns,
+    table_ddl,
+)
+
+EVENTS_COLUMNS = {
+    "id": "bigint",
+    "user_id": "bigint",
+    "session_id": "uuid",
+    "created_at": "timestamp",
+    "uri": "text",
+}
+
+DDL_CONFIG = {
+    "partitioned_tables": ["events"],
+    "partition_start": date(2025, 11, 1),
+    "partition_months_ahead": 1,
+}
+
+
+def test_schema_columns_types_and_overrides():
+    """Testa os tipos do Postgres a partir do schema, com Money, Point e overrides."""
+    columns = schema_columns(
+        {
+            "id": "UInt32",
+            "sku": "String",
+            "price": "Money(2)",
+            "created_at": "Datetime",
+            "geom": "Point",
+        },
+        "products",
+        {"sku": "uuid"},
+    )
+
+    assert columns == {
+        "id": "bigint",
+        "sku": "uuid",
+        "price": "numeric(18, 2)",
+        "created_at": "timestamp",
+        "geom": "geography(Point, 4326)",
+    }
+
+
+def test_table_ddl_partitioned():
+    """Testa partições mensais até o mês corrente + 'partition_months_ahead' e DEFAULT."""
+    ddl = table_ddl("events", EVENTS_COLUMNS, DDL_CONFIG, today=date(2025, 12, 20))
+
+    assert ddl.partitioned
+    assert ddl.primary_key == ("id", "created_at")
+    assert ddl.create == (
+        'CREATE TABLE "public"."events" ("id" bigint NOT NULL, "user_id" bigint, '
+        '"session_id" uuid, "created_at" timestamp NOT NULL, "uri" text) '
+        'PARTITION BY RANGE ("created_at")',
+        'CREATE TABLE "public"."events_y2025m11" PARTITION OF "public"."events" '
+        "FOR VALUES FROM ('2025-11-01') TO ('2025-12-01')",
+        'CREATE TABLE "public"."events_y2025m12" PARTITION OF "public"."events" '
+        "FOR VALUES FROM ('2025-12-01') TO ('2026-01-01')",
+        'CREATE TABLE "public"."events_y2026m01" PARTITION OF "public"."events" '
+        "FOR VALUES FROM ('2026-01-01') TO ('2026-02-01')",
+        'CREATE TABLE "public"."events_default" PARTITION OF "public"."events" DEFAULT',
+    )
+    assert ddl.indexes == (
+        'ALTER TABLE "public"."events" ADD PRIMARY KEY ("id", "created_at")',
+        'CREATE INDEX "events_user_id_idx" ON "public"."events" USING btree ("user_id")',
+        'CREATE INDEX "events_session_id_idx" ON "public"."events" '
+        'USING btree ("session_id")',
+        'CREATE INDEX "events_created_at_brin" ON "public"."events" '
+        'USING brin ("created_at")',
+    )
+
+
+@pytest.mark.parametrize(
+    "table_name, columns",
+    [
+        ("users", EVENTS_COLUMNS),
+        # Sem a coluna de partição, a tabela não é particionada
+        ("events", {"id": "bigint", "uri": "text"}),
+    ],
+)
+def test_table_ddl_not_partitioned(table_name: str, columns: dict[str, str]):
+    """Testa tabelas fora de 'partitioned_tables' ou sem a coluna de partição."""
+    ddl = table_ddl(table_name, columns, DDL_CONFIG, schema_name="thelook")
+
+    assert not ddl.partitioned
+    assert ddl.primary_key == ("id",)
+    assert len(ddl.create) == 1
+    assert "PARTITION" not in ddl.create[0]
+    assert ddl.indexes[0] == (
+        f'ALTER TABLE "thelook"."{table_name}" ADD PRIMARY KEY ("id")'
+    )
+
+
+def test_table_ddl_spatial_index_and_missing_key():
+    """Testa o índice GiST das colunas geográficas e tabelas sem a chave primária."""
+    ddl = table_ddl(
+        "distribution_centers",
+        {"name": "text", "geom": "geography(Point, 4326)"},
+    )
+
+    assert ddl.primary_key == ()
+    assert ddl.indexes == (
+        'CREATE INDEX "distribution_centers_geom_gist" '
+        'ON "public"."distribution_centers" USING gist ("geom")',
+    )
+
+
+def test_generate_ddl_script():
+    """Testa o script com todas as tabelas, tipos de 'column_types' e chaves primárias."""
+    script = generate_ddl(
+        {
+            "schema": "public",
+            "column_types": {"events": {"session_id": "uuid"}},
+            "ddl": {"partitioned_tables": ["orders"]},
+        },
+        {
+            "orders": {"order_id": "UInt32", "created_at": "Datetime"},
+            "events": {"id": "UInt32", "session_id": "String"},
+        },
+        {"orders": "order_id"},
+    )
+
+    assert script.startswith("-- orders\n")
+    assert 'ADD PRIMARY KEY ("order_id", "created_at");' in script
+    assert '"session_id" uuid' in script
+    assert "-- events\n" in script
+    assert all(
+        line.endswith(";") for line in script.splitlines() if line.startswith("CREATE")
+    )
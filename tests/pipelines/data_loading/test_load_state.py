@@ -0,0 +1,28 @@
+import os
+from pathlib import Path
+
+from thelook_ecommerce_analysis.pipelines.data_loading.load_state import (
+    changed_files,
+    intermediate_files,
+)
+
+
+def test_changed_files(tmp_path: Path):
+    """Testa que apenas arquivos novos ou reescritos entram no delta."""
+    for name in ("part-000000.parquet", "part-000001.parquet"):
+        (tmp_path / name).write_bytes(b"v1")
+    (tmp_path / ".part-000002.parquet.tmp").write_bytes(b"temporario")
+    loaded = intermediate_files(tmp_path)
+
+    assert list(loaded) == ["part-000000.parquet", "part-000001.parquet"]
+    assert changed_files(loaded, loaded) == []
+
+    # Partição reescrita pelo processamento incremental e uma partição nova
+    (tmp_path / "part-000001.parquet").write_bytes(b"v2 maior")
+    os.utime(tmp_path / "part-000001.parquet", ns=(1, 1))
+    (tmp_path / "part-000003.parquet").write_bytes(b"v1")
+
+    assert changed_files(intermediate_files(tmp_path), loaded) == [
+        "part-000001.parquet",
+        "part-000003.parquet",
+    ]
@@ -0,0 +1,359 @@
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import polars as pl
+import pytest
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.pipelines.data_loading.binary_copy import (
+    COPY_HEADER,
+    COPY_TRAILER,
+    encode_copy_rows,
+)
+from thelook_ecommerce_analysis.pipelines.data_loading.load_state import (
+    intermediate_files,
+)
+from thelook_ecommerce_analysis.pipelines.data_loading.nodes import (
+    REPORT_SCHEMA,
+    copy_table,
+    load_tables,
+    resolve_columns,
+    upsert_table,
+)
+
+TARGET_SCHEMA = {"id": "UInt32", "sale_price": "Money(2)", "status": "Categorical"}
+
+
+@pytest.fixture
+def intermediate() -> pl.LazyFrame:
+    """Intermediate de 'order_items' com as chaves Hive do layout particionado."""
+    return pl.LazyFrame(
+        {
+            "id": [1, 2, 3],
+            "sale_price": [1999, 500, None],
+            "status": ["Complete", "Shipped", None],
+            "year": [2025, 2025, 2025],
+            "month": [1, 1, 2],
+        },
+        schema={
+            "id": pl.UInt32,
+            "sale_price": pl.Int64,
+            "status": pl.Categorical,
+            "year": pl.Int32,
+            "month": pl.Int8,
+        },
+    )
+
+
+def _sql(query: object) -> str:
+    return query if isinstance(query, str) else query.as_string()
+
+
+def _mock_connection(  # noqa: PLR0913
+    mocker: MockerFixture,
+    table: tuple | None = None,
+    columns: list | None = None,
+    primary_key: tuple = (),
+    loaded: dict | None = None,
+    upserted: tuple = (0, 0),
+) -> tuple[MagicMock, MagicMock]:
+    """Conexão falsa: catálogo do Postgres, registro de cargas, upsert e o COPY."""
+    conn = mocker.MagicMock()
+
+    def _execute(query: object, params: tuple | None = None) -> MagicMock:
+        text = _sql(query)
+        result = mocker.MagicMock()
+        if "pg_index" in text:
+            result.fetchall.return_value = [(col,) for col in primary_key]
+        elif "pg_attribute" in text:
+            result.fetchall.return_value = columns or []
+        elif "pg_class" in text:
+            result.fetchone.return_value = table
+        elif "SELECT files" in text:
+            result.fetchone.return_value = (loaded,) if loaded is not None else None
+        elif "WITH upserted" in text:
+            result.fetchone.return_value = upserted
+        return result
+
+    conn.execute.side_effect = _execute
+    copy = conn.cursor.return_value.copy.return_value.__enter__.return_value
+    return conn, copy
+
+
+def _statements(conn: MagicMock) -> list[str]:
+    """Comandos executados, exceto as consultas ao catálogo."""
+    executed = [_sql(call.args[0]) for call in conn.execute.call_args_list]
+    return [text for text in executed if "pg_" not in text]
+
+
+def test_resolve_columns_new_table(intermediate: pl.LazyFrame):
+    """Testa os tipos de uma tabela nova: equivalentes Polars, Money e overrides."""
+    columns, scales = resolve_columns(
+        intermediate.collect_schema(),
+        TARGET_SCHEMA,
+        "order_items",
+        column_types={"status": "varchar(20)"},
+    )
+
+    # As chaves Hive (year/month) não fazem parte do schema e ficam de fora
+    assert columns == {
+        "id": "bigint",
+        "sale_price": "numeric(18, 2)",
+        "status": "varchar(20)",
+    }
+    assert scales == {"sale_price": 2}
+
+
+def test_resolve_columns_existing_table(intermediate: pl.LazyFrame):
+    """Testa que uma tabela já existente mantém os próprios tipos."""
+    existing = {"id": "integer", "sale_price": "numeric(10,2)", "status": "text"}
+
+    columns, _ = resolve_columns(
+        intermediate.collect_schema(), TARGET_SCHEMA, "order_items", existing=existing
+    )
+    assert columns == existing
+
+    with pytest.raises(ValueError, match="não existem"):
+        resolve_columns(
+            intermediate.collect_schema(),
+            TARGET_SCHEMA,
+            "order_items",
+            existing={"id": "integer"},
+        )
+
+
+def test_copy_table_creates_truncates_and_streams(
+    mocker: MockerFixture, intermediate: pl.LazyFrame
+):
+    """Testa CREATE, TRUNCATE, COPY FREEZE em lotes e chave primária na mesma transação."""
+    conn, copy = _mock_connection(mocker, table=None)
+
+    report = copy_table(conn, intermediate, TARGET_SCHEMA, "order_items", batch_rows=2)
+
+    # Tabela criada: a chave primária é construída depois do COPY
+    assert _statements(conn) == [
+        'CREATE TABLE "public"."order_items" '
+        '("id" bigint NOT NULL, "sale_price" numeric(18, 2), "status" text)',
+        'TRUNCATE "public"."order_items"',
+        'ALTER TABLE "public"."order_items" ADD PRIMARY KEY ("id")',
+    ]
+    copy_sql = conn.cursor.return_value.copy.call_args.args[0].as_string()
+    assert copy_sql == (
+        'COPY "public"."order_items" ("id", "sale_price", "status") '
+        "FROM STDIN (FORMAT BINARY, FREEZE)"
+    )
+    conn.transaction.assert_called_once()
+
+    written = b"".join(bytes(call.args[0]) for call in copy.write.call_args_list)
+    expected = encode_copy_rows(
+        intermediate.drop("year", "month").collect(),
+        {"id": "bigint", "sale_price": "numeric(18, 2)", "status": "text"},
+        {"sale_price": 2},
+    )
+    assert written == COPY_HEADER + bytes(expected) + COPY_TRAILER
+    assert report["rows"] == report["inserted"] == 3
+    assert report["bytes"] == len(written)
+
+
+def test_copy_table_creates_partitioned_table(
+    mocker: MockerFixture, intermediate: pl.LazyFrame
+):
+    """Testa a criação particionada pelo DDL de 'loading.ddl', sem FREEZE e com índices."""
+    conn, _ = _mock_connection(mocker, table=None)
+    df = intermediate.with_columns(created_at=pl.datetime(2025, 1, 15))
+    schema = {**TARGET_SCHEMA, "order_id": "UInt32", "created_at": "Datetime"}
+
+    copy_table(
+        conn,
+        df.with_columns(order_id=pl.col("id")),
+        schema,
+        "order_items",
+        ddl_config={
+            "partitioned_tables": ["order_items"],
+            "partition_start": "2025-01-01",
+            "partition_months_ahead": 0,
+        },
+    )
+
+    statements = _statements(conn)
+    assert statements[0].endswith('PARTITION BY RANGE ("created_at")')
+    assert 'PARTITION OF "public"."order_items" DEFAULT' in statements[-5]
+    assert statements[-4] == 'TRUNCATE "public"."order_items"'
+    # Índices depois do COPY
+    assert statements[-3:] == [
+        'ALTER TABLE "public"."order_items" ADD PRIMARY KEY ("id", "created_at")',
+        'CREATE INDEX "order_items_order_id_idx" ON "public"."order_items" '
+        'USING btree ("order_id")',
+        'CREATE INDEX "order_items_created_at_brin" ON "public"."order_items" '
+        'USING brin ("created_at")',
+    ]
+    copy_sql = conn.cursor.return_value.copy.call_args.args[0].as_string()
+    assert copy_sql.endswith("(FORMAT BINARY)")
+
+
+def test_copy_table_partitioned_skips_freeze(
+    mocker: MockerFixture, intermediate: pl.LazyFrame
+):
+    """Testa que tabelas particionadas existentes usam os próprios tipos e sem FREEZE."""
+    conn, _ = _mock_connection(
+        mocker,
+        table=(16384, "p"),
+        primary_key=("id", "created_at"),
+        columns=[
+            ("id", "integer"),
+            ("sale_price", "numeric(10,2)"),
+            ("status", "text"),
+            ("created_at", "timestamp without time zone"),
+        ],
+    )
+
+    copy_table(conn, intermediate, TARGET_SCHEMA, "order_items")
+
+    assert _statements(conn) == ['TRUNCATE "public"."order_items"']
+    copy_sql = conn.cursor.return_value.copy.call_args.args[0].as_string()
+    assert copy_sql.endswith("(FORMAT BINARY)")
+
+
+def test_load_tables_parallel_pool(mocker: MockerFixture, intermediate: pl.LazyFrame):
+    """Testa a carga paralela: uma conexão do pool compartilhado por tabela, devolvidas."""
+    pool = mocker.MagicMock(size=4)
+    conn = pool.connection.return_value.__enter__.return_value
+    mock_copy = mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_loading.nodes.copy_table",
+        side_effect=lambda conn, df, schema, table, **kwargs: {
+            "table": table,
+            "mode": "replace",
+            "rows": 3,
+            "inserted": 3,
+            "updated": 0,
+            "unchanged": 0,
+            "bytes": 100,
+            "seconds": 0.5,
+            "rows_per_second": 6.0,
+            "mb_per_second": 0.0002,
+        },
+    )
+
+    report = load_tables(
+        pool,
+        {"max_workers": 4, "column_types": {"users": {"email": "citext"}}},
+        {"order_items": TARGET_SCHEMA, "users": {"id": "UInt32"}},
+        {"orders": "order_id"},
+        order_items=intermediate,
+        users=intermediate,
+    )
+
+    # Sem 'intermediate_dir': um empréstimo por tabela, sem o registro de cargas
+    assert pool.connection.call_count == 2
+    assert pool.connection.return_value.__exit__.call_count == 2
+    assert mock_copy.call_args_list[0].args[0] is conn
+    assert mock_copy.call_args_list[1].kwargs["column_types"] == {"email": "citext"}
+    assert report.schema == pl.Schema(REPORT_SCHEMA)
+    assert report["table"].to_list() == ["order_items", "users"]
+
+
+@pytest.fixture
+def intermediate_dir(tmp_path: Path, intermediate: pl.LazyFrame) -> Path:
+    """Intermediate de 'order_items' em duas partições (uma por mês)."""
+    table_dir = tmp_path / "order_items"
+    for (month,), part in (
+        intermediate.collect().partition_by("month", as_dict=True).items()
+    ):
+        path = table_dir / f"year=2025/month={month}/part-0.parquet"
+        path.parent.mkdir(parents=True)
+        part.drop("year", "month").write_parquet(path)
+    return table_dir
+
+
+def test_upsert_table_loads_only_changed_files(
+    mocker: MockerFixture, intermediate: pl.LazyFrame, intermediate_dir: Path
+):
+    """Testa que apenas os arquivos alterados passam pela staging e pelo upsert."""
+    files = intermediate_files(intermediate_dir)
+    january = "year=2025/month=1/part-0.parquet"
+    conn, copy = _mock_connection(
+        mocker,
+        table=(16384, "r"),
+        columns=[("id", "bigint"), ("sale_price", "numeric(18,2)"), ("status", "text")],
+        primary_key=("id",),
+        loaded={january: files[january]},
+        upserted=(1, 0),
+    )
+
+    report = upsert_table(
+        conn,
+        intermediate,
+        TARGET_SCHEMA,
+        "order_items",
+        files=files,
+        table_dir=intermediate_dir,
+    )
+
+    statements = _statements(conn)
+    assert "SELECT files" in statements[0]
+    assert statements[1] == (
+        'CREATE UNLOGGED TABLE IF NOT EXISTS "public"."_staging_order_items" '
+        '(LIKE "public"."order_items" INCLUDING DEFAULTS)'
+    )
+    upsert = next(text for text in statements if "WITH upserted" in text)
+    assert 'ON CONFLICT ("id") DO UPDATE' in upsert
+    assert "IS DISTINCT FROM" in upsert
+    assert "RETURNING (xmax = 0)" in upsert
+    assert any("INSERT INTO" in text and "_load_state" in text for text in statements)
+    assert statements[-1] == 'DROP TABLE IF EXISTS "public"."_staging_order_items"'
+
+    # Apenas fevereiro (id 3) foi enviado
+    copy_sql = conn.cursor.return_value.copy.call_args.args[0].as_string()
+    assert "_staging_order_items" in copy_sql
+    assert not copy_sql.endswith("FREEZE)")
+    written = b"".join(bytes(call.args[0]) for call in copy.write.call_args_list)
+    expected = encode_copy_rows(
+        intermediate.filter(pl.col("month") == 2).drop("year", "month").collect(),
+        {"id": "bigint", "sale_price": "numeric(18,2)", "status": "text"},
+        {"sale_price": 2},
+    )
+    assert written == COPY_HEADER + bytes(expected) + COPY_TRAILER
+    assert (report["rows"], report["inserted"], report["updated"]) == (1, 1, 0)
+
+
+def test_upsert_table_commit_intervals(
+    mocker: MockerFixture, intermediate: pl.LazyFrame
+):
+    """Testa um upsert e um commit a cada `commit_rows` linhas, com as contagens somadas."""
+    conn, _ = _mock_connection(
+        mocker,
+        table=(16384, "r"),
+        columns=[("id", "bigint"), ("sale_price", "numeric(18,2)"), ("status", "text")],
+        primary_key=("id",),
+        upserted=(1, 0),
+    )
+
+    report = upsert_table(
+        conn, intermediate, TARGET_SCHEMA, "order_items", batch_rows=1, commit_rows=2
+    )
+
+    upserts = [text for text in _statements(conn) if "WITH upserted" in text]
+    assert len(upserts) == 2  # 3 linhas: 2 + 1
+    assert (report["rows"], report["inserted"], report["unchanged"]) == (3, 2, 1)
+    # Preparação, dois intervalos e a remoção da staging
+    assert conn.transaction.call_count == 4
+
+
+def test_upsert_table_requires_primary_key(
+    mocker: MockerFixture, intermediate: pl.LazyFrame
+):
+    """Testa o erro para tabelas existentes sem chave primária."""
+    conn, _ = _mock_connection(
+        mocker,
+        table=(16384, "r"),
+        columns=[("id", "bigint"), ("sale_price", "numeric"), ("status", "text")],
+    )
+
+    with pytest.raises(ValueError, match="chave primária"):
+        upsert_table(conn, intermediate, TARGET_SCHEMA, "order_items")
+
+
+def test_load_tables_invalid_mode():
+    """Testa o erro para modos de carga desconhecidos."""
+    with pytest.raises(ValueError, match="Modo 'merge' inválido"):
+        load_tables(MagicMock(), {"mode": "merge"}, {}, {})
@@ -0,0 +1,38 @@
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.pipelines.data_loading import create_pipeline
+
+
+def test_loading_pipeline_structure(mocker: MockerFixture):
+    """Testa o nó de carga com o Intermediate de cada tabela (ou as de 'loading.tables')."""
+    params = {
+        "processing": {"schemas": {"orders": {}, "users": {}, "events": {}}},
+        "loading": {},
+    }
+    mock_params = mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_loading.pipeline.get_params",
+        side_effect=params.get,
+    )
+
+    pipeline = create_pipeline()
+    node = pipeline.nodes[1]
+    assert node.name == "load_tables_node"
+    assert node._inputs == {
+        "pool": "postgres_pool",
+        "config": "params:loading",
+        "schemas": "params:processing.schemas",
+        "primary_keys": "params:processing.primary_keys",
+        "orders": "processing_intermediate_orders",
+        "users": "processing_intermediate_users",
+        "events": "processing_intermediate_events",
+    }
+    assert node.outputs == ["loading_report"]
+
+    ddl_node = pipeline.nodes[0]
+    assert ddl_node.name == "generate_ddl_node"
+    assert ddl_node.outputs == ["loading_ddl"]
+
+    params["loading"] = {"tables": ["users"]}
+    node = create_pipeline().nodes[1]
+    assert set(node._inputs) == {"pool", "config", "schemas", "primary_keys", "users"}
+    assert mock_params.call_count == 4
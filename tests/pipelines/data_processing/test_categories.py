@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import polars as pl
+
+from thelook_ecommerce_analysis.pipelines.data_processing.categories import (
+    CategoryRegistry,
+    update_category_registry,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.nodes import process_table
+
+SCHEMAS = {
+    "orders": {"order_id": "UInt32", "status": "Categorical"},
+    "order_items": {"id": "UInt32", "status": "Categorical"},
+    "inventory_items": {"id": "UInt32", "product_category": "Categorical"},
+}
+
+
+def _config(tmp_path: Path) -> dict:
+    return {
+        "filepath": str(tmp_path / "_categories.json"),
+        "aliases": {"product_category": "category"},
+    }
+
+
+def test_registry_appends_without_reordering(tmp_path: Path):
+    """Testa se valores novos vão para o final e os códigos existentes não mudam."""
+    registry = CategoryRegistry(str(tmp_path / "cat.json"))
+    registry.extend("status", ["Shipped", "Complete"])
+    registry.save()
+
+    registry = CategoryRegistry(str(tmp_path / "cat.json"))
+    new_values = registry.extend("status", ["Cancelled", "Shipped", None])
+
+    assert new_values == ["Cancelled"]
+    assert registry.values("status") == ["Complete", "Shipped", "Cancelled"]
+
+
+def test_update_registry_shares_domains_across_tables(tmp_path: Path):
+    """Testa se colunas de tabelas diferentes compartilham o domínio do registro."""
+    orders = pl.LazyFrame({"order_id": [1, 2], "status": [" Shipped", "Complete"]})
+    items = pl.LazyFrame({"id": [1], "status": ["Returned"]})
+    inventory = pl.LazyFrame({"id": [1], "product_category": ["Jeans"]})
+
+    result = update_category_registry(
+        SCHEMAS,
+        _config(tmp_path),
+        orders,
+        items,
+        inventory,
+        table_names=["orders", "order_items", "inventory_items"],
+    )
+
+    statuses = ["Complete", "Shipped", "Returned"]
+    assert result["orders"] == {"status": statuses}
+    assert result["order_items"] == {"status": statuses}
+    assert result["inventory_items"] == {"product_category": ["Jeans"]}
+    assert CategoryRegistry(_config(tmp_path)["filepath"]).values("category") == [
+        "Jeans"
+    ]
+
+
+def test_process_table_casts_to_shared_enum(tmp_path: Path):
+    """Testa se as tabelas recebem o mesmo pl.Enum e o join usa os códigos."""
+    orders = pl.LazyFrame({"order_id": [1, 2], "status": ["Shipped", "Complete"]})
+    items = pl.LazyFrame({"id": [7], "status": ["Shipped "]})
+    categories = update_category_registry(
+        SCHEMAS,
+        _config(tmp_path),
+        orders,
+        items,
+        table_names=["orders", "order_items"],
+    )
+
+    res_orders = process_table(
+        orders, SCHEMAS["orders"], "orders", "order_id", categories
+    ).collect()
+    res_items = process_table(
+        items, SCHEMAS["order_items"], "order_items", categories=categories
+    ).collect()
+
+    enum = pl.Enum(["Complete", "Shipped"])
+    assert res_orders.schema["status"] == enum
+    assert res_items.schema["status"] == enum
+    joined = res_orders.join(res_items, on="status")
+    assert joined["order_id"].to_list() == [1]
@@ -0,0 +1,152 @@
+import polars as pl
+import pytest
+
+from thelook_ecommerce_analysis.pipelines.data_processing.geo import (
+    POINT_DTYPE,
+    NearestCenterIndex,
+    assign_nearest_distribution_center,
+    assign_order_distribution_center,
+    benchmark_geo,
+    haversine_km,
+    parse_wkt_point,
+    to_wkb,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.nodes import process_table
+
+# São Paulo, Nova York e Tóquio
+CENTERS = pl.DataFrame(
+    {
+        "id": [1, 2, 3],
+        "geom": ["POINT(-46.63 -23.55)", "POINT(-74.01 40.71)", "POINT(139.69 35.69)"],
+    }
+)
+
+
+def test_parse_wkt_point():
+    """Testa o parse do WKT canônico e a anulação de valores fora do formato."""
+    df = pl.DataFrame(
+        {
+            "geom": [
+                "POINT(-46.63 -23.55)",
+                "POINT(1 x)",
+                "POINT EMPTY",
+                "LINESTRING(0 0, 1 1)",
+                None,
+            ]
+        }
+    )
+
+    result = df.select(parse_wkt_point("geom"))["geom"]
+
+    assert result.dtype == POINT_DTYPE
+    assert result.to_list() == [
+        {"longitude": -46.63, "latitude": -23.55},
+        None,
+        None,
+        None,
+        None,
+    ]
+
+
+def test_point_schema_type_in_process_table():
+    """Testa o tipo `Point` no schema: WKT vira coordenadas e o inválido vira nulo."""
+    raw = pl.LazyFrame({"id": [1, 2], "geom": ["POINT(10.5 -3.25)", "invalid"]})
+
+    result = process_table(raw, {"id": "UInt32", "geom": "Point"}, "t").collect()
+
+    assert result.schema["geom"] == POINT_DTYPE
+    assert result.sort("id")["geom"].to_list() == [
+        {"longitude": 10.5, "latitude": -3.25},
+        None,
+    ]
+
+
+def test_to_wkb():
+    """Testa o WKB little-endian de um ponto (cabeçalho + x + y) e pontos nulos."""
+    df = pl.DataFrame(
+        {"geom": [{"longitude": 1.0, "latitude": 2.0}, None]},
+        schema={"geom": POINT_DTYPE},
+    )
+
+    result = df.select(to_wkb("geom"))["geom"].to_list()
+
+    assert result[0] == bytes.fromhex("0101000000000000000000f03f0000000000000040")
+    assert result[1] is None
+
+
+def test_haversine_km():
+    """Testa a distância São Paulo - Nova York (~7.680 km)."""
+    km = pl.select(
+        haversine_km(pl.lit(-46.63), pl.lit(-23.55), pl.lit(-74.01), pl.lit(40.71))
+    ).item()
+
+    assert km == pytest.approx(7_680, rel=0.01)
+
+
+def test_nearest_center_matches_brute_force():
+    """Testa se o índice escolhe o mesmo centro e distância da haversine com todos."""
+    index = NearestCenterIndex.from_frame(CENTERS, "geom")
+    users = pl.LazyFrame(
+        {
+            "geom": [
+                {"longitude": -43.2, "latitude": -22.9},  # Rio de Janeiro
+                {"longitude": -87.6, "latitude": 41.9},  # Chicago
+                {"longitude": 135.5, "latitude": 34.7},  # Osaka
+                None,
+            ]
+        },
+        schema={"geom": POINT_DTYPE},
+    )
+
+    result = index.assign(users, "geom").collect()
+
+    assert result["nearest_distribution_center_id"].to_list() == [1, 2, 3, None]
+    assert result.schema["nearest_distribution_center_id"] == CENTERS.schema["id"]
+    expected = pl.select(
+        haversine_km(pl.lit(-43.2), pl.lit(-22.9), pl.lit(-46.63), pl.lit(-23.55))
+    ).item()
+    assert result["nearest_distribution_center_km"][0] == pytest.approx(expected)
+    assert result.columns == [
+        "geom",
+        "nearest_distribution_center_id",
+        "nearest_distribution_center_km",
+    ]
+
+
+def test_empty_index_raises():
+    """Testa se uma tabela de centros sem pontos válidos falha com mensagem clara."""
+    with pytest.raises(ValueError, match="Índice de centros vazio"):
+        NearestCenterIndex.from_frame(CENTERS.head(0), "geom")
+
+
+def test_assign_users_and_orders():
+    """Testa as tabelas de centro mais próximo por usuário e por pedido."""
+    users = pl.LazyFrame({"id": [10, 20], "user_geom": ["POINT(-43.2 -22.9)", None]})
+    orders = pl.LazyFrame({"order_id": [1, 2, 3], "user_id": [10, 20, 10]})
+
+    user_centers = assign_nearest_distribution_center(
+        users,
+        CENTERS.rename({"geom": "distribution_center_geom"}).lazy(),
+        {},
+    )
+    order_centers = assign_order_distribution_center(orders, user_centers).collect()
+
+    assert user_centers.collect_schema().names() == [
+        "user_id",
+        "nearest_distribution_center_id",
+        "nearest_distribution_center_km",
+    ]
+    assert order_centers.sort("order_id")[
+        "nearest_distribution_center_id"
+    ].to_list() == [
+        1,
+        None,
+        1,
+    ]
+
+
+def test_benchmark_geo():
+    """Testa o benchmark em escala reduzida (inclui a conferência por força bruta)."""
+    results = benchmark_geo(rows=20_000, centers=10, repeat=1)
+
+    assert results["nearest_rows_per_second"] > 0
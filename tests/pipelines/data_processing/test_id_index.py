@@ -0,0 +1,137 @@
+from pathlib import Path
+
+import polars as pl
+import pytest
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.pipelines.data_processing.id_index import (
+    BLOOM_FILE,
+    BloomFilter,
+    IdIndex,
+)
+
+
+@pytest.mark.parametrize("bloom", [True, False])
+def test_contains_matches_membership(bloom: bool):
+    """Testa a busca binária (com e sem Bloom) contra o `is_in` do Polars."""
+    ids = pl.Series(range(0, 2_000, 2))
+    probe = pl.Series(list(range(-5, 2_100)) + [None])
+    index = IdIndex.build(ids, bloom=bloom)
+
+    expected = probe.is_in(ids.implode()).fill_null(False)
+
+    assert index.contains(probe).to_list() == expected.to_list()
+
+
+def test_build_normalizes_ids():
+    """Testa se o índice fica ordenado, sem repetições e em UInt32."""
+    index = IdIndex.build(pl.Series([5, 1, 5, None, 3]), bloom=False)
+
+    assert index.ids.dtype == pl.UInt32
+    assert index.ids.to_list() == [1, 3, 5]
+
+
+def test_add_promotes_to_uint64():
+    """Testa se chaves acima de UInt32 promovem o índice (e refazem o Bloom)."""
+    index = IdIndex.build(pl.Series([1, 2]))
+
+    index.add(pl.Series([2, 2**33]))
+
+    assert index.ids.dtype == pl.UInt64
+    assert index.contains(pl.Series([1, 3, 2**33])).to_list() == [True, False, True]
+
+
+def test_add_promotion_keeps_configured_fpr():
+    """Testa se o Bloom refeito na promoção a UInt64 mantém o `fpr` configurado."""
+    index = IdIndex.build(pl.Series([1, 2]), fpr=0.001)
+
+    index.add(pl.Series([2**33]))
+
+    assert index.bloom.fpr == 0.001
+
+
+def test_add_grows_bloom_beyond_capacity():
+    """Testa se o Bloom é refeito maior quando as chaves passam da capacidade."""
+    index = IdIndex.build(pl.Series(range(100)), fpr=0.01)
+    words = len(index.bloom.words)
+
+    for start in range(100, 10_100, 1_000):
+        index.add(pl.Series(range(start, start + 1_000)))
+
+    assert index.bloom.capacity >= len(index.ids) == 10_100
+    assert len(index.bloom.words) > words
+    absent = pl.Series(range(20_000, 30_000), dtype=pl.UInt32)
+    assert index.bloom.might_contain(absent).mean() < 0.05
+    assert index.contains(pl.Series([0, 10_099, 10_100])).to_list() == [
+        True,
+        True,
+        False,
+    ]
+
+
+def test_bloom_has_no_false_negatives():
+    """Testa se o filtro de Bloom nunca descarta uma chave presente."""
+    ids = pl.Series(range(10_000), dtype=pl.UInt32)
+    bloom = BloomFilter.build(ids, fpr=0.01)
+
+    assert bloom.might_contain(ids).all()
+    absent = pl.Series(range(10_000, 20_000), dtype=pl.UInt32)
+    assert bloom.might_contain(absent).mean() < 0.05
+
+
+def test_save_and_load_roundtrip(tmp_path: Path):
+    """Testa se o índice e o filtro são persistidos e lidos de volta."""
+    index = IdIndex.build(pl.Series([3, 7, 11]))
+    index.save(tmp_path)
+
+    loaded = IdIndex.load(tmp_path)
+
+    assert loaded.ids.to_list() == [3, 7, 11]
+    assert loaded.bloom.num_hashes == index.bloom.num_hashes
+    assert loaded.bloom.capacity == index.bloom.capacity
+    assert loaded.contains(pl.Series([7, 8])).to_list() == [True, False]
+
+
+def test_load_rebuilds_bloom_from_another_polars_version(
+    tmp_path: Path, mocker: MockerFixture
+):
+    """Testa se um Bloom gravado por outra versão do Polars é refeito (hash diferente)."""
+    IdIndex.build(pl.Series([3, 7])).save(tmp_path)
+    mocker.patch.object(pl, "__version__", "0.0.0")
+    build = mocker.spy(BloomFilter, "build")
+
+    loaded = IdIndex.load(tmp_path)
+
+    build.assert_called_once()
+    assert loaded.contains(pl.Series([3, 4])).to_list() == [True, False]
+
+
+def test_load_rebuilds_bloom_with_another_fpr(tmp_path: Path, mocker: MockerFixture):
+    """Testa se um Bloom gravado com outro `fpr` é refeito com o configurado."""
+    IdIndex.build(pl.Series([3, 7]), fpr=0.01).save(tmp_path)
+    build = mocker.spy(BloomFilter, "build")
+
+    loaded = IdIndex.load(tmp_path, fpr=0.001)
+
+    build.assert_called_once()
+    assert loaded.bloom.fpr == 0.001
+
+
+def test_load_missing_returns_none(tmp_path: Path):
+    """Testa se um diretório sem índice retorna None."""
+    assert IdIndex.load(tmp_path) is None
+    assert not (tmp_path / BLOOM_FILE).exists()
+
+
+def test_stats_report_memory_and_lookups():
+    """Testa se as estatísticas informam memória e consultas."""
+    index = IdIndex.build(pl.Series(range(100)), bloom=True)
+    index.contains(pl.Series(range(200)))
+
+    stats = index.stats
+
+    assert stats["ids"] == 100
+    assert stats["index_bytes"] == 400
+    assert stats["bloom_bytes"] > 0
+    assert stats["lookups"] == 200
+    assert stats["lookups_per_second"] > 0
@@ -0,0 +1,185 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import polars as pl
+import pytest
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.datasets import StreamingPolarsDataset
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.id_index import (
+    IDS_FILE,
+    IdIndex,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.incremental import (
+    MARKER_NAME,
+    process_table_incremental,
+)
+
+SCHEMA = {"id": "UInt32", "status": "String"}
+
+Layers = tuple[StreamingPolarsDataset, StreamingPolarsDataset]
+
+
+@pytest.fixture
+def layers(tmp_path: Path) -> Iterator[Layers]:
+    """Camadas Raw e Intermediate da tabela 'orders' em diretórios temporários."""
+    POST_SAVE_ACTIONS.discard()
+    raw = StreamingPolarsDataset(filepath=str(tmp_path / "raw" / "orders"))
+    intermediate = StreamingPolarsDataset(
+        filepath=str(tmp_path / "intermediate" / "orders")
+    )
+    yield raw, intermediate
+    POST_SAVE_ACTIONS.discard()
+
+
+def _run(
+    tmp_path: Path,
+    raw: StreamingPolarsDataset,
+    intermediate: StreamingPolarsDataset,
+    schema: dict[str, str] = SCHEMA,
+    id_index: dict | None = None,
+) -> pl.LazyFrame | dict[str, pl.LazyFrame]:
+    """Executa o nó como o Kedro: grava a saída e aplica as ações pós-gravação."""
+    result = process_table_incremental(
+        raw.load(),
+        schema,
+        "orders",
+        raw_dir=str(tmp_path / "raw"),
+        intermediate_dir=str(tmp_path / "intermediate"),
+        bucket_size=10,
+        id_index=id_index,
+    )
+    intermediate.save(result)
+    POST_SAVE_ACTIONS.run("processing_intermediate_orders")
+    return result
+
+
+def _table(intermediate: StreamingPolarsDataset) -> dict[int, str]:
+    return dict(intermediate.load().collect().iter_rows())
+
+
+def test_first_run_builds_partitions_and_marker(tmp_path: Path, layers: Layers):
+    """Testa se a primeira execução grava a tabela inteira por faixas de chave."""
+    raw, intermediate = layers
+    raw.save({"0": pl.DataFrame({"id": [1, 15, 1], "status": ["a", "b", "c"]})})
+
+    result = _run(tmp_path, raw, intermediate)
+
+    assert isinstance(result, pl.LazyFrame)
+    table_dir = tmp_path / "intermediate" / "orders"
+    assert sorted(p.name for p in table_dir.glob("*.parquet")) == [
+        "part-000000.parquet",
+        "part-000001.parquet",
+    ]
+    assert (table_dir / MARKER_NAME).is_file()
+    assert _table(intermediate) == {1: "c", 15: "b"}
+
+
+def test_new_part_rewrites_only_affected_partitions(tmp_path: Path, layers: Layers):
+    """Testa o upsert do delta: só as partições com chaves novas são reescritas."""
+    raw, intermediate = layers
+    raw.save({"1": pl.DataFrame({"id": [1, 15, 25], "status": ["a", "b", "c"]})})
+    _run(tmp_path, raw, intermediate)
+    untouched = tmp_path / "intermediate" / "orders" / "part-000002.parquet"
+    mtime = untouched.stat().st_mtime_ns
+
+    raw.save({"2": pl.DataFrame({"id": [15, 16], "status": ["B", "d"]})})
+    result = _run(tmp_path, raw, intermediate)
+
+    assert list(result) == ["000001"]
+    assert untouched.stat().st_mtime_ns == mtime
+    assert _table(intermediate) == {1: "a", 15: "B", 16: "d", 25: "c"}
+
+
+def test_id_index_skips_anti_join_for_new_keys(
+    tmp_path: Path, layers: Layers, mocker: MockerFixture
+):
+    """Testa se o índice de chaves evita o anti join em partições só com chaves novas."""
+    raw, intermediate = layers
+    config = {"enabled": True, "bloom": True}
+    raw.save({"1": pl.DataFrame({"id": [1, 15], "status": ["a", "b"]})})
+    _run(tmp_path, raw, intermediate, id_index=config)
+    assert (tmp_path / "intermediate" / "orders" / IDS_FILE).is_file()
+
+    join = mocker.spy(pl.LazyFrame, "join")
+    raw.save({"2": pl.DataFrame({"id": [2, 15], "status": ["c", "B"]})})
+    raw.save({"3": pl.DataFrame({"id": [17], "status": ["d"]})})
+    _run(tmp_path, raw, intermediate, id_index=config)
+
+    # Só a partição 1 (chave 15 atualizada) faz anti join; a 0 recebe apenas a chave 2
+    anti_joins = [c for c in join.call_args_list if c.kwargs.get("how") == "anti"]
+    assert len(anti_joins) == 1
+    assert _table(intermediate) == {1: "a", 2: "c", 15: "B", 17: "d"}
+    index = IdIndex.load(tmp_path / "intermediate" / "orders")
+    assert index.ids.to_list() == [1, 2, 15, 17]
+
+
+def test_failed_index_update_keeps_parts_pending(
+    tmp_path: Path, layers: Layers, mocker: MockerFixture
+):
+    """Testa que uma falha no índice não marca as partes: a execução seguinte as refaz."""
+    raw, intermediate = layers
+    config = {"enabled": True}
+    raw.save({"1": pl.DataFrame({"id": [1], "status": ["a"]})})
+    _run(tmp_path, raw, intermediate, id_index=config)
+
+    raw.save({"2": pl.DataFrame({"id": [1, 2], "status": ["A", "b"]})})
+    mocker.patch.object(IdIndex, "save", side_effect=OSError("disco cheio"))
+    with pytest.raises(OSError, match="disco cheio"):
+        _run(tmp_path, raw, intermediate, id_index=config)
+    marker = (tmp_path / "intermediate" / "orders" / MARKER_NAME).read_text()
+    assert "2.parquet" not in marker
+
+    mocker.stopall()
+    result = _run(tmp_path, raw, intermediate, id_index=config)
+
+    assert result != {}
+    assert _table(intermediate) == {1: "A", 2: "b"}
+    assert IdIndex.load(tmp_path / "intermediate" / "orders").ids.to_list() == [1, 2]
+
+
+def test_no_new_parts_returns_empty(tmp_path: Path, layers: Layers):
+    """Testa se, sem partes Raw novas, nada é gravado."""
+    raw, intermediate = layers
+    raw.save({"1": pl.DataFrame({"id": [1], "status": ["a"]})})
+    _run(tmp_path, raw, intermediate)
+
+    assert _run(tmp_path, raw, intermediate) == {}
+
+
+def test_rewritten_raw_triggers_rebuild(tmp_path: Path, layers: Layers):
+    """Testa se um Raw reescrito (partes processadas removidas) reconstrói a tabela."""
+    raw, intermediate = layers
+    raw.save({"1": pl.DataFrame({"id": [1, 2], "status": ["a", "b"]})})
+    _run(tmp_path, raw, intermediate)
+
+    raw.save(pl.DataFrame({"id": [2], "status": ["B"]}))
+    result = _run(tmp_path, raw, intermediate)
+
+    assert isinstance(result, pl.LazyFrame)
+    assert _table(intermediate) == {2: "B"}
+
+
+def test_schema_change_triggers_rebuild(tmp_path: Path, layers: Layers):
+    """Testa se um schema diferente do marcador reconstrói a tabela."""
+    raw, intermediate = layers
+    raw.save({"1": pl.DataFrame({"id": [1], "status": ["a"]})})
+    _run(tmp_path, raw, intermediate)
+
+    result = _run(tmp_path, raw, intermediate, {"id": "UInt64", "status": "String"})
+
+    assert isinstance(result, pl.LazyFrame)
+
+
+def test_non_integer_key_raises(tmp_path: Path, layers: Layers):
+    """Testa se uma chave não inteira é rejeitada (as partições são faixas da chave)."""
+    raw, _ = layers
+    raw.save({"1": pl.DataFrame({"id": ["a"], "status": ["a"]})})
+
+    with pytest.raises(ValueError, match="chave inteira"):
+        process_table_incremental(
+            raw.load(), {"id": "String", "status": "String"}, "orders"
+        )
@@ -0,0 +1,95 @@
+from decimal import Decimal
+
+import polars as pl
+import pytest
+
+from thelook_ecommerce_analysis.pipelines.data_processing.money import (
+    benchmark_money,
+    money_scale,
+    money_to_decimal,
+    restore_money,
+    to_money,
+)
+
+
+@pytest.mark.parametrize(
+    ("type_str", "scale"),
+    [("Money", 2), ("Money(4)", 4), (" Money( 0 ) ", 0), ("Decimal(10, 2)", None)],
+)
+def test_money_scale(type_str: str, scale: int | None):
+    """Testa a leitura da escala dos tipos Money."""
+    assert money_scale(type_str) == scale
+
+
+def test_money_scale_rejects_int64_overflow():
+    """Testa se uma escala que não cabe em Int64 falha."""
+    with pytest.raises(ValueError, match="não cabe em Int64"):
+        money_scale("Money(19)")
+
+
+def test_to_money_matches_decimal_rounding():
+    """Testa se o Money arredonda exatamente como o cast para Decimal."""
+    values = [0.125, 1.005, 2.675, -0.125, 0.135, 199.99, 0.1 + 0.2, None]
+    df = pl.DataFrame({"price": values})
+
+    money = df.select(to_money("price", 2))
+    decimal = df.select(pl.col("price").cast(pl.Decimal(10, 2)))
+
+    assert money.schema["price"] == pl.Int64
+    restored = money.select(money_to_decimal("price", 2))
+    assert restored["price"].to_list() == decimal["price"].to_list()
+
+
+def test_to_money_from_strings_and_decimals():
+    """Testa a conversão a partir de String e Decimal (Raw com cast_on_ingest)."""
+    df = pl.DataFrame(
+        {
+            "s": ["10.50", "-0.01"],
+            "d": pl.Series(
+                [Decimal("10.50"), Decimal("-0.01")], dtype=pl.Decimal(18, 2)
+            ),
+        }
+    )
+
+    res = df.select(to_money("s", 2), to_money("d", 2))
+
+    assert res["s"].to_list() == [1050, -1]
+    assert res["d"].to_list() == [1050, -1]
+
+
+def test_to_money_rejects_values_beyond_int64():
+    """Testa se valores com mais de 18 dígitos falham em vez de estourar."""
+    df = pl.DataFrame({"price": ["123456789012345678.00"]})
+
+    with pytest.raises(pl.exceptions.InvalidOperationError):
+        df.select(to_money("price", 2))
+
+
+def test_restore_money_converts_only_money_columns():
+    """Testa se a fronteira de saída devolve Decimal exato só nas colunas Money."""
+    df = pl.LazyFrame({"id": [1, 2], "price": [1050, -1], "qty": [3, 4]})
+    schema = {"id": "UInt32", "price": "Money", "qty": "UInt8", "missing": "Money"}
+
+    res = restore_money(df, schema).collect()
+
+    assert res.schema["price"] == pl.Decimal(18, 2)
+    assert res["price"].to_list() == [Decimal("10.50"), Decimal("-0.01")]
+    assert res.schema["qty"] == pl.Int64
+
+
+def test_money_sum_is_exact():
+    """Testa se a soma em centavos bate com a soma em Decimal."""
+    df = pl.DataFrame({"price": [0.1] * 10 + [0.2] * 10})
+
+    total = df.select(to_money("price", 2).sum())
+    restored = restore_money(total, {"price": "Money"})
+
+    assert restored["price"][0] == Decimal("3.00")
+
+
+def test_benchmark_money_results_match():
+    """Testa se o benchmark executa e confere os dois caminhos."""
+    results = benchmark_money(rows=10_000, groups=10, repeat=1)
+
+    assert results["money_seconds"] > 0
+    assert results["speedup"] > 0
@@ -1,7 +1,12 @@
 import polars as pl
 import pytest
+from pytest_mock import MockerFixture
 
+from thelook_ecommerce_analysis.pipelines.data_processing import schema_plan
 from thelook_ecommerce_analysis.pipelines.data_processing.nodes import process_table
+from thelook_ecommerce_analysis.pipelines.data_processing.schema_plan import (
+    SCHEMA_PLANS,
+)
 
 
 @pytest.fixture
@@ -47,6 +52,17 @@ def test_decimal_parsing(dummy_lazy_df: pl.LazyFrame):
     assert res["date_col"], pl.Datetime
 
 
+def test_money_type_stores_scaled_int64(dummy_lazy_df: pl.LazyFrame):
+    """Testa se Money vira centavos em Int64 com o mesmo arredondamento do Decimal."""
+    schema = {"id": "UInt32", "amount": "Money"}
+
+    res = process_table(dummy_lazy_df, schema, "test").collect().sort("id")
+
+    assert res.schema["amount"] == pl.Int64
+    assert res["amount"].to_list() == [1050, 2000, 3000]
+    assert SCHEMA_PLANS.get(schema).money_scales == {"amount": 2}
+
+
 def test_invalid_type_raises_error(dummy_lazy_df: pl.LazyFrame):
     """Testa se o tipo inválido falha."""
     schema = {"id": "Floater"}
@@ -99,3 +115,91 @@ def test_deduplication_logic_without_id_column():
     assert df_result.height == 2  # Ana (duplicada) vira 1 + Bia = 2 linhas
     assert "Ana" in df_result["nome"]
     assert "Bia" in df_result["nome"]
+
+
+def test_process_table_accepts_already_typed_input():
+    """Testa se o Raw já convertido na ingestão (Categorical) é processado sem erro."""
+    df_raw = pl.LazyFrame(
+        {"id": [1, 2], "cat_col": [" A ", "B"]},
+        schema={"id": pl.UInt32, "cat_col": pl.Categorical},
+    )
+
+    res = process_table(df_raw, {"id": "UInt32", "cat_col": "Categorical"}, "test")
+
+    assert sorted(res.collect()["cat_col"].cast(pl.String).to_list()) == ["A", "B"]
+
+
+def test_latest_raw_part_wins_by_primary_key():
+    """Testa se a linha lida por último (parte Raw mais recente) substitui as anteriores."""
+    df_raw = pl.LazyFrame(
+        {
+            "order_id": [1, 2, 2, 1],
+            "status": ["Processing", "Processing", "Shipped", "Complete"],
+        }
+    )
+    schema = {"order_id": "UInt32", "status": "String"}
+
+    res = process_table(df_raw, schema, "orders", primary_key="order_id").collect()
+
+    assert res.columns == ["order_id", "status"]
+    assert dict(res.sort("order_id").iter_rows()) == {1: "Complete", 2: "Shipped"}
+
+
+def test_deduplication_with_streaming_engine():
+    """Testa se a deduplicação dá o mesmo resultado no engine streaming."""
+    df_raw = pl.LazyFrame(
+        {
+            "id": [i % 1_000 for i in range(5_000)],
+            "version": list(range(5_000)),
+        }
+    )
+    schema = {"id": "UInt32", "version": "UInt32"}
+
+    res = process_table(df_raw, schema, "events").collect(engine="streaming")
+
+    assert res.height == 1_000
+    assert dict(res.sort("id").iter_rows()) == {i: 4_000 + i for i in range(1_000)}
+
+
+def test_primary_key_must_be_in_schema(dummy_lazy_df: pl.LazyFrame):
+    """Testa se uma chave fora do schema é rejeitada."""
+    with pytest.raises(ValueError, match="Chave 'order_id'"):
+        process_table(dummy_lazy_df, {"id": "UInt32"}, "test", primary_key="order_id")
+
+
+def test_schema_errors_reported_together(dummy_lazy_df: pl.LazyFrame):
+    """Testa se todas as colunas ausentes e tipos inválidos aparecem no mesmo erro."""
+    schema = {
+        "id": "Floater",
+        "missing_a": "UInt32",
+        "amount": "Decimal(2, 5)",
+        "missing_b": "String",
+    }
+
+    with pytest.raises(ValueError, match="SCHEMA ERROR") as exc:
+        process_table(dummy_lazy_df, schema, "test")
+
+    message = str(exc.value)
+    assert "Coluna 'missing_a' não encontrada" in message
+    assert "Coluna 'missing_b' não encontrada" in message
+    assert "'test.id'" in message
+    assert "'test.amount'" in message
+
+
+def test_schema_plan_compiled_once_per_config(
+    dummy_lazy_df: pl.LazyFrame, mocker: MockerFixture
+):
+    """Testa se o mesmo schema (em outra tabela ou execução) reutiliza o plano compilado."""
+    SCHEMA_PLANS.clear()
+    resolve = mocker.spy(schema_plan, "get_polars_type")
+    schema = {"id": "UInt32", "cat_col": "Categorical"}
+
+    process_table(dummy_lazy_df, schema, "table_a")
+    process_table(dummy_lazy_df, dict(schema), "table_b")
+
+    assert resolve.call_count == 2
+    assert SCHEMA_PLANS.stats == {"plans": 1, "hits": 1, "misses": 1}
+
+    # Outra ordem de colunas gera outro plano (a ordem de saída faz parte do schema)
+    process_table(dummy_lazy_df, {"cat_col": "Categorical", "id": "UInt32"}, "t")
+    assert SCHEMA_PLANS.stats["plans"] == 2
@@ -1,3 +1,5 @@
+from unittest.mock import MagicMock
+
 import pytest
 from kedro.pipeline import Pipeline
 from pytest_mock import MockerFixture
@@ -18,6 +20,15 @@ MOCK_PROCESSING_CONFIG = {
 type Params = dict[str, dict[str, str]]
 
 
+@pytest.fixture(autouse=True)
+def mock_get_catalog_entry(mocker: MockerFixture) -> MagicMock:
+    """Mock do get_catalog_entry: nenhuma tabela com o layout particionado por data."""
+    return mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_catalog_entry",
+        return_value={},
+    )
+
+
 @pytest.fixture
 def mock_get_params(mocker: MockerFixture) -> Params:
     """Mock do get_params para não ler arquivos reais."""
@@ -51,3 +62,132 @@ def test_node_naming_convention(mock_get_params: Params):
     # Verifica Tags
     assert "processing" in orders_node.tags
     assert "orders" in orders_node.tags
+
+
+def test_primary_key_input_wired(mocker: MockerFixture):
+    """Testa se 'processing.primary_keys' é conectado apenas às tabelas declaradas."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_params",
+        return_value={
+            **MOCK_PROCESSING_CONFIG,
+            "primary_keys": {"orders": "order_id"},
+        },
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    assert nodes["process_orders_node"]._inputs["primary_key"] == (
+        "params:processing.primary_keys.orders"
+    )
+    assert "primary_key" not in nodes["process_products_node"]._inputs
+
+
+def test_incremental_mode_wires_incremental_node(mocker: MockerFixture):
+    """Testa se 'processing.incremental.enabled' troca o nó e conecta os parâmetros."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_params",
+        return_value={
+            **MOCK_PROCESSING_CONFIG,
+            "incremental": {"enabled": True, "bucket_size": 10},
+        },
+    )
+
+    orders_node = next(
+        n for n in create_pipeline().nodes if n.name == "process_orders_node"
+    )
+
+    assert orders_node.func.__name__ == "process_table_incremental"
+    assert orders_node._inputs["bucket_size"] == (
+        "params:processing.incremental.bucket_size"
+    )
+    assert "raw_dir" not in orders_node._inputs
+
+
+def test_incremental_mode_rejects_date_partitioned_tables(mocker: MockerFixture):
+    """Testa a falha na criação do pipeline com incremental e 'partition_by' juntos."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_params",
+        return_value={**MOCK_PROCESSING_CONFIG, "incremental": {"enabled": True}},
+    )
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_catalog_entry",
+        side_effect=lambda name: (
+            {"partition_by": "created_at"}
+            if name == "processing_intermediate_orders"
+            else {}
+        ),
+    )
+
+    with pytest.raises(ValueError, match=r"\['orders'\]"):
+        create_pipeline()
+
+
+def test_category_registry_node_feeds_processing(mocker: MockerFixture):
+    """Testa se o registro de categorias roda antes e alimenta os nós de processamento."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_params",
+        return_value={
+            "schemas": {
+                "orders": {"order_id": "UInt32", "status": "Categorical"},
+                "products": {"id": "UInt32"},
+            },
+            "categories": {"enabled": True, "filepath": "cat.json"},
+        },
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    registry_node = nodes["update_category_registry_node"]
+    assert registry_node.inputs == [
+        "params:processing.schemas",
+        "params:processing.categories",
+        "ingestion_raw_orders",
+    ]
+    assert nodes["process_orders_node"]._inputs["categories"] == (
+        "processing_categories"
+    )
+
+
+def test_quality_adds_report_node(mocker: MockerFixture):
+    """Testa se 'processing.quality.enabled' monta o relatório a partir do Intermediate."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_params",
+        return_value={**MOCK_PROCESSING_CONFIG, "quality": {"enabled": True}},
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    orders_node = nodes["process_orders_node"]
+    assert orders_node.func.__name__ == "process_with_quality"
+    assert orders_node._inputs["quality"] == "params:processing.quality"
+    assert orders_node.outputs == ["processing_intermediate_orders"]
+
+    report_node = nodes["report_orders_quality_node"]
+    assert report_node._inputs["intermediate"] == "processing_intermediate_orders"
+    assert report_node.outputs == ["processing_quality_orders"]
+
+
+def test_geo_nodes_follow_intermediate(mocker: MockerFixture):
+    """Testa se 'processing.geo.enabled' liga usuários e pedidos ao centro mais próximo."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_processing.pipeline.get_params",
+        return_value={
+            "schemas": {
+                "users": {"id": "UInt32", "user_geom": "Point"},
+                "distribution_centers": {"id": "UInt8"},
+                "orders": {"order_id": "UInt32", "user_id": "UInt32"},
+            },
+            "geo": {"enabled": True},
+        },
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    assert nodes["assign_nearest_distribution_center_node"].inputs == [
+        "processing_intermediate_users",
+        "processing_intermediate_distribution_centers",
+        "params:processing.geo",
+    ]
+    assert nodes["assign_order_distribution_center_node"].outputs == [
+        "processing_intermediate_order_distribution_centers"
+    ]
@@ -0,0 +1,205 @@
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from thelook_ecommerce_analysis.datasets import StreamingPolarsDataset
+from thelook_ecommerce_analysis.pipelines.data_ingestion.post_save import (
+    POST_SAVE_ACTIONS,
+)
+from thelook_ecommerce_analysis.pipelines.data_processing.nodes import process_table
+from thelook_ecommerce_analysis.pipelines.data_processing.quality import (
+    METRICS_SCHEMA,
+    process_with_quality,
+    report_quality,
+)
+
+SCHEMA = {
+    "id": "UInt32",
+    "age": "UInt8",
+    "price": "Money",
+    "created_at": "Datetime",
+    "shipped_at": "Datetime",
+}
+
+
+@pytest.fixture(autouse=True)
+def reset_post_save_actions() -> Iterator[None]:
+    """Descarta a gravação dos totais agendada por cada teste."""
+    POST_SAVE_ACTIONS.discard()
+    yield
+    POST_SAVE_ACTIONS.discard()
+
+
+@pytest.fixture
+def raw() -> pl.LazyFrame:
+    """Linhas com uma data inválida, um envio antes da criação e valores fora da faixa."""
+    return pl.LazyFrame(
+        {
+            "id": [1, 2, 3, 4, 4],
+            "age": [30, 130, None, 40, 41],
+            "price": [10.0, -1.0, 5.0, 0.2, 0.3],
+            "created_at": [
+                "2025-01-02T00:00:00",
+                "2025-01-02T00:00:00",
+                "invalid",
+                "2025-01-05T00:00:00",
+                "2025-01-05T00:00:00",
+            ],
+            "shipped_at": [
+                datetime(2025, 1, 3),
+                datetime(2025, 1, 1),
+                None,
+                datetime(2025, 1, 6),
+                datetime(2025, 1, 6),
+            ],
+        }
+    )
+
+
+@pytest.fixture
+def config(tmp_path: Path) -> dict:
+    return {
+        "fail": True,
+        "totals_dir": str(tmp_path / "_totals"),
+        "defaults": {"max_cast_failure_rate": None, "max_violation_rate": None},
+        "rules": {
+            "t": {
+                "age": {"min": 0, "max": 120, "max_null_rate": 0.5},
+                "price": {"min": 0.25},
+                "shipped_at": {"not_before": "created_at"},
+            }
+        },
+    }
+
+
+def _save(result: pl.LazyFrame, path: Path) -> StreamingPolarsDataset:
+    """Grava o Intermediate como o Kedro: dataset e depois as ações pós-gravação."""
+    dataset = StreamingPolarsDataset(filepath=str(path))
+    dataset.save(result)
+    POST_SAVE_ACTIONS.run("processing_intermediate_t")
+    return dataset
+
+
+def _process_and_report(
+    tmp_path: Path, raw: pl.LazyFrame, config: dict
+) -> tuple[StreamingPolarsDataset, pl.DataFrame]:
+    result = process_with_quality(
+        raw, SCHEMA, "t", config, process=process_table, primary_key="id"
+    )
+    dataset = _save(result, tmp_path / "t")
+    return dataset, report_quality(dataset.load(), "t", config)
+
+
+def _metrics(report: pl.DataFrame) -> dict[tuple[str, str], int]:
+    return {
+        (r["column"], r["metric"]): r["count"] for r in report.iter_rows(named=True)
+    }
+
+
+def test_metrics_collected_while_saving(
+    tmp_path: Path, raw: pl.LazyFrame, config: dict
+):
+    """Testa se as métricas saem da mesma execução que grava o Intermediate."""
+    dataset, report = _process_and_report(tmp_path, raw, config)
+
+    metrics = _metrics(report)
+
+    # Deduplicado: a última versão do id 4 é a que entra nas métricas
+    assert metrics[("*", "rows")] == 4
+    assert metrics[("age", "above_max")] == 1
+    assert metrics[("age", "null_rate")] == 1
+    assert metrics[("created_at", "cast_failure_rate")] == 1
+    assert metrics[("shipped_at", "before_created_at")] == 1
+    # Money: o limite 0.25 é comparado em centavos (25)
+    assert metrics[("price", "below_min")] == 1
+    # As colunas auxiliares não são gravadas
+    assert dataset.load().collect_schema().names() == list(SCHEMA)
+
+
+def test_report_schema_and_rates(tmp_path: Path, raw: pl.LazyFrame, config: dict):
+    """Testa o formato compacto do relatório e as taxas sobre as linhas gravadas."""
+    _, df = _process_and_report(tmp_path, raw, config)
+
+    assert df.schema == pl.Schema(METRICS_SCHEMA)
+    age_nulls = df.filter(pl.col("column") == "age", pl.col("metric") == "null_rate")
+    assert age_nulls["rate"][0] == 0.25
+    assert age_nulls["threshold"][0] == 0.5
+    assert not df["failed"].any()
+
+
+def test_report_requires_saved_intermediate(raw: pl.LazyFrame, config: dict):
+    """Testa se o relatório não sai antes da gravação do Intermediate (sem totais)."""
+    result = process_with_quality(
+        raw, SCHEMA, "t", config, process=process_table, primary_key="id"
+    )
+    result.collect(
+        engine="streaming"
+    )  # Plano executado, mas o Intermediate não gravado
+
+    with pytest.raises(ValueError, match="Totais de 't' não encontrados"):
+        report_quality(None, "t", config)
+
+
+def test_threshold_fails_report_node(tmp_path: Path, raw: pl.LazyFrame, config: dict):
+    """Testa se um limite excedido falha o nó do relatório (após gravar a tabela)."""
+    config["defaults"]["max_violation_rate"] = 0.0
+
+    with pytest.raises(ValueError, match="QUALITY ERROR.*age:above_max"):
+        _process_and_report(tmp_path, raw, config)
+    assert (tmp_path / "t" / "part-0.parquet").is_file()
+
+
+def test_threshold_only_warns_without_fail(
+    tmp_path: Path, raw: pl.LazyFrame, config: dict, caplog: pytest.LogCaptureFixture
+):
+    """Testa se, com `fail: false`, os limites excedidos viram apenas avisos."""
+    config["fail"] = False
+    config["defaults"]["max_violation_rate"] = 0.0
+
+    _, report = _process_and_report(tmp_path, raw, config)
+
+    assert report["failed"].sum() == 3
+    assert "Qualidade 't.age'" in caplog.text
+
+
+def test_metrics_do_not_rescan_raw(tmp_path: Path, raw: pl.LazyFrame, config: dict):
+    """Testa se as métricas não acrescentam leituras do Raw às da gravação da tabela."""
+
+    def _rows_read(with_quality: bool) -> int:
+        rows_read = []
+
+        def _count(batch: pl.DataFrame) -> pl.DataFrame:
+            rows_read.append(batch.height)
+            return batch
+
+        counted = raw.map_batches(_count, streamable=True, schema=raw.collect_schema())
+        if with_quality:
+            result = process_with_quality(
+                counted, SCHEMA, "t", config, process=process_table, primary_key="id"
+            )
+            dataset = _save(result, tmp_path / "with_quality")
+            report_quality(dataset.load(), "t", config)
+        else:
+            result = process_table(counted, SCHEMA, "t", primary_key="id")
+            _save(result, tmp_path / "without_quality")
+        return sum(rows_read)
+
+    assert _rows_read(with_quality=True) == _rows_read(with_quality=False)
+
+
+def test_empty_report_without_execution(config: dict):
+    """Testa o relatório de uma tabela sem linhas processadas (ex: incremental sem delta)."""
+    process_with_quality(
+        pl.LazyFrame(schema={"id": pl.UInt32}),
+        {"id": "UInt32"},
+        "t",
+        config,
+        process=lambda *args, **kwargs: {},
+    )
+    POST_SAVE_ACTIONS.run("processing_intermediate_t")
+
+    df = report_quality({}, "t", config)
+    assert df.filter(pl.col("metric") == "rows")["count"][0] == 0
@@ -0,0 +1,33 @@
+import polars as pl
+import pytest
+
+from thelook_ecommerce_analysis.pipelines.data_processing.schema_plan import (
+    cast_expr,
+    compile_schema_plan,
+    get_polars_type,
+)
+
+
+def test_compile_schema_plan_builds_expressions():
+    """Testa se o plano compilado tem os tipos resolvidos e uma expressão por coluna."""
+    plan = compile_schema_plan({"id": "UInt32", "price": "Decimal(10, 2)"}, "t")
+
+    assert plan.dtypes == {"id": pl.UInt32, "price": pl.Decimal(10, 2)}
+    assert len(plan.expressions) == 2
+
+
+def test_get_polars_type_money_and_invalid():
+    """Testa Money como inteiro escalado e a mensagem de tipos desconhecidos."""
+    assert get_polars_type("Money(4)") == pl.Int64
+    with pytest.raises(ValueError, match="Tipo desconhecido"):
+        get_polars_type("Floater")
+
+
+def test_cast_expr_categorical_from_categorical():
+    """Testa o cast para Categorical de uma coluna que já chega Categorical (ingestão)."""
+    df = pl.DataFrame({"c": [" a", "b "]}, schema={"c": pl.Categorical})
+
+    out = df.select(cast_expr("c", pl.Categorical))
+
+    assert out["c"].dtype == pl.Categorical
+    assert out["c"].to_list() == ["a", "b"]
@@ -0,0 +1,94 @@
+import polars as pl
+import pytest
+
+from thelook_ecommerce_analysis.pipelines.data_processing.nodes import process_table
+from thelook_ecommerce_analysis.pipelines.data_profiling.nodes import (
+    build_narrowing_advice,
+    profile_table_dtypes,
+    suggest_type,
+)
+
+SCHEMA = {
+    "id": "UInt32",
+    "num_of_item": "UInt32",
+    "delta": "Int64",
+    "status": "String",
+    "email": "String",
+    "price": "Float64",
+}
+
+
+@pytest.fixture
+def raw_orders() -> pl.LazyFrame:
+    """Raw com inteiros pequenos, uma string repetitiva e uma única por linha."""
+    n = 1_000
+    return pl.LazyFrame(
+        {
+            "id": list(range(1, n + 1)),
+            "num_of_item": [i % 4 + 1 for i in range(n)],
+            "delta": [i % 50 - 25 for i in range(n)],
+            "status": [["Complete", "Shipped", None][i % 3] for i in range(n)],
+            "email": [f"user{i}@example.com" for i in range(n)],
+            "price": [i / 10 for i in range(n)],
+        }
+    )
+
+
+def test_profile_suggests_narrowest_types(raw_orders: pl.LazyFrame):
+    """Testa o perfil e as sugestões de tipo por coluna."""
+    report = profile_table_dtypes(raw_orders, SCHEMA, "orders", {"headroom": 2.0})
+
+    by_column = {row["column"]: row for row in report.iter_rows(named=True)}
+    assert by_column["num_of_item"]["min"] == 1
+    assert by_column["num_of_item"]["max"] == 4
+    assert by_column["num_of_item"]["suggested_type"] == "UInt8"
+    assert by_column["id"]["suggested_type"] == "UInt16"  # 1000 * 2 < 65536
+    assert by_column["delta"]["suggested_type"] == "Int8"
+    assert by_column["status"]["nulls"] == 333
+    assert by_column["status"]["suggested_type"] == "Categorical"
+    assert by_column["email"]["suggested_type"] == "String"
+    assert by_column["price"]["suggested_type"] == "Float64"
+    assert by_column["num_of_item"]["saved_bytes"] == 3_000
+
+
+def test_suggest_type_respects_headroom():
+    """Testa se a folga sobre o máximo observado evita um tipo justo demais."""
+    stats = {"rows": 10, "nulls": 0, "cardinality": 10, "min": 0, "max": 200}
+
+    assert suggest_type("UInt32", stats, {"headroom": 1.0}) == "UInt8"
+    assert suggest_type("UInt32", stats, {"headroom": 2.0}) == "UInt16"
+
+
+def test_suggest_type_never_widens():
+    """Testa se um schema já estreito é mantido."""
+    stats = {"rows": 10, "nulls": 0, "cardinality": 10, "min": 0, "max": 100}
+
+    assert suggest_type("UInt8", stats, {"headroom": 4.0}) == "UInt8"
+
+
+def test_build_narrowing_advice(raw_orders: pl.LazyFrame):
+    """Testa a consolidação dos perfis em relatório e tipos sugeridos."""
+    report = profile_table_dtypes(raw_orders, SCHEMA, "orders")
+
+    full_report, narrowed = build_narrowing_advice(report)
+
+    assert full_report.height == len(SCHEMA)
+    assert narrowed["orders"] == {
+        "id": "UInt16",
+        "num_of_item": "UInt8",
+        "delta": "Int8",
+        "status": "Categorical",
+    }
+
+
+def test_process_table_applies_narrowing_with_overflow_guard():
+    """Testa se o tipo sugerido é aplicado e se um overflow mantém o tipo do schema."""
+    raw = pl.LazyFrame({"id": [1, 2], "num_of_item": [3, 300]})
+    schema = {"id": "UInt32", "num_of_item": "UInt32"}
+    narrowed = {"orders": {"id": "UInt8", "num_of_item": "UInt8"}}
+
+    res = process_table(raw, schema, "orders", narrowed_types=narrowed).collect()
+
+    assert res.schema["id"] == pl.UInt8
+    assert res.schema["num_of_item"] == pl.UInt32
+    assert res["num_of_item"].to_list() == [3, 300]
@@ -0,0 +1,23 @@
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.pipelines.data_profiling import create_pipeline
+
+
+def test_profiling_pipeline_structure(mocker: MockerFixture):
+    """Testa um nó de perfil por tabela e a consolidação das sugestões."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.pipelines.data_profiling.pipeline.get_params",
+        return_value={"schemas": {"orders": {"id": "UInt32"}, "users": {}}},
+    )
+
+    nodes = {n.name: n for n in create_pipeline().nodes}
+
+    assert nodes["profile_orders_node"]._inputs["df"] == "ingestion_raw_orders"
+    assert nodes["build_narrowing_advice_node"].inputs == [
+        "profiling_dtypes_orders",
+        "profiling_dtypes_users",
+    ]
+    assert nodes["build_narrowing_advice_node"].outputs == [
+        "profiling_dtype_report",
+        "profiling_narrowed_types",
+    ]
@@ -0,0 +1,44 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.utils.get_catalog import get_catalog_entry
+
+# Simula a estrutura de um catalog.yml
+MOCK_CATALOG = {
+    "processing_intermediate_events": {
+        "type": "thelook_ecommerce_analysis.datasets.StreamingPolarsDataset",
+        "partition_by": "created_at",
+    },
+}
+
+
+@pytest.fixture
+def mock_config_loader(mocker: MockerFixture) -> MagicMock:
+    """Mock do OmegaConfigLoader para não precisar ler arquivos."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.utils.get_catalog.settings", CONF_SOURCE="conf"
+    )
+    mock_cls = mocker.patch(
+        "thelook_ecommerce_analysis.utils.get_catalog.OmegaConfigLoader"
+    )
+    mock_cls.return_value.__getitem__.side_effect = (
+        lambda key: MOCK_CATALOG if key == "catalog" else {}
+    )
+    return mock_cls
+
+
+def test_get_catalog_entry_returns_dataset_config(mock_config_loader: MagicMock):
+    """Testa se a função retorna a configuração explícita do dataset."""
+    entry = get_catalog_entry("processing_intermediate_events")
+
+    assert entry["partition_by"] == "created_at"
+    mock_config_loader.assert_called_once_with(
+        conf_source="conf", base_env="base", default_run_env="local"
+    )
+
+
+def test_get_catalog_entry_missing_returns_empty(mock_config_loader: MagicMock):
+    """Testa o fallback para datasets definidos apenas por dataset factory."""
+    assert get_catalog_entry("processing_intermediate_users") == {}
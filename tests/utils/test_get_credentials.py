@@ -0,0 +1,35 @@
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.utils.get_credentials import get_credentials
+
+MOCK_CREDENTIALS = {"postgres": {"host": "localhost", "port": 5432}}
+
+
+@pytest.fixture
+def mock_config_loader(mocker: MockerFixture) -> MagicMock:
+    """Mock do OmegaConfigLoader para não precisar ler arquivos."""
+    mocker.patch(
+        "thelook_ecommerce_analysis.utils.get_credentials.settings",
+        CONF_SOURCE="conf",
+    )
+    mock_cls = mocker.patch(
+        "thelook_ecommerce_analysis.utils.get_credentials.OmegaConfigLoader"
+    )
+    mock_cls.return_value.__getitem__.side_effect = (
+        lambda key: MOCK_CREDENTIALS if key == "credentials" else {}
+    )
+    return mock_cls
+
+
+def test_get_credentials_returns_entry(mock_config_loader: MagicMock):
+    """Testa se retorna apenas a entrada solicitada."""
+    assert get_credentials("postgres") == {"host": "localhost", "port": 5432}
+
+
+def test_get_credentials_missing_key_raises(mock_config_loader: MagicMock):
+    """Testa se uma chave inexistente gera erro explícito."""
+    with pytest.raises(KeyError, match="não encontrada em credentials.yml"):
+        get_credentials("bigquery")
@@ -0,0 +1,164 @@
+import threading
+from unittest.mock import MagicMock
+
+import psycopg
+import pytest
+from psycopg import pq
+from pytest_mock import MockerFixture
+
+from thelook_ecommerce_analysis.utils.postgres_pool import (
+    PostgresPool,
+    PostgresPoolRegistry,
+    build_conninfo,
+)
+
+CREDENTIALS = {
+    "host": "localhost",
+    "port": 5432,
+    "dbname": "thelook_db",
+    "user": "admin",
+    "password": "se cret",
+    "driver": "psycopg",
+}
+
+
+@pytest.fixture
+def mock_connect(mocker: MockerFixture) -> MagicMock:
+    """psycopg.connect falso: cada chamada retorna uma conexão nova e ociosa."""
+
+    def _connect(conninfo: str) -> MagicMock:
+        conn = mocker.MagicMock(closed=False)
+        conn.info.transaction_status = pq.TransactionStatus.IDLE
+
+        def _end_transaction() -> None:
+            conn.info.transaction_status = pq.TransactionStatus.IDLE
+
+        conn.commit.side_effect = conn.rollback.side_effect = _end_transaction
+        return conn
+
+    return mocker.patch(
+        "thelook_ecommerce_analysis.utils.postgres_pool.psycopg.connect",
+        side_effect=_connect,
+    )
+
+
+def test_build_conninfo_quotes_values():
+    """Testa a conn string apenas com as chaves do libpq e valores escapados."""
+    conninfo = build_conninfo(CREDENTIALS)
+
+    assert "dbname=thelook_db" in conninfo
+    assert "password='se cret'" in conninfo
+    assert "driver" not in conninfo
+
+
+def test_pool_opens_on_demand_and_reuses(mock_connect: MagicMock):
+    """Testa a abertura sob demanda e a reutilização das conexões devolvidas."""
+    pool = PostgresPool("dbname=x", size=2)
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+
+    assert first is second
+    assert mock_connect.call_count == 1
+    stats = pool.stats
+    assert (stats["open"], stats["in_use"], stats["borrows"]) == (1, 0, 2)
+
+    pool.close()
+    first.close.assert_called_once()
+    assert pool.stats["open"] == 0
+
+
+def test_pool_commits_and_rolls_back(mock_connect: MagicMock):
+    """Testa o commit da transação aberta no bloco e o rollback quando o bloco falha."""
+    pool = PostgresPool("dbname=x", size=1)
+
+    with pool.connection() as conn:
+        conn.info.transaction_status = pq.TransactionStatus.INTRANS
+    conn.commit.assert_called_once()
+    conn.rollback.assert_not_called()
+
+    with pytest.raises(RuntimeError), pool.connection() as conn:
+        conn.info.transaction_status = pq.TransactionStatus.INERROR
+        raise RuntimeError("falha no nó")
+    conn.rollback.assert_called_once()
+    assert pool.stats["open"] == 1
+
+
+def test_pool_discards_broken_connection(mock_connect: MagicMock):
+    """Testa que uma conexão quebrada é descartada e a próxima é aberta de novo."""
+    pool = PostgresPool("dbname=x", size=1)
+
+    with pool.connection() as conn:
+        conn.closed = True
+        conn.info.transaction_status = pq.TransactionStatus.UNKNOWN
+        conn.rollback.side_effect = psycopg.OperationalError
+
+    with pool.connection() as other:
+        pass
+
+    assert other is not conn
+    assert mock_connect.call_count == 2
+
+
+def test_pool_waits_for_free_connection(mock_connect: MagicMock):
+    """Testa a espera por uma conexão livre (métricas de espera) e o timeout."""
+    pool = PostgresPool("dbname=x", size=1, timeout=5)
+    borrowed = threading.Event()
+    release = threading.Event()
+
+    def _hold() -> None:
+        with pool.connection():
+            borrowed.set()
+            release.wait()
+
+    holder = threading.Thread(target=_hold)
+    holder.start()
+    borrowed.wait()
+    threading.Timer(0.05, release.set).start()
+    with pool.connection():
+        pass
+    holder.join()
+
+    stats = pool.stats
+    assert (stats["borrows"], stats["waits"], stats["peak"]) == (2, 1, 1)
+    assert stats["max_wait"] >= 0.04
+    assert 0 < stats["utilization"] <= 1
+
+    pool = PostgresPool("dbname=x", size=1, timeout=0.01)
+    with pool.connection(), pytest.raises(TimeoutError, match="Nenhuma conexão livre"):
+        with pool.connection():
+            pass
+
+
+def test_close_closes_borrowed_connection_on_return(mock_connect: MagicMock):
+    """Testa que, com o pool fechado, a conexão emprestada é fechada ao ser devolvida."""
+    pool = PostgresPool("dbname=x", size=2)
+
+    with pool.connection() as borrowed:
+        with pool.connection() as idle:
+            pass
+        pool.close()
+        idle.close.assert_called_once()
+        borrowed.close.assert_not_called()
+
+    borrowed.close.assert_called_once()
+    assert pool.stats["open"] == 0
+
+
+def test_registry_shares_pool_per_database(mock_connect: MagicMock):
+    """Testa um pool por banco, com o tamanho do primeiro pedido, e o fechamento."""
+    registry = PostgresPoolRegistry()
+
+    pool = registry.get_pool(CREDENTIALS, size=3)
+    assert registry.get_pool(CREDENTIALS, size=8) is pool
+    assert pool.size == 3
+    assert registry.get_pool({**CREDENTIALS, "dbname": "other"}) is not pool
+
+    with pool.connection():
+        pass
+    assert registry.stats["localhost/thelook_db"]["borrows"] == 1
+
+    registry.close_all()
+    assert registry.stats == {}